@@ -68,6 +68,50 @@ def default_host_config_dir(agent: str, *, codex_default: str | None = None) ->
         return os.path.expanduser("~/.midoriai/.agent_config")
 
 
+def resolve_agent_config_dir(
+    agent_cli: str, *, env: object | None, settings: dict[str, object]
+) -> str:
+    """Resolve a host config directory for an agent CLI.
+
+    Precedence:
+    1. Environment agent_selection (first matching agent instance with config_dir)
+    2. Global per-agent settings (host_*_dir)
+    3. Legacy env.host_codex_dir override (deprecated)
+    """
+    agent_cli = normalize_agent(agent_cli)
+
+    agent_selection = getattr(env, "agent_selection", None)
+    for inst in getattr(agent_selection, "agents", None) or []:
+        if normalize_agent(getattr(inst, "agent_cli", "")) != agent_cli:
+            continue
+        inst_dir = os.path.expanduser(
+            str(getattr(inst, "config_dir", "") or "").strip()
+        )
+        if inst_dir:
+            return inst_dir
+
+    # Fall back to global settings-based config dir
+    config_dir = ""
+    if agent_cli == "claude":
+        config_dir = str(settings.get("host_claude_dir") or "")
+    elif agent_cli == "copilot":
+        config_dir = str(settings.get("host_copilot_dir") or "")
+    elif agent_cli == "gemini":
+        config_dir = str(settings.get("host_gemini_dir") or "")
+    else:
+        config_dir = str(
+            settings.get("host_codex_dir")
+            or os.environ.get("CODEX_HOST_CODEX_DIR", os.path.expanduser("~/.codex"))
+        )
+
+    # Legacy: check env.host_codex_dir override (deprecated) — only apply for codex
+    legacy_codex_dir = str(getattr(env, "host_codex_dir", "") or "")
+    if agent_cli == "codex" and legacy_codex_dir:
+        config_dir = legacy_codex_dir
+
+    return os.path.expanduser(str(config_dir or "").strip())
+
+
 def agent_requires_github_token(agent: str) -> bool:
     agent = normalize_agent(agent)
     from agents_runner.agent_systems import get_agent_system
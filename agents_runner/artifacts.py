@@ -10,6 +10,7 @@ import json
 import logging
 import mimetypes
 import multiprocessing
+import os
 import queue
 import shutil
 import time
@@ -504,31 +505,106 @@ def list_staging_artifacts(task_id: str) -> list[StagingArtifactMeta]:
     artifacts: list[StagingArtifactMeta] = []
 
     try:
-        for file_path in staging_dir.iterdir():
-            if not file_path.is_file():
+        artifacts = list(snapshot_staging_dir(staging_dir).values())
+
+        # Sort by modification time (newest first)
+        artifacts.sort(key=lambda a: a.modified_at, reverse=True)
+
+    except Exception as e:
+        logger.error(f"Failed to list staging artifacts for task {task_id}: {e}")
+
+    return artifacts
+
+
+@dataclass
+class StagingArtifactDiff:
+    """Delta between two staging directory snapshots."""
+
+    added: list[StagingArtifactMeta]
+    modified: list[StagingArtifactMeta]
+    removed: list[str]
+
+    def is_empty(self) -> bool:
+        return not (self.added or self.modified or self.removed)
+
+
+def snapshot_staging_dir(staging_dir: Path) -> dict[str, StagingArtifactMeta]:
+    """
+    Take a (name, size, mtime) snapshot of the files in a staging directory.
+
+    Uses ``os.scandir`` so each entry costs a single ``stat`` call.
+
+    Args:
+        staging_dir: Staging directory to scan
+
+    Returns:
+        Mapping of filename to staging artifact metadata (empty if missing)
+
+    Raises:
+        OSError: If the directory exists but cannot be read
+    """
+    snapshot: dict[str, StagingArtifactMeta] = {}
+    if not staging_dir.exists():
+        return snapshot
+
+    with os.scandir(staging_dir) as entries:
+        for entry in entries:
+            try:
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+            except OSError:
+                # File vanished between listing and stat.
                 continue
 
-            stat = file_path.stat()
-            mime_type, _ = mimetypes.guess_type(file_path.name)
+            mime_type, _ = mimetypes.guess_type(entry.name)
             if mime_type is None:
                 mime_type = "application/octet-stream"
 
-            artifact = StagingArtifactMeta(
-                filename=file_path.name,
-                path=file_path,
+            snapshot[entry.name] = StagingArtifactMeta(
+                filename=entry.name,
+                path=staging_dir / entry.name,
                 size_bytes=stat.st_size,
                 modified_at=datetime.fromtimestamp(stat.st_mtime, timezone.utc),
                 mime_type=mime_type,
             )
-            artifacts.append(artifact)
 
-        # Sort by modification time (newest first)
-        artifacts.sort(key=lambda a: a.modified_at, reverse=True)
+    return snapshot
 
-    except Exception as e:
-        logger.error(f"Failed to list staging artifacts for task {task_id}: {e}")
 
-    return artifacts
+def diff_staging_snapshots(
+    previous: dict[str, StagingArtifactMeta],
+    current: dict[str, StagingArtifactMeta],
+) -> StagingArtifactDiff:
+    """
+    Compute added/modified/removed entries between two staging snapshots.
+
+    A file counts as modified when its size or modification time changed.
+
+    Args:
+        previous: Earlier snapshot from :func:`snapshot_staging_dir`
+        current: Later snapshot from :func:`snapshot_staging_dir`
+
+    Returns:
+        StagingArtifactDiff with added and modified entries sorted newest first
+    """
+    added: list[StagingArtifactMeta] = []
+    modified: list[StagingArtifactMeta] = []
+
+    for name, meta in current.items():
+        before = previous.get(name)
+        if before is None:
+            added.append(meta)
+        elif (
+            before.size_bytes != meta.size_bytes
+            or before.modified_at != meta.modified_at
+        ):
+            modified.append(meta)
+
+    removed = sorted(name for name in previous if name not in current)
+    added.sort(key=lambda a: a.modified_at, reverse=True)
+    modified.sort(key=lambda a: a.modified_at, reverse=True)
+    return StagingArtifactDiff(added=added, modified=modified, removed=removed)
 
 
 def get_staging_artifact_path(task_id: str, filename: str) -> Path | None:
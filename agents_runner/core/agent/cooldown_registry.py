@@ -0,0 +1,191 @@
+"""
+Indexed cooldown registry.
+
+Wraps the shared ``watch_states`` dict with an index of active cooldowns by
+exact attempt key and by agent CLI, plus a min-heap of expiry times. Lookups
+are O(1) and expiry is O(log n) per cooldown instead of a scan over every
+watch state. Expired cooldowns are cleared by ``expire_due`` and reported
+through ``on_change`` so the caller can wake anything that waited on them.
+"""
+
+from __future__ import annotations
+
+import heapq
+import threading
+from datetime import datetime
+from datetime import timezone
+from typing import Callable
+
+from agents_runner.core.agent.rate_limit import RateLimitDetector
+from agents_runner.core.agent.watch_state import AgentStatus
+from agents_runner.core.agent.watch_state import AgentWatchState
+from agents_runner.core.agent.watch_state import SupportLevel
+
+
+def _agent_cli_of(key: str) -> str:
+    return key.split("::", 1)[0].strip().lower()
+
+
+def _timestamp(value: datetime | None) -> float | None:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class CooldownRegistry:
+    """Cooldown lookups and expiry over a shared ``watch_states`` dict.
+
+    ``watch_states`` stays the source of truth for persistence and the
+    cooldown dialog; all mutations must go through the registry so the index
+    stays in sync. Safe to call from supervisor threads.
+
+    ``on_change`` is called (outside the lock) after a cooldown is set,
+    cleared or expires, with the affected keys.
+    """
+
+    def __init__(
+        self,
+        watch_states: dict[str, AgentWatchState],
+        *,
+        on_change: Callable[[list[str]], None] | None = None,
+    ) -> None:
+        self._watch_states = watch_states
+        self._on_change = on_change
+        self._lock = threading.Lock()
+        # key -> cooldown_until timestamp, for keys currently on cooldown
+        self._active: dict[str, float] = {}
+        self._by_cli: dict[str, set[str]] = {}
+        self._heap: list[tuple[float, str]] = []
+        self._version = 0
+        self.rebuild()
+
+    @property
+    def version(self) -> int:
+        """Bumped on every change; lets persistence skip unchanged saves."""
+        return self._version
+
+    def rebuild(self) -> None:
+        """Re-index ``watch_states`` (after loading them from disk)."""
+        with self._lock:
+            self._active.clear()
+            self._by_cli.clear()
+            self._heap.clear()
+            for key, state in self._watch_states.items():
+                until = _timestamp(state.cooldown_until)
+                if until is not None:
+                    self._index(key, until)
+            heapq.heapify(self._heap)
+            self._version += 1
+
+    def _index(self, key: str, until: float) -> None:
+        self._active[key] = until
+        self._by_cli.setdefault(_agent_cli_of(key), set()).add(key)
+        heapq.heappush(self._heap, (until, key))
+
+    def _unindex(self, key: str) -> None:
+        # Heap entries are dropped lazily in expire_due.
+        if self._active.pop(key, None) is None:
+            return
+        keys = self._by_cli.get(_agent_cli_of(key))
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                self._by_cli.pop(_agent_cli_of(key), None)
+
+    def check(self, agent_key: str) -> AgentWatchState | None:
+        """Return the watch state for a key (or bare agent CLI), if any.
+
+        For a bare agent CLI, any exact key of that CLI on cooldown matches.
+        """
+        agent_key = str(agent_key or "").strip()
+        if not agent_key:
+            return None
+        with self._lock:
+            state = self._watch_states.get(agent_key)
+            if state is not None or "::" in agent_key:
+                return state
+            agent_cli = agent_key.lower()
+            state = self._watch_states.get(agent_cli)
+            if state is not None:
+                return state
+            for key in self._by_cli.get(agent_cli, ()):
+                candidate = self._watch_states.get(key)
+                if candidate is not None and candidate.is_on_cooldown():
+                    return candidate
+        return None
+
+    def is_on_cooldown(self, agent_key: str) -> bool:
+        state = self.check(agent_key)
+        return bool(state and state.is_on_cooldown())
+
+    def set_cooldown(
+        self, agent_key: str, duration_seconds: int, reason: str = ""
+    ) -> AgentWatchState:
+        agent_key = str(agent_key or "").strip()
+        with self._lock:
+            state = self._watch_states.get(agent_key)
+            if state is None:
+                state = AgentWatchState(
+                    provider_name=agent_key,
+                    support_level=SupportLevel.BEST_EFFORT,
+                )
+                self._watch_states[agent_key] = state
+            RateLimitDetector.record_rate_limit(state, duration_seconds, reason)
+            self._unindex(agent_key)
+            until = _timestamp(state.cooldown_until)
+            if until is not None:
+                self._index(agent_key, until)
+            self._version += 1
+        self._notify([agent_key])
+        return state
+
+    def clear_cooldown(self, agent_key: str) -> None:
+        agent_key = str(agent_key or "").strip()
+        with self._lock:
+            state = self._watch_states.get(agent_key)
+            if state is None:
+                return
+            RateLimitDetector.clear_cooldown(state)
+            self._unindex(agent_key)
+            self._version += 1
+        self._notify([agent_key])
+
+    def next_expiry(self) -> float | None:
+        """Epoch seconds of the earliest pending expiry, if any."""
+        with self._lock:
+            while self._heap:
+                until, key = self._heap[0]
+                if self._active.get(key) == until:
+                    return until
+                heapq.heappop(self._heap)
+        return None
+
+    def expire_due(self, now: float | None = None) -> list[str]:
+        """Clear cooldowns whose time has passed; returns the expired keys."""
+        now = datetime.now(timezone.utc).timestamp() if now is None else now
+        expired: list[str] = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                until, key = heapq.heappop(self._heap)
+                if self._active.get(key) != until:
+                    continue  # superseded by a newer cooldown or cleared
+                self._unindex(key)
+                state = self._watch_states.get(key)
+                if state is not None and state.status == AgentStatus.ON_COOLDOWN:
+                    state.status = AgentStatus.READY
+                expired.append(key)
+            if expired:
+                self._version += 1
+        if expired:
+            self._notify(expired)
+        return expired
+
+    def _notify(self, keys: list[str]) -> None:
+        if self._on_change is None:
+            return
+        try:
+            self._on_change(list(keys))
+        except Exception:
+            pass
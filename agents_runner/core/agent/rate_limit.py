@@ -6,7 +6,6 @@ Detects rate-limit errors from agent logs and manages cooldown state.
 
 from __future__ import annotations
 
-import re
 from datetime import datetime
 from datetime import timedelta
 from datetime import timezone
@@ -65,34 +64,11 @@ class RateLimitDetector:
             If not rate-limited, returns (False, 0)
             If rate-limited, returns (True, duration_in_seconds)
         """
-        # Check exit code (429 = Too Many Requests in HTTP)
-        if exit_code == 429:
-            return True, 3600  # Default 1 hour for HTTP 429
+        from agents_runner.execution.failure_signals import FailureSignalDetector
 
-        # Get patterns for this agent
-        patterns = RateLimitDetector.PATTERNS.get(agent_cli, [])
-
-        # Scan recent logs (last 100 lines)
-        for line in logs[-100:]:
-            line_lower = line.lower()
-
-            for pattern, default_cooldown in patterns:
-                match = re.search(pattern, line_lower)
-                if not match:
-                    continue
-
-                # Found rate-limit indicator
-                if default_cooldown is None:
-                    # Pattern includes duration extraction
-                    try:
-                        duration = int(match.group(1))
-                        return True, duration
-                    except (IndexError, ValueError):
-                        return True, 3600  # Fallback to 1 hour
-                else:
-                    return True, default_cooldown
-
-        return False, 0
+        detector = FailureSignalDetector(agent_cli)
+        detector.feed_lines(logs[-100:])
+        return detector.rate_limit(exit_code=exit_code)
 
     @staticmethod
     def record_rate_limit(
@@ -10,6 +10,7 @@ from agents_runner.docker.config import DockerRunnerConfig
 from agents_runner.docker.agent_worker_github import GitHubOperations
 from agents_runner.docker.agent_worker_setup import WorkerSetup
 from agents_runner.docker.agent_worker_container import ContainerExecutor
+from agents_runner.environments.cow_workspace import create_workspace_snapshot
 
 
 class DockerAgentWorker:
@@ -48,6 +49,13 @@ class DockerAgentWorker:
             return self._executor.container_id
         return self._container_id
 
+    @property
+    def resource_usage(self) -> dict[str, Any]:
+        """Peak memory and CPU time of the last container run, if known."""
+        if self._executor is not None:
+            return self._executor.resource_usage
+        return {}
+
     @property
     def gh_repo_root(self) -> str | None:
         """Get the GitHub repository root path."""
@@ -68,12 +76,13 @@ class DockerAgentWorker:
         from agents_runner.docker.process import _run_docker
 
         self._stop.set()
-        if self._container_id:
+        container_id = self.container_id
+        if container_id:
             try:
-                _run_docker(["stop", "-t", "1", self._container_id], timeout_s=10.0)
+                _run_docker(["stop", "-t", "1", container_id], timeout_s=10.0)
             except Exception:
                 try:
-                    _run_docker(["kill", self._container_id], timeout_s=10.0)
+                    _run_docker(["kill", container_id], timeout_s=10.0)
                 except Exception:
                     pass
 
@@ -82,9 +91,10 @@ class DockerAgentWorker:
         from agents_runner.docker.process import _run_docker
 
         self._stop.set()
-        if self._container_id:
+        container_id = self.container_id
+        if container_id:
             try:
-                _run_docker(["kill", self._container_id], timeout_s=10.0)
+                _run_docker(["kill", container_id], timeout_s=10.0)
             except Exception:
                 pass
 
@@ -92,6 +102,7 @@ class DockerAgentWorker:
         """Execute the agent task in a Docker container.
 
         Orchestrates:
+        0. Copy-on-write snapshot of a mounted folder (if configured)
         1. GitHub repository preparation
         2. Runtime environment setup
         3. Container execution and monitoring
@@ -99,6 +110,15 @@ class DockerAgentWorker:
         preflight_tmp_paths: list[str] = []
 
         try:
+            # Step 0: Give the task its own view of a mounted folder
+            if self._config.workspace_snapshot_source:
+                create_workspace_snapshot(
+                    self._config.workspace_snapshot_source,
+                    self._config.workspace_snapshot_root
+                    or os.path.dirname(self._config.host_workdir),
+                    on_log=self._on_log,
+                )
+
             # Step 1: Prepare GitHub repository (if configured)
             if self._config.gh_repo:
                 try:
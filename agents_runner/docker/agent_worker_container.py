@@ -4,7 +4,7 @@ Handles Docker container orchestration including:
 - Agent command building
 - Desktop/VNC setup (cached and runtime variants)
 - Preflight script execution
-- Environment variable forwarding
+- Environment variable forwarding (per-environment parts via run_plan)
 - Container lifecycle management
 - Log streaming and state monitoring
 
@@ -28,58 +28,17 @@ import selectors
 import subprocess
 from typing import Any, Callable
 
-from agents_runner.agent_cli import build_noninteractive_cmd, verify_cli_clause
-from agents_runner.agent_cli import agent_requires_github_token
-from agents_runner.github_token import resolve_github_token
+from agents_runner.agent_cli import build_noninteractive_cmd
+from agents_runner.github_token import cached_github_token
 from agents_runner.log_format import format_log, wrap_container_log
-from agents_runner.core.shell_templates import git_identity_clause, shell_log_statement
+from agents_runner.core.shell_templates import shell_log_statement
 
+from agents_runner.docker.cgroups import ContainerUsageTracker
 from agents_runner.docker.config import DockerRunnerConfig
 from agents_runner.docker.process import _run_docker, _inspect_state
 from agents_runner.docker.agent_worker_setup import RuntimeEnvironment
-from agents_runner.docker.utils import deduplicate_mounts
-from agents_runner.environments import load_environments
-
-
-def _is_gh_context_enabled(environment_id: str | None) -> bool:
-    """Check if GitHub Context is enabled in environment settings."""
-    if not environment_id:
-        return False
-    try:
-        environments = load_environments()
-        env = environments.get(str(environment_id))
-    except Exception:
-        return False
-    if env is None:
-        return False
-    return bool(getattr(env, "gh_context_enabled", False))
-
-
-def _needs_cross_agent_gh_token(environment_id: str | None) -> bool:
-    """Check if any cross-agent allowlisted agent requires a GitHub token."""
-    if not environment_id:
-        return False
-    try:
-        environments = load_environments()
-        env = environments.get(str(environment_id))
-    except Exception:
-        return False
-    if env is None or not env.cross_agent_allowlist:
-        return False
-    if env.agent_selection is None or not env.agent_selection.agents:
-        return False
-
-    from agents_runner.agent_cli import normalize_agent
-
-    agent_cli_by_id: dict[str, str] = {
-        agent.agent_id: agent.agent_cli for agent in env.agent_selection.agents
-    }
-
-    for agent_id in env.cross_agent_allowlist:
-        agent_cli = agent_cli_by_id.get(agent_id)
-        if agent_cli and agent_requires_github_token(normalize_agent(agent_cli)):
-            return True
-    return False
+from agents_runner.docker.run_plan import RunPlan
+from agents_runner.docker.run_plan import run_plan_for
 
 
 class ContainerExecutor:
@@ -108,12 +67,18 @@ class ContainerExecutor:
         self._on_log = on_log
         self._stop = stop_event
         self._container_id: str | None = None
+        self._usage: ContainerUsageTracker | None = None
 
     @property
     def container_id(self) -> str | None:
         """Get the container ID."""
         return self._container_id
 
+    @property
+    def resource_usage(self) -> dict[str, Any]:
+        """Peak memory and CPU time read from the container's cgroup."""
+        return self._usage.summary() if self._usage is not None else {}
+
     def execute_container(self) -> int:
         """Execute the agent container and return exit code.
 
@@ -125,36 +90,68 @@ class ContainerExecutor:
             agent_args = self._build_agent_command()
             agent_cmd = " ".join(shlex.quote(part) for part in agent_args)
 
-            # Setup desktop state tracking
-            desktop_state: dict[str, Any] = {}
-
-            # Build preflight clause and mounts
-            preflight_clause, preflight_mounts = self._build_preflight_clause(
-                desktop_state
+            # Environment/agent-dependent args come from the cached plan
+            plan, cached = run_plan_for(self._config, self._runtime_env)
+            self._on_log(
+                format_log(
+                    "docker",
+                    "plan",
+                    "DEBUG",
+                    f"run plan {plan.key[:12]} ({'cached' if cached else 'compiled'})",
+                )
             )
 
-            # Build environment variables
-            env_args, docker_env = self._build_env_args()
+            # Setup desktop state tracking
+            desktop_state: dict[str, Any] = {}
+            if plan.desktop_enabled:
+                if plan.desktop_from_cached_image:
+                    self._on_log(
+                        format_log(
+                            "desktop",
+                            "setup",
+                            "INFO",
+                            "using pre-installed desktop from cached image",
+                        )
+                    )
+                desktop_state.update(
+                    {
+                        "DesktopEnabled": True,
+                        "DesktopDisplay": plan.desktop_display,
+                    }
+                )
 
-            # Build port args
-            port_args = self._build_port_args()
+            # Build task-specific preflight clause and mounts
+            preflight_clause, preflight_mounts = self._build_preflight_clause()
 
-            # Build extra mounts
-            extra_mount_args = self._build_extra_mounts()
+            # Resolve the GitHub token per launch; it is never part of the plan
+            docker_env = self._github_token_env(plan)
 
-            # Build Docker run args
-            args = self._build_docker_run_args(
-                platform_args=self._runtime_env.platform_args,
-                port_args=port_args,
-                extra_mount_args=extra_mount_args,
+            args = plan.docker_run_args(
+                container_name=self._runtime_env.container_name,
+                container_cwd=self._runtime_env.container_cwd,
+                image=self._runtime_env.runtime_image,
+                task_mounts=self._task_mounts(),
                 preflight_mounts=preflight_mounts,
-                env_args=env_args,
                 preflight_clause=preflight_clause,
                 agent_cmd=agent_cmd,
+                task_token=self._runtime_env.task_token,
+                forward_github_token=docker_env is not None,
             )
 
+            resources = self._config.resources
+            if not resources.is_unlimited():
+                self._on_log(
+                    format_log(
+                        "docker",
+                        "resources",
+                        "INFO",
+                        f"resource limits: {resources.describe()}",
+                    )
+                )
+
             # Start container
             self._container_id = _run_docker(args, timeout_s=60.0, env=docker_env)
+            self._usage = ContainerUsageTracker(self._container_id)
 
             # Setup desktop port mapping if enabled
             if self._runtime_env.desktop_enabled and self._container_id:
@@ -187,23 +184,35 @@ class ContainerExecutor:
             agent_cli_args=list(self._config.agent_cli_args or []),
         )
 
-    def _build_preflight_clause(
-        self, desktop_state: dict[str, Any]
-    ) -> tuple[str, list[str]]:
-        """Build preflight clause and mounts. Returns (clause, mounts)."""
+    def _task_mounts(self) -> list[str]:
+        """Config, workspace and artifacts mounts for this task."""
+        return [
+            f"{self._config.host_config_dir}:{self._runtime_env.config_container_dir}",
+            f"{self._runtime_env.host_mount}:{self._config.container_workdir}",
+            f"{self._runtime_env.artifacts_staging_dir}:/tmp/agents-artifacts",
+        ]
+
+    def _github_token_env(self, plan: RunPlan) -> dict[str, str] | None:
+        """Docker client env carrying GH_TOKEN/GITHUB_TOKEN, or None to skip."""
+        if not plan.needs_github_token:
+            return None
+        configured = self._config.env_vars or {}
+        if "GH_TOKEN" in configured or "GITHUB_TOKEN" in configured:
+            return None
+        token = cached_github_token()
+        if not token:
+            return None
+        self._on_log("[auth] forwarding GitHub token from host -> container")
+        docker_env = dict(os.environ)
+        docker_env["GH_TOKEN"] = token
+        docker_env["GITHUB_TOKEN"] = token
+        return docker_env
+
+    def _build_preflight_clause(self) -> tuple[str, list[str]]:
+        """Build settings/environment preflight clause and mounts."""
         preflight_clause = ""
         preflight_mounts: list[str] = []
 
-        # Desktop preflight
-        if self._runtime_env.desktop_enabled:
-            preflight_clause += self._build_desktop_preflight_clause()
-            desktop_state.update(
-                {
-                    "DesktopEnabled": True,
-                    "DesktopDisplay": self._runtime_env.desktop_display,
-                }
-            )
-
         # Settings preflight
         if self._runtime_env.settings_preflight_tmp_path is not None:
             clause, mounts = self._build_settings_preflight(
@@ -224,90 +233,6 @@ class ContainerExecutor:
 
         return preflight_clause, preflight_mounts
 
-    def _build_desktop_preflight_clause(self) -> str:
-        """Build desktop preflight clause based on cached vs runtime setup."""
-        using_cached_image = self._runtime_env.runtime_image != self._config.image
-        if using_cached_image:
-            self._on_log(
-                format_log(
-                    "desktop",
-                    "setup",
-                    "INFO",
-                    "using pre-installed desktop from cached image",
-                )
-            )
-            return self._build_desktop_cached_preflight(
-                self._runtime_env.desktop_display
-            )
-        return self._build_desktop_runtime_preflight(self._runtime_env.desktop_display)
-
-    def _build_desktop_cached_preflight(self, desktop_display: str) -> str:
-        """Build preflight clause for cached desktop image."""
-        common_setup = (
-            f"{shell_log_statement('desktop', 'vnc', 'INFO', 'starting headless desktop (noVNC)')}; "
-            f"export DISPLAY={desktop_display}; "
-            'export QT_QPA_PLATFORM="${QT_QPA_PLATFORM:-xcb}"; '
-            'export XDG_RUNTIME_DIR="${XDG_RUNTIME_DIR:-/tmp/xdg-$(id -un)}"; '
-            'mkdir -p "${XDG_RUNTIME_DIR}"; '
-            'RUNTIME_BASE="/tmp/agents-runner-desktop/${AGENTS_RUNNER_TASK_ID:-task}"; '
-            'mkdir -p "${RUNTIME_BASE}"/{run,log,out,config}; '
-        )
-        novnc_setup = (
-            "if [ -f /etc/default/novnc-path ]; then source /etc/default/novnc-path; else "
-            'NOVNC_WEB=""; for candidate in "/usr/share/webapps/novnc" "/usr/share/novnc" "/usr/share/noVNC"; do '
-            'if [ -d "${candidate}" ]; then NOVNC_WEB="${candidate}"; break; fi; done; fi; '
-            "if [ -f /etc/profile.d/desktop-env.sh ]; then source /etc/profile.d/desktop-env.sh; fi; "
-        )
-        service_start = (
-            'Xvnc :1 -geometry 1280x800 -depth 24 -SecurityTypes None -localhost -rfbport 5901 >"${RUNTIME_BASE}/log/xvnc.log" 2>&1 & sleep 0.25; '
-            '(fluxbox >"${RUNTIME_BASE}/log/fluxbox.log" 2>&1 &) || true; '
-            '(xterm -geometry 80x24+10+10 >"${RUNTIME_BASE}/log/xterm.log" 2>&1 &) || true; '
-            'if [ -n "${NOVNC_WEB}" ]; then websockify --web="${NOVNC_WEB}" 6080 127.0.0.1:5901 >"${RUNTIME_BASE}/log/novnc.log" 2>&1 & '
-            f"else {shell_log_statement('desktop', 'vnc', 'ERROR', 'noVNC web root not found')} >&2; fi; "
-        )
-        return (
-            common_setup
-            + novnc_setup
-            + service_start
-            + f"{shell_log_statement('desktop', 'vnc', 'INFO', 'ready')}; "
-            f"{shell_log_statement('desktop', 'vnc', 'INFO', 'DISPLAY=${DISPLAY}')}; "
-            f"{shell_log_statement('desktop', 'vnc', 'INFO', 'screenshot: import -display :1 -window root /tmp/agents-artifacts/${AGENTS_RUNNER_TASK_ID:-task}-desktop.png')}; "
-        )
-
-    def _build_desktop_runtime_preflight(self, desktop_display: str) -> str:
-        """Build preflight clause for runtime desktop installation."""
-        common_setup = (
-            f"{shell_log_statement('desktop', 'vnc', 'INFO', 'starting headless desktop (noVNC)')}; "
-            f"export DISPLAY={desktop_display}; "
-            'export QT_QPA_PLATFORM="${QT_QPA_PLATFORM:-xcb}"; '
-            'export XDG_RUNTIME_DIR="${XDG_RUNTIME_DIR:-/tmp/xdg-$(id -un)}"; '
-            'mkdir -p "${XDG_RUNTIME_DIR}"; '
-            'RUNTIME_BASE="/tmp/agents-runner-desktop/${AGENTS_RUNNER_TASK_ID:-task}"; '
-            'mkdir -p "${RUNTIME_BASE}"/{run,log,out,config}; '
-        )
-        install_packages = (
-            "if command -v yay >/dev/null 2>&1; then "
-            "yay -S --noconfirm --needed tigervnc fluxbox xterm imagemagick xorg-xwininfo xcb-util-cursor novnc websockify wmctrl xdotool xorg-xprop xorg-xauth ttf-dejavu xorg-fonts-misc || true; fi; "
-        )
-        service_start = (
-            'Xvnc :1 -geometry 1280x800 -depth 24 -SecurityTypes None -localhost -rfbport 5901 >"${RUNTIME_BASE}/log/xvnc.log" 2>&1 & sleep 0.25; '
-            '(fluxbox >"${RUNTIME_BASE}/log/fluxbox.log" 2>&1 &) || true; '
-            '(xterm -geometry 80x24+10+10 >"${RUNTIME_BASE}/log/xterm.log" 2>&1 &) || true; '
-            'NOVNC_WEB=""; for candidate in "/usr/share/webapps/novnc" "/usr/share/novnc" "/usr/share/noVNC"; do '
-            'if [ -d "${candidate}" ]; then NOVNC_WEB="${candidate}"; break; fi; done; '
-            'if [ -z "${NOVNC_WEB}" ]; then '
-            f"{shell_log_statement('desktop', 'vnc', 'ERROR', 'noVNC web root not found')} >&2; "
-            'else websockify --web="${NOVNC_WEB}" 6080 127.0.0.1:5901 >"${RUNTIME_BASE}/log/novnc.log" 2>&1 & fi; '
-        )
-        return (
-            common_setup
-            + install_packages
-            + service_start
-            + f"{shell_log_statement('desktop', 'vnc', 'INFO', 'ready')}; "
-            f"{shell_log_statement('desktop', 'vnc', 'INFO', 'DISPLAY=${DISPLAY}')}; "
-            f"{shell_log_statement('desktop', 'vnc', 'INFO', 'screenshot: import -display :1 -window root /tmp/agents-artifacts/${AGENTS_RUNNER_TASK_ID:-task}-desktop.png')}; "
-        )
-
     def _build_settings_preflight(
         self, tmp_path: str, container_path: str
     ) -> tuple[str, list[str]]:
@@ -348,162 +273,6 @@ class ContainerExecutor:
             ["-v", f"{tmp_path}:{container_path}:ro"],
         )
 
-    def _build_env_args(self) -> tuple[list[str], dict[str, str] | None]:
-        """Build environment variable arguments. Returns (env_args, docker_env)."""
-        env_args: list[str] = []
-        docker_env: dict[str, str] | None = None
-
-        # Add configured env vars
-        for key, value in sorted((self._config.env_vars or {}).items()):
-            k = str(key).strip()
-            if k:
-                env_args.extend(["-e", f"{k}={value}"])
-
-        # Forward GitHub tokens if needed
-        needs_token = (
-            _is_gh_context_enabled(self._config.environment_id)
-            or agent_requires_github_token(self._runtime_env.agent_cli)
-            or _needs_cross_agent_gh_token(self._config.environment_id)
-        )
-
-        if needs_token:
-            token = resolve_github_token()
-            if (
-                token
-                and "GH_TOKEN" not in (self._config.env_vars or {})
-                and "GITHUB_TOKEN" not in (self._config.env_vars or {})
-            ):
-                self._on_log("[auth] forwarding GitHub token from host -> container")
-                docker_env = dict(os.environ)
-                docker_env["GH_TOKEN"] = token
-                docker_env["GITHUB_TOKEN"] = token
-                env_args.extend(["-e", "GH_TOKEN", "-e", "GITHUB_TOKEN"])
-
-        # Add desktop env vars if enabled
-        if self._runtime_env.desktop_enabled:
-            env_args.extend(
-                [
-                    "-e",
-                    f"AGENTS_RUNNER_TASK_ID={self._runtime_env.task_token}",
-                    "-e",
-                    f"DISPLAY={self._runtime_env.desktop_display}",
-                ]
-            )
-
-        return env_args, docker_env
-
-    def _build_port_args(self) -> list[str]:
-        """Build port mapping arguments."""
-        port_args: list[str] = []
-        for port_spec in self._config.ports or []:
-            spec = str(port_spec or "").strip()
-            if not spec:
-                continue
-            if self._runtime_env.desktop_enabled and self._publishes_container_port(
-                spec, 6080
-            ):
-                continue
-            port_args.extend(["-p", spec])
-        if self._runtime_env.desktop_enabled:
-            port_args.extend(["-p", "127.0.0.1::6080"])
-        return port_args
-
-    @staticmethod
-    def _publishes_container_port(spec: str, port: int) -> bool:
-        base = str(spec or "").strip()
-        if not base:
-            return False
-        base = base.split("/", 1)[0]
-        container_part = base.rsplit(":", 1)[-1].strip()
-        if not container_part:
-            return False
-        if container_part.isdigit():
-            return int(container_part) == int(port)
-        if "-" in container_part:
-            left, right = (p.strip() for p in container_part.split("-", 1))
-            if left.isdigit() and right.isdigit():
-                start = int(left)
-                end = int(right)
-                p = int(port)
-                return start <= p <= end
-        return False
-
-    def _build_extra_mounts(self) -> list[str]:
-        """Build extra mount arguments with deduplication."""
-        # Collect all mount strings first (without -v flags)
-        all_mounts: list[str] = []
-
-        # Add primary config mount
-        all_mounts.append(
-            f"{self._config.host_config_dir}:{self._runtime_env.config_container_dir}"
-        )
-
-        # Add workspace mount
-        all_mounts.append(
-            f"{self._runtime_env.host_mount}:{self._config.container_workdir}"
-        )
-
-        # Add artifacts mount
-        all_mounts.append(
-            f"{self._runtime_env.artifacts_staging_dir}:/tmp/agents-artifacts"
-        )
-
-        # Add extra mounts from config
-        for mount in self._config.extra_mounts or []:
-            m = str(mount).strip()
-            if m:
-                all_mounts.append(m)
-
-        # Add config extra mounts (cross-agent configs, etc.)
-        for mount in self._runtime_env.config_extra_mounts:
-            m = str(mount).strip()
-            if m:
-                all_mounts.append(m)
-
-        # Deduplicate by container path, preserving order
-        deduplicated = deduplicate_mounts(all_mounts)
-
-        # Build mount arguments with -v flags
-        extra_mount_args: list[str] = []
-        for mount in deduplicated:
-            extra_mount_args.extend(["-v", mount])
-
-        return extra_mount_args
-
-    def _build_docker_run_args(
-        self,
-        platform_args: list[str],
-        port_args: list[str],
-        extra_mount_args: list[str],
-        preflight_mounts: list[str],
-        env_args: list[str],
-        preflight_clause: str,
-        agent_cmd: str,
-    ) -> list[str]:
-        """Build complete Docker run command arguments."""
-        return [
-            "run",
-            *platform_args,
-            "-d",
-            "-t",
-            "--name",
-            self._runtime_env.container_name,
-            *extra_mount_args,
-            *preflight_mounts,
-            *env_args,
-            *port_args,
-            "-w",
-            self._runtime_env.container_cwd,
-            self._runtime_env.runtime_image,
-            "/bin/bash",
-            "-lc",
-            "set -euo pipefail; "
-            f"{git_identity_clause()}"
-            f"{preflight_clause}"
-            f"{verify_cli_clause(self._runtime_env.agent_cli)}"
-            f"exec {agent_cmd}",
-        ]
-
     def _setup_desktop_port_mapping(
         self, desktop_state: dict[str, Any], docker_env: dict[str, str] | None
     ) -> None:
@@ -562,6 +331,8 @@ class ContainerExecutor:
                 # Poll container state every 0.75 seconds
                 if now - last_poll >= 0.75:
                     last_poll = now
+                    if self._usage is not None:
+                        self._usage.poll()
                     try:
                         state = _inspect_state(self._container_id)
                         if state:
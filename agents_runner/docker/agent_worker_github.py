@@ -41,6 +41,7 @@ class GitHubOperations:
                 prefer_gh=config.gh_prefer_gh_cli,
                 recreate_if_needed=config.gh_recreate_if_needed,
                 on_log=on_log,
+                clone_options=config.gh_clone_options,
             )
             gh_repo_root = str(result.get("repo_root") or "") or None
             gh_base_branch = str(result.get("base_branch") or "") or None
@@ -89,22 +90,22 @@ class GitHubOperations:
         gh_branch: str | None,
         on_log: Callable[[str], None],
     ) -> None:
-        """Update GitHub context file after repository clone."""
+        """Update GitHub context file after repository clone.
+
+        Tasks cloned from the same base commit share one generated context;
+        see ``agents_runner.gh.context_cache``.
+        """
         try:
-            from agents_runner.environments.git_operations import get_git_info
-            from agents_runner.pr_metadata import GitHubContext
+            from agents_runner.gh.context_cache import github_context_cache
             from agents_runner.pr_metadata import update_github_context_after_clone
 
-            git_info = get_git_info(gh_repo_root)
-            if git_info:
-                github_context = GitHubContext(
-                    repo_url=git_info.repo_url,
-                    repo_owner=git_info.repo_owner,
-                    repo_name=git_info.repo_name,
-                    base_branch=gh_base_branch or git_info.branch,
-                    task_branch=gh_branch,
-                    head_commit=git_info.commit_sha,
-                )
+            github_context = github_context_cache().resolve(
+                gh_repo_root,
+                repo=config.gh_repo,
+                base_branch=gh_base_branch,
+                task_branch=gh_branch,
+            )
+            if github_context:
                 update_github_context_after_clone(
                     config.gh_context_file_path,
                     github_context=github_context,
@@ -8,7 +8,7 @@ from typing import Any, Callable
 
 from agents_runner.prompt_sanitizer import sanitize_prompt
 from agents_runner.agent_cli import normalize_agent
-from agents_runner.environments import load_environments
+from agents_runner.environments import load_environments_cached
 from agents_runner.prompts import load_prompt
 from agents_runner.log_format import format_log
 from agents_runner.midoriai_template import MidoriAITemplateDetection
@@ -127,7 +127,7 @@ class PromptAssembler:
             return (False, None)
 
         try:
-            environments = load_environments()
+            environments = load_environments_cached()
             env = environments.get(str(self._environment_id))
             if env is not None:
                 cross_agents_enabled = (
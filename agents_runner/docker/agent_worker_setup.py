@@ -285,7 +285,7 @@ class WorkerSetup:
             / ".midoriai"
             / "agents-runner"
             / "artifacts"
-            / (self._config.task_id or "task")
+            / (self._config.artifacts_key or self._config.task_id or "task")
             / "staging"
         )
         artifacts_staging_dir.mkdir(parents=True, exist_ok=True)
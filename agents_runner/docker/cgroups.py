@@ -0,0 +1,127 @@
+"""
+Per-container resource accounting from cgroup files.
+
+Docker places each container in its own cgroup. Reading the cgroup files
+directly is far cheaper than ``docker stats`` and gives cumulative CPU time,
+which ``docker stats`` does not. Both cgroup v2 (systemd or cgroupfs
+driver) and the v1 memory/cpuacct controllers are supported. Every reader
+returns ``None`` when the files are not visible (rootless Docker, Docker
+Desktop VMs, containers that already exited).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+
+_V2_ROOTS = (
+    "/sys/fs/cgroup/system.slice/docker-{id}.scope",
+    "/sys/fs/cgroup/docker/{id}",
+)
+_V1_MEMORY_ROOT = "/sys/fs/cgroup/memory/docker/{id}"
+_V1_CPUACCT_ROOTS = (
+    "/sys/fs/cgroup/cpuacct/docker/{id}",
+    "/sys/fs/cgroup/cpu,cpuacct/docker/{id}",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class CgroupUsage:
+    memory_bytes: int
+    # Kernel-tracked high-water mark, when the kernel exposes one.
+    memory_peak_bytes: int | None = None
+    cpu_usec: int | None = None
+
+
+def _read_int(path: str) -> int | None:
+    try:
+        return int(Path(path).read_text(encoding="utf-8").strip())
+    except (OSError, ValueError):
+        return None
+
+
+def _read_cpu_stat_usec(path: str) -> int | None:
+    try:
+        with open(path, encoding="utf-8") as handle:
+            for line in handle:
+                if line.startswith("usage_usec "):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def read_cgroup_usage(container_id: str) -> CgroupUsage | None:
+    """Return current usage for a container given its full ID."""
+    container_id = str(container_id or "").strip()
+    if not container_id:
+        return None
+    for template in _V2_ROOTS:
+        root = template.format(id=container_id)
+        memory = _read_int(f"{root}/memory.current")
+        if memory is None:
+            continue
+        return CgroupUsage(
+            memory_bytes=memory,
+            memory_peak_bytes=_read_int(f"{root}/memory.peak"),
+            cpu_usec=_read_cpu_stat_usec(f"{root}/cpu.stat"),
+        )
+
+    v1_root = _V1_MEMORY_ROOT.format(id=container_id)
+    memory = _read_int(f"{v1_root}/memory.usage_in_bytes")
+    if memory is None:
+        return None
+    cpu_usec: int | None = None
+    for template in _V1_CPUACCT_ROOTS:
+        usage_ns = _read_int(f"{template.format(id=container_id)}/cpuacct.usage")
+        if usage_ns is not None:
+            cpu_usec = usage_ns // 1000
+            break
+    return CgroupUsage(
+        memory_bytes=memory,
+        memory_peak_bytes=_read_int(f"{v1_root}/memory.max_usage_in_bytes"),
+        cpu_usec=cpu_usec,
+    )
+
+
+class ContainerUsageTracker:
+    """Tracks peak memory and CPU time of one container while it runs.
+
+    The cgroup disappears when the container stops, so ``poll`` is called
+    from the monitor loop and the summary holds the last values seen.
+    """
+
+    def __init__(self, container_id: str) -> None:
+        self._container_id = str(container_id or "").strip()
+        self._peak_bytes = 0
+        self._cpu_usec: int | None = None
+        self._samples = 0
+        self._available = True
+
+    def poll(self) -> None:
+        if not self._available or not self._container_id:
+            return
+        usage = read_cgroup_usage(self._container_id)
+        if usage is None:
+            # Never visible: stop trying. Already seen: the container exited.
+            if self._samples == 0:
+                self._available = False
+            return
+        self._samples += 1
+        self._peak_bytes = max(
+            self._peak_bytes, usage.memory_bytes, usage.memory_peak_bytes or 0
+        )
+        if usage.cpu_usec is not None:
+            self._cpu_usec = usage.cpu_usec
+
+    def summary(self) -> dict[str, object]:
+        """Return usage for ``attempt_history``; empty if nothing was read."""
+        if self._samples == 0:
+            return {}
+        summary: dict[str, object] = {
+            "peak_memory_mb": round(self._peak_bytes / (1024 * 1024), 1),
+            "samples": self._samples,
+        }
+        if self._cpu_usec is not None:
+            summary["cpu_seconds"] = round(self._cpu_usec / 1_000_000, 2)
+        return summary
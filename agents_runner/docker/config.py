@@ -1,6 +1,9 @@
 from dataclasses import dataclass
 from dataclasses import field
 
+from agents_runner.docker.resources import ContainerResources
+from agents_runner.gh.repo_clone import CloneOptions
+
 
 @dataclass(frozen=True)
 class DockerRunnerConfig:
@@ -37,8 +40,18 @@ class DockerRunnerConfig:
     gh_prefer_gh_cli: bool = True
     gh_recreate_if_needed: bool = True
     gh_base_branch: str | None = None
+    gh_clone_options: CloneOptions = field(default_factory=CloneOptions)
     gh_context_file_path: str | None = None  # Host path to GitHub context file
+    # Mounted workspaces with snapshots: host_workdir is a copy-on-write view
+    # of this folder, created under the snapshot root before the run.
+    workspace_snapshot_source: str | None = None
+    workspace_snapshot_root: str | None = None
+    # Artifact staging directory name; defaults to task_id. Race mode gives
+    # each racer its own so losers' files never reach the task.
+    artifacts_key: str | None = None
     # Hard timeout for post-run artifact collection/finalization (best-effort).
     artifact_collection_timeout_s: float = 30.0
     # Optional override for container name (for testing or custom naming)
     container_name: str | None = None
+    # CPU/memory/pids limits passed to `docker run`
+    resources: ContainerResources = field(default_factory=ContainerResources)
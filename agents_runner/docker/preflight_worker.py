@@ -20,7 +20,7 @@ from agents_runner.docker_platform import docker_platform_for_pixelarch
 from agents_runner.docker_platform import has_rosetta
 from agents_runner.gh_management import GhManagementError
 from agents_runner.gh_management import prepare_github_repo_for_task
-from agents_runner.github_token import resolve_github_token
+from agents_runner.github_token import cached_github_token
 
 from agents_runner.docker.config import DockerRunnerConfig
 from agents_runner.docker.process import _has_image
@@ -45,9 +45,9 @@ def _needs_cross_agent_gh_token(environment_id: str | None) -> bool:
 
     # Load environment and validate structure
     try:
-        from agents_runner.environments import load_environments
+        from agents_runner.environments import load_environments_cached
 
-        environments = load_environments()
+        environments = load_environments_cached()
         env = environments.get(str(environment_id))
     except Exception:
         return False
@@ -125,6 +125,7 @@ class DockerPreflightWorker:
                         prefer_gh=self._config.gh_prefer_gh_cli,
                         recreate_if_needed=self._config.gh_recreate_if_needed,
                         on_log=self._on_log,
+                        clone_options=self._config.gh_clone_options,
                     )
                     if result.get("branch"):
                         self._on_log(
@@ -349,7 +350,7 @@ class DockerPreflightWorker:
                 and not needs_token_for_primary
             )
             if needs_token_for_primary or needs_token_for_cross:
-                token = resolve_github_token()
+                token = cached_github_token()
                 if (
                     token
                     and "GH_TOKEN" not in (self._config.env_vars or {})
@@ -0,0 +1,155 @@
+"""
+Container resource profiles and CPU-set partitioning.
+
+An environment's resource profile is either a preset name (``small``,
+``medium``, ``large``, ``unlimited``) or a custom spec such as
+``"cpus=2, memory=4g, pids=512"``. It maps to Docker's ``--cpus``,
+``--memory``, ``--pids-limit`` and ``--cpuset-cpus`` flags.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+from collections import Counter
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class ContainerResources:
+    # 0 / "" means no limit for each field.
+    cpus: float = 0.0
+    memory_mb: int = 0
+    pids_limit: int = 0
+    cpuset_cpus: str = ""
+
+    def is_unlimited(self) -> bool:
+        return not (
+            self.cpus > 0
+            or self.memory_mb > 0
+            or self.pids_limit > 0
+            or self.cpuset_cpus
+        )
+
+    def docker_args(self) -> list[str]:
+        args: list[str] = []
+        if self.cpus > 0:
+            args.extend(["--cpus", f"{self.cpus:g}"])
+        if self.memory_mb > 0:
+            # Same swap limit: a runaway build is OOM-killed instead of
+            # pushing the host into swap.
+            args.extend(
+                [
+                    "--memory",
+                    f"{self.memory_mb}m",
+                    "--memory-swap",
+                    f"{self.memory_mb}m",
+                ]
+            )
+        if self.pids_limit > 0:
+            args.extend(["--pids-limit", str(self.pids_limit)])
+        if self.cpuset_cpus:
+            args.extend(["--cpuset-cpus", self.cpuset_cpus])
+        return args
+
+    def describe(self) -> str:
+        if self.is_unlimited():
+            return "unlimited"
+        parts: list[str] = []
+        if self.cpus > 0:
+            parts.append(f"cpus={self.cpus:g}")
+        if self.memory_mb > 0:
+            parts.append(f"memory={self.memory_mb}m")
+        if self.pids_limit > 0:
+            parts.append(f"pids={self.pids_limit}")
+        if self.cpuset_cpus:
+            parts.append(f"cpuset={self.cpuset_cpus}")
+        return ", ".join(parts)
+
+
+RESOURCE_PROFILES: dict[str, ContainerResources] = {
+    "unlimited": ContainerResources(),
+    "small": ContainerResources(cpus=1.0, memory_mb=2048, pids_limit=512),
+    "medium": ContainerResources(cpus=2.0, memory_mb=4096, pids_limit=1024),
+    "large": ContainerResources(cpus=4.0, memory_mb=8192, pids_limit=2048),
+}
+
+
+def _parse_memory_mb(value: str) -> int:
+    text = value.strip().lower().removesuffix("b")
+    factor = {"k": 1 / 1024, "m": 1, "g": 1024, "t": 1024 * 1024}.get(text[-1:], None)
+    if factor is not None:
+        text = text[:-1]
+    else:
+        factor = 1
+    return max(0, int(float(text) * factor))
+
+
+def parse_resource_profile(text: str | None) -> ContainerResources:
+    """Resolve a preset name or custom spec; invalid parts are ignored."""
+    value = str(text or "").strip().lower()
+    if not value:
+        return ContainerResources()
+    if value in RESOURCE_PROFILES:
+        return RESOURCE_PROFILES[value]
+
+    cpus = 0.0
+    memory_mb = 0
+    pids_limit = 0
+    for part in value.replace(";", ",").split(","):
+        key, sep, raw = part.partition("=")
+        key = key.strip()
+        raw = raw.strip()
+        if not sep or not raw:
+            continue
+        try:
+            if key == "cpus":
+                cpus = max(0.0, float(raw))
+            elif key in {"memory", "mem"}:
+                memory_mb = _parse_memory_mb(raw)
+            elif key in {"pids", "pids_limit"}:
+                pids_limit = max(0, int(raw))
+        except ValueError:
+            continue
+    return ContainerResources(cpus=cpus, memory_mb=memory_mb, pids_limit=pids_limit)
+
+
+def _host_cpus() -> list[int]:
+    try:
+        return sorted(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        return list(range(os.cpu_count() or 1))
+
+
+class CpusetAllocator:
+    """Hands out CPU sets so concurrent tasks land on different cores.
+
+    Each allocation takes the least-used CPUs, so tasks only share cores once
+    every core is taken. Owned by the UI thread.
+    """
+
+    def __init__(self, cpus: list[int] | None = None) -> None:
+        self._cpus = list(cpus) if cpus is not None else _host_cpus()
+        self._load: Counter[int] = Counter({cpu: 0 for cpu in self._cpus})
+        self._assigned: dict[str, list[int]] = {}
+
+    def allocate(self, task_id: str, cpus: float) -> str:
+        """Assign CPUs for ``task_id`` sized from its ``--cpus`` limit."""
+        task_id = str(task_id)
+        self.release(task_id)
+        count = max(1, math.ceil(cpus)) if cpus > 0 else 1
+        count = min(count, len(self._cpus))
+        chosen = sorted(
+            sorted(self._cpus, key=lambda cpu: (self._load[cpu], cpu))[:count]
+        )
+        for cpu in chosen:
+            self._load[cpu] += 1
+        self._assigned[task_id] = chosen
+        return ",".join(str(cpu) for cpu in chosen)
+
+    def release(self, task_id: str) -> None:
+        for cpu in self._assigned.pop(str(task_id), []):
+            self._load[cpu] = max(0, self._load[cpu] - 1)
+
+    def assigned(self, task_id: str) -> str:
+        return ",".join(str(cpu) for cpu in self._assigned.get(str(task_id), []))
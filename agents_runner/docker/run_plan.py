@@ -0,0 +1,351 @@
+"""Precompiled `docker run` plans.
+
+Most of a task's `docker run` command only depends on the environment and
+agent configuration: configured env vars, port mappings, shared mounts, the
+resource flags, the desktop preflight script and the CLI verification clause.
+``RunPlan`` holds those pieces, computed once per configuration and cached by
+a content hash of its inputs. A launch only fills in the task-specific parts
+(container name, workspace mounts, preflight scripts, the agent command).
+
+Usage Example:
+    plan, _cached = run_plan_for(config, runtime_env)
+    args = plan.docker_run_args(
+        container_name=runtime_env.container_name,
+        container_cwd=runtime_env.container_cwd,
+        image=runtime_env.runtime_image,
+        task_mounts=[...],
+        preflight_mounts=[],
+        preflight_clause="",
+        agent_cmd="codex exec ...",
+        task_token=runtime_env.task_token,
+        forward_github_token=False,
+    )
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from agents_runner.agent_cli import agent_requires_github_token
+from agents_runner.agent_cli import normalize_agent
+from agents_runner.agent_cli import verify_cli_clause
+from agents_runner.core.shell_templates import git_identity_clause
+from agents_runner.core.shell_templates import shell_log_statement
+from agents_runner.docker.agent_worker_setup import RuntimeEnvironment
+from agents_runner.docker.config import DockerRunnerConfig
+from agents_runner.docker.utils import deduplicate_mounts
+from agents_runner.environments import load_environments_cached
+
+DESKTOP_CONTAINER_PORT = 6080
+
+_MAX_CACHED_PLANS = 64
+_plans_lock = threading.Lock()
+_plans: OrderedDict[str, RunPlan] = OrderedDict()
+
+
+@dataclass(frozen=True, slots=True)
+class RunPlan:
+    """The environment/agent-dependent part of a `docker run` command."""
+
+    key: str
+    agent_cli: str
+    platform_args: tuple[str, ...]
+    resource_args: tuple[str, ...]
+    env_args: tuple[str, ...]
+    port_args: tuple[str, ...]
+    shared_mounts: tuple[str, ...]
+    needs_github_token: bool
+    desktop_enabled: bool
+    desktop_display: str
+    desktop_from_cached_image: bool
+    desktop_clause: str
+    verify_clause: str
+
+    def mount_args(self, task_mounts: list[str]) -> list[str]:
+        """`-v` args for the task's own mounts followed by the shared ones.
+
+        Task mounts come first so they win when a shared mount targets the
+        same container path.
+        """
+        args: list[str] = []
+        for mount in deduplicate_mounts([*task_mounts, *self.shared_mounts]):
+            args.extend(["-v", mount])
+        return args
+
+    def docker_run_args(
+        self,
+        *,
+        container_name: str,
+        container_cwd: str,
+        image: str,
+        task_mounts: list[str],
+        preflight_mounts: list[str],
+        preflight_clause: str,
+        agent_cmd: str,
+        task_token: str,
+        forward_github_token: bool,
+    ) -> list[str]:
+        """Complete `docker run` arguments for one task."""
+        env_args = list(self.env_args)
+        if forward_github_token:
+            env_args.extend(["-e", "GH_TOKEN", "-e", "GITHUB_TOKEN"])
+        if self.desktop_enabled:
+            env_args.extend(
+                [
+                    "-e",
+                    f"AGENTS_RUNNER_TASK_ID={task_token}",
+                    "-e",
+                    f"DISPLAY={self.desktop_display}",
+                ]
+            )
+        return [
+            "run",
+            *self.platform_args,
+            "-d",
+            "-t",
+            "--name",
+            container_name,
+            *self.resource_args,
+            *self.mount_args(task_mounts),
+            *preflight_mounts,
+            *env_args,
+            *self.port_args,
+            "-w",
+            container_cwd,
+            image,
+            "/bin/bash",
+            "-lc",
+            "set -euo pipefail; "
+            f"{git_identity_clause()}"
+            f"{self.desktop_clause}"
+            f"{preflight_clause}"
+            f"{self.verify_clause}"
+            f"exec {agent_cmd}",
+        ]
+
+
+def environment_needs_github_token(environment_id: str | None) -> bool:
+    """True when GitHub context or a cross-agent CLI in the environment needs a token."""
+    if not environment_id:
+        return False
+    try:
+        env = load_environments_cached().get(str(environment_id))
+    except Exception:
+        return False
+    if env is None:
+        return False
+    if bool(getattr(env, "gh_context_enabled", False)):
+        return True
+    if not env.cross_agent_allowlist:
+        return False
+    if env.agent_selection is None or not env.agent_selection.agents:
+        return False
+
+    agent_cli_by_id: dict[str, str] = {
+        agent.agent_id: agent.agent_cli for agent in env.agent_selection.agents
+    }
+    for agent_id in env.cross_agent_allowlist:
+        agent_cli = agent_cli_by_id.get(agent_id)
+        if agent_cli and agent_requires_github_token(normalize_agent(agent_cli)):
+            return True
+    return False
+
+
+def publishes_container_port(spec: str, port: int) -> bool:
+    """True when a `-p` spec publishes ``port`` (alone or inside a range)."""
+    base = str(spec or "").strip()
+    if not base:
+        return False
+    base = base.split("/", 1)[0]
+    container_part = base.rsplit(":", 1)[-1].strip()
+    if not container_part:
+        return False
+    if container_part.isdigit():
+        return int(container_part) == int(port)
+    if "-" in container_part:
+        left, right = (p.strip() for p in container_part.split("-", 1))
+        if left.isdigit() and right.isdigit():
+            return int(left) <= int(port) <= int(right)
+    return False
+
+
+def desktop_cached_preflight(desktop_display: str) -> str:
+    """Preflight clause for an image with the desktop already installed."""
+    common_setup = (
+        f"{shell_log_statement('desktop', 'vnc', 'INFO', 'starting headless desktop (noVNC)')}; "
+        f"export DISPLAY={desktop_display}; "
+        'export QT_QPA_PLATFORM="${QT_QPA_PLATFORM:-xcb}"; '
+        'export XDG_RUNTIME_DIR="${XDG_RUNTIME_DIR:-/tmp/xdg-$(id -un)}"; '
+        'mkdir -p "${XDG_RUNTIME_DIR}"; '
+        'RUNTIME_BASE="/tmp/agents-runner-desktop/${AGENTS_RUNNER_TASK_ID:-task}"; '
+        'mkdir -p "${RUNTIME_BASE}"/{run,log,out,config}; '
+    )
+    novnc_setup = (
+        "if [ -f /etc/default/novnc-path ]; then source /etc/default/novnc-path; else "
+        'NOVNC_WEB=""; for candidate in "/usr/share/webapps/novnc" "/usr/share/novnc" "/usr/share/noVNC"; do '
+        'if [ -d "${candidate}" ]; then NOVNC_WEB="${candidate}"; break; fi; done; fi; '
+        "if [ -f /etc/profile.d/desktop-env.sh ]; then source /etc/profile.d/desktop-env.sh; fi; "
+    )
+    service_start = (
+        'Xvnc :1 -geometry 1280x800 -depth 24 -SecurityTypes None -localhost -rfbport 5901 >"${RUNTIME_BASE}/log/xvnc.log" 2>&1 & sleep 0.25; '
+        '(fluxbox >"${RUNTIME_BASE}/log/fluxbox.log" 2>&1 &) || true; '
+        '(xterm -geometry 80x24+10+10 >"${RUNTIME_BASE}/log/xterm.log" 2>&1 &) || true; '
+        'if [ -n "${NOVNC_WEB}" ]; then websockify --web="${NOVNC_WEB}" 6080 127.0.0.1:5901 >"${RUNTIME_BASE}/log/novnc.log" 2>&1 & '
+        f"else {shell_log_statement('desktop', 'vnc', 'ERROR', 'noVNC web root not found')} >&2; fi; "
+    )
+    return (
+        common_setup
+        + novnc_setup
+        + service_start
+        + f"{shell_log_statement('desktop', 'vnc', 'INFO', 'ready')}; "
+        f"{shell_log_statement('desktop', 'vnc', 'INFO', 'DISPLAY=${DISPLAY}')}; "
+        f"{shell_log_statement('desktop', 'vnc', 'INFO', 'screenshot: import -display :1 -window root /tmp/agents-artifacts/${AGENTS_RUNNER_TASK_ID:-task}-desktop.png')}; "
+    )
+
+
+def desktop_runtime_preflight(desktop_display: str) -> str:
+    """Preflight clause that installs and starts the desktop at runtime."""
+    common_setup = (
+        f"{shell_log_statement('desktop', 'vnc', 'INFO', 'starting headless desktop (noVNC)')}; "
+        f"export DISPLAY={desktop_display}; "
+        'export QT_QPA_PLATFORM="${QT_QPA_PLATFORM:-xcb}"; '
+        'export XDG_RUNTIME_DIR="${XDG_RUNTIME_DIR:-/tmp/xdg-$(id -un)}"; '
+        'mkdir -p "${XDG_RUNTIME_DIR}"; '
+        'RUNTIME_BASE="/tmp/agents-runner-desktop/${AGENTS_RUNNER_TASK_ID:-task}"; '
+        'mkdir -p "${RUNTIME_BASE}"/{run,log,out,config}; '
+    )
+    install_packages = (
+        "if command -v yay >/dev/null 2>&1; then "
+        "yay -S --noconfirm --needed tigervnc fluxbox xterm imagemagick xorg-xwininfo xcb-util-cursor novnc websockify wmctrl xdotool xorg-xprop xorg-xauth ttf-dejavu xorg-fonts-misc || true; fi; "
+    )
+    service_start = (
+        'Xvnc :1 -geometry 1280x800 -depth 24 -SecurityTypes None -localhost -rfbport 5901 >"${RUNTIME_BASE}/log/xvnc.log" 2>&1 & sleep 0.25; '
+        '(fluxbox >"${RUNTIME_BASE}/log/fluxbox.log" 2>&1 &) || true; '
+        '(xterm -geometry 80x24+10+10 >"${RUNTIME_BASE}/log/xterm.log" 2>&1 &) || true; '
+        'NOVNC_WEB=""; for candidate in "/usr/share/webapps/novnc" "/usr/share/novnc" "/usr/share/noVNC"; do '
+        'if [ -d "${candidate}" ]; then NOVNC_WEB="${candidate}"; break; fi; done; '
+        'if [ -z "${NOVNC_WEB}" ]; then '
+        f"{shell_log_statement('desktop', 'vnc', 'ERROR', 'noVNC web root not found')} >&2; "
+        'else websockify --web="${NOVNC_WEB}" 6080 127.0.0.1:5901 >"${RUNTIME_BASE}/log/novnc.log" 2>&1 & fi; '
+    )
+    return (
+        common_setup
+        + install_packages
+        + service_start
+        + f"{shell_log_statement('desktop', 'vnc', 'INFO', 'ready')}; "
+        f"{shell_log_statement('desktop', 'vnc', 'INFO', 'DISPLAY=${DISPLAY}')}; "
+        f"{shell_log_statement('desktop', 'vnc', 'INFO', 'screenshot: import -display :1 -window root /tmp/agents-artifacts/${AGENTS_RUNNER_TASK_ID:-task}-desktop.png')}; "
+    )
+
+
+def _plan_inputs(
+    config: DockerRunnerConfig, runtime_env: RuntimeEnvironment
+) -> dict[str, object]:
+    """Everything a plan depends on, in a JSON-serialisable form."""
+    return {
+        "agent_cli": runtime_env.agent_cli,
+        "platform_args": list(runtime_env.platform_args),
+        "resource_args": config.resources.docker_args(),
+        "env_vars": sorted(
+            (str(k).strip(), str(v)) for k, v in (config.env_vars or {}).items()
+        ),
+        "ports": [str(p or "").strip() for p in config.ports or []],
+        "extra_mounts": [str(m).strip() for m in config.extra_mounts or []],
+        "config_extra_mounts": [
+            str(m).strip() for m in runtime_env.config_extra_mounts
+        ],
+        "needs_github_token": (
+            agent_requires_github_token(runtime_env.agent_cli)
+            or environment_needs_github_token(config.environment_id)
+        ),
+        "desktop_enabled": bool(runtime_env.desktop_enabled),
+        "desktop_display": runtime_env.desktop_display,
+        "desktop_from_cached_image": runtime_env.runtime_image != config.image,
+    }
+
+
+def run_plan_key(inputs: dict[str, object]) -> str:
+    raw = json.dumps(inputs, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def compile_run_plan(inputs: dict[str, object], key: str = "") -> RunPlan:
+    """Build a plan from ``_plan_inputs`` output (no caching)."""
+    desktop_enabled = bool(inputs["desktop_enabled"])
+    desktop_display = str(inputs["desktop_display"])
+    from_cache = bool(inputs["desktop_from_cached_image"])
+
+    env_args: list[str] = []
+    for k, value in inputs["env_vars"]:  # type: ignore[union-attr]
+        if k:
+            env_args.extend(["-e", f"{k}={value}"])
+
+    port_args: list[str] = []
+    for spec in inputs["ports"]:  # type: ignore[union-attr]
+        if not spec:
+            continue
+        if desktop_enabled and publishes_container_port(spec, DESKTOP_CONTAINER_PORT):
+            continue
+        port_args.extend(["-p", spec])
+    if desktop_enabled:
+        port_args.extend(["-p", f"127.0.0.1::{DESKTOP_CONTAINER_PORT}"])
+
+    shared_mounts = [
+        m
+        for m in [*inputs["extra_mounts"], *inputs["config_extra_mounts"]]  # type: ignore[misc]
+        if m
+    ]
+
+    desktop_clause = ""
+    if desktop_enabled:
+        desktop_clause = (
+            desktop_cached_preflight(desktop_display)
+            if from_cache
+            else desktop_runtime_preflight(desktop_display)
+        )
+
+    agent_cli = str(inputs["agent_cli"])
+    return RunPlan(
+        key=key or run_plan_key(inputs),
+        agent_cli=agent_cli,
+        platform_args=tuple(inputs["platform_args"]),  # type: ignore[arg-type]
+        resource_args=tuple(inputs["resource_args"]),  # type: ignore[arg-type]
+        env_args=tuple(env_args),
+        port_args=tuple(port_args),
+        shared_mounts=tuple(deduplicate_mounts(shared_mounts)),
+        needs_github_token=bool(inputs["needs_github_token"]),
+        desktop_enabled=desktop_enabled,
+        desktop_display=desktop_display,
+        desktop_from_cached_image=from_cache,
+        desktop_clause=desktop_clause,
+        verify_clause=verify_cli_clause(agent_cli),
+    )
+
+
+def run_plan_for(
+    config: DockerRunnerConfig, runtime_env: RuntimeEnvironment
+) -> tuple[RunPlan, bool]:
+    """Return the cached plan for this configuration and whether it was a hit."""
+    inputs = _plan_inputs(config, runtime_env)
+    key = run_plan_key(inputs)
+    with _plans_lock:
+        plan = _plans.get(key)
+        if plan is not None:
+            _plans.move_to_end(key)
+            return plan, True
+    plan = compile_run_plan(inputs, key)
+    with _plans_lock:
+        _plans[key] = plan
+        _plans.move_to_end(key)
+        while len(_plans) > _MAX_CACHED_PLANS:
+            _plans.popitem(last=False)
+    return plan, False
+
+
+def clear_run_plans() -> None:
+    with _plans_lock:
+        _plans.clear()
@@ -16,9 +16,12 @@ from agents_runner.environments.paths import default_data_dir
 from agents_runner.environments.paths import environment_path
 from agents_runner.environments.paths import managed_repo_checkout_path
 from agents_runner.environments.paths import managed_repos_dir
+from agents_runner.environments.paths import workspace_trash_dir
 from agents_runner.environments.serialize import serialize_environment
 from agents_runner.environments.storage import delete_environment
+from agents_runner.environments.storage import has_environments
 from agents_runner.environments.storage import load_environments
+from agents_runner.environments.storage import load_environments_cached
 from agents_runner.environments.storage import save_environment
 
 __all__ = [
@@ -33,7 +36,9 @@ __all__ = [
     "default_data_dir",
     "delete_environment",
     "environment_path",
+    "has_environments",
     "load_environments",
+    "load_environments_cached",
     "managed_repo_checkout_path",
     "managed_repos_dir",
     "normalize_workspace_type",
@@ -41,6 +46,7 @@ __all__ = [
     "parse_mounts_text",
     "parse_ports_text",
     "save_environment",
+    "workspace_trash_dir",
     "serialize_environment",
     "SYSTEM_ENV_ID",
     "SYSTEM_ENV_NAME",
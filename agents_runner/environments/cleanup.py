@@ -2,6 +2,8 @@
 Cleanup and resource management for task workspaces.
 
 Provides utilities to clean up task-specific directories and manage disk space.
+Removed workspaces are moved into the trash and deleted by the background
+reaper (see ``reaper.py``); they are only deleted inline when that move fails.
 """
 
 import logging
@@ -11,7 +13,11 @@ import time
 from typing import Callable
 
 from agents_runner.log_format import format_log
+from .cow_workspace import release_workspace_snapshot
+from .cow_workspace import snapshot_kept_unmerged
+from .disk_usage import directory_size
 from .paths import managed_repo_checkout_path
+from .reaper import workspace_reaper
 
 logger = logging.getLogger(__name__)
 
@@ -72,6 +78,20 @@ def cleanup_task_workspace(
         )
         return True
 
+    # A copy-on-write snapshot's overlay must be unmounted first; removing
+    # files through the mount would only record whiteouts.
+    if not release_workspace_snapshot(task_workspace):
+        msg = format_log(
+            "cleanup",
+            "safety",
+            "WARN",
+            f"Snapshot still mounted, not removing: {task_workspace}",
+        )
+        logger.warning(msg)
+        if on_log:
+            on_log(msg)
+        return False
+
     try:
         msg = format_log(
             "cleanup", "task", "INFO", f"Removing task workspace: {task_workspace}"
@@ -80,35 +100,23 @@ def cleanup_task_workspace(
         if on_log:
             on_log(msg)
 
-        # Use shutil.rmtree with error handler for better cleanup
-        def handle_remove_error(func, path, exc_info):
-            """Handle permission errors during removal."""
-            logger.debug(
+        trash_path = _move_to_trash(task_workspace, data_dir)
+        if trash_path:
+            logger.info(
                 format_log(
-                    "cleanup", "task", "DEBUG", f"Error removing {path}: {exc_info[1]}"
+                    "cleanup",
+                    "task",
+                    "INFO",
+                    f"Moved {task_workspace} to {trash_path} for deletion",
                 )
             )
-            # Try to make writable and retry
-            try:
-                os.chmod(path, 0o700)
-                func(path)
-            except Exception as retry_exc:
-                logger.debug(
-                    format_log(
-                        "cleanup",
-                        "task",
-                        "DEBUG",
-                        f"Retry failed for {path}: {retry_exc}",
-                    )
+        else:
+            _remove_tree(task_workspace)
+            logger.info(
+                format_log(
+                    "cleanup", "task", "INFO", f"Successfully removed: {task_workspace}"
                 )
-
-        shutil.rmtree(task_workspace, onerror=handle_remove_error)
-
-        logger.info(
-            format_log(
-                "cleanup", "task", "INFO", f"Successfully removed: {task_workspace}"
             )
-        )
         if on_log:
             on_log(format_log("cleanup", "task", "INFO", "Workspace cleaned up"))
         return True
@@ -126,6 +134,49 @@ def cleanup_task_workspace(
         return False
 
 
+def _move_to_trash(path: str, data_dir: str | None) -> str:
+    """Hand ``path`` to the background reaper; "" if it cannot be moved."""
+    try:
+        return workspace_reaper(data_dir).discard(path)
+    except OSError as exc:
+        logger.debug(
+            format_log(
+                "cleanup", "task", "DEBUG", f"Cannot move {path} to trash: {exc}"
+            )
+        )
+        return ""
+
+
+def _remove_tree(path: str) -> None:
+    """Delete ``path`` in place, making read-only entries writable as needed."""
+
+    def handle_remove_error(func, failed_path, exc_info):
+        """Handle permission errors during removal."""
+        logger.debug(
+            format_log(
+                "cleanup",
+                "task",
+                "DEBUG",
+                f"Error removing {failed_path}: {exc_info[1]}",
+            )
+        )
+        # Try to make writable and retry
+        try:
+            os.chmod(failed_path, 0o700)
+            func(failed_path)
+        except Exception as retry_exc:
+            logger.debug(
+                format_log(
+                    "cleanup",
+                    "task",
+                    "DEBUG",
+                    f"Retry failed for {failed_path}: {retry_exc}",
+                )
+            )
+
+    shutil.rmtree(path, onerror=handle_remove_error)
+
+
 def cleanup_old_task_workspaces(
     env_id: str,
     max_age_hours: int = 24,
@@ -167,6 +218,9 @@ def cleanup_old_task_workspaces(
             # Skip if not a directory
             if not os.path.isdir(task_path):
                 continue
+            # Holds a task's edits that could not be merged back
+            if snapshot_kept_unmerged(task_path):
+                continue
 
             try:
                 # Check modification time
@@ -193,7 +247,10 @@ def cleanup_old_task_workspaces(
                             )
                         )
 
-                    shutil.rmtree(task_path, ignore_errors=True)
+                    if not release_workspace_snapshot(task_path):
+                        continue
+                    if not _move_to_trash(task_path, data_dir):
+                        shutil.rmtree(task_path, ignore_errors=True)
                     removed_count += 1
 
             except Exception as exc:
@@ -254,16 +311,7 @@ def get_task_workspace_size(
         return 0
 
     try:
-        total_size = 0
-        for dirpath, dirnames, filenames in os.walk(task_workspace):
-            for filename in filenames:
-                filepath = os.path.join(dirpath, filename)
-                try:
-                    total_size += os.path.getsize(filepath)
-                except (OSError, FileNotFoundError):
-                    # Skip files that we can't access
-                    continue
-        return total_size
+        return directory_size(task_workspace)
 
     except Exception as exc:
         logger.warning(
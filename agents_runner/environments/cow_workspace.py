@@ -0,0 +1,654 @@
+"""
+Copy-on-write task snapshots of mounted-folder workspaces.
+
+Mounted environments bind-mount the user's folder straight into the task
+container, so two tasks against the same folder edit the same files. With
+snapshots enabled each task instead works in its own view of the folder under
+``managed-repos/{env_id}/tasks/{task_id}/workspace``:
+
+- ``overlay``: an overlayfs mount (kernel overlay when running as root, else
+  ``fuse-overlayfs -o allow_other``, which needs ``user_allow_other`` in
+  ``/etc/fuse.conf``) with the folder as the read-only lower layer and a
+  per-task ``upper``/``work`` directory. Creating it costs nothing up front
+  and the task's changes are exactly the upper layer.
+- ``reflink``: ``cp -a --reflink=auto`` of the folder. On btrfs/XFS/APFS-like
+  filesystems the copy shares blocks with the original; elsewhere it is a
+  plain copy.
+
+A manifest of the folder (size and mtime per file) is recorded when the
+snapshot is taken. ``snapshot_changes`` diffs the task's view against it and
+``merge_snapshot`` copies changed files back, refusing (and reporting) any
+path that also changed in the folder since the snapshot. Applied paths are
+written back into the manifest, so merging again is a no-op. ``.git``
+directories are never diffed or merged; empty directories are not merged.
+
+Writing into an overlay's lower layer while it is mounted is undefined, so a
+folder is the lower layer of at most one mounted overlay: further snapshots
+of it taken meanwhile use ``reflink``. An overlay is unmounted before it is
+merged, and its changes are read from the upper layer.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+import stat
+import subprocess
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from agents_runner.log_format import format_log
+
+logger = logging.getLogger(__name__)
+
+MODE_OVERLAY = "overlay"
+MODE_REFLINK = "reflink"
+SNAPSHOT_MODES: tuple[str, ...] = (MODE_OVERLAY, MODE_REFLINK)
+
+MANIFEST_FILENAME = "snapshot.json"
+_MANIFEST_VERSION = 1
+_EXCLUDED_DIRS = frozenset({".git"})
+_WHITEOUT_PREFIX = ".wh."
+_OPAQUE_MARKER = ".wh..wh..opq"
+_OPAQUE_XATTRS = (
+    "trusted.overlay.opaque",
+    "user.overlay.opaque",
+    "user.fuseoverlayfs.opaque",
+)
+
+# Held while checking for and mounting (or unmounting) overlays.
+_overlay_lock = threading.Lock()
+
+_LOG_LEVELS = {"DEBUG": logging.DEBUG, "INFO": logging.INFO, "WARN": logging.WARNING}
+
+# relpath -> (size, mtime_ns) of a file or symlink.
+Manifest = dict[str, tuple[int, int]]
+
+
+@dataclass(frozen=True, slots=True)
+class WorkspaceSnapshot:
+    root: str
+    source: str
+    mode: str
+
+    @property
+    def workdir(self) -> str:
+        return snapshot_workdir(self.root)
+
+    @property
+    def upper_dir(self) -> str:
+        return os.path.join(self.root, "upper")
+
+    @property
+    def work_dir(self) -> str:
+        return os.path.join(self.root, "work")
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.root, MANIFEST_FILENAME)
+
+    @property
+    def changes_dir(self) -> str:
+        """Where the task's versions of changed files live."""
+        return self.upper_dir if self.mode == MODE_OVERLAY else self.workdir
+
+
+@dataclass(frozen=True, slots=True)
+class SnapshotChanges:
+    changed: tuple[str, ...] = ()
+    deleted: tuple[str, ...] = ()
+
+    @property
+    def empty(self) -> bool:
+        return not self.changed and not self.deleted
+
+
+@dataclass(frozen=True, slots=True)
+class MergeResult:
+    applied: tuple[str, ...] = ()
+    deleted: tuple[str, ...] = ()
+    conflicts: tuple[str, ...] = ()
+
+
+def snapshot_workdir(root: str) -> str:
+    """The directory a task mounts for a snapshot rooted at ``root``."""
+    return os.path.join(root, "workspace")
+
+
+def _log(on_log: Callable[[str], None] | None, level: str, message: str) -> None:
+    line = format_log("workspace", "snapshot", level, message)
+    logger.log(_LOG_LEVELS.get(level, logging.INFO), line)
+    if on_log is not None:
+        on_log(line)
+
+
+def _entry_key(st: os.stat_result) -> tuple[int, int]:
+    return int(st.st_size), int(st.st_mtime_ns)
+
+
+def _lstat(path: str) -> os.stat_result | None:
+    try:
+        return os.lstat(path)
+    except OSError:
+        return None
+
+
+def scan_tree(top: str) -> Manifest:
+    """Size and mtime of every file and symlink under ``top`` (skips .git)."""
+    manifest: Manifest = {}
+    stack = [""]
+    while stack:
+        rel_dir = stack.pop()
+        try:
+            entries = os.scandir(os.path.join(top, rel_dir) if rel_dir else top)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in _EXCLUDED_DIRS:
+                            stack.append(rel)
+                        continue
+                    manifest[rel] = _entry_key(entry.stat(follow_symlinks=False))
+                except OSError:
+                    continue
+    return manifest
+
+
+def _read_manifest(root: str) -> dict | None:
+    try:
+        with open(os.path.join(root, MANIFEST_FILENAME), encoding="utf-8") as f:
+            payload = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(payload, dict) or payload.get("version") != _MANIFEST_VERSION:
+        return None
+    return payload
+
+
+def _write_manifest(root: str, payload: dict) -> None:
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=f"{MANIFEST_FILENAME}.", suffix=".tmp", dir=root
+    )
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(payload, f)
+    os.replace(tmp_path, os.path.join(root, MANIFEST_FILENAME))
+
+
+def _manifest_files(payload: dict) -> Manifest:
+    files = payload.get("files")
+    if not isinstance(files, dict):
+        return {}
+    return {
+        str(rel): (int(value[0]), int(value[1]))
+        for rel, value in files.items()
+        if isinstance(value, list) and len(value) == 2
+    }
+
+
+def _mark_kept(root: str, reason: str) -> None:
+    payload = _read_manifest(root)
+    if payload is None:
+        return
+    payload["kept_unmerged"] = {"reason": reason, "at": time.time()}
+    try:
+        _write_manifest(root, payload)
+    except OSError as exc:
+        logger.warning("could not mark snapshot %s as kept: %s", root, exc)
+
+
+def snapshot_kept_unmerged(root: str) -> bool:
+    """Whether ``root`` holds task changes that were not merged back.
+
+    Such snapshots must survive automatic cleanup until the user deals with
+    them; the marker lives in the manifest, so it outlasts the task's run.
+    """
+    payload = _read_manifest(root)
+    return payload is not None and bool(payload.get("kept_unmerged"))
+
+
+def load_workspace_snapshot(root: str) -> WorkspaceSnapshot | None:
+    payload = _read_manifest(root)
+    if payload is None:
+        return None
+    return WorkspaceSnapshot(
+        root=root,
+        source=str(payload.get("source") or ""),
+        mode=str(payload.get("mode") or MODE_REFLINK),
+    )
+
+
+def _run(args: list[str], timeout_s: float = 60.0) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        args,
+        capture_output=True,
+        text=True,
+        timeout=timeout_s,
+        check=False,
+    )
+
+
+def _mount_overlay(snapshot: WorkspaceSnapshot) -> str:
+    """Mount the overlay; returns "" on success or the failure reason."""
+    for path in (snapshot.upper_dir, snapshot.work_dir, snapshot.workdir):
+        os.makedirs(path, exist_ok=True)
+    options = (
+        f"lowerdir={snapshot.source},upperdir={snapshot.upper_dir},"
+        f"workdir={snapshot.work_dir}"
+    )
+    attempts: list[list[str]] = []
+    if hasattr(os, "geteuid") and os.geteuid() == 0:
+        attempts.append(
+            ["mount", "-t", "overlay", "overlay", "-o", options, snapshot.workdir]
+        )
+    if shutil.which("fuse-overlayfs"):
+        # Without allow_other a rootful Docker daemon sees an empty directory,
+        # so there is no retry without it; the caller falls back to reflink.
+        attempts.append(
+            ["fuse-overlayfs", "-o", f"{options},allow_other", snapshot.workdir]
+        )
+    if not attempts:
+        return "no overlay mount available (needs root or fuse-overlayfs)"
+    reason = ""
+    for args in attempts:
+        try:
+            proc = _run(args)
+        except (OSError, subprocess.SubprocessError) as exc:
+            reason = str(exc)
+            continue
+        if proc.returncode == 0:
+            return ""
+        reason = (proc.stderr or proc.stdout or "").strip() or f"{args[0]} failed"
+    return reason
+
+
+def _mounted_overlays_of(source: str, root: str) -> list[str]:
+    """Roots of other snapshots whose overlay of ``source`` is mounted.
+
+    Snapshot roots are ``<managed-repos>/<env_id>/tasks/<task_id>``.
+    """
+    root = os.path.abspath(root)
+    managed = os.path.dirname(os.path.dirname(os.path.dirname(root)))
+    found: list[str] = []
+    try:
+        env_ids = os.listdir(managed)
+    except OSError:
+        return found
+    for env_id in env_ids:
+        try:
+            task_ids = os.listdir(os.path.join(managed, env_id, "tasks"))
+        except OSError:
+            continue
+        for task_id in task_ids:
+            other = os.path.join(managed, env_id, "tasks", task_id)
+            if other == root:
+                continue
+            snapshot = load_workspace_snapshot(other)
+            if (
+                snapshot is not None
+                and snapshot.mode == MODE_OVERLAY
+                and snapshot.source == source
+                and os.path.ismount(snapshot.workdir)
+            ):
+                found.append(other)
+    return found
+
+
+def _unmount(path: str) -> bool:
+    if not os.path.ismount(path):
+        return True
+    for args in (
+        ["fusermount3", "-u", path],
+        ["fusermount", "-u", path],
+        ["umount", path],
+    ):
+        if not shutil.which(args[0]):
+            continue
+        try:
+            if _run(args, timeout_s=30.0).returncode == 0:
+                return True
+        except (OSError, subprocess.SubprocessError):
+            continue
+    return not os.path.ismount(path)
+
+
+def _copy_reflink(source: str, dest: str) -> None:
+    os.makedirs(dest, exist_ok=True)
+    if shutil.which("cp"):
+        try:
+            proc = _run(
+                ["cp", "-a", "--reflink=auto", f"{source}/.", dest],
+                timeout_s=3600.0,
+            )
+        except (OSError, subprocess.SubprocessError):
+            proc = None
+        if proc is not None and proc.returncode == 0:
+            return
+    # Non-GNU cp: plain copy that keeps symlinks and timestamps.
+    shutil.copytree(source, dest, symlinks=True, dirs_exist_ok=True)
+
+
+def create_workspace_snapshot(
+    source: str,
+    root: str,
+    *,
+    modes: Iterable[str] = SNAPSHOT_MODES,
+    on_log: Callable[[str], None] | None = None,
+) -> WorkspaceSnapshot:
+    """Give a task its own copy-on-write view of ``source`` under ``root``.
+
+    Reuses an existing snapshot at ``root`` (remounting an overlay if needed),
+    so retries of the same task keep their changes. Raises OSError when no
+    mode works.
+    """
+    source = os.path.abspath(os.path.expanduser(source))
+    if not os.path.isdir(source):
+        raise OSError(f"workspace folder does not exist: {source}")
+
+    existing = load_workspace_snapshot(root)
+    if existing is not None:
+        if existing.mode == MODE_OVERLAY and not os.path.ismount(existing.workdir):
+            with _overlay_lock:
+                if _mounted_overlays_of(source, root):
+                    raise OSError(
+                        "could not remount workspace snapshot: another task's "
+                        f"overlay of {source} is mounted"
+                    )
+                reason = _mount_overlay(existing)
+            if reason:
+                raise OSError(f"could not remount workspace snapshot: {reason}")
+        _log(on_log, "INFO", f"reusing {existing.mode} snapshot of {source}")
+        return existing
+
+    os.makedirs(root, exist_ok=True)
+    start_s = time.monotonic()
+    files = scan_tree(source)
+    errors: list[str] = []
+    for mode in modes:
+        snapshot = WorkspaceSnapshot(root=root, source=source, mode=mode)
+        if mode == MODE_OVERLAY:
+            with _overlay_lock:
+                if _mounted_overlays_of(source, root):
+                    reason = "another task's overlay of this folder is mounted"
+                else:
+                    reason = _mount_overlay(snapshot)
+            if reason:
+                errors.append(f"overlay: {reason}")
+                _log(on_log, "DEBUG", f"overlay unavailable ({reason})")
+                continue
+        elif mode == MODE_REFLINK:
+            try:
+                _copy_reflink(source, snapshot.workdir)
+            except (OSError, shutil.Error) as exc:
+                errors.append(f"reflink: {exc}")
+                continue
+        else:
+            continue
+        _write_manifest(
+            root,
+            {
+                "version": _MANIFEST_VERSION,
+                "source": source,
+                "mode": mode,
+                "created_at": time.time(),
+                "files": {rel: list(key) for rel, key in files.items()},
+            },
+        )
+        _log(
+            on_log,
+            "INFO",
+            f"{mode} snapshot of {source} ({len(files)} files) "
+            f"ready in {time.monotonic() - start_s:.1f}s",
+        )
+        return snapshot
+    raise OSError("could not snapshot workspace: " + "; ".join(errors or ["no mode"]))
+
+
+def _is_opaque(path: str) -> bool:
+    if os.path.lexists(os.path.join(path, _OPAQUE_MARKER)):
+        return True
+    for name in _OPAQUE_XATTRS:
+        try:
+            if os.getxattr(path, name, follow_symlinks=False) == b"y":
+                return True
+        except (OSError, AttributeError):
+            continue
+    return False
+
+
+def _overlay_touched(snapshot: WorkspaceSnapshot, base: Manifest) -> tuple[set, set]:
+    """Candidate changed/deleted paths from the overlay's upper layer."""
+    changed: set[str] = set()
+    deleted: set[str] = set()
+
+    def _deleted_under(prefix: str) -> None:
+        deleted.update(
+            rel for rel in base if rel == prefix or rel.startswith(prefix + "/")
+        )
+
+    stack = [""]
+    while stack:
+        rel_dir = stack.pop()
+        abs_dir = os.path.join(snapshot.upper_dir, rel_dir)
+        if rel_dir and _is_opaque(abs_dir):
+            # The directory replaced the folder's copy wholesale.
+            _deleted_under(rel_dir)
+        try:
+            entries = list(os.scandir(abs_dir))
+        except OSError:
+            continue
+        for entry in entries:
+            rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            if entry.name == _OPAQUE_MARKER:
+                continue
+            if entry.name.startswith(_WHITEOUT_PREFIX):
+                name = entry.name[len(_WHITEOUT_PREFIX) :]
+                _deleted_under(f"{rel_dir}/{name}" if rel_dir else name)
+            elif stat.S_ISCHR(st.st_mode) and st.st_rdev == 0:
+                _deleted_under(rel)
+            elif stat.S_ISDIR(st.st_mode):
+                if entry.name not in _EXCLUDED_DIRS:
+                    stack.append(rel)
+            else:
+                changed.add(rel)
+    return changed, deleted
+
+
+def snapshot_changes(snapshot: WorkspaceSnapshot) -> SnapshotChanges:
+    """Files the task added, modified or removed relative to the manifest."""
+    payload = _read_manifest(snapshot.root) or {}
+    base = _manifest_files(payload)
+    if snapshot.mode == MODE_OVERLAY:
+        candidates, gone = _overlay_touched(snapshot, base)
+        view: Manifest = {}
+        for rel in candidates:
+            st = _lstat(os.path.join(snapshot.upper_dir, rel))
+            if st is not None and not stat.S_ISDIR(st.st_mode):
+                view[rel] = _entry_key(st)
+        # Only paths the upper layer touched can have been removed.
+        deleted = sorted(rel for rel in gone if rel not in view)
+    else:
+        view = scan_tree(snapshot.workdir)
+        deleted = sorted(rel for rel in base if rel not in view)
+    changed = sorted(rel for rel, key in view.items() if base.get(rel) != key)
+    return SnapshotChanges(changed=tuple(changed), deleted=tuple(deleted))
+
+
+def _copy_back(src: str, dest: str) -> None:
+    os.makedirs(os.path.dirname(dest) or ".", exist_ok=True)
+    if os.path.islink(src):
+        target = os.readlink(src)
+        if os.path.lexists(dest):
+            os.unlink(dest)
+        os.symlink(target, dest)
+        return
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=".agents-runner-", dir=os.path.dirname(dest) or "."
+    )
+    os.close(fd)
+    try:
+        shutil.copy2(src, tmp_path)
+        os.replace(tmp_path, dest)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def merge_snapshot(
+    snapshot: WorkspaceSnapshot,
+    *,
+    on_log: Callable[[str], None] | None = None,
+) -> MergeResult:
+    """Write the task's changes back into the source folder.
+
+    A path is only written (or deleted) if the folder still has the version
+    the snapshot started from; otherwise it is reported as a conflict and
+    left alone. An overlay snapshot is unmounted first. Raises OSError if
+    that fails or another task's overlay of the folder is mounted (in any
+    mode: the folder is that overlay's lower layer).
+    """
+    payload = _read_manifest(snapshot.root)
+    if payload is None:
+        raise OSError(f"no workspace snapshot at {snapshot.root}")
+    # Held for the whole merge so no overlay of the folder is mounted meanwhile.
+    with _overlay_lock:
+        others = _mounted_overlays_of(snapshot.source, snapshot.root)
+        if others:
+            raise OSError(
+                f"overlay of {snapshot.source} still mounted for "
+                f"{', '.join(others)}; not merging"
+            )
+        if snapshot.mode == MODE_OVERLAY and not _unmount(snapshot.workdir):
+            raise OSError(f"could not unmount {snapshot.workdir}")
+        return _merge_locked(snapshot, payload, on_log)
+
+
+def _merge_locked(
+    snapshot: WorkspaceSnapshot,
+    payload: dict,
+    on_log: Callable[[str], None] | None,
+) -> MergeResult:
+    base = _manifest_files(payload)
+    changes = snapshot_changes(snapshot)
+    applied: list[str] = []
+    deleted: list[str] = []
+    conflicts: list[str] = []
+
+    def _unchanged_in_source(rel: str) -> bool:
+        st = _lstat(os.path.join(snapshot.source, rel))
+        if st is None:
+            return rel not in base
+        return not stat.S_ISDIR(st.st_mode) and _entry_key(st) == base.get(rel)
+
+    for rel in changes.changed:
+        dest = os.path.join(snapshot.source, rel)
+        if not _unchanged_in_source(rel):
+            conflicts.append(rel)
+            continue
+        try:
+            _copy_back(os.path.join(snapshot.changes_dir, rel), dest)
+        except OSError as exc:
+            _log(on_log, "WARN", f"could not merge {rel}: {exc}")
+            conflicts.append(rel)
+            continue
+        st = _lstat(dest)
+        if st is not None:
+            base[rel] = _entry_key(st)
+        applied.append(rel)
+
+    for rel in changes.deleted:
+        if not _unchanged_in_source(rel):
+            if _lstat(os.path.join(snapshot.source, rel)) is None:
+                base.pop(rel, None)
+            else:
+                conflicts.append(rel)
+            continue
+        try:
+            os.unlink(os.path.join(snapshot.source, rel))
+        except OSError as exc:
+            _log(on_log, "WARN", f"could not delete {rel}: {exc}")
+            conflicts.append(rel)
+            continue
+        base.pop(rel, None)
+        deleted.append(rel)
+
+    payload["files"] = {rel: list(key) for rel, key in base.items()}
+    payload["merged_at"] = time.time()
+    payload.pop("kept_unmerged", None)
+    _write_manifest(snapshot.root, payload)
+    return MergeResult(
+        applied=tuple(applied), deleted=tuple(deleted), conflicts=tuple(conflicts)
+    )
+
+
+def finish_workspace_snapshot(
+    root: str,
+    *,
+    merge: bool = True,
+    on_log: Callable[[str], None] | None = None,
+) -> bool:
+    """Finalization step for a task snapshot: merge it back (or discard it).
+
+    Returns True when the snapshot can be removed, False when conflicting
+    changes were left in it for the user to resolve. Kept snapshots are
+    marked (see ``snapshot_kept_unmerged``) so cleanup leaves them alone.
+    """
+    snapshot = load_workspace_snapshot(root)
+    if snapshot is None:
+        return True
+    if not merge:
+        _log(on_log, "INFO", "task was stopped; discarding snapshot changes")
+        return True
+    try:
+        result = merge_snapshot(snapshot, on_log=on_log)
+    except OSError as exc:
+        _log(on_log, "WARN", f"keeping snapshot unmerged: {exc}")
+        _mark_kept(root, str(exc))
+        return False
+    _log(
+        on_log,
+        "INFO",
+        f"merged {len(result.applied)} changed and {len(result.deleted)} deleted "
+        f"file(s) back into {snapshot.source}",
+    )
+    if not result.conflicts:
+        return True
+    shown = ", ".join(result.conflicts[:10])
+    more = len(result.conflicts) - 10
+    if more > 0:
+        shown += f" (+{more} more)"
+    _log(
+        on_log,
+        "WARN",
+        f"{len(result.conflicts)} file(s) also changed in {snapshot.source}; "
+        f"keeping the task's versions in {snapshot.changes_dir}: {shown}",
+    )
+    _mark_kept(root, f"{len(result.conflicts)} conflicting file(s)")
+    return False
+
+
+def release_workspace_snapshot(root: str) -> bool:
+    """Unmount a snapshot's overlay so ``root`` can be deleted.
+
+    Returns False if the view is still mounted; callers must not remove
+    ``root`` then.
+    """
+    workdir = snapshot_workdir(root)
+    if not os.path.isdir(workdir):
+        return True
+    return _unmount(workdir)
@@ -0,0 +1,355 @@
+"""
+Disk usage of ``managed-repos/`` with quota-based eviction.
+
+Sizing a task workspace means visiting every file in it, and most
+workspaces (finished tasks) never change again. ``DiskUsageTracker`` scans
+on a background thread with ``os.scandir`` and caches each workspace's size
+keyed by a cheap signature: the mtimes of the workspace directory and its
+direct children. A workspace is only rescanned when that signature moves
+(or it is invalidated explicitly, e.g. when its task finishes).
+
+With a quota set, each scan that finds ``managed-repos/`` over the quota
+evicts finished task workspaces, least recently modified first, until the
+total fits again. Whether a workspace may go, and how it is removed, is up
+to the caller.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SCAN_INTERVAL_S = 5 * 60.0
+_TASKS_DIRNAME = "tasks"
+
+# (mtime_ns of the directory, newest mtime_ns among its direct children)
+_Signature = tuple[int, int]
+
+
+@dataclass(frozen=True, slots=True)
+class WorkspaceUsage:
+    env_id: str
+    # Empty for environment-level data outside ``tasks/``.
+    task_id: str
+    path: str
+    size_bytes: int
+    modified_at: float
+
+
+@dataclass(frozen=True, slots=True)
+class DiskUsageReport:
+    root: str
+    workspaces: tuple[WorkspaceUsage, ...]
+    scanned_at: float
+    quota_bytes: int = 0
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(item.size_bytes for item in self.workspaces)
+
+    def by_environment(self) -> dict[str, int]:
+        totals: dict[str, int] = {}
+        for item in self.workspaces:
+            totals[item.env_id] = totals.get(item.env_id, 0) + item.size_bytes
+        return totals
+
+    def summary(self, *, top: int = 5) -> str:
+        """Multi-line breakdown for the settings page."""
+        total = f"Total: {format_bytes(self.total_bytes)}"
+        if self.quota_bytes > 0:
+            total += f" of {format_bytes(self.quota_bytes)} quota"
+        lines = [total]
+        for env_id, size in sorted(
+            self.by_environment().items(), key=lambda kv: (-kv[1], kv[0])
+        ):
+            count = sum(
+                1 for item in self.workspaces if item.env_id == env_id and item.task_id
+            )
+            lines.append(f"  {env_id}: {format_bytes(size)} ({count} task(s))")
+        largest = sorted(
+            (item for item in self.workspaces if item.task_id),
+            key=lambda item: -item.size_bytes,
+        )[: max(0, top)]
+        if largest:
+            lines.append("Largest task workspaces:")
+            lines.extend(
+                f"  {item.task_id} ({item.env_id}): {format_bytes(item.size_bytes)}"
+                for item in largest
+            )
+        return "\n".join(lines)
+
+
+def format_bytes(size_bytes: int) -> str:
+    size = float(size_bytes)
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024.0:
+            return f"{size:.1f} {unit}"
+        size /= 1024.0
+    return f"{size:.1f} TB"
+
+
+def directory_size(path: str, *, exclude: frozenset[str] = frozenset()) -> int:
+    """Total size of the regular files under ``path`` (symlinks not followed).
+
+    ``exclude`` names top-level entries to skip. Other filesystems mounted
+    below ``path`` (e.g. a snapshot's overlay view) are not counted.
+    """
+    try:
+        device = os.stat(path, follow_symlinks=False).st_dev
+    except OSError:
+        return 0
+    total = 0
+    stack = [(path, True)]
+    while stack:
+        current, top = stack.pop()
+        try:
+            entries = os.scandir(current)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if top and entry.name in exclude:
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.stat(follow_symlinks=False).st_dev == device:
+                            stack.append((entry.path, False))
+                    elif entry.is_file(follow_symlinks=False):
+                        total += entry.stat(follow_symlinks=False).st_size
+                except OSError:
+                    continue
+    return total
+
+
+def _signature(path: str) -> _Signature | None:
+    try:
+        own = os.stat(path, follow_symlinks=False).st_mtime_ns
+    except OSError:
+        return None
+    newest = own
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    newest = max(newest, entry.stat(follow_symlinks=False).st_mtime_ns)
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return own, newest
+
+
+@dataclass(slots=True)
+class _CacheEntry:
+    signature: _Signature
+    usage: WorkspaceUsage
+
+
+class DiskUsageTracker:
+    """Cached, incremental size accounting for ``managed-repos/``."""
+
+    def __init__(
+        self,
+        root: str,
+        *,
+        interval_s: float = DEFAULT_SCAN_INTERVAL_S,
+        on_update: Callable[[DiskUsageReport], None] | None = None,
+    ) -> None:
+        self._root = root
+        self._interval_s = max(1.0, float(interval_s))
+        self._on_update = on_update
+        self._lock = threading.Lock()
+        self._scan_lock = threading.Lock()
+        self._cache: dict[str, _CacheEntry] = {}
+        self._report: DiskUsageReport | None = None
+        self._quota_bytes = 0
+        self._is_evictable: Callable[[WorkspaceUsage], bool] | None = None
+        self._evict: Callable[[WorkspaceUsage], bool] | None = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.scans = 0
+        self.sized = 0
+
+    @property
+    def root(self) -> str:
+        return self._root
+
+    def report(self) -> DiskUsageReport | None:
+        """The last scan's result, without touching the disk."""
+        with self._lock:
+            return self._report
+
+    def configure(
+        self,
+        *,
+        quota_bytes: int,
+        is_evictable: Callable[[WorkspaceUsage], bool] | None = None,
+        evict: Callable[[WorkspaceUsage], bool] | None = None,
+    ) -> None:
+        """Set the quota (0 disables eviction) and the eviction callbacks."""
+        with self._lock:
+            self._quota_bytes = max(0, int(quota_bytes))
+            if is_evictable is not None:
+                self._is_evictable = is_evictable
+            if evict is not None:
+                self._evict = evict
+
+    def invalidate(self, path: str | None = None) -> None:
+        """Forget cached sizes (one workspace, or all of them)."""
+        with self._lock:
+            if path is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(os.path.normpath(path), None)
+
+    def _workspace_dirs(self) -> list[tuple[str, str, str]]:
+        """(env_id, task_id, path) for every workspace under the root."""
+        found: list[tuple[str, str, str]] = []
+        try:
+            env_entries = list(os.scandir(self._root))
+        except OSError:
+            return found
+        for env_entry in env_entries:
+            # Skips the reaper's ``.trash``; environment ids never start with a dot.
+            if env_entry.name.startswith(".") or not env_entry.is_dir(
+                follow_symlinks=False
+            ):
+                continue
+            found.append((env_entry.name, "", env_entry.path))
+            tasks_dir = os.path.join(env_entry.path, _TASKS_DIRNAME)
+            try:
+                task_entries = list(os.scandir(tasks_dir))
+            except OSError:
+                continue
+            for task_entry in task_entries:
+                if task_entry.is_dir(follow_symlinks=False):
+                    found.append((env_entry.name, task_entry.name, task_entry.path))
+        return found
+
+    def scan(self) -> DiskUsageReport:
+        """Size every workspace, reusing cached sizes whose signature held."""
+        with self._scan_lock:
+            usages: list[WorkspaceUsage] = []
+            fresh: dict[str, _CacheEntry] = {}
+            for env_id, task_id, path in self._workspace_dirs():
+                key = os.path.normpath(path)
+                signature = _signature(path)
+                if signature is None:
+                    continue
+                with self._lock:
+                    cached = self._cache.get(key)
+                if cached is not None and cached.signature == signature:
+                    entry = cached
+                else:
+                    exclude = frozenset() if task_id else frozenset({_TASKS_DIRNAME})
+                    entry = _CacheEntry(
+                        signature,
+                        WorkspaceUsage(
+                            env_id=env_id,
+                            task_id=task_id,
+                            path=path,
+                            size_bytes=directory_size(path, exclude=exclude),
+                            modified_at=signature[1] / 1e9,
+                        ),
+                    )
+                    self.sized += 1
+                fresh[key] = entry
+                usages.append(entry.usage)
+            with self._lock:
+                # Drops entries for workspaces that no longer exist.
+                self._cache = fresh
+                report = DiskUsageReport(
+                    root=self._root,
+                    workspaces=tuple(usages),
+                    scanned_at=time.time(),
+                    quota_bytes=self._quota_bytes,
+                )
+                self._report = report
+                self.scans += 1
+            return report
+
+    def enforce_quota(self, report: DiskUsageReport) -> list[WorkspaceUsage]:
+        """Evict finished task workspaces (LRU) until under the quota."""
+        with self._lock:
+            quota = self._quota_bytes
+            is_evictable = self._is_evictable
+            evict = self._evict
+        total = report.total_bytes
+        if quota <= 0 or total <= quota or evict is None:
+            return []
+        candidates = sorted(
+            (
+                item
+                for item in report.workspaces
+                if item.task_id and (is_evictable is None or is_evictable(item))
+            ),
+            key=lambda item: item.modified_at,
+        )
+        evicted: list[WorkspaceUsage] = []
+        for item in candidates:
+            if total <= quota:
+                break
+            try:
+                removed = evict(item)
+            except Exception:
+                logger.exception("evicting %s failed", item.path)
+                removed = False
+            if removed:
+                evicted.append(item)
+                total -= item.size_bytes
+                self.invalidate(item.path)
+        if total > quota:
+            logger.info(
+                "managed-repos still over quota after eviction: %s of %s",
+                format_bytes(total),
+                format_bytes(quota),
+            )
+        return evicted
+
+    def refresh(self) -> DiskUsageReport:
+        """Scan, enforce the quota, and report (rescanning after evictions)."""
+        report = self.scan()
+        if self.enforce_quota(report):
+            report = self.scan()
+        if self._on_update is not None:
+            try:
+                self._on_update(report)
+            except Exception:
+                logger.exception("disk usage callback failed")
+        return report
+
+    # Background thread
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._loop, name="disk-usage", daemon=True
+        )
+        self._thread.start()
+
+    def request_scan(self) -> None:
+        self._wake.set()
+
+    def stop(self, *, timeout_s: float = 0.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        thread = self._thread
+        if thread is not None and timeout_s > 0:
+            thread.join(timeout_s)
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("disk usage scan failed")
+            self._wake.wait(self._interval_s)
+            self._wake.clear()
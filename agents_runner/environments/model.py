@@ -68,6 +68,10 @@ class AgentSelection:
     selection_mode: str = "round-robin"
     agent_fallbacks: dict[str, str] = field(default_factory=dict)
     pinned_agent_id: str = ""
+    # "race" mode: how many agents start at once and how the winner is picked
+    # ("first" success, or the "smallest-diff" once every racer finished).
+    race_width: int = 2
+    race_pick: str = "first"
 
 
 @dataclass
@@ -79,6 +83,9 @@ class Environment:
     host_codex_dir: str = ""
     agent_cli_args: str = ""
     max_agents_running: int = -1
+    # Preset name or "cpus=2, memory=4g, pids=512"; see docker/resources.py
+    resource_profile: str = "unlimited"
+    cpuset_partitioning: bool = False
     headless_desktop_enabled: bool = False
     cache_desktop_build: bool = False
     container_caching_enabled: bool = False
@@ -96,6 +103,14 @@ class Environment:
     gh_last_base_branch: str = ""
     gh_use_host_cli: bool = True
     gh_context_enabled: bool = False  # Renamed from gh_pr_metadata_enabled
+    # Cloned workspaces: blob-less partial clone, shallow depth (0 = full
+    # history) and sparse-checkout paths (empty = whole tree).
+    clone_partial: bool = False
+    clone_depth: int = 0
+    clone_sparse_paths: list[str] = field(default_factory=list)
+    # Mounted workspaces: run each task in a copy-on-write snapshot of the
+    # folder and merge its changes back at finalization.
+    mounted_snapshots: bool = False
     prompts: list[PromptConfig] = field(default_factory=list)
     prompts_unlocked: bool = False
     agent_selection: AgentSelection | None = None
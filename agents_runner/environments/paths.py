@@ -36,6 +36,15 @@ def managed_repos_dir(data_dir: str | None = None) -> str:
     return os.path.join(data_dir, "managed-repos")
 
 
+def workspace_trash_dir(data_dir: str | None = None) -> str:
+    """Where removed workspaces wait for background deletion.
+
+    Inside ``managed-repos/`` so moving a workspace there is a same-filesystem
+    rename; the leading dot keeps it apart from environment ids.
+    """
+    return os.path.join(managed_repos_dir(data_dir=data_dir), ".trash")
+
+
 def managed_repo_checkout_path(
     env_id: str, data_dir: str | None = None, task_id: str | None = None
 ) -> str:
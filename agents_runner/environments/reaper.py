@@ -0,0 +1,379 @@
+"""
+Background deletion of task workspaces.
+
+Removing a clone with a large ``.git`` or ``node_modules`` takes a long time,
+and doing it inline made cleanup slow and made it compete with running
+tasks for disk. ``WorkspaceReaper.discard`` instead renames the workspace
+into ``managed-repos/.trash/``. The rename is atomic and on the same
+filesystem, so the workspace is gone from its old path right away. A
+background thread then deletes the trash entries one at a time, clearing
+directories in parallel with ``os.scandir``/``os.unlink`` on a small worker
+pool. The threads run at idle I/O priority and lowest CPU priority where the
+platform allows it.
+
+Anything that could not be deleted stays in the trash and is reported as a
+leftover. Entries still in the trash when a reaper starts, such as leftovers
+or deletions cut short by an exit, are queued again.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import logging
+import os
+import platform
+import sys
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Future
+from concurrent.futures import wait
+from dataclasses import dataclass
+
+from agents_runner.execution.executor import WorkerPool
+from agents_runner.log_format import format_log
+
+from .disk_usage import format_bytes
+from .paths import workspace_trash_dir
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 4
+# Failed paths kept per trash entry for reporting.
+_MAX_REPORTED_FAILURES = 5
+
+_IOPRIO_WHO_PROCESS = 1
+_IOPRIO_CLASS_IDLE = 3
+_IOPRIO_CLASS_SHIFT = 13
+_SYS_IOPRIO_SET = {"x86_64": 251, "aarch64": 30, "i686": 289, "armv7l": 314}
+
+_priority = threading.local()
+
+
+def _lower_thread_priority() -> None:
+    """Idle I/O class and nice 19 for the calling thread (Linux; best effort)."""
+    if getattr(_priority, "lowered", False):
+        return
+    _priority.lowered = True
+    if not sys.platform.startswith("linux"):
+        return
+    tid = threading.get_native_id()
+    try:
+        # On Linux a thread id here affects only that thread.
+        os.setpriority(os.PRIO_PROCESS, tid, 19)
+    except (AttributeError, OSError):
+        pass
+    nr = _SYS_IOPRIO_SET.get(platform.machine())
+    if nr is None:
+        return
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        libc.syscall(
+            nr, _IOPRIO_WHO_PROCESS, tid, _IOPRIO_CLASS_IDLE << _IOPRIO_CLASS_SHIFT
+        )
+    except (AttributeError, OSError):
+        pass
+
+
+@dataclass(frozen=True, slots=True)
+class PurgeResult:
+    name: str
+    files: int
+    bytes_freed: int
+    elapsed_s: float
+    # Paths that could not be removed; empty when the entry is gone.
+    leftovers: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True, slots=True)
+class ReaperStatus:
+    pending: int
+    active: str
+    active_files: int
+    active_bytes: int
+    freed_bytes: int
+    leftovers: tuple[str, ...]
+
+    def summary(self) -> str:
+        if self.active:
+            text = (
+                f"Deleting: {self.active} ({self.active_files} files, "
+                f"{format_bytes(self.active_bytes)} so far)"
+            )
+            if self.pending:
+                text += f", {self.pending} more queued"
+        elif self.pending:
+            text = f"Deleting: {self.pending} queued"
+        else:
+            text = "Deleting: idle"
+        if self.freed_bytes:
+            text += f"; {format_bytes(self.freed_bytes)} reclaimed"
+        if self.leftovers:
+            text += f"\nLeft in trash: {', '.join(self.leftovers)}"
+        return text
+
+
+class WorkspaceReaper:
+    """Moves workspaces to a trash directory and deletes them in the background."""
+
+    def __init__(self, trash_dir: str, *, workers: int = DEFAULT_WORKERS) -> None:
+        self._trash_dir = trash_dir
+        self._pool = WorkerPool("reaper", max_workers=workers)
+        self._cond = threading.Condition()
+        self._queue: deque[str] = deque()
+        self._active = ""
+        self._active_files = 0
+        self._active_bytes = 0
+        self._freed_bytes = 0
+        self._leftovers: dict[str, tuple[str, ...]] = {}
+        self._listeners: list[Callable[[PurgeResult], None]] = []
+        self._thread: threading.Thread | None = None
+        self._stopping = False
+
+    @property
+    def trash_dir(self) -> str:
+        return self._trash_dir
+
+    def add_listener(self, callback: Callable[[PurgeResult], None]) -> None:
+        """Call ``callback`` (on the reaper thread) after each trash entry."""
+        with self._cond:
+            self._listeners.append(callback)
+
+    def discard(self, path: str) -> str:
+        """Move ``path`` into the trash and queue it; returns its trash path.
+
+        Raises OSError when the rename is not possible (e.g. ``path`` is on
+        another filesystem); the caller should delete it directly then.
+        """
+        os.makedirs(self._trash_dir, exist_ok=True)
+        name = f"{time.time_ns()}-{os.path.basename(os.path.normpath(path))}"
+        target = os.path.join(self._trash_dir, name)
+        os.rename(path, target)
+        self._enqueue(name)
+        return target
+
+    def _enqueue(self, name: str) -> None:
+        with self._cond:
+            if name in self._queue or name == self._active:
+                return
+            self._leftovers.pop(name, None)
+            self._queue.append(name)
+            self._cond.notify_all()
+        self.start()
+
+    def start(self) -> None:
+        """Start the reaper thread and queue whatever is already in the trash."""
+        with self._cond:
+            if self._thread is not None or self._stopping:
+                return
+            try:
+                existing = sorted(os.listdir(self._trash_dir))
+            except OSError:
+                existing = []
+            self._queue.extendleft(
+                name for name in reversed(existing) if name not in self._queue
+            )
+            self._thread = threading.Thread(
+                target=self._loop, name="workspace-reaper", daemon=True
+            )
+            self._thread.start()
+
+    def status(self) -> ReaperStatus:
+        with self._cond:
+            return ReaperStatus(
+                pending=len(self._queue),
+                active=self._active,
+                active_files=self._active_files,
+                active_bytes=self._active_bytes,
+                freed_bytes=self._freed_bytes,
+                leftovers=tuple(sorted(self._leftovers)),
+            )
+
+    def wait_idle(self, timeout_s: float | None = None) -> bool:
+        """Wait until the queue is empty; True if it got there in time."""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._queue and not self._active, timeout=timeout_s
+            )
+
+    def stop(self, *, timeout_s: float = 0.0) -> None:
+        """Stop deleting; whatever is left in the trash is queued next start."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+            thread = self._thread
+        self._pool.shutdown(timeout_s=0.0, cancel_pending=False)
+        if thread is not None and timeout_s > 0:
+            thread.join(timeout_s)
+
+    def _loop(self) -> None:
+        _lower_thread_priority()
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or self._stopping)
+                if self._stopping:
+                    return
+                name = self._queue.popleft()
+                self._active = name
+                self._active_files = 0
+                self._active_bytes = 0
+            try:
+                result = self._purge(name)
+            except Exception as exc:
+                logger.exception("purging %s failed", name)
+                result = PurgeResult(name, 0, 0, 0.0, (f"{name}: {exc}",))
+            with self._cond:
+                self._freed_bytes += result.bytes_freed
+                if result.leftovers:
+                    self._leftovers[name] = result.leftovers
+                listeners = list(self._listeners)
+            self._report(result)
+            for callback in listeners:
+                try:
+                    callback(result)
+                except Exception:
+                    logger.exception("reaper listener failed")
+            with self._cond:
+                self._active = ""
+                self._cond.notify_all()
+
+    def _report(self, result: PurgeResult) -> None:
+        if result.leftovers:
+            logger.warning(
+                format_log(
+                    "cleanup",
+                    "reaper",
+                    "WARN",
+                    f"could not fully delete {result.name} "
+                    f"({format_bytes(result.bytes_freed)} freed); left in "
+                    f"{self._trash_dir}: {', '.join(result.leftovers)}",
+                )
+            )
+            return
+        logger.info(
+            format_log(
+                "cleanup",
+                "reaper",
+                "INFO",
+                f"deleted {result.name}: {result.files} files, "
+                f"{format_bytes(result.bytes_freed)} in {result.elapsed_s:.1f}s",
+            )
+        )
+
+    def _purge(self, name: str) -> PurgeResult:
+        root = os.path.join(self._trash_dir, name)
+        start = time.monotonic()
+        if not os.path.lexists(root):
+            return PurgeResult(name, 0, 0, 0.0)
+        if not os.path.isdir(root) or os.path.islink(root):
+            size = os.lstat(root).st_size
+            os.unlink(root)
+            return PurgeResult(name, 1, size, time.monotonic() - start)
+
+        dirs: list[str] = []
+        failures: list[str] = []
+        files = 0
+        freed = 0
+        pending: set[Future] = {self._pool.submit(self._clear_dir, root)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                path, subdirs, count, size, failed = future.result()
+                dirs.append(path)
+                failures.extend(failed)
+                files += count
+                freed += size
+                with self._cond:
+                    self._active_files = files
+                    self._active_bytes = freed
+                for subdir in subdirs:
+                    pending.add(self._pool.submit(self._clear_dir, subdir))
+
+        # Children before parents.
+        for path in sorted(dirs, key=lambda p: p.count(os.sep), reverse=True):
+            try:
+                os.rmdir(path)
+            except FileNotFoundError:
+                pass
+            except PermissionError:
+                try:
+                    os.chmod(os.path.dirname(path), 0o700)
+                    os.rmdir(path)
+                except OSError:
+                    failures.append(path)
+            except OSError:
+                failures.append(path)
+        leftovers: tuple[str, ...] = ()
+        if os.path.lexists(root):
+            leftovers = tuple(failures[:_MAX_REPORTED_FAILURES]) or (root,)
+        return PurgeResult(name, files, freed, time.monotonic() - start, leftovers)
+
+    @staticmethod
+    def _clear_dir(path: str) -> tuple[str, list[str], int, int, list[str]]:
+        """Unlink everything but subdirectories directly inside ``path``.
+
+        Returns (path, subdirectories, files removed, bytes freed, failures).
+        """
+        _lower_thread_priority()
+        try:
+            entries = list(os.scandir(path))
+        except PermissionError:
+            try:
+                os.chmod(path, 0o700)
+                entries = list(os.scandir(path))
+            except OSError:
+                return path, [], 0, 0, [path]
+        except OSError:
+            return path, [], 0, 0, [path]
+        subdirs: list[str] = []
+        failures: list[str] = []
+        files = 0
+        freed = 0
+        writable_checked = False
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                    continue
+                size = entry.stat(follow_symlinks=False).st_size
+            except OSError:
+                size = 0
+            try:
+                os.unlink(entry.path)
+            except FileNotFoundError:
+                continue
+            except PermissionError:
+                if writable_checked:
+                    failures.append(entry.path)
+                    continue
+                writable_checked = True
+                try:
+                    os.chmod(path, 0o700)
+                    os.unlink(entry.path)
+                except OSError:
+                    failures.append(entry.path)
+                    continue
+            except OSError:
+                failures.append(entry.path)
+                continue
+            files += 1
+            freed += size
+        return path, subdirs, files, freed, failures
+
+
+_reapers: dict[str, WorkspaceReaper] = {}
+_reapers_lock = threading.Lock()
+
+
+def workspace_reaper(data_dir: str | None = None) -> WorkspaceReaper:
+    """The shared, started reaper for ``data_dir``'s trash directory."""
+    trash_dir = os.path.normpath(workspace_trash_dir(data_dir))
+    with _reapers_lock:
+        reaper = _reapers.get(trash_dir)
+        if reaper is None:
+            reaper = WorkspaceReaper(trash_dir)
+            _reapers[trash_dir] = reaper
+    reaper.start()
+    return reaper
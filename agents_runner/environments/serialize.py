@@ -178,6 +178,10 @@ def _environment_from_payload(payload: dict[str, Any]) -> Environment | None:
         max_agents_running = int(str(payload.get("max_agents_running", -1)).strip())
     except (ValueError, AttributeError):
         max_agents_running = -1
+    resource_profile = (
+        str(payload.get("resource_profile") or "unlimited").strip() or "unlimited"
+    )
+    cpuset_partitioning = bool(payload.get("cpuset_partitioning", False))
 
     preflight_enabled = bool(payload.get("preflight_enabled", False))
     preflight_script = str(payload.get("preflight_script") or "")
@@ -232,6 +236,20 @@ def _environment_from_payload(payload: dict[str, Any]) -> Environment | None:
     # Normalize using the new function
     workspace_type = normalize_workspace_type(workspace_type)
 
+    clone_partial = bool(payload.get("clone_partial", False))
+    try:
+        clone_depth = max(0, int(payload.get("clone_depth", 0) or 0))
+    except (TypeError, ValueError):
+        clone_depth = 0
+    clone_sparse_paths_raw = payload.get("clone_sparse_paths", [])
+    clone_sparse_paths = (
+        [str(p).strip() for p in clone_sparse_paths_raw if str(p or "").strip()]
+        if isinstance(clone_sparse_paths_raw, list)
+        else []
+    )
+
+    mounted_snapshots = bool(payload.get("mounted_snapshots", False))
+
     try:
         midoriai_template_likelihood = float(
             payload.get("midoriai_template_likelihood", 0.0)
@@ -289,6 +307,13 @@ def _environment_from_payload(payload: dict[str, Any]) -> Environment | None:
         pinned_agent_id = str(
             agent_selection_data.get("pinned_agent_id", "") or ""
         ).strip()
+        try:
+            race_width = max(2, int(agent_selection_data.get("race_width", 2)))
+        except (TypeError, ValueError):
+            race_width = 2
+        race_pick = str(agent_selection_data.get("race_pick", "first") or "first")
+        if race_pick not in {"first", "smallest-diff"}:
+            race_pick = "first"
 
         agents_payload = agent_selection_data.get("agents")
         seen_ids: set[str] = set()
@@ -384,6 +409,8 @@ def _environment_from_payload(payload: dict[str, Any]) -> Environment | None:
                 selection_mode=selection_mode,
                 agent_fallbacks=cleaned_fallbacks,
                 pinned_agent_id=pinned_agent_id,
+                race_width=race_width,
+                race_pick=race_pick,
             )
 
     # Cross-agent delegation settings
@@ -401,6 +428,8 @@ def _environment_from_payload(payload: dict[str, Any]) -> Environment | None:
         host_codex_dir=host_codex_dir,
         agent_cli_args=agent_cli_args,
         max_agents_running=max_agents_running,
+        resource_profile=resource_profile,
+        cpuset_partitioning=cpuset_partitioning,
         headless_desktop_enabled=headless_desktop_enabled,
         cache_desktop_build=cache_desktop_build,
         container_caching_enabled=container_caching_enabled,
@@ -418,6 +447,10 @@ def _environment_from_payload(payload: dict[str, Any]) -> Environment | None:
         gh_last_base_branch=gh_last_base_branch,
         gh_use_host_cli=gh_use_host_cli,
         gh_context_enabled=gh_context_enabled,  # Use migrated field name
+        clone_partial=clone_partial,
+        clone_depth=clone_depth,
+        clone_sparse_paths=clone_sparse_paths,
+        mounted_snapshots=mounted_snapshots,
         prompts=prompts,
         prompts_unlocked=prompts_unlocked,
         agent_selection=agent_selection,
@@ -467,6 +500,10 @@ def serialize_environment(env: Environment) -> dict[str, Any]:
             ).strip(),
             "agent_config_dirs": legacy_config_dirs,
             "agent_fallbacks": dict(env.agent_selection.agent_fallbacks),
+            "race_width": int(getattr(env.agent_selection, "race_width", 2) or 2),
+            "race_pick": str(
+                getattr(env.agent_selection, "race_pick", "first") or "first"
+            ),
         }
 
     # Validate cross-agent allowlist before serializing
@@ -486,6 +523,8 @@ def serialize_environment(env: Environment) -> dict[str, Any]:
         "agent_cli_args": env.agent_cli_args,
         "codex_extra_args": env.agent_cli_args,
         "max_agents_running": int(env.max_agents_running),
+        "resource_profile": str(getattr(env, "resource_profile", "") or "unlimited"),
+        "cpuset_partitioning": bool(getattr(env, "cpuset_partitioning", False)),
         "headless_desktop_enabled": bool(
             getattr(env, "headless_desktop_enabled", False)
         ),
@@ -515,6 +554,10 @@ def serialize_environment(env: Environment) -> dict[str, Any]:
         "gh_context_enabled": bool(env.gh_context_enabled),  # Save with new name
         # Also save with old name for backward compatibility with older builds
         "gh_pr_metadata_enabled": bool(env.gh_context_enabled),
+        "clone_partial": bool(getattr(env, "clone_partial", False)),
+        "clone_depth": int(getattr(env, "clone_depth", 0) or 0),
+        "clone_sparse_paths": list(getattr(env, "clone_sparse_paths", []) or []),
+        "mounted_snapshots": bool(getattr(env, "mounted_snapshots", False)),
         "midoriai_template_likelihood": float(
             max(0.0, min(1.0, float(getattr(env, "midoriai_template_likelihood", 0.0))))
         ),
@@ -1,6 +1,7 @@
 import json
 import os
 import tempfile
+import threading
 
 from typing import Any
 
@@ -85,6 +86,45 @@ def load_environments(data_dir: str | None = None) -> dict[str, Environment]:
     return envs
 
 
+_CACHE_LOCK = threading.Lock()
+_CACHE: dict[str, tuple[tuple[int, int, int], dict[str, Environment]]] = {}
+
+
+def load_environments_cached(data_dir: str | None = None) -> dict[str, Environment]:
+    """Like ``load_environments`` but reuses the last parse while the file is unchanged.
+
+    The cache is keyed by the file's mtime, size and inode, so saves from any
+    process invalidate it. The returned objects are shared between callers:
+    treat them as read-only and use ``load_environments`` before editing and
+    saving an environment.
+    """
+    data_dir = data_dir or default_data_dir()
+    envs_path = _environments_path_for_data_dir(data_dir)
+    try:
+        st = os.stat(envs_path)
+        signature = (st.st_mtime_ns, st.st_size, st.st_ino)
+    except OSError:
+        signature = (0, 0, 0)
+    with _CACHE_LOCK:
+        cached = _CACHE.get(envs_path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+    envs = load_environments(data_dir)
+    with _CACHE_LOCK:
+        _CACHE[envs_path] = (signature, envs)
+    return envs
+
+
+def has_environments(data_dir: str | None = None) -> bool:
+    """Return True if at least one stored environment parses successfully."""
+    data_dir = data_dir or default_data_dir()
+    envs_path = _environments_path_for_data_dir(data_dir)
+    for item in _load_environments_items(envs_path):
+        if _environment_from_payload(item) is not None:
+            return True
+    return False
+
+
 def save_environment(env: Environment, data_dir: str | None = None) -> None:
     data_dir = data_dir or default_data_dir()
     envs_path = _environments_path_for_data_dir(data_dir)
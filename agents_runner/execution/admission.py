@@ -0,0 +1,391 @@
+"""
+Host-resource-aware admission control for agent containers.
+
+Before a queued task starts, the scheduler asks ``AdmissionController.check``
+whether the host has room for another container. The controller compares
+the latest host sample (load average, available memory, free disk on the
+data dir) plus the usage of running agent containers against configurable
+thresholds.
+
+Sampling runs on a background thread: ``check`` never blocks and only looks
+at the most recent sample. Admitted starts are counted as pending and
+reserve their estimated load and memory until a sample taken
+``START_SETTLE_S`` after them lands (a container takes a while to show up in
+the load average and memory figures), so a burst of queued tasks cannot all
+pass on readings that do not include each other yet.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections.abc import Callable
+from collections.abc import Iterable
+from dataclasses import dataclass
+from dataclasses import field
+from pathlib import Path
+
+from agents_runner.docker.cgroups import read_cgroup_usage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_LOAD_PER_CPU = 2.0
+DEFAULT_MIN_FREE_MEMORY_MB = 1024
+DEFAULT_MIN_FREE_DISK_MB = 2048
+
+# Memory reserved for a pending start when no running container gives a hint.
+DEFAULT_TASK_MEMORY_MB = 512
+
+SAMPLE_INTERVAL_S = 2.0
+# How long a started container stays reserved as pending.
+START_SETTLE_S = 15.0
+
+_MIB = 1024 * 1024
+
+_SIZE_RE = re.compile(r"^\s*([0-9.]+)\s*([kmgtp]?i?b)?\s*$", re.IGNORECASE)
+_SIZE_UNITS = {
+    "b": 1,
+    "kb": 1000,
+    "mb": 1000**2,
+    "gb": 1000**3,
+    "tb": 1000**4,
+    "kib": 1024,
+    "mib": 1024**2,
+    "gib": 1024**3,
+    "tib": 1024**4,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class AdmissionThresholds:
+    enabled: bool = True
+    # 0 disables the individual check.
+    max_load_per_cpu: float = DEFAULT_MAX_LOAD_PER_CPU
+    min_free_memory_mb: int = DEFAULT_MIN_FREE_MEMORY_MB
+    min_free_disk_mb: int = DEFAULT_MIN_FREE_DISK_MB
+
+    @classmethod
+    def from_settings(cls, settings: dict[str, object]) -> AdmissionThresholds:
+        def _number(key: str, default: float) -> float:
+            try:
+                return max(0.0, float(str(settings.get(key, default)).strip()))
+            except (TypeError, ValueError):
+                return default
+
+        return cls(
+            enabled=bool(settings.get("admission_control_enabled", True)),
+            max_load_per_cpu=_number(
+                "admission_max_load_per_cpu", DEFAULT_MAX_LOAD_PER_CPU
+            ),
+            min_free_memory_mb=int(
+                _number("admission_min_free_memory_mb", DEFAULT_MIN_FREE_MEMORY_MB)
+            ),
+            min_free_disk_mb=int(
+                _number("admission_min_free_disk_mb", DEFAULT_MIN_FREE_DISK_MB)
+            ),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class ContainerUsage:
+    memory_bytes: int
+    cpu_percent: float | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class HostSample:
+    sampled_at_s: float
+    cpu_count: int
+    load_1m: float | None = None
+    mem_total_bytes: int | None = None
+    mem_available_bytes: int | None = None
+    disk_free_bytes: int | None = None
+    containers: dict[str, ContainerUsage] = field(default_factory=dict)
+
+    def average_container_memory(self) -> int | None:
+        if not self.containers:
+            return None
+        total = sum(usage.memory_bytes for usage in self.containers.values())
+        return total // len(self.containers)
+
+
+@dataclass(frozen=True, slots=True)
+class AdmissionDecision:
+    allowed: bool
+    reason: str = ""
+    # Which check failed: "sample", "load", "memory" or "disk".
+    resource: str = ""
+
+
+def parse_size(text: str) -> int | None:
+    """Parse docker-style sizes such as ``"512MiB"`` or ``"1.2GB"``."""
+    match = _SIZE_RE.match(str(text or ""))
+    if not match:
+        return None
+    unit = (match.group(2) or "b").lower()
+    factor = _SIZE_UNITS.get(unit)
+    if factor is None:
+        return None
+    return int(float(match.group(1)) * factor)
+
+
+def read_loadavg(path: str = "/proc/loadavg") -> float | None:
+    try:
+        return float(Path(path).read_text(encoding="utf-8").split()[0])
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def read_meminfo(path: str = "/proc/meminfo") -> tuple[int | None, int | None]:
+    """Return (MemTotal, MemAvailable) in bytes."""
+    values: dict[str, int] = {}
+    try:
+        with open(path, encoding="utf-8") as handle:
+            for line in handle:
+                key, _, rest = line.partition(":")
+                if key in {"MemTotal", "MemAvailable"}:
+                    values[key] = int(rest.split()[0]) * 1024
+                    if len(values) == 2:
+                        break
+    except (OSError, ValueError, IndexError):
+        pass
+    return values.get("MemTotal"), values.get("MemAvailable")
+
+
+def disk_free_bytes(path: str) -> int | None:
+    try:
+        stats = os.statvfs(path)
+    except OSError:
+        return None
+    return int(stats.f_bavail) * int(stats.f_frsize)
+
+
+def _docker_stats(container_ids: list[str]) -> dict[str, ContainerUsage]:
+    """One batched ``docker stats --no-stream`` call for all containers."""
+    from agents_runner.docker.process import _run_docker
+
+    if not container_ids:
+        return {}
+    try:
+        raw = _run_docker(
+            ["stats", "--no-stream", "--format", "{{json .}}", *container_ids],
+            timeout_s=15.0,
+        )
+    except Exception as exc:
+        logger.debug("docker stats failed: %s", exc)
+        return {}
+
+    wanted = set(container_ids)
+    usage: dict[str, ContainerUsage] = {}
+    for line in raw.splitlines():
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        memory = parse_size(str(row.get("MemUsage") or "").split("/")[0])
+        if memory is None:
+            continue
+        try:
+            cpu = float(str(row.get("CPUPerc") or "").rstrip("%"))
+        except ValueError:
+            cpu = None
+        name = str(row.get("Name") or "")
+        key = str(row.get("Container") or row.get("ID") or "")
+        for candidate in (name, key):
+            if candidate in wanted:
+                key = candidate
+                break
+        else:
+            key = next(
+                (cid for cid in wanted if key and cid.startswith(key)), name or key
+            )
+        usage[key] = ContainerUsage(memory_bytes=memory, cpu_percent=cpu)
+    return usage
+
+
+class ContainerUsageSampler:
+    """Reads per-container usage from cgroups, falling back to docker stats."""
+
+    def __init__(self) -> None:
+        self._cpu_prev: dict[str, tuple[int, float]] = {}
+
+    def sample(self, container_ids: Iterable[str]) -> dict[str, ContainerUsage]:
+        ids = sorted({str(cid).strip() for cid in container_ids if str(cid).strip()})
+        usage: dict[str, ContainerUsage] = {}
+        missing: list[str] = []
+        now = time.monotonic()
+        seen: dict[str, tuple[int, float]] = {}
+        for cid in ids:
+            found = read_cgroup_usage(cid)
+            if found is None:
+                missing.append(cid)
+                continue
+            memory, cpu_usec = found.memory_bytes, found.cpu_usec
+            cpu_percent: float | None = None
+            if cpu_usec is not None:
+                seen[cid] = (cpu_usec, now)
+                previous = self._cpu_prev.get(cid)
+                if previous is not None and now > previous[1]:
+                    elapsed_usec = (now - previous[1]) * 1_000_000
+                    cpu_percent = 100.0 * (cpu_usec - previous[0]) / elapsed_usec
+            usage[cid] = ContainerUsage(memory_bytes=memory, cpu_percent=cpu_percent)
+        self._cpu_prev = seen
+        usage.update(_docker_stats(missing))
+        return usage
+
+
+def sample_host(
+    data_dir: str,
+    container_ids: Iterable[str] = (),
+    *,
+    sampler: ContainerUsageSampler | None = None,
+) -> HostSample:
+    """Read load, memory, disk and container usage once."""
+    sampler = sampler or ContainerUsageSampler()
+    total, available = read_meminfo()
+    return HostSample(
+        sampled_at_s=time.monotonic(),
+        cpu_count=os.cpu_count() or 1,
+        load_1m=read_loadavg(),
+        mem_total_bytes=total,
+        mem_available_bytes=available,
+        disk_free_bytes=disk_free_bytes(data_dir),
+        containers=sampler.sample(container_ids),
+    )
+
+
+def evaluate(
+    sample: HostSample | None,
+    thresholds: AdmissionThresholds,
+    *,
+    pending_starts: int = 0,
+) -> AdmissionDecision:
+    """Decide whether one more container fits, given ``pending_starts``."""
+    if not thresholds.enabled:
+        return AdmissionDecision(True)
+    if sample is None:
+        return AdmissionDecision(False, "sampling host resources", "sample")
+
+    if thresholds.max_load_per_cpu > 0 and sample.load_1m is not None:
+        projected = (sample.load_1m + pending_starts) / max(1, sample.cpu_count)
+        if projected >= thresholds.max_load_per_cpu:
+            return AdmissionDecision(
+                False,
+                f"host load {sample.load_1m:.2f} on {sample.cpu_count} CPUs "
+                f"(limit {thresholds.max_load_per_cpu:g} per CPU)",
+                "load",
+            )
+
+    if thresholds.min_free_memory_mb > 0 and sample.mem_available_bytes is not None:
+        per_task = sample.average_container_memory() or DEFAULT_TASK_MEMORY_MB * _MIB
+        projected = sample.mem_available_bytes - per_task * (pending_starts + 1)
+        if projected < thresholds.min_free_memory_mb * _MIB:
+            return AdmissionDecision(
+                False,
+                f"{sample.mem_available_bytes // _MIB} MiB memory available, "
+                f"~{per_task // _MIB} MiB per task "
+                f"(keep {thresholds.min_free_memory_mb} MiB free)",
+                "memory",
+            )
+
+    if thresholds.min_free_disk_mb > 0 and sample.disk_free_bytes is not None:
+        if sample.disk_free_bytes < thresholds.min_free_disk_mb * _MIB:
+            return AdmissionDecision(
+                False,
+                f"{sample.disk_free_bytes // _MIB} MiB free on data dir "
+                f"(keep {thresholds.min_free_disk_mb} MiB free)",
+                "disk",
+            )
+
+    return AdmissionDecision(True)
+
+
+class AdmissionController:
+    """Gates container starts on the latest background host sample."""
+
+    def __init__(
+        self,
+        data_dir: str,
+        thresholds: AdmissionThresholds | None = None,
+        *,
+        on_sample: Callable[[], None] | None = None,
+        sample_interval_s: float = SAMPLE_INTERVAL_S,
+    ) -> None:
+        self._data_dir = data_dir
+        self._thresholds = thresholds or AdmissionThresholds()
+        self._on_sample = on_sample
+        self._sample_interval_s = float(sample_interval_s)
+        self._containers = ContainerUsageSampler()
+        self._lock = threading.Lock()
+        self._sample: HostSample | None = None
+        # Monotonic times of starts not yet reflected in a sample.
+        self._pending_starts: list[float] = []
+        self._refreshing = False
+
+    @property
+    def thresholds(self) -> AdmissionThresholds:
+        return self._thresholds
+
+    def configure(self, thresholds: AdmissionThresholds) -> None:
+        self._thresholds = thresholds
+
+    def latest_sample(self) -> HostSample | None:
+        with self._lock:
+            return self._sample
+
+    def check(self, running_container_ids: Iterable[str] = ()) -> AdmissionDecision:
+        """Return whether one more container may start right now.
+
+        Also starts a background refresh when the sample is stale; the
+        ``on_sample`` callback fires when it lands so callers can retry.
+        """
+        if not self._thresholds.enabled:
+            return AdmissionDecision(True)
+        with self._lock:
+            sample = self._sample
+            pending = len(self._pending_starts)
+        stale = (
+            sample is None
+            or time.monotonic() - sample.sampled_at_s >= self._sample_interval_s
+        )
+        if stale:
+            self.refresh_async(running_container_ids)
+        return evaluate(sample, self._thresholds, pending_starts=pending)
+
+    def note_started(self) -> None:
+        """Reserve room for a start that samples will not show for a while."""
+        with self._lock:
+            self._pending_starts.append(time.monotonic())
+
+    def refresh_async(self, running_container_ids: Iterable[str] = ()) -> None:
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        ids = list(running_container_ids)
+        threading.Thread(
+            target=self._refresh, args=(ids,), name="host-sample", daemon=True
+        ).start()
+
+    def _refresh(self, container_ids: list[str]) -> None:
+        try:
+            sample = sample_host(
+                self._data_dir, container_ids, sampler=self._containers
+            )
+        except Exception as exc:
+            logger.debug("host sample failed: %s", exc)
+            sample = None
+        with self._lock:
+            self._refreshing = False
+            if sample is not None:
+                self._sample = sample
+                settled = sample.sampled_at_s - START_SETTLE_S
+                self._pending_starts = [
+                    started for started in self._pending_starts if started > settled
+                ]
+        if sample is not None and self._on_sample is not None:
+            self._on_sample()
@@ -0,0 +1,284 @@
+"""
+Bounded worker pools for background work.
+
+``ExecutorService`` owns a few named pools so the number of helper threads
+stays predictable no matter how many tasks are open:
+
+- ``run``: one worker per running agent task (supervisor loop)
+- ``finalize``: artifact collection and post-run finalization
+- ``git``: pull request creation and other git/gh calls
+- ``io``: container removal, workspace cleanup, log tails
+
+Workers are daemon threads started on demand and retired after sitting idle,
+matching the old one-thread-per-job behaviour at exit: nothing here keeps
+the process alive. Each pool caps its waiting queue; ``submit`` raises
+``PoolSaturated`` when the queue is full (or waits up to ``wait_s`` for
+room), which is the back-pressure signal for callers.
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Future
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+POOL_RUN = "run"
+POOL_FINALIZE = "finalize"
+POOL_GIT = "git"
+POOL_IO = "io"
+
+# (max_workers, max_queue); max_queue 0 means unbounded.
+DEFAULT_POOL_SIZES: dict[str, tuple[int, int]] = {
+    POOL_RUN: (32, 0),
+    POOL_FINALIZE: (4, 256),
+    POOL_GIT: (4, 256),
+    POOL_IO: (8, 512),
+}
+
+_IDLE_TIMEOUT_S = 60.0
+
+
+class PoolSaturated(RuntimeError):
+    """The pool's queue is full."""
+
+
+class WorkerPool:
+    """Fixed-size pool of daemon worker threads with a bounded queue."""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        max_workers: int,
+        max_queue: int = 0,
+        idle_timeout_s: float = _IDLE_TIMEOUT_S,
+    ) -> None:
+        self.name = name
+        self._max_workers = max(1, int(max_workers))
+        self._max_queue = max(0, int(max_queue))
+        self._idle_timeout_s = float(idle_timeout_s)
+        self._cond = threading.Condition()
+        self._queue: deque[tuple[Future, Callable[..., Any], tuple[Any, ...]]] = deque()
+        self._threads: set[threading.Thread] = set()
+        self._idle = 0
+        self._active = 0
+        self._peak_active = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._shutdown = False
+        self._seq = itertools.count(1)
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    def resize(self, max_workers: int) -> None:
+        """Change the worker limit; extra workers retire as they go idle."""
+        with self._cond:
+            self._max_workers = max(1, int(max_workers))
+            self._spawn_locked()
+            self._cond.notify_all()
+
+    def _full_locked(self) -> bool:
+        return bool(self._max_queue) and len(self._queue) >= self._max_queue
+
+    def has_capacity(self) -> bool:
+        """True when a new submission would start right away."""
+        with self._cond:
+            return (
+                not self._shutdown
+                and self._active + len(self._queue) < self._max_workers
+            )
+
+    def submit(self, fn: Callable[..., Any], *args: Any, wait_s: float = 0.0) -> Future:
+        """Queue ``fn(*args)`` and return its future.
+
+        Raises PoolSaturated when the queue stays full for ``wait_s`` seconds
+        and RuntimeError after shutdown.
+        """
+        future: Future = Future()
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError(f"{self.name} pool is shut down")
+            if self._full_locked() and wait_s > 0:
+                self._cond.wait_for(
+                    lambda: self._shutdown or not self._full_locked(), timeout=wait_s
+                )
+                if self._shutdown:
+                    raise RuntimeError(f"{self.name} pool is shut down")
+            if self._full_locked():
+                self._rejected += 1
+                raise PoolSaturated(
+                    f"{self.name} pool queue is full ({self._max_queue} waiting)"
+                )
+            self._queue.append((future, fn, args))
+            self._submitted += 1
+            self._spawn_locked()
+            self._cond.notify()
+        return future
+
+    def _spawn_locked(self) -> None:
+        while (
+            len(self._queue) > self._idle
+            and len(self._threads) < self._max_workers
+            and not self._shutdown
+        ):
+            thread = threading.Thread(
+                target=self._work,
+                name=f"{self.name}-worker-{next(self._seq)}",
+                daemon=True,
+            )
+            self._threads.add(thread)
+            # Counted idle until it picks up work so we do not overspawn.
+            self._idle += 1
+            thread.start()
+
+    def _work(self) -> None:
+        me = threading.current_thread()
+        while True:
+            with self._cond:
+                deadline = time.monotonic() + self._idle_timeout_s
+                while not self._queue and not self._shutdown:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                self._idle -= 1
+                if (
+                    not self._queue
+                    or self._shutdown
+                    or len(self._threads) > self._max_workers
+                ):
+                    self._threads.discard(me)
+                    return
+                future, fn, args = self._queue.popleft()
+                self._active += 1
+                self._peak_active = max(self._peak_active, self._active)
+                # Wake submitters waiting for queue room.
+                self._cond.notify_all()
+
+            run = future.set_running_or_notify_cancel()
+            result: Any = None
+            error: BaseException | None = None
+            if run:
+                try:
+                    result = fn(*args)
+                except BaseException as exc:
+                    # Thread workers used to print these via excepthook.
+                    logger.exception("%s pool job failed", self.name)
+                    error = exc
+
+            # Free the slot before resolving the future so done callbacks
+            # already see the capacity.
+            with self._cond:
+                self._active -= 1
+                self._idle += 1
+                self._completed += 1
+                if error is not None:
+                    self._failed += 1
+                self._cond.notify_all()
+            if run:
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+
+    def stats(self) -> dict[str, int]:
+        with self._cond:
+            return {
+                "max_workers": self._max_workers,
+                "max_queue": self._max_queue,
+                "threads": len(self._threads),
+                "active": self._active,
+                "peak_active": self._peak_active,
+                "queued": len(self._queue),
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self, *, timeout_s: float = 0.0, cancel_pending: bool = True) -> bool:
+        """Stop accepting work and wait up to ``timeout_s`` for active jobs.
+
+        Returns True when nothing is still running.
+        """
+        with self._cond:
+            self._shutdown = True
+            if cancel_pending:
+                while self._queue:
+                    future, _fn, _args = self._queue.popleft()
+                    future.cancel()
+            self._cond.notify_all()
+            if timeout_s > 0:
+                self._cond.wait_for(
+                    lambda: self._active == 0 and not self._queue, timeout=timeout_s
+                )
+            return self._active == 0 and not self._queue
+
+
+class ExecutorService:
+    """The app's named worker pools."""
+
+    def __init__(self, sizes: dict[str, tuple[int, int]] | None = None) -> None:
+        self._pools: dict[str, WorkerPool] = {}
+        for name, (max_workers, max_queue) in {
+            **DEFAULT_POOL_SIZES,
+            **(sizes or {}),
+        }.items():
+            self._pools[name] = WorkerPool(
+                name, max_workers=max_workers, max_queue=max_queue
+            )
+
+    def pool(self, name: str) -> WorkerPool:
+        return self._pools[name]
+
+    def submit(
+        self, pool: str, fn: Callable[..., Any], *args: Any, wait_s: float = 0.0
+    ) -> Future:
+        return self._pools[pool].submit(fn, *args, wait_s=wait_s)
+
+    def try_submit(
+        self, pool: str, fn: Callable[..., Any], *args: Any
+    ) -> Future | None:
+        """Like ``submit`` but returns None (and logs) instead of raising."""
+        try:
+            return self._pools[pool].submit(fn, *args)
+        except (PoolSaturated, RuntimeError) as exc:
+            logger.warning(
+                "dropped %s job %s: %s", pool, getattr(fn, "__name__", fn), exc
+            )
+            return None
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        return {name: pool.stats() for name, pool in self._pools.items()}
+
+    def shutdown(
+        self,
+        *,
+        timeout_s: float = 5.0,
+        wait_for: tuple[str, ...] = (POOL_FINALIZE, POOL_GIT, POOL_IO),
+    ) -> bool:
+        """Cancel queued work everywhere and wait for active jobs in ``wait_for``.
+
+        ``timeout_s`` is shared by the waited pools. Agent runs are not waited
+        for by default; their containers keep going and recovery picks them up
+        on the next start. Anything still running is left to its daemon thread.
+        """
+        deadline = time.monotonic() + max(0.0, float(timeout_s))
+        for pool in self._pools.values():
+            pool.shutdown(timeout_s=0.0)
+        idle = True
+        for name in wait_for:
+            remaining = deadline - time.monotonic()
+            idle = self._pools[name].shutdown(timeout_s=max(0.0, remaining)) and idle
+        return idle
@@ -0,0 +1,294 @@
+"""
+Incremental failure-signal detection for streaming agent logs.
+
+Every signal the supervisor cares about (failure categories, error types and
+the agent's rate-limit patterns) is compiled into one combined prefilter
+regex per agent. Log lines are fed as they arrive; a line only pays for the
+individual patterns when the prefilter matches. The detector keeps hit
+counters, the recent hits needed for tail-windowed checks, and a bounded tail
+of raw lines, so classification at exit needs no rescan of the run.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import Counter
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+from typing import Iterable
+
+from agents_runner.core.agent.rate_limit import RateLimitDetector
+from agents_runner.execution.supervisor_types import ErrorType
+from agents_runner.execution.supervisor_types import FailureCategory
+from agents_runner.execution.supervisor_types import FailureReason
+
+DEFAULT_TAIL_LINES = 200
+
+# Tail windows (in lines) used by classify_error and rate-limit detection.
+RATE_LIMIT_WINDOW = 100
+ERROR_WINDOW = 50
+
+# (category, pattern, label) in priority order within each category.
+FAILURE_SIGNALS: tuple[tuple[FailureCategory, str, str], ...] = (
+    ("rate_limit", re.escape("429"), "contains: 429"),
+    ("rate_limit", re.escape("rate limit"), "contains: rate limit"),
+    ("rate_limit", re.escape("quota"), "contains: quota"),
+    (
+        "rate_limit",
+        re.escape("exceeded your copilot token usage"),
+        "contains: exceeded your Copilot token usage",
+    ),
+    ("rate_limit", re.escape("capierror: 429"), "contains: CAPIError: 429"),
+    ("auth", r"authentication.?failed", "authentication failed"),
+    ("auth", r"invalid.?api.?key", "invalid api key"),
+    ("auth", r"unauthorized", "unauthorized"),
+    ("auth", r"forbidden", "forbidden"),
+    ("auth", r"invalid.?credentials", "invalid credentials"),
+    ("tool_error", r"command.?not.?found", "command not found"),
+    ("tool_error", r"no such file", "no such file"),
+    ("tool_error", r"not installed", "not installed"),
+    ("network", r"timed? out", "timeout"),
+    ("network", r"connection (refused|reset)", "connection reset/refused"),
+    ("network", r"temporary failure", "temporary failure"),
+    ("network", r"network is unreachable", "network unreachable"),
+    ("network", r"dns", "dns"),
+    ("network", r"tls|ssl", "tls/ssl"),
+)
+
+# (error type, pattern) checked over the last RATE_LIMIT_WINDOW/ERROR_WINDOW lines.
+ERROR_SIGNALS: tuple[tuple[ErrorType, str], ...] = (
+    (ErrorType.RATE_LIMIT, r"rate.?limit"),
+    (ErrorType.RATE_LIMIT, r"429"),
+    (ErrorType.RATE_LIMIT, r"too.?many.?requests"),
+    (ErrorType.RATE_LIMIT, r"quota.?exceeded"),
+    (ErrorType.RATE_LIMIT, r"retry.?after"),
+    (ErrorType.FATAL, r"authentication.?failed"),
+    (ErrorType.FATAL, r"invalid.?api.?key"),
+    (ErrorType.FATAL, r"permission.?denied"),
+    (ErrorType.FATAL, r"unauthorized"),
+    (ErrorType.FATAL, r"forbidden"),
+    (ErrorType.FATAL, r"access.?denied"),
+    (ErrorType.FATAL, r"invalid.?credentials"),
+    (ErrorType.AGENT_FAILURE, r"command.?not.?found"),
+    (ErrorType.AGENT_FAILURE, r"no such file.*codex"),
+    (ErrorType.AGENT_FAILURE, r"no such file.*claude"),
+    (ErrorType.AGENT_FAILURE, r"no such file.*copilot"),
+    (ErrorType.AGENT_FAILURE, r"no such file.*gemini"),
+    (ErrorType.AGENT_FAILURE, r"bash:.*not found"),
+    (ErrorType.AGENT_FAILURE, r"agent.?not.?available"),
+    (ErrorType.AGENT_FAILURE, r"agent.?not.?installed"),
+)
+
+_FAILURE_MESSAGES: dict[str, str] = {
+    "rate_limit": "rate limit or quota exhaustion detected",
+    "auth": "authentication/authorization failure detected",
+    "tool_error": "agent/tool execution failure detected",
+    "network": "network failure detected",
+}
+
+
+def _failure(category: FailureCategory, matched: list[str]) -> FailureReason:
+    return FailureReason(
+        failure_category=category,
+        failure_message=_FAILURE_MESSAGES[category],
+        matched_signals=tuple(matched),
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class _LineHits:
+    failure_labels: tuple[str, ...]
+    error_types: frozenset[ErrorType]
+    # First matching rate-limit pattern as its cooldown in seconds, if any.
+    rate_limit_cooldown: int | None
+
+
+@dataclass(frozen=True, slots=True)
+class _SignalSet:
+    prefilter: re.Pattern[str]
+    failure_patterns: tuple[tuple[re.Pattern[str], str], ...]
+    error_patterns: tuple[tuple[re.Pattern[str], ErrorType], ...]
+    rate_limit_patterns: tuple[tuple[re.Pattern[str], int | None], ...]
+
+    def scan(self, line_lower: str) -> _LineHits | None:
+        if not self.prefilter.search(line_lower):
+            return None
+        failure_labels = tuple(
+            label
+            for pattern, label in self.failure_patterns
+            if pattern.search(line_lower)
+        )
+        error_types = frozenset(
+            error_type
+            for pattern, error_type in self.error_patterns
+            if pattern.search(line_lower)
+        )
+        cooldown: int | None = None
+        for pattern, default_cooldown in self.rate_limit_patterns:
+            match = pattern.search(line_lower)
+            if not match:
+                continue
+            if default_cooldown is not None:
+                cooldown = default_cooldown
+            else:
+                # Pattern includes duration extraction
+                try:
+                    cooldown = int(match.group(1))
+                except (IndexError, ValueError):
+                    cooldown = 3600  # Fallback to 1 hour
+            break
+        if not failure_labels and not error_types and cooldown is None:
+            return None
+        return _LineHits(failure_labels, error_types, cooldown)
+
+
+@lru_cache(maxsize=None)
+def _signal_set(agent_cli: str) -> _SignalSet:
+    rate_limit = tuple(RateLimitDetector.PATTERNS.get(agent_cli, []))
+    sources = [pattern for _, pattern, _ in FAILURE_SIGNALS]
+    sources.extend(pattern for _, pattern in ERROR_SIGNALS)
+    sources.extend(pattern for pattern, _ in rate_limit)
+    unique = list(dict.fromkeys(sources))
+    return _SignalSet(
+        prefilter=re.compile("|".join(f"(?:{pattern})" for pattern in unique)),
+        failure_patterns=tuple(
+            (re.compile(pattern), label) for _, pattern, label in FAILURE_SIGNALS
+        ),
+        error_patterns=tuple(
+            (re.compile(pattern), error_type) for error_type, pattern in ERROR_SIGNALS
+        ),
+        rate_limit_patterns=tuple(
+            (re.compile(pattern), cooldown) for pattern, cooldown in rate_limit
+        ),
+    )
+
+
+class FailureSignalDetector:
+    """Scans log lines as they stream in and classifies the run at exit.
+
+    Results match ``classify_failure_reason``, ``classify_error`` and
+    ``RateLimitDetector.detect`` run over the full log list.
+    """
+
+    def __init__(self, agent_cli: str = "", *, tail_lines: int = DEFAULT_TAIL_LINES):
+        self._signals = _signal_set(str(agent_cli or "").strip().lower())
+        self._tail: deque[str] = deque(maxlen=max(RATE_LIMIT_WINDOW, int(tail_lines)))
+        self._lines_seen = 0
+        self._label_hits: Counter[str] = Counter()
+        # (line number, hits) for lines inside the largest tail window.
+        self._recent: deque[tuple[int, _LineHits]] = deque()
+
+    @property
+    def lines_seen(self) -> int:
+        return self._lines_seen
+
+    def feed(self, line: str) -> None:
+        line = str(line)
+        self._tail.append(line)
+        self._lines_seen += 1
+        hits = self._signals.scan(line.lower())
+        if hits is not None:
+            self._label_hits.update(hits.failure_labels)
+            self._recent.append((self._lines_seen, hits))
+        oldest = self._lines_seen - RATE_LIMIT_WINDOW
+        while self._recent and self._recent[0][0] <= oldest:
+            self._recent.popleft()
+
+    def feed_lines(self, lines: Iterable[str]) -> None:
+        for line in lines:
+            self.feed(line)
+
+    def tail(self) -> list[str]:
+        """Return the most recent raw lines (bounded)."""
+        return list(self._tail)
+
+    def hit_counts(self) -> dict[str, int]:
+        """Return how many lines matched each failure signal label."""
+        return dict(self._label_hits)
+
+    def _recent_hits(self, window: int) -> Iterable[_LineHits]:
+        oldest = self._lines_seen - window
+        return (hits for line_no, hits in self._recent if line_no > oldest)
+
+    def classify_failure(
+        self,
+        *,
+        exit_code: int,
+        container_state: dict[str, Any],
+        exit_summary: str | None,
+    ) -> FailureReason:
+        """Classify failure reason from the streamed logs plus the exit summary."""
+        labels = set(self._label_hits)
+        for line in str(exit_summary or "").splitlines():
+            hits = self._signals.scan(line.lower())
+            if hits is not None:
+                labels.update(hits.failure_labels)
+
+        by_category: dict[FailureCategory, list[str]] = {}
+        for category, _pattern, label in FAILURE_SIGNALS:
+            if label in labels:
+                by_category.setdefault(category, []).append(label)
+
+        rate_hits = by_category.get("rate_limit", [])
+        if rate_hits:
+            return _failure("rate_limit", rate_hits)
+
+        # Container crash
+        if container_state.get("OOMKilled", False) or exit_code == 137:
+            return FailureReason(
+                failure_category="tool_error",
+                failure_message="container crashed (OOMKilled or SIGKILL)",
+                matched_signals=("container_crash",),
+            )
+
+        tool_hits = list(by_category.get("tool_error", []))
+        if exit_code in {126, 127}:
+            tool_hits.append(f"exit_code={exit_code}")
+        for category, matched in (
+            ("auth", by_category.get("auth", [])),
+            ("tool_error", tool_hits),
+            ("network", by_category.get("network", [])),
+        ):
+            if matched:
+                return _failure(category, matched)
+
+        return FailureReason(
+            failure_category="unknown",
+            failure_message="unknown failure",
+            matched_signals=(),
+        )
+
+    def classify_error(
+        self, *, exit_code: int, container_state: dict[str, Any]
+    ) -> ErrorType:
+        """Classify execution error to determine retry/fallback strategy."""
+        # Container crash (highest priority)
+        if container_state.get("OOMKilled", False) or exit_code == 137:
+            return ErrorType.CONTAINER_CRASH
+
+        for error_type, window in (
+            (ErrorType.RATE_LIMIT, RATE_LIMIT_WINDOW),
+            (ErrorType.FATAL, ERROR_WINDOW),
+            (ErrorType.AGENT_FAILURE, ERROR_WINDOW),
+        ):
+            if any(
+                error_type in hits.error_types for hits in self._recent_hits(window)
+            ):
+                return error_type
+
+        # Exit code analysis
+        if exit_code in {126, 127}:  # Command not executable / not found
+            return ErrorType.AGENT_FAILURE
+        return ErrorType.RETRYABLE
+
+    def rate_limit(self, *, exit_code: int) -> tuple[bool, int]:
+        """Return (is_rate_limited, cooldown_seconds) for the agent's patterns."""
+        # Check exit code (429 = Too Many Requests in HTTP)
+        if exit_code == 429:
+            return True, 3600  # Default 1 hour for HTTP 429
+        for hits in self._recent_hits(RATE_LIMIT_WINDOW):
+            if hits.rate_limit_cooldown is not None:
+                return True, hits.rate_limit_cooldown
+        return False, 0
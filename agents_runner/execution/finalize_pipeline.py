@@ -0,0 +1,243 @@
+"""
+Staged pipeline for finalizing finished tasks.
+
+Finalization used to run artifact collection, commit, push, PR creation and
+workspace cleanup back to back on one ``finalize`` worker, so a burst of
+finished tasks queued behind each other's slowest step. ``FinalizePipeline``
+gives every stage its own bounded ``WorkerPool``: a task moves to the next
+stage's pool when its current step returns, so one task can be pushing while
+another is still collecting artifacts and a third is opening its PR.
+
+A job is an ordered list of ``PipelineStep``. A step that returns ``False``
+or raises ends the job early, except for later steps marked ``always``
+(snapshot merge, cleanup), which run regardless so workspaces are not leaked
+or left mounted. The job reports the first error raised. Per-stage counters
+and busy time are kept for throughput reporting.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any
+
+from .executor import WorkerPool
+
+logger = logging.getLogger(__name__)
+
+STAGE_ARTIFACTS = "artifacts"
+STAGE_COMMIT = "commit"
+STAGE_PUSH = "push"
+STAGE_PR = "pr"
+STAGE_CLEANUP = "cleanup"
+
+STAGES: tuple[str, ...] = (
+    STAGE_ARTIFACTS,
+    STAGE_COMMIT,
+    STAGE_PUSH,
+    STAGE_PR,
+    STAGE_CLEANUP,
+)
+
+# Workers per stage. Push workers mostly wait on a shared batched push, so
+# that stage gets more of them than the CPU/disk-bound ones.
+DEFAULT_STAGE_WORKERS: dict[str, int] = {
+    STAGE_ARTIFACTS: 4,
+    STAGE_COMMIT: 4,
+    STAGE_PUSH: 8,
+    STAGE_PR: 4,
+    STAGE_CLEANUP: 4,
+}
+
+# Only the entry stage has a bounded queue: once a job is admitted it must be
+# able to reach cleanup.
+DEFAULT_MAX_QUEUE = 256
+
+
+@dataclass(frozen=True, slots=True)
+class PipelineStep:
+    stage: str
+    fn: Callable[[], Any]
+    always: bool = False
+
+
+class _StageMetrics:
+    __slots__ = ("completed", "failed", "busy_s", "first_start", "last_end")
+
+    def __init__(self) -> None:
+        self.completed = 0
+        self.failed = 0
+        self.busy_s = 0.0
+        self.first_start: float | None = None
+        self.last_end: float | None = None
+
+
+class _Job:
+    __slots__ = ("job_id", "steps", "on_finish", "future", "error", "stopped")
+
+    def __init__(
+        self,
+        job_id: str,
+        steps: list[PipelineStep],
+        on_finish: Callable[[BaseException | None], None] | None,
+    ) -> None:
+        self.job_id = job_id
+        self.steps = steps
+        self.on_finish = on_finish
+        self.future: Future = Future()
+        self.error: BaseException | None = None
+        self.stopped = False
+
+
+class FinalizePipeline:
+    """One bounded worker pool per finalization stage."""
+
+    def __init__(
+        self,
+        workers: dict[str, int] | None = None,
+        *,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+    ) -> None:
+        sizes = {**DEFAULT_STAGE_WORKERS, **(workers or {})}
+        self._pools: dict[str, WorkerPool] = {}
+        for stage in STAGES:
+            self._pools[stage] = WorkerPool(
+                f"finalize-{stage}",
+                max_workers=sizes[stage],
+                max_queue=max_queue if stage == STAGES[0] else 0,
+            )
+        self._lock = threading.Lock()
+        self._metrics: dict[str, _StageMetrics] = {s: _StageMetrics() for s in STAGES}
+
+    def pool(self, stage: str) -> WorkerPool:
+        return self._pools[stage]
+
+    def submit(
+        self,
+        job_id: str,
+        steps: list[PipelineStep],
+        *,
+        on_finish: Callable[[BaseException | None], None] | None = None,
+    ) -> Future:
+        """Start a job; the future resolves after its last step.
+
+        ``on_finish`` runs (with the first error, if any) before the future
+        resolves. Raises PoolSaturated when the entry stage's queue is full.
+        """
+        job = _Job(job_id, list(steps), on_finish)
+        if not job.steps:
+            self._finish(job)
+            return job.future
+        first = job.steps[0]
+        self._pools[first.stage].submit(self._run_step, job, 0)
+        return job.future
+
+    def _run_step(self, job: _Job, index: int) -> None:
+        step = job.steps[index]
+        start = time.monotonic()
+        ok = True
+        try:
+            if step.fn() is False:
+                job.stopped = True
+        except Exception as exc:
+            ok = False
+            logger.exception("%s: %s step failed", job.job_id, step.stage)
+            if job.error is None:
+                job.error = exc
+            job.stopped = True
+        self._record(step.stage, start, time.monotonic(), ok)
+        self._advance(job, index + 1)
+
+    def _advance(self, job: _Job, index: int) -> None:
+        while index < len(job.steps):
+            step = job.steps[index]
+            if job.stopped and not step.always:
+                index += 1
+                continue
+            try:
+                self._pools[step.stage].submit(self._run_step, job, index)
+            except RuntimeError as exc:
+                # Shut down under us; report the job as failed.
+                if job.error is None:
+                    job.error = exc
+                break
+            return
+        self._finish(job)
+
+    def _finish(self, job: _Job) -> None:
+        if job.on_finish is not None:
+            try:
+                job.on_finish(job.error)
+            except Exception:
+                logger.exception("%s: finalization callback failed", job.job_id)
+        if job.error is not None:
+            job.future.set_exception(job.error)
+        else:
+            job.future.set_result(None)
+
+    def _record(self, stage: str, start: float, end: float, ok: bool) -> None:
+        with self._lock:
+            metrics = self._metrics[stage]
+            metrics.completed += 1
+            if not ok:
+                metrics.failed += 1
+            metrics.busy_s += end - start
+            if metrics.first_start is None:
+                metrics.first_start = start
+            metrics.last_end = end
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Per-stage pool load plus completed steps, busy time and throughput.
+
+        ``per_min`` is completed steps per minute of wall time between the
+        stage's first start and its latest finish.
+        """
+        out: dict[str, dict[str, float]] = {}
+        for stage in STAGES:
+            pool = self._pools[stage].stats()
+            with self._lock:
+                metrics = self._metrics[stage]
+                span_s = (
+                    (metrics.last_end or 0.0) - metrics.first_start
+                    if metrics.first_start is not None
+                    else 0.0
+                )
+                done = metrics.completed
+                out[stage] = {
+                    "workers": pool["max_workers"],
+                    "active": pool["active"],
+                    "queued": pool["queued"],
+                    "completed": done,
+                    "failed": metrics.failed,
+                    "busy_s": metrics.busy_s,
+                    "avg_s": metrics.busy_s / done if done else 0.0,
+                    "per_min": done * 60.0 / span_s if span_s > 0 else 0.0,
+                }
+        return out
+
+    def summary(self) -> str:
+        """One line, e.g. ``artifacts 3 done (avg 1.2s, 40.0/min), push 1 active``."""
+        parts: list[str] = []
+        for stage, item in self.stats().items():
+            text = f"{stage} {int(item['completed'])} done"
+            if item["completed"]:
+                text += f" (avg {item['avg_s']:.1f}s, {item['per_min']:.1f}/min)"
+            if item["active"] or item["queued"]:
+                text += f", {int(item['active'])} active/{int(item['queued'])} queued"
+            parts.append(text)
+        return "; ".join(parts)
+
+    def shutdown(self, *, timeout_s: float = 0.0) -> bool:
+        """Stop all stages; waits up to ``timeout_s`` (shared) for active steps."""
+        deadline = time.monotonic() + max(0.0, float(timeout_s))
+        for pool in self._pools.values():
+            pool.shutdown(timeout_s=0.0)
+        idle = True
+        for pool in self._pools.values():
+            remaining = deadline - time.monotonic()
+            idle = pool.shutdown(timeout_s=max(0.0, remaining)) and idle
+        return idle
@@ -0,0 +1,495 @@
+"""
+Launch preparation for agent tasks.
+
+Turns an environment plus app settings into a ``TaskLaunchContext`` (the
+part shared by every task started from that environment in one go) and then
+fills in a task's runner config and prompt. Free of Qt so the main window
+and the headless runner build tasks the same way.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import shlex
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import Callable
+
+from agents_runner.agent_cli import resolve_agent_config_dir
+from agents_runner.docker.config import DockerRunnerConfig
+from agents_runner.docker.resources import ContainerResources
+from agents_runner.docker.resources import parse_resource_profile
+from agents_runner.environments import WORKSPACE_CLONED
+from agents_runner.environments import WORKSPACE_MOUNTED
+from agents_runner.environments import Environment
+from agents_runner.environments.git_operations import get_git_info
+from agents_runner.environments.model import AgentInstance
+from agents_runner.environments.model import AgentSelection
+from agents_runner.gh.gh_cli import is_gh_available
+from agents_runner.gh.repo_clone import clone_options_for_environment
+from agents_runner.log_format import format_log
+from agents_runner.pr_metadata import GitHubContext
+from agents_runner.pr_metadata import ensure_github_context_file
+from agents_runner.pr_metadata import ensure_pr_metadata_file
+from agents_runner.pr_metadata import github_context_host_path
+from agents_runner.pr_metadata import github_context_prompt_instructions
+from agents_runner.pr_metadata import pr_metadata_container_path
+from agents_runner.pr_metadata import pr_metadata_host_path
+from agents_runner.pr_metadata import pr_metadata_prompt_instructions
+from agents_runner.prompt_sanitizer import sanitize_prompt
+from agents_runner.ui.constants import PIXELARCH_AGENT_CONTEXT_SUFFIX
+from agents_runner.ui.constants import PIXELARCH_EMERALD_IMAGE
+from agents_runner.ui.constants import PIXELARCH_GIT_CONTEXT_SUFFIX
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TaskLaunchContext:
+    """Environment-level launch state shared by every task of one submission."""
+
+    env_id: str
+    env: Environment | None
+    host_codex: str
+    desired_base: str
+    interactive: bool
+    workspace_type: str
+    image: str
+    agent_cli_args: list[str]
+    resolved_agent_selection: AgentSelection | None
+    settings_preflight_script: str | None
+    environment_preflight_script: str | None
+    headless_desktop_enabled: bool
+    desktop_cache_enabled: bool
+    container_caching_enabled: bool
+    cached_preflight_script: str
+    prompt_suffixes: list[str]
+    env_prompt_count: int
+    env_vars: dict[str, str]
+    extra_mounts: list[str]
+    ports: list[str]
+    use_host_gh: bool
+    gh_repo: str | None
+    resources: ContainerResources
+    git_folder: str = ""
+    git_info: Any = None
+    git_error: str = ""
+    checked_config_dirs: set[tuple[str, str]] = field(default_factory=set)
+
+
+def pinned_agent_missing(env: Environment | None) -> bool:
+    """True when ``env`` is in pinned mode but its pinned agent is not listed."""
+    selection = env.agent_selection if env else None
+    if not selection:
+        return False
+    if str(selection.selection_mode or "").strip().lower() != "pinned":
+        return False
+    pinned_id = str(selection.pinned_agent_id or "").strip()
+    pinned_lower = pinned_id.lower()
+    return not any(
+        str(inst.agent_id or "").strip() == pinned_id
+        or str(inst.agent_id or "").strip().lower() == pinned_lower
+        for inst in selection.agents or []
+    )
+
+
+def resolve_agent_selection(
+    env: Environment | None, settings: dict[str, Any]
+) -> AgentSelection | None:
+    """Copy ``env``'s agent selection with every config dir resolved.
+
+    Pinned mode keeps only the pinned agent and drops fallbacks.
+    """
+    if not (env and env.agent_selection and env.agent_selection.agents):
+        return None
+    selection = env.agent_selection
+    selection_mode = str(selection.selection_mode or "round-robin").strip()
+    pinned_agent_id = str(selection.pinned_agent_id or "").strip()
+    pinned_lower = pinned_agent_id.lower()
+    resolved_agents: list[AgentInstance] = []
+    for inst in list(selection.agents or []):
+        inst_id = str(inst.agent_id or "").strip()
+        if (
+            selection_mode.lower() == "pinned"
+            and pinned_agent_id
+            and inst_id != pinned_agent_id
+            and inst_id.lower() != pinned_lower
+        ):
+            continue
+        inst_cli = str(inst.agent_cli or "").strip()
+        inst_dir = os.path.expanduser(str(inst.config_dir or "").strip())
+        if not inst_dir:
+            inst_dir = resolve_agent_config_dir(inst_cli, env=env, settings=settings)
+        resolved_agents.append(
+            AgentInstance(
+                agent_id=inst_id or inst_cli,
+                agent_cli=inst_cli,
+                config_dir=inst_dir,
+                cli_flags=str(inst.cli_flags or "").strip(),
+            )
+        )
+    return AgentSelection(
+        agents=resolved_agents,
+        selection_mode=selection_mode,
+        agent_fallbacks=(
+            {}
+            if selection_mode.lower() == "pinned"
+            else dict(selection.agent_fallbacks or {})
+        ),
+        pinned_agent_id=pinned_agent_id,
+        race_width=int(selection.race_width or 2),
+        race_pick=str(selection.race_pick or "first"),
+    )
+
+
+def build_launch_context(
+    *,
+    env_id: str,
+    env: Environment | None,
+    settings: dict[str, Any],
+    host_codex: str = "",
+    base_branch: str = "",
+    interactive: bool = True,
+) -> TaskLaunchContext:
+    """Resolve everything a new task needs that only depends on its environment.
+
+    Raises ValueError when the environment's agent CLI flags do not parse.
+    """
+    agent_cli_args: list[str] = []
+    if env and env.agent_cli_args.strip():
+        agent_cli_args = shlex.split(env.agent_cli_args)
+
+    settings_preflight_script: str | None = None
+    if (
+        settings.get("preflight_enabled")
+        and str(settings.get("preflight_script") or "").strip()
+    ):
+        settings_preflight_script = str(settings.get("preflight_script") or "")
+
+    environment_preflight_script: str | None = None
+    if env and env.preflight_enabled and (env.preflight_script or "").strip():
+        environment_preflight_script = env.preflight_script
+
+    force_headless_desktop = bool(settings.get("headless_desktop_enabled") or False)
+    env_headless_desktop = (
+        bool(getattr(env, "headless_desktop_enabled", False)) if env else False
+    )
+    headless_desktop_enabled = bool(force_headless_desktop or env_headless_desktop)
+    desktop_cache_enabled = (
+        bool(getattr(env, "cache_desktop_build", False)) if env else False
+    )
+    # Only enable cache if desktop is enabled
+    desktop_cache_enabled = desktop_cache_enabled and headless_desktop_enabled
+
+    workspace_type = env.workspace_type if env else "none"
+
+    prompt_suffixes: list[str] = []
+    if bool(settings.get("append_pixelarch_context") or False):
+        prompt_suffixes.append(PIXELARCH_AGENT_CONTEXT_SUFFIX)
+    # Inject git context when cloned workspace is used
+    if workspace_type == WORKSPACE_CLONED:
+        prompt_suffixes.append(PIXELARCH_GIT_CONTEXT_SUFFIX)
+    enabled_env_prompts: list[str] = []
+    if env and bool(getattr(env, "prompts_unlocked", False)):
+        for p in getattr(env, "prompts", None) or []:
+            text = str(getattr(p, "text", "") or "").strip()
+            if not text or not bool(getattr(p, "enabled", False)):
+                continue
+            enabled_env_prompts.append(sanitize_prompt(text))
+    if enabled_env_prompts:
+        prompt_suffixes.append("\n\n" + "\n\n".join(enabled_env_prompts))
+
+    extra_mounts = list(env.extra_mounts) if env else []
+    # Add host cache mount if enabled in settings
+    if settings.get("mount_host_cache", False):
+        host_cache = os.path.expanduser("~/.cache")
+        container_cache = "/home/midori-ai/.cache"
+        extra_mounts.append(f"{host_cache}:{container_cache}:rw")
+
+    use_host_gh = bool(getattr(env, "gh_use_host_cli", True)) if env else True
+    use_host_gh = bool(use_host_gh and is_gh_available())
+
+    gh_repo: str | None = None
+    if workspace_type == WORKSPACE_CLONED and env:
+        gh_repo = str(env.workspace_target or "").strip() or None
+
+    ctx = TaskLaunchContext(
+        env_id=env_id,
+        env=env,
+        host_codex=os.path.expanduser(str(host_codex or "").strip()),
+        desired_base=str(base_branch or "").strip(),
+        interactive=interactive,
+        workspace_type=workspace_type,
+        image=PIXELARCH_EMERALD_IMAGE,
+        agent_cli_args=agent_cli_args,
+        resolved_agent_selection=resolve_agent_selection(env, settings),
+        settings_preflight_script=settings_preflight_script,
+        environment_preflight_script=environment_preflight_script,
+        headless_desktop_enabled=headless_desktop_enabled,
+        desktop_cache_enabled=desktop_cache_enabled,
+        container_caching_enabled=(
+            bool(getattr(env, "container_caching_enabled", False)) if env else False
+        ),
+        cached_preflight_script=(
+            str(getattr(env, "cached_preflight_script", "") or "").strip()
+            if env
+            else ""
+        ),
+        prompt_suffixes=prompt_suffixes,
+        env_prompt_count=len(enabled_env_prompts),
+        env_vars=dict(env.env_vars) if env else {},
+        extra_mounts=extra_mounts,
+        ports=list(getattr(env, "ports", []) or []) if env else [],
+        use_host_gh=use_host_gh,
+        gh_repo=gh_repo,
+        resources=(
+            parse_resource_profile(env.resource_profile)
+            if env
+            else ContainerResources()
+        ),
+    )
+    _detect_mounted_git(ctx)
+    return ctx
+
+
+def _detect_mounted_git(ctx: TaskLaunchContext) -> None:
+    """Look up the mounted folder's git info once for the whole submission."""
+    env = ctx.env
+    if not env or not bool(getattr(env, "gh_context_enabled", False)):
+        return
+    if env.workspace_type != WORKSPACE_MOUNTED:
+        return
+    folder_path = str(env.workspace_target or "").strip()
+    if not folder_path:
+        return
+    ctx.git_folder = folder_path
+    try:
+        ctx.git_info = get_git_info(folder_path)
+    except Exception as exc:
+        logger.warning(
+            format_log("gh", "context", "WARN", f"git detection failed: {exc}")
+        )
+        ctx.git_error = str(exc)
+
+
+def prepare_task_launch(
+    ctx: TaskLaunchContext,
+    task: Any,
+    *,
+    data_dir: str,
+    on_log: Callable[[str], None],
+    extra_mounts: list[str] | None = None,
+    pull_image: bool = True,
+) -> None:
+    """Fill in ``task``'s runner config, runner prompt and agent selection.
+
+    ``task`` must already have its id, prompt, agent, config dir and workdir.
+    ``extra_mounts`` are added on top of the environment's mounts (e.g.
+    cross-agent config dirs). Also writes the task's GitHub context and PR
+    metadata files when the environment asks for them.
+    """
+    env = ctx.env
+    task_id = task.task_id
+    task.gh_use_host_cli = ctx.use_host_gh
+
+    runner_prompt = task.prompt
+    for suffix in ctx.prompt_suffixes:
+        runner_prompt = f"{runner_prompt.rstrip()}{suffix}"
+    if ctx.env_prompt_count:
+        on_log(
+            format_log(
+                "env",
+                "prompts",
+                "INFO",
+                f"appended {ctx.env_prompt_count} environment prompt(s) (non-interactive)",
+            )
+        )
+    extra_mounts_for_task = list(ctx.extra_mounts) + list(extra_mounts or [])
+
+    # GitHub context preparation
+    # For cloned: Create empty file before clone, populate after clone completes
+    # For mounted: Detect git and populate immediately if it's a git repo
+    # For non-git: Skip gracefully (never fail the task)
+    if env and bool(getattr(env, "gh_context_enabled", False)):
+        should_generate = False
+        github_context = None
+
+        if env.workspace_type == WORKSPACE_MOUNTED:
+            # Mounted: git detection ran once in build_launch_context
+            folder_path = ctx.git_folder
+            git_info = ctx.git_info
+            if ctx.git_error:
+                on_log(
+                    format_log(
+                        "gh",
+                        "context",
+                        "WARN",
+                        f"git detection failed: {ctx.git_error}; continuing without context",
+                    )
+                )
+            elif git_info:
+                should_generate = True
+                github_context = GitHubContext(
+                    repo_url=git_info.repo_url,
+                    repo_owner=git_info.repo_owner,
+                    repo_name=git_info.repo_name,
+                    base_branch=git_info.branch,
+                    task_branch=None,
+                    head_commit=git_info.commit_sha,
+                )
+                # Populate task.git immediately for mounted environments
+                task.git = {
+                    "repo_url": git_info.repo_url,
+                    "repo_owner": git_info.repo_owner,
+                    "repo_name": git_info.repo_name,
+                    "base_branch": git_info.branch,
+                    "target_branch": None,
+                    "head_commit": git_info.commit_sha,
+                }
+                # Also set gh_repo_root for mounted tasks
+                if folder_path and os.path.isdir(folder_path):
+                    task.gh_repo_root = folder_path
+                on_log(
+                    format_log(
+                        "gh",
+                        "context",
+                        "INFO",
+                        f"detected git repo: {git_info.repo_url}",
+                    )
+                )
+            elif folder_path:
+                on_log(
+                    format_log(
+                        "gh",
+                        "context",
+                        "INFO",
+                        "folder is not a git repository; skipping context",
+                    )
+                )
+        elif env.workspace_type == WORKSPACE_CLONED:
+            # Cloned: Will populate after clone
+            should_generate = True
+
+        # Create GitHub context file
+        if should_generate:
+            host_context_path = github_context_host_path(data_dir, task_id)
+            pr_host_path = pr_metadata_host_path(data_dir, task_id)
+            pr_container_path = pr_metadata_container_path(task_id)
+            try:
+                ensure_github_context_file(
+                    host_context_path,
+                    task_id=task_id,
+                    github_context=github_context,
+                )
+                ensure_pr_metadata_file(
+                    pr_host_path,
+                    task_id=task_id,
+                )
+            except Exception as exc:
+                logger.error(
+                    format_log(
+                        "gh",
+                        "context",
+                        "ERROR",
+                        f"failed to create GitHub context file: {exc}",
+                    )
+                )
+                on_log(
+                    format_log(
+                        "gh",
+                        "context",
+                        "ERROR",
+                        f"failed to create GitHub context file: {exc}; continuing without context",
+                    )
+                )
+            else:
+                task.gh_context_path = host_context_path
+                task.gh_pr_metadata_path = pr_host_path
+
+                # Only mount the PR title/body TOML into the container (agents edit this).
+                extra_mounts_for_task.append(f"{pr_host_path}:{pr_container_path}:rw")
+
+                # Provide read-only repo context inline; do not mount the repo metadata file.
+                if github_context is not None:
+                    repo_url = github_context.repo_url
+                    repo_owner = github_context.repo_owner or ""
+                    repo_name = github_context.repo_name or ""
+                    base_branch = github_context.base_branch
+                    task_branch = github_context.task_branch or ""
+                    head_commit = github_context.head_commit
+                else:
+                    # For cloned repos, we may not know branch/commit until after clone.
+                    repo_url = str(getattr(env, "workspace_target", "") or "").strip()
+                    repo_owner = ""
+                    repo_name = ""
+                    base_branch = ctx.desired_base or "auto"
+                    task_branch = "(already created by runner)"
+                    head_commit = "(set after clone)"
+
+                runner_prompt = (
+                    f"{runner_prompt}"
+                    f"{github_context_prompt_instructions(repo_url=repo_url, repo_owner=repo_owner, repo_name=repo_name, base_branch=base_branch, task_branch=task_branch, head_commit=head_commit)}"
+                    f"{pr_metadata_prompt_instructions(pr_container_path)}"
+                )
+                on_log(
+                    format_log(
+                        "gh",
+                        "context",
+                        "INFO",
+                        "GitHub context enabled (host-only) and PR metadata file mounted",
+                    )
+                )
+                # Clarify two-phase process for cloned repo environments
+                if ctx.workspace_type == WORKSPACE_CLONED:
+                    on_log(
+                        format_log(
+                            "gh",
+                            "context",
+                            "INFO",
+                            "Repository metadata will be populated after clone completes",
+                        )
+                    )
+
+    # Get the host GitHub context path if it was created (regardless of mode)
+    gh_context_file = getattr(task, "gh_context_path", None) or None
+    snapshot_root = str(getattr(task, "workspace_snapshot", "") or "").strip()
+    snapshot_source = (
+        os.path.expanduser(str(env.workspace_target or "").strip())
+        if snapshot_root and env
+        else ""
+    )
+    task._runner_config = DockerRunnerConfig(
+        task_id=task_id,
+        image=ctx.image,
+        host_config_dir=task.host_config_dir,
+        host_workdir=task.host_workdir,
+        agent_cli=task.agent_cli,
+        environment_id=ctx.env_id,
+        auto_remove=True,
+        pull_before_run=pull_image,
+        settings_preflight_script=ctx.settings_preflight_script,
+        environment_preflight_script=ctx.environment_preflight_script,
+        headless_desktop_enabled=ctx.headless_desktop_enabled,
+        desktop_cache_enabled=ctx.desktop_cache_enabled,
+        container_caching_enabled=ctx.container_caching_enabled,
+        cached_preflight_script=ctx.cached_preflight_script or None,
+        env_vars=dict(ctx.env_vars),
+        extra_mounts=extra_mounts_for_task,
+        ports=list(ctx.ports),
+        agent_cli_args=list(ctx.agent_cli_args),
+        gh_repo=ctx.gh_repo,
+        gh_prefer_gh_cli=ctx.use_host_gh,
+        gh_recreate_if_needed=True,
+        gh_base_branch=ctx.desired_base or None,
+        gh_clone_options=clone_options_for_environment(ctx.env),
+        gh_context_file_path=gh_context_file,
+        resources=ctx.resources,
+        workspace_snapshot_source=snapshot_source or None,
+        workspace_snapshot_root=snapshot_root or None,
+    )
+    task._runner_prompt = runner_prompt
+    task._agent_selection = ctx.resolved_agent_selection or (
+        env.agent_selection if env else None
+    )
@@ -0,0 +1,277 @@
+"""
+Global task scheduler for queued agent runs.
+
+Queued tasks wait in one priority heap per environment. Each admission pass
+visits environments by head priority, with ties broken round-robin, and
+starts a queue head when its environment, the global limit and its agent CLI
+all have a free slot. Running counts are kept up to date as tasks start and
+stop, so a pass never rescans every task.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass
+from dataclasses import field
+
+UNLIMITED = -1
+
+
+@dataclass(order=True)
+class _QueueEntry:
+    sort_key: tuple[int, float, int]
+    task_id: str = field(compare=False)
+    env_id: str = field(compare=False)
+    agent_cli: str = field(compare=False)
+
+    @property
+    def priority(self) -> int:
+        return -self.sort_key[0]
+
+
+def _has_slot(limit: int, running: int) -> bool:
+    return limit < 0 or running < limit
+
+
+def parse_agent_limits(text: str) -> dict[str, int]:
+    """Parse ``"codex=2, claude=1"`` into a per-agent-CLI limit map."""
+    limits: dict[str, int] = {}
+    for part in str(text or "").replace("\n", ",").split(","):
+        name, sep, value = part.partition("=")
+        name = name.strip().lower()
+        if not sep or not name:
+            continue
+        try:
+            limits[name] = int(value.strip())
+        except ValueError:
+            continue
+    return limits
+
+
+def format_agent_limits(limits: dict[str, int]) -> str:
+    return ", ".join(f"{name}={int(value)}" for name, value in sorted(limits.items()))
+
+
+class TaskScheduler:
+    """Priority queue with per-environment, per-agent and global limits.
+
+    Not thread-safe; the UI thread owns it.
+    """
+
+    def __init__(
+        self,
+        *,
+        env_limit: Callable[[str], int] | None = None,
+        global_limit: int = UNLIMITED,
+        agent_limits: dict[str, int] | None = None,
+    ) -> None:
+        self._env_limit = env_limit or (lambda _env_id: UNLIMITED)
+        self._global_limit = int(global_limit)
+        self._agent_limits: dict[str, int] = {}
+        self.configure(agent_limits=agent_limits or {})
+
+        self._seq = itertools.count()
+        self._queues: dict[str, list[_QueueEntry]] = {}
+        self._queued: dict[str, _QueueEntry] = {}
+        # Environments with queued work, least recently served first.
+        self._env_turns: dict[str, int] = {}
+        self._turn = itertools.count()
+
+        self._running: dict[str, tuple[str, str]] = {}
+        self._running_by_env: Counter[str] = Counter()
+        self._running_by_agent: Counter[str] = Counter()
+
+    def configure(
+        self,
+        *,
+        global_limit: int | None = None,
+        agent_limits: dict[str, int] | None = None,
+    ) -> None:
+        if global_limit is not None:
+            self._global_limit = int(global_limit)
+        if agent_limits is not None:
+            self._agent_limits = {
+                str(name).strip().lower(): int(value)
+                for name, value in agent_limits.items()
+                if str(name).strip()
+            }
+
+    # Queue
+
+    def enqueue(
+        self,
+        task_id: str,
+        *,
+        env_id: str,
+        agent_cli: str = "",
+        priority: int = 0,
+        created_at_s: float = 0.0,
+    ) -> None:
+        task_id = str(task_id)
+        if task_id in self._running:
+            return
+        env_id = str(env_id or "")
+        entry = _QueueEntry(
+            sort_key=(-int(priority), float(created_at_s), next(self._seq)),
+            task_id=task_id,
+            env_id=env_id,
+            agent_cli=str(agent_cli or "").strip().lower(),
+        )
+        # Re-enqueueing replaces the old entry; the stale heap item is skipped.
+        self._queued[task_id] = entry
+        heapq.heappush(self._queues.setdefault(env_id, []), entry)
+        self._env_turns.setdefault(env_id, next(self._turn))
+
+    def discard(self, task_id: str) -> None:
+        """Drop a task from the queue if it is still waiting."""
+        self._queued.pop(str(task_id), None)
+
+    def is_queued(self, task_id: str) -> bool:
+        return str(task_id) in self._queued
+
+    def queued_count(self) -> int:
+        return len(self._queued)
+
+    def _head(self, env_id: str) -> _QueueEntry | None:
+        heap = self._queues.get(env_id)
+        while heap:
+            entry = heap[0]
+            if self._queued.get(entry.task_id) is entry:
+                return entry
+            heapq.heappop(heap)
+        self._queues.pop(env_id, None)
+        self._env_turns.pop(env_id, None)
+        return None
+
+    # Running counters
+
+    def mark_running(self, task_id: str, *, env_id: str, agent_cli: str = "") -> None:
+        task_id = str(task_id)
+        self._queued.pop(task_id, None)
+        if task_id in self._running:
+            return
+        env_id = str(env_id or "")
+        agent_cli = str(agent_cli or "").strip().lower()
+        self._running[task_id] = (env_id, agent_cli)
+        self._running_by_env[env_id] += 1
+        self._running_by_agent[agent_cli] += 1
+
+    def mark_finished(self, task_id: str) -> None:
+        slot = self._running.pop(str(task_id), None)
+        if slot is None:
+            return
+        env_id, agent_cli = slot
+        self._running_by_env[env_id] -= 1
+        if self._running_by_env[env_id] <= 0:
+            del self._running_by_env[env_id]
+        self._running_by_agent[agent_cli] -= 1
+        if self._running_by_agent[agent_cli] <= 0:
+            del self._running_by_agent[agent_cli]
+
+    def forget(self, task_id: str) -> None:
+        self.discard(task_id)
+        self.mark_finished(task_id)
+
+    def is_running(self, task_id: str) -> bool:
+        return str(task_id) in self._running
+
+    def running_task_ids(self) -> list[str]:
+        return list(self._running)
+
+    def running_count(self, env_id: str | None = None) -> int:
+        if env_id is None:
+            return len(self._running)
+        return int(self._running_by_env.get(str(env_id), 0))
+
+    def running_count_for_agent(self, agent_cli: str) -> int:
+        return int(self._running_by_agent.get(str(agent_cli).strip().lower(), 0))
+
+    def can_start(self, env_id: str, agent_cli: str = "") -> bool:
+        env_id = str(env_id or "")
+        agent_cli = str(agent_cli or "").strip().lower()
+        if not _has_slot(self._global_limit, len(self._running)):
+            return False
+        if not _has_slot(int(self._env_limit(env_id)), self.running_count(env_id)):
+            return False
+        agent_limit = self._agent_limits.get(agent_cli, UNLIMITED)
+        return _has_slot(agent_limit, self.running_count_for_agent(agent_cli))
+
+    # Admission
+
+    def admit(
+        self,
+        *,
+        can_admit: Callable[[str], bool] | None = None,
+        is_held: Callable[[str], bool] | None = None,
+    ) -> list[str]:
+        """Pop every queue head that fits the limits and mark it running.
+
+        Environments take turns: the highest-priority head goes first and
+        equal priorities rotate, so one busy environment cannot starve the
+        rest. A head blocked by its agent limit holds its environment's queue,
+        as does a head for which ``is_held`` returns True (e.g. every agent
+        on cooldown). ``can_admit`` lets the caller veto a task (e.g. host
+        resource checks); a veto stops the pass.
+        """
+        admitted: list[str] = []
+        held: set[str] = set()
+        while _has_slot(self._global_limit, len(self._running)):
+            candidates: list[tuple[int, int, _QueueEntry]] = []
+            for env_id in list(self._env_turns):
+                if env_id in held:
+                    continue
+                head = self._head(env_id)
+                if head is None or not self.can_start(env_id, head.agent_cli):
+                    continue
+                if is_held is not None and is_held(head.task_id):
+                    held.add(env_id)
+                    continue
+                candidates.append((-head.priority, self._env_turns[env_id], head))
+            if not candidates:
+                break
+            _, _, entry = min(candidates, key=lambda item: (item[0], item[1]))
+            if can_admit is not None and not can_admit(entry.task_id):
+                break
+            heapq.heappop(self._queues[entry.env_id])
+            self._env_turns[entry.env_id] = next(self._turn)
+            self.mark_running(
+                entry.task_id, env_id=entry.env_id, agent_cli=entry.agent_cli
+            )
+            admitted.append(entry.task_id)
+        return admitted
+
+    def sync(
+        self,
+        *,
+        running: dict[str, tuple[str, str]],
+        queued: list[tuple[str, str, str, int, float]],
+    ) -> None:
+        """Rebuild counters and queue from a full task listing.
+
+        ``running`` maps task id to (env id, agent cli); ``queued`` holds
+        (task id, env id, agent cli, priority, created_at_s). Tasks already
+        queued keep their place.
+        """
+        for task_id in list(self._running):
+            if task_id not in running:
+                self.mark_finished(task_id)
+        for task_id, (env_id, agent_cli) in running.items():
+            self.mark_running(task_id, env_id=env_id, agent_cli=agent_cli)
+
+        waiting = {item[0] for item in queued}
+        for task_id in list(self._queued):
+            if task_id not in waiting:
+                self.discard(task_id)
+        for task_id, env_id, agent_cli, priority, created_at_s in queued:
+            if task_id in self._queued or task_id in self._running:
+                continue
+            self.enqueue(
+                task_id,
+                env_id=env_id,
+                agent_cli=agent_cli,
+                priority=priority,
+                created_at_s=created_at_s,
+            )
@@ -8,26 +8,107 @@ fallback to alternate agents, and intelligent error classification.
 from __future__ import annotations
 
 import os
+import shlex
+import threading
 from typing import Any
 from typing import Callable
 from typing import Literal
 
 from agents_runner.agent_cli import additional_config_mounts
 from agents_runner.agent_cli import default_host_config_dir
+from agents_runner.core.agent.cooldown_registry import CooldownRegistry
 from agents_runner.docker.config import DockerRunnerConfig
 from agents_runner.docker_runner import DockerAgentWorker
 from agents_runner.environments.model import AgentInstance
 from agents_runner.environments.model import AgentSelection
-from agents_runner.execution.supervisor_errors import classify_failure_reason
+from agents_runner.execution.failure_signals import FailureSignalDetector
+from agents_runner.execution.supervisor_race import _Racer
+from agents_runner.execution.supervisor_race import _SupervisorRaceMixin
 from agents_runner.execution.supervisor_types import AttemptKey
 from agents_runner.execution.supervisor_types import SupervisorConfig
 from agents_runner.execution.supervisor_types import SupervisorResult
+from agents_runner.github_token import invalidate_github_token
 from agents_runner.log_format import format_log
 from agents_runner.prompts import RetryContext
 from agents_runner.prompts import build_task_prompt
 
 
-class TaskSupervisor:
+def agent_chain_for(
+    config: DockerRunnerConfig,
+    agent_selection: AgentSelection | None,
+    *,
+    sequential: bool = False,
+    on_warning: Callable[[str], None] | None = None,
+) -> list[AgentInstance]:
+    """Return the agents a run tries: the primary, then its fallback chain.
+
+    Race mode uses the selection order instead of fallbacks, unless
+    ``sequential`` (a race that could not run falls back to the chain).
+    """
+    if not agent_selection or not agent_selection.agents:
+        return [
+            AgentInstance(
+                agent_id="default",
+                agent_cli=config.agent_cli,
+                config_dir=config.host_config_dir,
+                cli_flags="",
+            )
+        ]
+    agents = list(agent_selection.agents)
+    race = str(agent_selection.selection_mode or "").strip().lower() == "race"
+    if race and not sequential:
+        return agents
+
+    fallbacks = agent_selection.agent_fallbacks or {}
+    chain = [agents[0]]
+    current_id = agents[0].agent_id
+    visited = {current_id}
+    while current_id in fallbacks:
+        next_id = fallbacks[current_id]
+        if next_id in visited:
+            if on_warning:
+                on_warning("circular fallback detected, stopping chain")
+            break
+        next_agent = next((a for a in agents if a.agent_id == next_id), None)
+        if not next_agent:
+            if on_warning:
+                on_warning(f"invalid fallback reference: {next_id}")
+            break
+        chain.append(next_agent)
+        visited.add(next_id)
+        current_id = next_id
+    return chain
+
+
+def attempt_key_for(agent: AgentInstance, config: DockerRunnerConfig) -> AttemptKey:
+    """Identity of one agent+config attempt, as used for cooldowns."""
+    configured = os.path.expanduser(str(agent.config_dir or "").strip())
+    codex_default: str | None = None
+    if str(config.agent_cli or "").strip().lower() == "codex":
+        codex_default = config.host_config_dir
+    host_config_dir = configured or default_host_config_dir(
+        agent.agent_cli, codex_default=codex_default
+    )
+    host_config_dir = str(host_config_dir or "").strip()
+    if host_config_dir:
+        host_config_dir = os.path.abspath(host_config_dir)
+
+    if agent.cli_flags:
+        try:
+            agent_cli_args = list(shlex.split(agent.cli_flags))
+        except ValueError:
+            agent_cli_args = []
+    else:
+        agent_cli_args = list(config.agent_cli_args or [])
+
+    return AttemptKey(
+        agent_cli=str(agent.agent_cli or "").strip().lower() or "codex",
+        host_config_dir=host_config_dir,
+        agent_cli_args=tuple(agent_cli_args),
+    )
+
+
+class TaskSupervisor(_SupervisorRaceMixin):
     """Supervises task execution with retry and fallback capabilities.
 
     Manages agent task execution with:
@@ -35,6 +116,7 @@ class TaskSupervisor:
     - No same-agent+config retries within a task run
     - Structured failure reasons for each attempt
     - Per agent+config cooldown on rate limit/quota errors
+    - Optional race mode: several agents at once, first/best success wins
     """
 
     def __init__(
@@ -50,6 +132,7 @@ class TaskSupervisor:
         on_done: Callable[[int, str | None, list[str], dict[str, Any]], None]
         | None = None,
         watch_states: dict[str, Any] | None = None,
+        cooldowns: CooldownRegistry | None = None,
     ) -> None:
         """Initialize task supervisor.
 
@@ -64,6 +147,8 @@ class TaskSupervisor:
             on_agent_switch: Callback for agent switches (from_agent, to_agent)
             on_done: Callback for completion (exit_code, error, artifacts, metadata)
             watch_states: Dict of agent watch states for cooldown tracking
+            cooldowns: Shared cooldown registry; when given, cooldowns are
+                read and recorded through it instead of ``watch_states``
         """
         self._config = config
         self._prompt = prompt
@@ -75,6 +160,7 @@ class TaskSupervisor:
         self._on_agent_switch = on_agent_switch
         self._on_done = on_done
         self._watch_states = watch_states or {}
+        self._cooldowns = cooldowns
 
         # State tracking
         self._agent_chain: list[AgentInstance] = []
@@ -84,6 +170,7 @@ class TaskSupervisor:
         self._attempt_history: list[dict[str, Any]] = []
         self._current_worker: DockerAgentWorker | None = None
         self._last_container_id: str | None = None
+        self._last_resource_usage: dict[str, Any] = {}
         self._last_gh_repo_root: str | None = None
         self._last_gh_base_branch: str | None = None
         self._last_gh_branch: str | None = None
@@ -92,15 +179,23 @@ class TaskSupervisor:
         self._last_exit_code = 0
         self._last_error: str | None = None
         self._last_artifacts: list[str] = []
-        self._last_logs: list[str] = []
+        self._signals = FailureSignalDetector(config.agent_cli)
         self._last_container_state: dict[str, Any] = {}
         self._user_stop_reason: Literal["cancel", "kill"] | None = None
 
+        # Race mode
+        self._racers: list[_Racer] = []
+        self._race_reporter: _Racer | None = None
+        self._race_lock = threading.Lock()
+
     @property
     def container_id(self) -> str | None:
         """Get current worker's container ID."""
         if self._current_worker:
             return self._current_worker.container_id
+        reporter = self._race_reporter
+        if reporter is not None and reporter.worker is not None:
+            return reporter.worker.container_id
         return self._last_container_id
 
     @property
@@ -126,8 +221,8 @@ class TaskSupervisor:
 
     def request_stop(self) -> None:
         """Request stop of current worker."""
-        if self._current_worker:
-            self._current_worker.request_stop()
+        for worker in self._active_workers():
+            worker.request_stop()
 
     def request_user_cancel(self) -> None:
         """User requested graceful cancellation (terminal, no retry/fallback)."""
@@ -136,8 +231,8 @@ class TaskSupervisor:
             self._on_log(
                 format_log("supervisor", "none", "INFO", "user_cancel requested")
             )
-        if self._current_worker:
-            self._current_worker.request_stop()
+        for worker in self._active_workers():
+            worker.request_stop()
 
     def request_user_kill(self) -> None:
         """User requested force kill (terminal, no retry/fallback)."""
@@ -146,12 +241,17 @@ class TaskSupervisor:
             self._on_log(
                 format_log("supervisor", "none", "INFO", "user_kill requested")
             )
-        if self._current_worker:
-            request_kill = getattr(self._current_worker, "request_kill", None)
+        for worker in self._active_workers():
+            request_kill = getattr(worker, "request_kill", None)
             if callable(request_kill):
                 request_kill()
             else:
-                self._current_worker.request_stop()
+                worker.request_stop()
+
+    def _active_workers(self) -> list[DockerAgentWorker]:
+        if self._current_worker:
+            return [self._current_worker]
+        return self._race_workers()
 
     def run(self) -> SupervisorResult:
         """Execute task with supervision.
@@ -161,6 +261,19 @@ class TaskSupervisor:
         """
         self._initialize_agent_chain()
 
+        if self._race_requested():
+            race_result = self._run_race()
+            if race_result is not None:
+                if self._on_done:
+                    self._on_done(
+                        race_result.exit_code,
+                        race_result.error,
+                        race_result.artifacts,
+                        race_result.metadata,
+                    )
+                return race_result
+            self._initialize_agent_chain(sequential=True)
+
         # Main supervision loop
         current_agent_cli: str | None = None
         while self._current_agent_index < len(self._agent_chain):
@@ -238,6 +351,7 @@ class TaskSupervisor:
                         "host_config_dir": attempt_key.host_config_dir,
                         "agent_cli_args": list(attempt_key.agent_cli_args),
                         "exit_code": int(result.exit_code),
+                        "resource_usage": dict(self._last_resource_usage),
                     }
                 )
                 final_metadata = dict(result.metadata)
@@ -257,10 +371,9 @@ class TaskSupervisor:
                 )
 
             # Record attempt and failure reason
-            failure = classify_failure_reason(
+            failure = self._signals.classify_failure(
                 exit_code=result.exit_code,
                 container_state=self._last_container_state,
-                logs=self._last_logs,
                 exit_summary=result.error,
             )
             self._attempt_history.append(
@@ -274,12 +387,16 @@ class TaskSupervisor:
                     "failure_category": failure.failure_category,
                     "failure_message": failure.failure_message,
                     "matched_signals": list(failure.matched_signals),
+                    "resource_usage": dict(self._last_resource_usage),
                 }
             )
 
             # Record cooldown if rate-limited (agent+config specific)
             if failure.failure_category == "rate_limit":
                 self._record_cooldown(attempt_key, reason=failure.failure_message)
+            elif failure.failure_category == "auth":
+                # The forwarded GitHub token may have been revoked or rotated.
+                invalidate_github_token()
 
             # Select the next distinct agent+config in the fallback chain.
             self._current_agent_index += 1
@@ -320,69 +437,27 @@ class TaskSupervisor:
             )
         return result
 
-    def _initialize_agent_chain(self) -> None:
+    def _initialize_agent_chain(self, *, sequential: bool = False) -> None:
         """Build ordered agent chain from agent_selection."""
+        self._agent_chain = agent_chain_for(
+            self._config,
+            self._agent_selection,
+            sequential=sequential,
+            on_warning=lambda message: self._on_log(
+                format_log("supervisor", "task", "WARN", message)
+            ),
+        )
         if not self._agent_selection or not self._agent_selection.agents:
-            # Use default agent from config
-            default_agent = AgentInstance(
-                agent_id="default",
-                agent_cli=self._config.agent_cli,
-                config_dir=self._config.host_config_dir,
-                cli_flags="",
-            )
-            self._agent_chain = [default_agent]
             return
-
-        # Build chain: [primary, fallback1, fallback2, ...]
-        agents = list(self._agent_selection.agents)
-        fallbacks = self._agent_selection.agent_fallbacks or {}
-
-        # Start with first agent
-        chain = [agents[0]]
-        current_id = agents[0].agent_id
-        visited = {current_id}
-
-        # Follow fallback chain
-        while current_id in fallbacks:
-            next_id = fallbacks[current_id]
-            if next_id in visited:
-                # Circular fallback detected
-                self._on_log(
-                    format_log(
-                        "supervisor",
-                        "task",
-                        "WARN",
-                        "circular fallback detected, stopping chain",
-                    )
-                )
-                break
-
-            next_agent = next((a for a in agents if a.agent_id == next_id), None)
-            if not next_agent:
-                # Invalid fallback reference
-                self._on_log(
-                    format_log(
-                        "supervisor",
-                        "task",
-                        "WARN",
-                        f"invalid fallback reference: {next_id}",
-                    )
-                )
-                break
-
-            chain.append(next_agent)
-            visited.add(next_id)
-            current_id = next_id
-
-        self._agent_chain = chain
-        self._on_log(
-            format_log(
-                "supervisor",
-                "task",
-                "INFO",
-                f"agent chain: {' -> '.join(a.agent_cli for a in chain)}",
+        if self._race_requested() and not sequential:
+            label = "race candidates: " + ", ".join(
+                a.agent_cli for a in self._agent_chain
             )
-        )
+        else:
+            label = "agent chain: " + " -> ".join(
+                a.agent_cli for a in self._agent_chain
+            )
+        self._on_log(format_log("supervisor", "task", "INFO", label))
 
     def _next_available_agent(
         self, *, start_index: int
@@ -463,8 +538,9 @@ class TaskSupervisor:
         self._last_exit_code = 0
         self._last_error = None
         self._last_artifacts = []
-        self._last_logs = []
+        self._signals = FailureSignalDetector(agent.agent_cli)
         self._last_container_state = {}
+        self._last_resource_usage = {}
 
         # Create and run worker
         worker = DockerAgentWorker(
@@ -479,6 +555,7 @@ class TaskSupervisor:
         worker.run()
 
         self._last_container_id = worker.container_id
+        self._last_resource_usage = worker.resource_usage
         self._last_gh_repo_root = worker.gh_repo_root
         self._last_gh_base_branch = worker.gh_base_branch
         self._last_gh_branch = worker.gh_branch
@@ -519,8 +596,6 @@ class TaskSupervisor:
         # Parse agent CLI args
         agent_cli_args: list[str] = []
         if agent.cli_flags:
-            import shlex
-
             try:
                 agent_cli_args = shlex.split(agent.cli_flags)
             except ValueError:
@@ -555,30 +630,24 @@ class TaskSupervisor:
             gh_prefer_gh_cli=self._config.gh_prefer_gh_cli,
             gh_recreate_if_needed=self._config.gh_recreate_if_needed,
             gh_base_branch=self._config.gh_base_branch,
+            gh_clone_options=self._config.gh_clone_options,
+            workspace_snapshot_source=self._config.workspace_snapshot_source,
+            workspace_snapshot_root=self._config.workspace_snapshot_root,
             artifact_collection_timeout_s=self._config.artifact_collection_timeout_s,
+            resources=self._config.resources,
         )
         return config
 
     def _resolve_host_config_dir(self, agent: AgentInstance) -> str:
-        configured = os.path.expanduser(str(agent.config_dir or "").strip())
-        codex_default: str | None = None
-        if str(self._config.agent_cli or "").strip().lower() == "codex":
-            codex_default = self._config.host_config_dir
-        host_config_dir = configured or default_host_config_dir(
-            agent.agent_cli, codex_default=codex_default
-        )
-        host_config_dir = str(host_config_dir or "").strip()
-        if host_config_dir:
-            host_config_dir = os.path.abspath(host_config_dir)
-        return host_config_dir
+        return attempt_key_for(agent, self._config).host_config_dir
 
     def _on_log_capture(self, log_line: str) -> None:
-        """Capture log lines for error classification.
+        """Scan log lines for failure signals as they stream in.
 
         Args:
             log_line: Log line from worker
         """
-        self._last_logs.append(log_line)
+        self._signals.feed(log_line)
         self._on_log(log_line)
 
     def _on_worker_done(
@@ -605,51 +674,27 @@ class TaskSupervisor:
         self._last_container_state = {}
 
     def _attempt_key(self, agent: AgentInstance) -> AttemptKey:
-        agent_cli = str(agent.agent_cli or "").strip().lower() or "codex"
-        host_config_dir = self._resolve_host_config_dir(agent)
-
-        agent_cli_args = self._effective_agent_cli_args(agent)
-        return AttemptKey(
-            agent_cli=agent_cli,
-            host_config_dir=host_config_dir,
-            agent_cli_args=tuple(agent_cli_args),
-        )
-
-    def _effective_agent_cli_args(self, agent: AgentInstance) -> list[str]:
-        if agent.cli_flags:
-            import shlex
-
-            try:
-                return list(shlex.split(agent.cli_flags))
-            except ValueError:
-                return []
-        return list(self._config.agent_cli_args or [])
+        return attempt_key_for(agent, self._config)
 
     def _is_on_cooldown(self, attempt_key: AttemptKey) -> bool:
+        if self._cooldowns is not None:
+            return self._cooldowns.is_on_cooldown(attempt_key.cooldown_key())
+
         from agents_runner.core.agent.cooldown_manager import CooldownManager
-        from agents_runner.core.agent.keys import cooldown_key
 
         cooldown_mgr = CooldownManager(self._watch_states)
-        key = cooldown_key(
-            agent_cli=attempt_key.agent_cli,
-            host_config_dir=attempt_key.host_config_dir,
-            agent_cli_args=list(attempt_key.agent_cli_args),
-        )
-        watch_state = cooldown_mgr.check_cooldown(key)
-        return bool(watch_state and watch_state.is_on_cooldown())
+        return cooldown_mgr.is_on_cooldown(attempt_key.cooldown_key())
 
     def _record_cooldown(self, attempt_key: AttemptKey, *, reason: str) -> None:
         """Record a one-hour cooldown for a specific agent+config selection."""
-        from agents_runner.core.agent.cooldown_manager import CooldownManager
-        from agents_runner.core.agent.keys import cooldown_key
+        if self._cooldowns is not None:
+            self._cooldowns.set_cooldown(attempt_key.cooldown_key(), 3600, reason[:200])
+        else:
+            from agents_runner.core.agent.cooldown_manager import CooldownManager
 
-        cooldown_mgr = CooldownManager(self._watch_states)
-        key = cooldown_key(
-            agent_cli=attempt_key.agent_cli,
-            host_config_dir=attempt_key.host_config_dir,
-            agent_cli_args=list(attempt_key.agent_cli_args),
-        )
-        cooldown_mgr.set_cooldown(key, 3600, reason[:200])
+            CooldownManager(self._watch_states).set_cooldown(
+                attempt_key.cooldown_key(), 3600, reason[:200]
+            )
 
         self._on_log(
             format_log(
@@ -663,8 +708,6 @@ class TaskSupervisor:
     def _result_for_exhausted_agents(
         self, *, last_exit_code: int | None = None
     ) -> SupervisorResult:
-        from agents_runner.core.agent.keys import cooldown_key
-
         attempted = [
             f"{a.get('agent_cli')}[{a.get('agent_id')}]"
             for a in self._attempt_history
@@ -673,12 +716,7 @@ class TaskSupervisor:
 
         on_cooldown: list[str] = []
         for agent in self._agent_chain:
-            key = self._attempt_key(agent)
-            ckey = cooldown_key(
-                agent_cli=key.agent_cli,
-                host_config_dir=key.host_config_dir,
-                agent_cli_args=list(key.agent_cli_args),
-            )
+            ckey = self._attempt_key(agent).cooldown_key()
             watch_state = self._watch_states.get(ckey)
             if watch_state and watch_state.is_on_cooldown() and ckey:
                 until = getattr(watch_state, "cooldown_until", None)
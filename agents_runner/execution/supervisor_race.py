@@ -0,0 +1,416 @@
+"""
+Race mode for the task supervisor.
+
+Starts the first N agents of the selection at once, each in its own clone of
+the task workspace and with its own artifact staging directory. One winner
+is kept (the first success, or the smallest diff once every racer
+finished); the rest are killed and their workspaces and staged artifacts
+removed. The winner's clone is moved to the task workspace path and its
+staged artifacts to the task's staging directory, so finalization works
+unchanged.
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import shutil
+import threading
+import time
+from dataclasses import dataclass
+from dataclasses import field
+from dataclasses import replace
+from typing import Any
+
+from agents_runner.artifacts import get_staging_dir
+from agents_runner.docker.config import DockerRunnerConfig
+from agents_runner.docker_runner import DockerAgentWorker
+from agents_runner.environments.model import AgentInstance
+from agents_runner.execution.failure_signals import FailureSignalDetector
+from agents_runner.execution.supervisor_types import AttemptKey
+from agents_runner.execution.supervisor_types import SupervisorResult
+from agents_runner.gh.git_ops import git_diff_size
+from agents_runner.github_token import invalidate_github_token
+from agents_runner.log_format import format_log
+
+RACE_PICKS = ("first", "smallest-diff")
+
+
+@dataclass
+class _Racer:
+    index: int
+    agent: AgentInstance
+    attempt_key: AttemptKey
+    config: DockerRunnerConfig
+    worker: DockerAgentWorker | None = None
+    thread: threading.Thread | None = None
+    signals: FailureSignalDetector | None = None
+    exit_code: int = 1
+    error: str | None = "worker exited without a result"
+    artifacts: list[str] = field(default_factory=list)
+    started_s: float = 0.0
+    finished_s: float = 0.0
+    done: bool = False
+    cancelled: bool = False
+    diff_lines: int | None = None
+
+
+class _SupervisorRaceMixin:
+    """Race execution for ``TaskSupervisor`` (``selection_mode == "race"``)."""
+
+    def _race_requested(self) -> bool:
+        selection = self._agent_selection
+        if not selection or not selection.agents:
+            return False
+        return str(selection.selection_mode or "").strip().lower() == "race"
+
+    def _race_candidates(self) -> list[AgentInstance]:
+        width = max(2, int(getattr(self._agent_selection, "race_width", 2) or 2))
+        picked: list[AgentInstance] = []
+        seen: set[AttemptKey] = set()
+        for agent in self._agent_chain:
+            key = self._attempt_key(agent)
+            if key in seen:
+                continue
+            if self._is_on_cooldown(key):
+                self._on_log(
+                    format_log(
+                        "supervisor",
+                        "cooldown",
+                        "INFO",
+                        f"skipping {agent.agent_cli} (agent+config) due to cooldown",
+                    )
+                )
+                continue
+            seen.add(key)
+            picked.append(agent)
+            if len(picked) >= width:
+                break
+        return picked
+
+    def _race_workdir(self, index: int) -> str:
+        workdir = str(self._config.host_workdir or "").rstrip(os.sep)
+        return workdir if index == 0 else f"{workdir}-race{index}"
+
+    def _race_artifacts_key(self, index: int) -> str:
+        return f"{self._config.task_id or 'task'}-race{index}"
+
+    def _race_workers(self) -> list[DockerAgentWorker]:
+        return [
+            racer.worker
+            for racer in self._racers
+            if racer.worker is not None and not racer.done
+        ]
+
+    def _run_race(self) -> SupervisorResult | None:
+        """Run the race; returns None when it cannot run (sequential fallback)."""
+        if not self._config.gh_repo:
+            self._on_log(
+                format_log(
+                    "supervisor",
+                    "race",
+                    "WARN",
+                    "race mode needs a cloned GitHub workspace; running agents in sequence",
+                )
+            )
+            return None
+        agents = self._race_candidates()
+        if len(agents) < 2:
+            self._on_log(
+                format_log(
+                    "supervisor",
+                    "race",
+                    "INFO",
+                    "race mode needs two available agents; running in sequence",
+                )
+            )
+            return None
+
+        pick = str(getattr(self._agent_selection, "race_pick", "") or "first")
+        if pick not in RACE_PICKS:
+            pick = "first"
+
+        racers: list[_Racer] = []
+        for index, agent in enumerate(agents):
+            key = self._attempt_key(agent)
+            self._attempted.add(key)
+            config = replace(
+                self._build_agent_config(agent),
+                host_workdir=self._race_workdir(index),
+                artifacts_key=self._race_artifacts_key(index),
+            )
+            racers.append(
+                _Racer(index=index, agent=agent, attempt_key=key, config=config)
+            )
+        self._racers = racers
+        self._race_reporter = racers[0]
+        self._on_log(
+            format_log(
+                "supervisor",
+                "race",
+                "INFO",
+                f"starting {len(racers)} agents at once: "
+                f"{', '.join(r.agent.agent_cli for r in racers)} (winner: {pick})",
+            )
+        )
+
+        finished: queue.Queue[_Racer] = queue.Queue()
+        for racer in racers:
+            self._start_racer(racer, finished)
+
+        winner: _Racer | None = None
+        for _ in racers:
+            racer = finished.get()
+            self._total_attempts += 1
+            outcome = "cancelled" if racer.cancelled else f"exit {racer.exit_code}"
+            self._on_log(
+                format_log(
+                    "supervisor",
+                    "race",
+                    "INFO",
+                    f"{racer.agent.agent_cli}[{racer.agent.agent_id}] finished "
+                    f"({outcome}) after {racer.finished_s - racer.started_s:.1f}s",
+                )
+            )
+            if (
+                pick == "first"
+                and winner is None
+                and racer.exit_code == 0
+                and not racer.cancelled
+                and self._user_stop_reason is None
+            ):
+                winner = racer
+                self._cancel_racers(exclude=racer)
+        for racer in racers:
+            if racer.thread is not None:
+                racer.thread.join()
+
+        if winner is None and self._user_stop_reason is None:
+            winner = self._pick_race_winner(racers, pick)
+        self._record_race_attempts(racers, winner)
+        workspace = self._settle_race_workspaces(racers, winner)
+        self._racers = []
+        self._race_reporter = None
+
+        if self._user_stop_reason is not None:
+            result = self._result_for_user_stop()
+            result.metadata["attempt_history"] = list(self._attempt_history)
+            return result
+
+        if winner is None:
+            self._last_artifacts = []
+            failed = [r for r in racers if not r.cancelled]
+            return self._result_for_exhausted_agents(
+                last_exit_code=failed[-1].exit_code if failed else 1
+            )
+
+        worker = winner.worker
+        self._last_container_id = worker.container_id if worker else None
+        self._last_resource_usage = worker.resource_usage if worker else {}
+        repo_root = worker.gh_repo_root if worker else None
+        if repo_root and repo_root.startswith(winner.config.host_workdir):
+            repo_root = workspace + repo_root[len(winner.config.host_workdir) :]
+        self._last_gh_repo_root = repo_root
+        self._last_gh_base_branch = worker.gh_base_branch if worker else None
+        self._last_gh_branch = worker.gh_branch if worker else None
+        self._on_log(
+            format_log(
+                "supervisor",
+                "race",
+                "INFO",
+                f"winner: {winner.agent.agent_cli}[{winner.agent.agent_id}]",
+            )
+        )
+        return SupervisorResult(
+            exit_code=0,
+            error=winner.error,
+            artifacts=list(winner.artifacts),
+            metadata={
+                "agent_used": winner.agent.agent_cli,
+                "agent_id": winner.agent.agent_id,
+                "retry_count": 0,
+                "total_attempts": self._total_attempts,
+                "race_width": len(racers),
+                "attempt_history": list(self._attempt_history),
+            },
+        )
+
+    def _start_racer(self, racer: _Racer, finished: queue.Queue[_Racer]) -> None:
+        signals = FailureSignalDetector(racer.agent.agent_cli)
+        racer.signals = signals
+
+        def on_log(line: str) -> None:
+            signals.feed(line)
+            self._on_log(line)
+
+        def on_state(state: dict[str, Any]) -> None:
+            # One container at a time drives the task's status in the UI.
+            if self._race_reporter is racer:
+                self._on_state(state)
+
+        def on_done(exit_code: int, error: str | None, artifacts: list[str]) -> None:
+            racer.exit_code = int(exit_code)
+            racer.error = error
+            racer.artifacts = list(artifacts or [])
+
+        racer.worker = DockerAgentWorker(
+            config=racer.config,
+            prompt=self._prompt,
+            on_state=on_state,
+            on_log=on_log,
+            on_done=on_done,
+        )
+
+        def run() -> None:
+            racer.started_s = time.monotonic()
+            try:
+                racer.worker.run()
+            except Exception as exc:
+                racer.exit_code = 1
+                racer.error = str(exc)
+            finally:
+                racer.finished_s = time.monotonic()
+                with self._race_lock:
+                    racer.done = True
+                    if self._race_reporter is racer:
+                        self._race_reporter = next(
+                            (r for r in self._racers if not r.done), racer
+                        )
+                finished.put(racer)
+
+        racer.thread = threading.Thread(
+            target=run,
+            name=f"race-{self._config.task_id}-{racer.index}",
+            daemon=True,
+        )
+        racer.thread.start()
+
+    def _cancel_racers(self, *, exclude: _Racer | None = None) -> None:
+        for racer in self._racers:
+            if racer is exclude or racer.done or racer.worker is None:
+                continue
+            racer.cancelled = True
+            self._on_log(
+                format_log(
+                    "supervisor",
+                    "race",
+                    "INFO",
+                    f"cancelling {racer.agent.agent_cli}[{racer.agent.agent_id}]",
+                )
+            )
+            racer.worker.request_kill()
+
+    def _pick_race_winner(self, racers: list[_Racer], pick: str) -> _Racer | None:
+        successes = [r for r in racers if r.exit_code == 0 and not r.cancelled]
+        if not successes:
+            return None
+        if pick != "smallest-diff":
+            return min(successes, key=lambda r: r.finished_s)
+        for racer in successes:
+            worker = racer.worker
+            if worker and worker.gh_repo_root and worker.gh_base_branch:
+                racer.diff_lines = git_diff_size(
+                    worker.gh_repo_root, worker.gh_base_branch
+                )
+        # An empty diff only wins when nobody changed anything.
+        return min(
+            successes,
+            key=lambda r: (
+                r.diff_lines is None,
+                r.diff_lines == 0,
+                r.diff_lines or 0,
+                r.finished_s,
+            ),
+        )
+
+    def _record_race_attempts(
+        self, racers: list[_Racer], winner: _Racer | None
+    ) -> None:
+        for racer in racers:
+            entry: dict[str, Any] = {
+                "attempt_number": racer.index + 1,
+                "agent_cli": racer.agent.agent_cli,
+                "agent_id": racer.agent.agent_id,
+                "host_config_dir": racer.attempt_key.host_config_dir,
+                "agent_cli_args": list(racer.attempt_key.agent_cli_args),
+                "exit_code": int(racer.exit_code),
+                "resource_usage": racer.worker.resource_usage if racer.worker else {},
+                "elapsed_s": round(max(0.0, racer.finished_s - racer.started_s), 1),
+            }
+            if racer.diff_lines is not None:
+                entry["diff_lines"] = racer.diff_lines
+            if racer is winner:
+                entry["race_outcome"] = "won"
+            elif racer.cancelled:
+                entry["race_outcome"] = "cancelled"
+            elif racer.exit_code == 0:
+                entry["race_outcome"] = "lost"
+            else:
+                entry["race_outcome"] = "failed"
+                failure = racer.signals.classify_failure(
+                    exit_code=racer.exit_code,
+                    container_state={},
+                    exit_summary=racer.error,
+                )
+                entry["failure_category"] = failure.failure_category
+                entry["failure_message"] = failure.failure_message
+                entry["matched_signals"] = list(failure.matched_signals)
+                if failure.failure_category == "rate_limit":
+                    self._record_cooldown(
+                        racer.attempt_key, reason=failure.failure_message
+                    )
+                elif failure.failure_category == "auth":
+                    invalidate_github_token()
+            self._attempt_history.append(entry)
+
+    def _settle_race_workspaces(
+        self, racers: list[_Racer], winner: _Racer | None
+    ) -> str:
+        """Drop loser clones and move the winner's to the task workspace."""
+        self._settle_race_artifacts(racers, winner)
+        target = self._race_workdir(0)
+        for racer in racers:
+            if racer is winner or racer.index == 0:
+                continue
+            shutil.rmtree(racer.config.host_workdir, ignore_errors=True)
+        if winner is None or winner.index == 0:
+            return target
+        shutil.rmtree(target, ignore_errors=True)
+        try:
+            os.replace(winner.config.host_workdir, target)
+        except OSError as exc:
+            self._on_log(
+                format_log(
+                    "supervisor",
+                    "race",
+                    "WARN",
+                    f"keeping winner workspace at {winner.config.host_workdir}: {exc}",
+                )
+            )
+            return winner.config.host_workdir
+        return target
+
+    def _settle_race_artifacts(
+        self, racers: list[_Racer], winner: _Racer | None
+    ) -> None:
+        """Promote the winner's staged artifacts; drop everyone else's."""
+        for racer in racers:
+            if not racer.config.artifacts_key:
+                continue
+            staging = get_staging_dir(racer.config.artifacts_key)
+            if racer is winner and staging.is_dir():
+                target = get_staging_dir(self._config.task_id or "task")
+                target.mkdir(parents=True, exist_ok=True)
+                for entry in staging.iterdir():
+                    try:
+                        os.replace(entry, target / entry.name)
+                    except OSError as exc:
+                        self._on_log(
+                            format_log(
+                                "supervisor",
+                                "race",
+                                "WARN",
+                                f"could not keep artifact {entry.name}: {exc}",
+                            )
+                        )
+            shutil.rmtree(staging.parent, ignore_errors=True)
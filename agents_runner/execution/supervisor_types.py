@@ -59,3 +59,12 @@ class AttemptKey:
     agent_cli: str
     host_config_dir: str
     agent_cli_args: tuple[str, ...]
+
+    def cooldown_key(self) -> str:
+        from agents_runner.core.agent.keys import cooldown_key
+
+        return cooldown_key(
+            agent_cli=self.agent_cli,
+            host_config_dir=self.host_config_dir,
+            agent_cli_args=list(self.agent_cli_args),
+        )
@@ -9,6 +9,7 @@ from .git_ops import (
     git_repo_root,
     is_git_repo,
 )
+from .git_session import GitSession, GitStatus
 from .repo_clone import ensure_github_clone
 from .task_plan import (
     RepoPlan,
@@ -19,6 +20,8 @@ from .task_plan import (
 
 __all__ = [
     "GhManagementError",
+    "GitSession",
+    "GitStatus",
     "RepoPlan",
     "commit_push_and_pr",
     "ensure_github_clone",
@@ -0,0 +1,242 @@
+"""Remote branch listings cached per repository.
+
+``git ls-remote --heads`` is a network round trip, and the branch picker asks
+for the same repository's branches over and over. ``RemoteBranchCache`` keeps
+the last listing per repository (keyed by GitHub ``owner/repo`` slug when the
+target is on GitHub), persists it to disk so a restart still has something to
+show, and reports listings older than the TTL as stale so callers refresh
+them in the background. The picker shows whatever is cached right away and
+updates in place when the refresh lands (stale-while-revalidate).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from agents_runner.persistence import default_state_path
+
+from .git_ops import git_list_remote_heads
+from .git_ops import git_remote_url
+from .git_ops import parse_github_url
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILENAME = "remote-branches.json"
+DEFAULT_TTL_S = 5 * 60.0
+_CACHE_VERSION = 1
+
+
+@dataclass(frozen=True, slots=True)
+class BranchListing:
+    branches: tuple[str, ...]
+    fetched_at: float
+
+    def age_s(self, now: float | None = None) -> float:
+        return max(0.0, (time.time() if now is None else now) - self.fetched_at)
+
+
+def repo_cache_key(repo: str) -> str:
+    """``owner/repo`` (lowercase) for GitHub targets, else the target itself."""
+    repo = (repo or "").strip()
+    owner, name = parse_github_url(repo)
+    if owner and name:
+        return f"{owner}/{name}".lower()
+    if "://" not in repo and not repo.startswith("git@") and repo.count("/") == 1:
+        return repo.removesuffix(".git").lower()
+    return repo
+
+
+class RemoteBranchCache:
+    """Thread-safe, disk-backed cache of remote branch names per repository."""
+
+    def __init__(
+        self,
+        path: str | None = None,
+        *,
+        ttl_s: float = DEFAULT_TTL_S,
+        fetch: Callable[[str], list[str]] = git_list_remote_heads,
+    ) -> None:
+        self._path = path
+        self._ttl_s = float(ttl_s)
+        self._fetch = fetch
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._listings: dict[str, BranchListing] = {}
+        self._loaded = path is None
+        self._fetch_locks: dict[str, threading.Lock] = {}
+
+    def peek(self, repo: str) -> BranchListing | None:
+        """Last known listing regardless of age; never touches the network."""
+        with self._lock:
+            self._load_locked()
+            return self._listings.get(repo_cache_key(repo))
+
+    def is_stale(self, listing: BranchListing | None) -> bool:
+        return listing is None or listing.age_s() >= self._ttl_s
+
+    def get(self, repo: str, *, max_age_s: float | None = None) -> list[str]:
+        """Branches no older than ``max_age_s`` (default: the TTL), fetching if needed."""
+        listing = self.peek(repo)
+        limit = self._ttl_s if max_age_s is None else float(max_age_s)
+        if listing is not None and listing.age_s() < limit:
+            return list(listing.branches)
+        return self.refresh(repo, max_age_s=limit)
+
+    def refresh(self, repo: str, *, max_age_s: float = 0.0) -> list[str]:
+        """Fetch from the remote now and store the result.
+
+        Concurrent refreshes of one repository share a single `ls-remote`:
+        callers that waited get the listing the first one stored, as long as
+        it is younger than ``max_age_s`` (or was stored while they waited).
+        """
+        key = repo_cache_key(repo)
+        started = time.time()
+        with self._fetch_lock(key):
+            listing = self.peek(repo)
+            if listing is not None and (
+                listing.fetched_at >= started or listing.age_s() < max_age_s
+            ):
+                return list(listing.branches)
+            branches = self._fetch(repo)
+            if not branches and listing is not None:
+                # ls-remote failures come back empty; keep the last listing.
+                logger.debug(
+                    "branch listing for %s came back empty; keeping cache", key
+                )
+                return list(listing.branches)
+            self.put(repo, branches)
+            return list(branches)
+
+    def put(self, repo: str, branches: list[str]) -> None:
+        key = repo_cache_key(repo)
+        listing = BranchListing(tuple(branches), time.time())
+        with self._lock:
+            self._load_locked()
+            self._listings[key] = listing
+        self._save()
+
+    def add_branch(self, repo: str, branch: str) -> None:
+        """Record a branch we just pushed without refetching."""
+        branch = (branch or "").strip()
+        if not branch:
+            return
+        key = repo_cache_key(repo)
+        # Check and update together so concurrent additions are not lost.
+        with self._lock:
+            self._load_locked()
+            listing = self._listings.get(key)
+            if listing is None or branch in listing.branches:
+                return
+            self._listings[key] = BranchListing(
+                tuple(sorted((*listing.branches, branch), key=str.casefold)),
+                listing.fetched_at,
+            )
+        self._save()
+
+    def _fetch_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._fetch_locks.setdefault(key, threading.Lock())
+
+    def _load_locked(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(self._path or "", "r", encoding="utf-8") as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(payload, dict) or payload.get("version") != _CACHE_VERSION:
+            return
+        repos = payload.get("repos")
+        if not isinstance(repos, dict):
+            return
+        for key, item in repos.items():
+            if not isinstance(item, dict):
+                continue
+            branches = item.get("branches")
+            try:
+                fetched_at = float(item.get("fetched_at") or 0.0)
+            except (TypeError, ValueError):
+                continue
+            if isinstance(branches, list):
+                self._listings[str(key)] = BranchListing(
+                    tuple(str(b) for b in branches if str(b or "").strip()),
+                    fetched_at,
+                )
+
+    def _save(self) -> None:
+        if not self._path:
+            return
+        # Snapshot under the save lock so the last write has the newest data.
+        with self._save_lock:
+            with self._lock:
+                listings = dict(self._listings)
+            self._write(self._path, listings)
+
+    @staticmethod
+    def _write(path: str, listings: dict[str, BranchListing]) -> None:
+        payload = {
+            "version": _CACHE_VERSION,
+            "repos": {
+                key: {"branches": list(item.branches), "fetched_at": item.fetched_at}
+                for key, item in sorted(listings.items())
+            },
+        }
+        directory = os.path.dirname(path) or "."
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(
+                prefix=f"{CACHE_FILENAME}.", suffix=".tmp", dir=directory
+            )
+        except OSError as exc:
+            logger.debug("could not save branch cache: %s", exc)
+            return
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(payload, f, indent=2)
+            os.replace(tmp_path, path)
+        except OSError as exc:
+            logger.debug("could not save branch cache: %s", exc)
+        finally:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+
+_cache_lock = threading.Lock()
+_caches: dict[str, RemoteBranchCache] = {}
+
+
+def remote_branch_cache(state_path: str | None = None) -> RemoteBranchCache:
+    """The cache stored next to the state file."""
+    state_path = state_path or default_state_path()
+    path = os.path.join(os.path.dirname(state_path) or ".", CACHE_FILENAME)
+    with _cache_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = _caches[path] = RemoteBranchCache(path)
+        return cache
+
+
+def cached_remote_branches(repo_root: str) -> list[str]:
+    """Last known remote branches for a checkout's origin, without network."""
+    url = git_remote_url(repo_root) or ""
+    if not url:
+        return []
+    listing = remote_branch_cache().peek(url)
+    return list(listing.branches) if listing is not None else []
+
+
+def note_pushed_branch(repo_root: str, branch: str) -> None:
+    url = git_remote_url(repo_root) or ""
+    if url:
+        remote_branch_cache().add_branch(url, branch)
@@ -0,0 +1,186 @@
+"""Reuse of generated GitHub context between tasks.
+
+Filling in a task's GitHub context file after its clone used to run several
+git commands against the fresh clone (repo root, branch, HEAD, remote URL),
+and the result is the same for every task that starts from the same commit
+of the same base branch. ``GitHubContextCache`` keeps the generated context
+keyed by ``(repo slug, base branch, HEAD SHA)`` and hands out copies with
+only the task-specific field (the task branch) filled in.
+
+HEAD is read straight from the repository's files (falling back to
+``git rev-parse HEAD``), so building the key costs no process launch. Each
+``(repo, base branch)`` keeps one entry; a lookup with a different HEAD
+drops it, which is how the cache follows the base branch as it moves.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+from agents_runner.pr_metadata import GitHubContext
+
+from .branch_cache import repo_cache_key
+from .git_ops import git_head_commit
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 64
+_SHA_LENGTHS = (40, 64)
+
+
+def _read_text(path: str) -> str:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return f.read().strip()
+    except (OSError, UnicodeDecodeError):
+        return ""
+
+
+def _git_dirs(repo_root: str) -> tuple[str, str] | None:
+    """(git dir, common dir) for a work tree; handles ``.git`` files."""
+    dot_git = os.path.join(repo_root, ".git")
+    if os.path.isdir(dot_git):
+        git_dir = dot_git
+    else:
+        pointer = _read_text(dot_git)
+        if not pointer.startswith("gitdir:"):
+            return None
+        git_dir = os.path.join(repo_root, pointer.removeprefix("gitdir:").strip())
+    common = _read_text(os.path.join(git_dir, "commondir"))
+    common_dir = os.path.join(git_dir, common) if common else git_dir
+    return os.path.normpath(git_dir), os.path.normpath(common_dir)
+
+
+def _is_sha(value: str) -> bool:
+    return len(value) in _SHA_LENGTHS and all(ch in "0123456789abcdef" for ch in value)
+
+
+def _resolve_ref(git_dir: str, common_dir: str, ref: str) -> str:
+    for base in (git_dir, common_dir):
+        sha = _read_text(os.path.join(base, *ref.split("/")))
+        if _is_sha(sha):
+            return sha
+    try:
+        with open(os.path.join(common_dir, "packed-refs"), encoding="utf-8") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 2 and parts[1] == ref and _is_sha(parts[0]):
+                    return parts[0]
+    except (OSError, UnicodeDecodeError):
+        pass
+    return ""
+
+
+def read_head_commit(repo_root: str) -> str | None:
+    """HEAD's commit SHA, read from the ref files when possible."""
+    dirs = _git_dirs(repo_root)
+    if dirs is not None:
+        git_dir, common_dir = dirs
+        head = _read_text(os.path.join(git_dir, "HEAD"))
+        if head.startswith("ref:"):
+            sha = _resolve_ref(git_dir, common_dir, head.removeprefix("ref:").strip())
+        else:
+            sha = head
+        if _is_sha(sha):
+            return sha
+    # Unborn branches, reftable repositories and other layouts.
+    return git_head_commit(repo_root)
+
+
+class GitHubContextCache:
+    """Generated ``GitHubContext`` per (repo, base branch, HEAD)."""
+
+    def __init__(self, *, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self._max_entries = max(1, int(max_entries))
+        self._lock = threading.Lock()
+        # (repo key, base branch) -> (HEAD SHA, context without task fields)
+        self._entries: OrderedDict[tuple[str, str], tuple[str, GitHubContext]] = (
+            OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, repo: str, base_branch: str, head_sha: str) -> GitHubContext | None:
+        slot = (repo_cache_key(repo), base_branch)
+        with self._lock:
+            entry = self._entries.get(slot)
+            if entry is None or entry[0] != head_sha:
+                if entry is not None:
+                    # HEAD moved; the stored context describes an old commit.
+                    del self._entries[slot]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(slot)
+            self.hits += 1
+            return dataclasses.replace(entry[1])
+
+    def put(
+        self, repo: str, base_branch: str, head_sha: str, context: GitHubContext
+    ) -> None:
+        slot = (repo_cache_key(repo), base_branch)
+        template = dataclasses.replace(context, task_branch=None)
+        with self._lock:
+            self._entries[slot] = (head_sha, template)
+            self._entries.move_to_end(slot)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, repo: str | None = None) -> None:
+        """Forget one repository's contexts, or everything."""
+        with self._lock:
+            if repo is None:
+                self._entries.clear()
+                return
+            key = repo_cache_key(repo)
+            for slot in [slot for slot in self._entries if slot[0] == key]:
+                del self._entries[slot]
+
+    def resolve(
+        self,
+        repo_root: str,
+        *,
+        repo: str,
+        base_branch: str | None,
+        task_branch: str | None,
+    ) -> GitHubContext | None:
+        """Context for a task's checkout, generated only on a cache miss.
+
+        Returns None when ``repo_root`` is not a usable git repository.
+        Without a known base branch nothing is cached: the fallback (the
+        checkout's current branch) is task-specific.
+        """
+        head_sha = read_head_commit(repo_root) if base_branch else None
+        if base_branch and head_sha:
+            cached = self.get(repo, base_branch, head_sha)
+            if cached is not None:
+                logger.debug("reusing GitHub context for %s@%s", repo, head_sha[:12])
+                return dataclasses.replace(cached, task_branch=task_branch)
+
+        from agents_runner.environments.git_operations import get_git_info
+
+        git_info = get_git_info(repo_root)
+        if git_info is None:
+            return None
+        context = GitHubContext(
+            repo_url=git_info.repo_url,
+            repo_owner=git_info.repo_owner,
+            repo_name=git_info.repo_name,
+            base_branch=base_branch or git_info.branch,
+            task_branch=task_branch,
+            head_commit=git_info.commit_sha,
+        )
+        if base_branch and head_sha == git_info.commit_sha:
+            self.put(repo, base_branch, head_sha, context)
+        return context
+
+
+_shared_cache = GitHubContextCache()
+
+
+def github_context_cache() -> GitHubContextCache:
+    """The process-wide cache used by task launches."""
+    return _shared_cache
@@ -1,5 +1,35 @@
 import shutil
+import threading
+import time
+
+from .errors import GhManagementError
+from .process import _run
+
+# `gh auth status` answers are shared by every task finalizing at once.
+# Failures are remembered briefly so a `gh auth login` is picked up soon.
+_AUTH_OK_TTL_S = 5 * 60.0
+_AUTH_FAILED_TTL_S = 15.0
+
+_auth_lock = threading.Lock()
+_auth_result: tuple[float, bool] | None = None
 
 
 def is_gh_available() -> bool:
     return shutil.which("gh") is not None
+
+
+def gh_is_authenticated() -> bool:
+    """Whether `gh auth status` succeeds; cached and single-flight."""
+    global _auth_result
+    with _auth_lock:
+        if _auth_result is not None:
+            checked_at, ok = _auth_result
+            ttl_s = _AUTH_OK_TTL_S if ok else _AUTH_FAILED_TTL_S
+            if time.monotonic() - checked_at < ttl_s:
+                return ok
+        try:
+            ok = _run(["gh", "auth", "status"], timeout_s=10.0).returncode == 0
+        except GhManagementError:
+            ok = False
+        _auth_result = (time.monotonic(), ok)
+        return ok
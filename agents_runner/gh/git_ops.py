@@ -137,6 +137,57 @@ def git_head_commit(repo_root: str) -> str | None:
     return sha if sha else None
 
 
+def git_diff_size(repo_root: str, base: str) -> int | None:
+    """Count changed lines between ``base`` and the working tree.
+
+    Committed and uncommitted changes both count, and so do untracked files
+    (all their lines are additions) that are not ignored; binary files count
+    as one line each. Returns None on error.
+    """
+    repo_root = _expand_dir(repo_root)
+    proc = _run(["git", "-C", repo_root, "diff", "--numstat", base], timeout_s=30.0)
+    if proc.returncode != 0:
+        return None
+    total = 0
+    for line in (proc.stdout or "").splitlines():
+        added, _, rest = line.partition("\t")
+        removed = rest.partition("\t")[0]
+        if added == "-" or removed == "-":
+            total += 1
+            continue
+        try:
+            total += int(added) + int(removed)
+        except ValueError:
+            continue
+    proc = _run(
+        ["git", "-C", repo_root, "ls-files", "-z", "--others", "--exclude-standard"],
+        timeout_s=30.0,
+    )
+    if proc.returncode != 0:
+        return None
+    for name in (proc.stdout or "").split("\0"):
+        if name:
+            total += _untracked_lines(os.path.join(repo_root, name))
+    return total
+
+
+def _untracked_lines(path: str) -> int:
+    """Lines in a new file, as ``git diff --numstat`` would count them."""
+    if os.path.islink(path):
+        return 1
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return 0
+    if b"\0" in data[:8000]:
+        return 1
+    lines = data.count(b"\n")
+    if data and not data.endswith(b"\n"):
+        lines += 1
+    return lines
+
+
 def git_remote_url(repo_root: str, remote: str = "origin") -> str | None:
     """Get remote URL for a given remote name.
 
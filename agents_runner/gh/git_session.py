@@ -0,0 +1,250 @@
+"""Git command session for one multi-step repo operation.
+
+``GitSession`` runs git against one repository and remembers read-only
+results (working tree status, ref existence, commit counts) until a command
+that can change the repository runs. Status comes from a single
+``git status --porcelain=v2 --branch`` call, which also carries the current
+branch, HEAD and ahead/behind counts against the upstream. Every command (and
+any other step wrapped in ``timed``) is recorded with its wall time so callers
+can log where an operation spent its time.
+
+In shallow clones ``rev_count`` deepens history on demand until both ends of
+a ``a..b`` range share a merge base, so ahead/behind counts stay correct
+without fetching the full history up front.
+"""
+
+import subprocess
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from .process import _expand_dir
+from .process import _require_ok
+from .process import _run
+
+# Shallow clones deepen by this many commits first, doubling per round; after
+# _MAX_DEEPEN_ROUNDS the rest of the history is fetched.
+_DEEPEN_STEP = 64
+_MAX_DEEPEN_ROUNDS = 4
+
+# Subcommands that never change refs, the index or the working tree.
+_READ_ONLY_COMMANDS: frozenset[str] = frozenset(
+    {
+        "cat-file",
+        "diff",
+        "for-each-ref",
+        "log",
+        "ls-files",
+        "ls-remote",
+        "merge-base",
+        "rev-list",
+        "rev-parse",
+        "show-ref",
+        "status",
+        "symbolic-ref",
+    }
+)
+
+
+@dataclass(frozen=True, slots=True)
+class GitStatus:
+    branch: str | None
+    head: str | None
+    upstream: str | None
+    ahead: int | None
+    behind: int | None
+    entries: tuple[str, ...]
+
+    @property
+    def clean(self) -> bool:
+        return not self.entries
+
+    @property
+    def has_unmerged(self) -> bool:
+        return any(line.startswith("u ") for line in self.entries)
+
+
+@dataclass(frozen=True, slots=True)
+class GitStep:
+    label: str
+    elapsed_s: float
+    ok: bool
+
+
+def parse_porcelain_v2(output: str) -> GitStatus:
+    """Parse ``git status --porcelain=v2 --branch`` output."""
+    branch: str | None = None
+    head: str | None = None
+    upstream: str | None = None
+    ahead: int | None = None
+    behind: int | None = None
+    entries: list[str] = []
+    for line in (output or "").splitlines():
+        if not line.startswith("# "):
+            if line.strip():
+                entries.append(line)
+            continue
+        key, _, value = line[2:].partition(" ")
+        value = value.strip()
+        if key == "branch.oid":
+            head = None if value == "(initial)" else value or None
+        elif key == "branch.head":
+            branch = None if value == "(detached)" else value or None
+        elif key == "branch.upstream":
+            upstream = value or None
+        elif key == "branch.ab":
+            parts = value.split()
+            try:
+                ahead = int(parts[0].lstrip("+"))
+                behind = int(parts[1].lstrip("-"))
+            except (IndexError, ValueError):
+                ahead = behind = None
+    return GitStatus(
+        branch=branch,
+        head=head,
+        upstream=upstream,
+        ahead=ahead,
+        behind=behind,
+        entries=tuple(entries),
+    )
+
+
+class GitSession:
+    """Runs git in ``repo_root`` with per-operation result caching and timing."""
+
+    def __init__(self, repo_root: str) -> None:
+        self.repo_root = _expand_dir(repo_root)
+        self.steps: list[GitStep] = []
+        self._status: GitStatus | None = None
+        self._refs: dict[str, bool] = {}
+        self._counts: dict[str, int | None] = {}
+        self._shallow: bool | None = None
+
+    def invalidate(self) -> None:
+        self._status = None
+        self._refs.clear()
+        self._counts.clear()
+
+    @contextmanager
+    def timed(self, label: str) -> Iterator[None]:
+        """Record the wall time of a non-git step (e.g. a `gh` call)."""
+        start = time.monotonic()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.steps.append(GitStep(label, time.monotonic() - start, ok))
+
+    def run(
+        self,
+        *args: str,
+        timeout_s: float = 45.0,
+        label: str | None = None,
+    ) -> subprocess.CompletedProcess[str]:
+        """Run ``git -C <repo> *args``; mutating commands drop cached results."""
+        command = args[0] if args else ""
+        start = time.monotonic()
+        try:
+            proc = _run(["git", "-C", self.repo_root, *args], timeout_s=timeout_s)
+        except Exception:
+            self.steps.append(
+                GitStep(label or command, time.monotonic() - start, False)
+            )
+            self.invalidate()
+            raise
+        self.steps.append(
+            GitStep(label or command, time.monotonic() - start, proc.returncode == 0)
+        )
+        if command not in _READ_ONLY_COMMANDS:
+            self.invalidate()
+        return proc
+
+    def require(
+        self, *args: str, timeout_s: float = 45.0, label: str | None = None
+    ) -> subprocess.CompletedProcess[str]:
+        proc = self.run(*args, timeout_s=timeout_s, label=label)
+        _require_ok(proc, args=["git", *args[:2]])
+        return proc
+
+    def status(self) -> GitStatus:
+        if self._status is None:
+            proc = self.require("status", "--porcelain=v2", "--branch", timeout_s=15.0)
+            self._status = parse_porcelain_v2(proc.stdout or "")
+        return self._status
+
+    def current_branch(self) -> str | None:
+        return self.status().branch
+
+    def has_ref(self, ref: str) -> bool:
+        if ref not in self._refs:
+            proc = self.run("show-ref", "--verify", "--quiet", ref, timeout_s=8.0)
+            self._refs[ref] = proc.returncode == 0
+        return self._refs[ref]
+
+    def is_shallow(self) -> bool:
+        if self._shallow is None:
+            proc = self.run("rev-parse", "--is-shallow-repository", timeout_s=8.0)
+            self._shallow = (proc.stdout or "").strip() == "true"
+        return self._shallow
+
+    def deepen_until_merge_base(self, left: str, right: str) -> bool:
+        """Fetch more history until ``left`` and ``right`` share a merge base.
+
+        A no-op for full clones. Returns False when no merge base was found.
+        """
+        if not self.is_shallow():
+            return True
+        for ref in (left, right):
+            # Missing refs never gain a merge base; do not fetch for them.
+            if self.run(
+                "rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}"
+            ).returncode:
+                return False
+        step = _DEEPEN_STEP
+        for attempt in range(_MAX_DEEPEN_ROUNDS + 1):
+            if self.run("merge-base", left, right, timeout_s=15.0).returncode == 0:
+                return True
+            if attempt == _MAX_DEEPEN_ROUNDS:
+                proc = self.run(
+                    "fetch", "--unshallow", "origin", timeout_s=600.0, label="unshallow"
+                )
+                if proc.returncode == 0:
+                    self._shallow = False
+                break
+            proc = self.run(
+                "fetch", f"--deepen={step}", "origin", timeout_s=180.0, label="deepen"
+            )
+            if proc.returncode != 0:
+                return False
+            step *= 2
+        return self.run("merge-base", left, right, timeout_s=15.0).returncode == 0
+
+    def rev_count(self, revision_range: str) -> int | None:
+        """``git rev-list --count <range>``, or None when it fails."""
+        if revision_range not in self._counts:
+            left, sep, right = revision_range.partition("..")
+            if sep and not right.startswith("."):
+                self.deepen_until_merge_base(left or "HEAD", right or "HEAD")
+            proc = self.run("rev-list", "--count", revision_range, timeout_s=15.0)
+            count: int | None = None
+            if proc.returncode == 0:
+                try:
+                    count = int((proc.stdout or "").strip() or "0")
+                except ValueError:
+                    count = None
+            self._counts[revision_range] = count
+        return self._counts[revision_range]
+
+    @property
+    def total_s(self) -> float:
+        return sum(step.elapsed_s for step in self.steps)
+
+    def summary(self) -> str:
+        """One line of per-step timings, e.g. ``fetch 1.20s, status 0.03s``."""
+        parts = [
+            f"{step.label} {step.elapsed_s:.2f}s" + ("" if step.ok else " (failed)")
+            for step in self.steps
+        ]
+        return f"{', '.join(parts)} (total {self.total_s:.2f}s)"
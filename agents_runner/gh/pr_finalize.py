@@ -0,0 +1,287 @@
+"""Pull request creation for a finished task.
+
+Runs the validate → existing-PR check → metadata → commit → push → PR steps
+that finalization performs for cloned-repo tasks. ``create_task_pull_request``
+runs them in one go; the stage functions let the finalization pipeline run
+commit, push and PR creation on separate workers. Progress goes to ``on_log`` as
+formatted log lines; nothing here touches Qt, so the GUI and the headless
+runner share it.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable
+
+from agents_runner.agent_display import format_agent_markdown_link
+from agents_runner.agent_display import get_agent_display_name
+from agents_runner.gh.git_session import GitSession
+from agents_runner.gh.pr_validation import check_existing_pr
+from agents_runner.gh.pr_validation import validate_pr_prerequisites
+from agents_runner.gh.task_plan import commit_task_changes
+from agents_runner.gh.task_plan import open_task_pull_request
+from agents_runner.gh.task_plan import push_task_branch
+from agents_runner.gh.task_plan import resolve_base_branch
+from agents_runner.log_format import format_log
+from agents_runner.pr_metadata import load_pr_metadata
+from agents_runner.pr_metadata import normalize_pr_title
+
+
+@dataclass(slots=True)
+class PullRequestDraft:
+    """A task's PR as it moves through the finalization stages."""
+
+    task_id: str
+    branch: str
+    base_branch: str
+    title: str
+    body: str
+    use_gh: bool
+    agent_cli: str
+    agent_cli_args: str
+    session: GitSession
+    existing_url: str | None = None
+
+
+def create_task_pull_request(
+    *,
+    task_id: str,
+    repo_root: str,
+    branch: str,
+    base_branch: str,
+    prompt_text: str,
+    task_token: str,
+    use_gh: bool,
+    on_log: Callable[[str], None],
+    pr_metadata_path: str | None = None,
+    agent_cli: str = "",
+    agent_cli_args: str = "",
+    is_override: bool = False,
+) -> str | None:
+    """Open (or find) the task's pull request.
+
+    Returns the PR URL, which may belong to a PR that already existed, or
+    None when validation failed, there was nothing to commit, PR creation
+    failed or only the branch was pushed.
+    """
+    draft = prepare_task_pull_request(
+        task_id=task_id,
+        repo_root=repo_root,
+        branch=branch,
+        base_branch=base_branch,
+        prompt_text=prompt_text,
+        task_token=task_token,
+        use_gh=use_gh,
+        on_log=on_log,
+        pr_metadata_path=pr_metadata_path,
+        agent_cli=agent_cli,
+        agent_cli_args=agent_cli_args,
+        is_override=is_override,
+    )
+    if draft is None:
+        return None
+    if draft.existing_url:
+        return draft.existing_url
+    try:
+        if not commit_pull_request_changes(draft, on_log):
+            return None
+        if not push_pull_request_branch(draft, on_log):
+            return None
+        return open_pull_request(draft, on_log)
+    finally:
+        log_git_steps(draft, on_log)
+
+
+def prepare_task_pull_request(
+    *,
+    task_id: str,
+    repo_root: str,
+    branch: str,
+    base_branch: str,
+    prompt_text: str,
+    task_token: str,
+    use_gh: bool,
+    on_log: Callable[[str], None],
+    pr_metadata_path: str | None = None,
+    agent_cli: str = "",
+    agent_cli_args: str = "",
+    is_override: bool = False,
+) -> PullRequestDraft | None:
+    """Validate the repo, look for an existing PR and build the PR text.
+
+    Returns None when validation failed. A draft with ``existing_url`` set
+    means the branch already has an open PR.
+    """
+    # Step 1: Pre-flight validation
+    on_log(format_log("gh", "pr", "INFO", "[1/6] Validating repository..."))
+
+    checks = validate_pr_prerequisites(
+        repo_root=repo_root,
+        branch=branch,
+        use_gh=use_gh,
+    )
+
+    # Check for failures
+    failed_checks = [(name, msg) for name, passed, msg in checks if not passed]
+    if failed_checks:
+        for name, msg in failed_checks:
+            on_log(format_log("gh", "pr", "ERROR", f"validation failed: {name}: {msg}"))
+        return None
+
+    # Check for existing PR (informational)
+    existing_pr = check_existing_pr(repo_root, branch)
+    if existing_pr:
+        on_log(
+            format_log(
+                "gh",
+                "pr",
+                "INFO",
+                f"[2/6] Pull request already exists: {existing_pr}",
+            )
+        )
+        return PullRequestDraft(
+            task_id=task_id,
+            branch=branch,
+            base_branch=base_branch,
+            title="",
+            body="",
+            use_gh=bool(use_gh),
+            agent_cli=agent_cli,
+            agent_cli_args=agent_cli_args,
+            session=GitSession(repo_root),
+            existing_url=existing_pr,
+        )
+
+    on_log(format_log("gh", "pr", "INFO", "[2/6] No existing PR found, proceeding..."))
+
+    on_log(format_log("gh", "pr", "INFO", "[3/6] Preparing PR metadata..."))
+
+    prompt_line = (prompt_text or "").strip().splitlines()[0] if prompt_text else ""
+    default_title = f"Agent Runner: {prompt_line or task_id}"
+    default_title = normalize_pr_title(default_title, fallback=default_title)
+
+    agent_display = get_agent_display_name(agent_cli) if agent_cli else "Agent"
+    agent_link = format_agent_markdown_link(agent_cli) if agent_cli else agent_display
+    runners_link = "[Agents Runner](https://github.com/Midori-AI-OSS/Agents-Runner)"
+
+    default_body = (
+        f"Automated by {runners_link}.\n\n"
+        f"Agent: {agent_link}\n\n"
+        f"Task: {task_token}\n\n"
+        "Prompt:\n"
+        f"{(prompt_text or '').strip()}\n"
+    )
+    metadata = load_pr_metadata(pr_metadata_path or "") if pr_metadata_path else None
+    if metadata is not None and (metadata.title or metadata.body):
+        on_log(
+            format_log("gh", "pr", "INFO", f"using PR metadata from {pr_metadata_path}")
+        )
+    title = (
+        normalize_pr_title(str(metadata.title or ""), fallback=default_title)
+        if metadata is not None
+        else default_title
+    )
+    body = str(metadata.body or "").strip() if metadata is not None else ""
+    if not body:
+        body = default_body
+
+    # Add override note for non-cloned-repo modes
+    if is_override:
+        body += "\n\n---\n**Note:** This is an override PR created manually for a cloned repo environment."
+
+    return PullRequestDraft(
+        task_id=task_id,
+        branch=branch,
+        base_branch=base_branch,
+        title=title,
+        body=body,
+        use_gh=bool(use_gh),
+        agent_cli=agent_cli,
+        agent_cli_args=agent_cli_args,
+        session=GitSession(repo_root),
+    )
+
+
+def commit_pull_request_changes(
+    draft: PullRequestDraft, on_log: Callable[[str], None]
+) -> bool:
+    """Commit the task's changes; False when there is nothing to push or on error."""
+    on_log(
+        format_log(
+            "gh",
+            "pr",
+            "INFO",
+            f"[4/6] Creating PR from {draft.branch} -> {draft.base_branch or 'auto'}",
+        )
+    )
+    try:
+        draft.base_branch = resolve_base_branch(
+            draft.session.repo_root, draft.base_branch
+        )
+        committed = commit_task_changes(
+            draft.session,
+            branch=draft.branch,
+            base_branch=draft.base_branch,
+            title=draft.title,
+        )
+    except Exception as exc:
+        on_log(format_log("gh", "pr", "ERROR", f"failed: {exc}"))
+        return False
+    if not committed:
+        on_log(
+            format_log("gh", "pr", "INFO", "[5/6] No changes to commit; skipping PR")
+        )
+    return committed
+
+
+def push_pull_request_branch(
+    draft: PullRequestDraft,
+    on_log: Callable[[str], None],
+    *,
+    push: Callable[[str, str], None] | None = None,
+) -> bool:
+    """Push the task branch; ``push`` may share the push with other tasks."""
+    try:
+        push_task_branch(draft.session, draft.branch, push=push)
+    except Exception as exc:
+        on_log(format_log("gh", "pr", "ERROR", f"failed: {exc}"))
+        return False
+    return True
+
+
+def open_pull_request(
+    draft: PullRequestDraft, on_log: Callable[[str], None]
+) -> str | None:
+    """Open the PR for the pushed branch; returns its URL or None."""
+    try:
+        pr_url = open_task_pull_request(
+            draft.session,
+            branch=draft.branch,
+            base_branch=draft.base_branch,
+            title=draft.title,
+            body=draft.body,
+            use_gh=draft.use_gh,
+            agent_cli=draft.agent_cli,
+            agent_cli_args=draft.agent_cli_args,
+        )
+    except Exception as exc:
+        on_log(format_log("gh", "pr", "ERROR", f"failed: {exc}"))
+        return None
+
+    if not pr_url:
+        on_log(
+            format_log(
+                "gh",
+                "pr",
+                "INFO",
+                "[5/6] Branch pushed; PR creation skipped (gh disabled or missing)",
+            )
+        )
+        return None
+    on_log(format_log("gh", "pr", "INFO", f"[6/6] PR created successfully: {pr_url}"))
+    return pr_url
+
+
+def log_git_steps(draft: PullRequestDraft, on_log: Callable[[str], None]) -> None:
+    if draft.session.steps:
+        on_log(format_log("gh", "pr", "DEBUG", f"git steps: {draft.session.summary()}"))
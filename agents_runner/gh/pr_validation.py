@@ -107,6 +107,11 @@ def _validate_gh_cli(use_gh: bool) -> tuple[bool, str]:
     if not use_gh:
         return (True, "gh CLI disabled")
 
+    from .rest_client import github_rest_client
+
+    if github_rest_client() is not None:
+        return (True, "using the GitHub REST API")
+
     # Check if gh is installed
     try:
         result = subprocess.run(
@@ -124,26 +129,33 @@ def _validate_gh_cli(use_gh: bool) -> tuple[bool, str]:
     except Exception as exc:
         return (False, f"gh CLI check failed: {exc}")
 
-    # Check authentication
-    try:
-        result = subprocess.run(
-            ["gh", "auth", "status"],
-            capture_output=True,
-            text=True,
-            timeout=10.0,
-        )
-        if result.returncode != 0:
-            return (False, "gh CLI not authenticated (run 'gh auth login')")
-    except subprocess.TimeoutExpired:
-        return (False, "gh auth status check timed out")
-    except Exception as exc:
-        return (False, f"gh auth check failed: {exc}")
+    # Check authentication (shared with other tasks finalizing right now)
+    from .gh_cli import gh_is_authenticated
+
+    if not gh_is_authenticated():
+        return (False, "gh CLI not authenticated (run 'gh auth login')")
 
     return (True, "gh CLI ready")
 
 
 def check_existing_pr(repo_root: str, branch: str) -> str | None:
-    """Check if PR already exists for branch. Returns PR URL or None."""
+    """Check if PR already exists for branch. Returns PR URL or None.
+
+    Uses the REST client when it is enabled, otherwise (or if the API call
+    fails) `gh pr list`.
+    """
+    from .rest_client import GitHubApiError
+    from .rest_client import github_rest_client
+    from .rest_client import repo_slug
+
+    client = github_rest_client()
+    slug = repo_slug(repo_root) if client is not None else None
+    if client is not None and slug is not None:
+        try:
+            return client.find_pull_request(slug[0], slug[1], branch)
+        except GitHubApiError:
+            pass
+
     try:
         result = subprocess.run(
             ["gh", "pr", "list", "--head", branch, "--json", "url", "--jq", ".[0].url"],
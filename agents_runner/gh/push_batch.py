@@ -0,0 +1,235 @@
+"""Batched `git push` for task branches that share a remote.
+
+Every finished task lives in its own clone, so a burst of tasks against one
+repository used to open one push connection (and one auth handshake) per
+task. A push to a remote nothing else is pushing to goes out right away.
+Requests that arrive while a push to the same remote is in flight are
+collected for a short window instead. The first clone in a batch fetches the other clones' branches over
+the local filesystem into a private ref namespace, then pushes every branch
+in a single ``git push --porcelain``. Branches the batched push did not
+confirm are pushed from their own clone as before.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from dataclasses import field
+
+from .branch_cache import repo_cache_key
+from .errors import GhManagementError
+from .git_ops import git_remote_url
+from .process import _expand_dir
+from .process import _require_ok
+from .process import _run
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW_S = 0.5
+DEFAULT_MAX_BATCH = 16
+_BATCH_REF_PREFIX = "refs/agents-runner/push/"
+# Porcelain flags for refs the remote accepted (or already had).
+_PUSH_OK_FLAGS = frozenset(" +-*=")
+
+
+@dataclass(slots=True)
+class _PushRequest:
+    repo_root: str
+    branch: str
+    done: threading.Event = field(default_factory=threading.Event)
+    pushed: bool = False
+
+
+@dataclass(slots=True)
+class _Batch:
+    requests: list[_PushRequest] = field(default_factory=list)
+    closed: bool = False
+
+
+def parse_push_porcelain(output: str) -> dict[str, bool]:
+    """Map destination refs to accepted/rejected from ``push --porcelain``."""
+    results: dict[str, bool] = {}
+    for line in (output or "").splitlines():
+        parts = line.split("\t")
+        if len(parts) < 2 or len(parts[0]) != 1 or ":" not in parts[1]:
+            continue
+        _src, _, dst = parts[1].partition(":")
+        results[dst] = parts[0] in _PUSH_OK_FLAGS
+    return results
+
+
+def push_branch(repo_root: str, branch: str, *, timeout_s: float = 180.0) -> None:
+    """``git push -u origin <branch>`` from the task's own clone."""
+    proc = _run(
+        ["git", "-C", repo_root, "push", "-u", "origin", branch], timeout_s=timeout_s
+    )
+    _require_ok(proc, args=["git", "push"])
+
+
+class PushBatcher:
+    """Groups concurrent pushes to the same remote into one `git push`."""
+
+    def __init__(
+        self,
+        *,
+        window_s: float = DEFAULT_WINDOW_S,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        remote_url: Callable[[str], str | None] = git_remote_url,
+    ) -> None:
+        self._window_s = max(0.0, float(window_s))
+        self._max_batch = max(1, int(max_batch))
+        self._remote_url = remote_url
+        self._lock = threading.Lock()
+        self._open: dict[str, _Batch] = {}
+        # Remote key -> pushes in flight (solo or batched).
+        self._active: dict[str, int] = {}
+        self.batches_pushed = 0
+
+    def push(self, repo_root: str, branch: str, *, timeout_s: float = 180.0) -> None:
+        """Push ``branch`` from ``repo_root``, sharing a push when possible.
+
+        Blocks until the branch is on the remote; raises GhManagementError
+        when the push fails.
+        """
+        repo_root = _expand_dir(repo_root)
+        key = repo_cache_key(self._remote_url(repo_root) or "")
+        if not key:
+            push_branch(repo_root, branch, timeout_s=timeout_s)
+            return
+
+        with self._lock:
+            busy = self._active.get(key, 0)
+            self._active[key] = busy + 1
+        try:
+            if not busy:
+                # Nothing to batch with; waiting out a window would only add
+                # latency to the common single-task case.
+                push_branch(repo_root, branch, timeout_s=timeout_s)
+            else:
+                self._push_batched(key, repo_root, branch, timeout_s=timeout_s)
+        finally:
+            with self._lock:
+                remaining = self._active.get(key, 1) - 1
+                if remaining > 0:
+                    self._active[key] = remaining
+                else:
+                    self._active.pop(key, None)
+
+    def _push_batched(
+        self, key: str, repo_root: str, branch: str, *, timeout_s: float
+    ) -> None:
+        request = _PushRequest(repo_root, branch)
+        with self._lock:
+            batch = self._open.get(key)
+            leader = batch is None
+            if batch is None:
+                batch = self._open[key] = _Batch()
+            batch.requests.append(request)
+            if len(batch.requests) >= self._max_batch:
+                self._close_locked(key, batch)
+
+        if leader:
+            if self._window_s:
+                time.sleep(self._window_s)
+            with self._lock:
+                self._close_locked(key, batch)
+            try:
+                self._flush(batch.requests, timeout_s=timeout_s)
+            finally:
+                for item in batch.requests:
+                    item.done.set()
+        else:
+            request.done.wait()
+
+        if not request.pushed:
+            push_branch(repo_root, branch, timeout_s=timeout_s)
+
+    def _close_locked(self, key: str, batch: _Batch) -> None:
+        if not batch.closed:
+            batch.closed = True
+            if self._open.get(key) is batch:
+                del self._open[key]
+
+    def _flush(self, requests: list[_PushRequest], *, timeout_s: float) -> None:
+        if len(requests) < 2:
+            return
+        leader = requests[0]
+        refspecs = [f"refs/heads/{leader.branch}:refs/heads/{leader.branch}"]
+        staged: list[tuple[_PushRequest, str]] = []
+        try:
+            for item in requests[1:]:
+                local_ref = _BATCH_REF_PREFIX + item.branch
+                proc = _run(
+                    [
+                        "git",
+                        "-C",
+                        leader.repo_root,
+                        "fetch",
+                        "--no-tags",
+                        "--quiet",
+                        item.repo_root,
+                        f"+refs/heads/{item.branch}:{local_ref}",
+                    ],
+                    timeout_s=60.0,
+                )
+                if proc.returncode == 0:
+                    staged.append((item, local_ref))
+                    refspecs.append(f"{local_ref}:refs/heads/{item.branch}")
+            if not staged:
+                return
+            proc = _run(
+                ["git", "-C", leader.repo_root, "push", "--porcelain", "origin"]
+                + refspecs,
+                timeout_s=timeout_s,
+            )
+            accepted = parse_push_porcelain(proc.stdout or "")
+            self.batches_pushed += 1
+            for item in (leader, *(item for item, _ in staged)):
+                if accepted.get(f"refs/heads/{item.branch}"):
+                    item.pushed = _record_upstream(item.repo_root, item.branch)
+            logger.debug(
+                "batched push of %d branches (%d accepted)",
+                len(refspecs),
+                sum(1 for item in requests if item.pushed),
+            )
+        except GhManagementError as exc:
+            logger.debug("batched push failed; pushing individually: %s", exc)
+        finally:
+            for _item, local_ref in staged:
+                try:
+                    _run(
+                        ["git", "-C", leader.repo_root, "update-ref", "-d", local_ref],
+                        timeout_s=10.0,
+                    )
+                except GhManagementError:
+                    pass
+
+
+def _record_upstream(repo_root: str, branch: str) -> bool:
+    """What ``push -u`` would have recorded, without touching the network."""
+    try:
+        for args in (
+            ["update-ref", f"refs/remotes/origin/{branch}", f"refs/heads/{branch}"],
+            ["config", f"branch.{branch}.remote", "origin"],
+            ["config", f"branch.{branch}.merge", f"refs/heads/{branch}"],
+        ):
+            if _run(["git", "-C", repo_root, *args], timeout_s=10.0).returncode != 0:
+                return False
+    except GhManagementError:
+        return False
+    return True
+
+
+_batcher_lock = threading.Lock()
+_batcher: PushBatcher | None = None
+
+
+def push_batcher() -> PushBatcher:
+    global _batcher
+    with _batcher_lock:
+        if _batcher is None:
+            _batcher = PushBatcher()
+        return _batcher
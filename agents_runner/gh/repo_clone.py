@@ -1,6 +1,8 @@
 import os
 import subprocess
 import time
+from dataclasses import dataclass
+from typing import Any
 
 from .errors import GhManagementError
 from .gh_cli import is_gh_available
@@ -8,6 +10,93 @@ from .git_ops import is_git_repo
 from .process import _expand_dir, _is_empty_dir, _require_ok, _run
 
 
+@dataclass(frozen=True, slots=True)
+class CloneOptions:
+    """How much of a repository a task clone fetches and checks out.
+
+    ``partial`` clones with ``--filter=blob:none`` (file contents are fetched
+    on demand), ``depth`` > 0 makes a shallow clone of that many commits, and
+    ``sparse_paths`` limits the working tree to those paths.
+    """
+
+    partial: bool = False
+    depth: int = 0
+    sparse_paths: tuple[str, ...] = ()
+
+    @property
+    def is_full(self) -> bool:
+        return not (self.partial or self.depth > 0 or self.sparse_paths)
+
+    def git_clone_args(self) -> list[str]:
+        args: list[str] = []
+        if self.partial:
+            args.append("--filter=blob:none")
+        if self.depth > 0:
+            # --depth implies --single-branch; keep every branch so the base
+            # branch and later fetches still resolve.
+            args += ["--depth", str(self.depth), "--no-single-branch"]
+        if self.sparse_paths:
+            args.append("--sparse")
+        return args
+
+
+def parse_sparse_paths(value: str | list[str] | tuple[str, ...]) -> tuple[str, ...]:
+    """Sparse-checkout paths from a list or newline/comma separated text."""
+    items = (
+        value
+        if isinstance(value, (list, tuple))
+        else str(value or "").replace(",", "\n").splitlines()
+    )
+    paths: list[str] = []
+    for item in items:
+        path = str(item or "").strip().strip("/")
+        if path and path not in paths:
+            paths.append(path)
+    return tuple(paths)
+
+
+def clone_options_for_environment(env: Any) -> CloneOptions:
+    """The environment's clone settings (full clone when unset)."""
+    if env is None:
+        return CloneOptions()
+    try:
+        depth = max(0, int(getattr(env, "clone_depth", 0) or 0))
+    except (TypeError, ValueError):
+        depth = 0
+    return CloneOptions(
+        partial=bool(getattr(env, "clone_partial", False)),
+        depth=depth,
+        sparse_paths=parse_sparse_paths(getattr(env, "clone_sparse_paths", ()) or ()),
+    )
+
+
+def apply_sparse_checkout(dest_dir: str, paths: tuple[str, ...]) -> None:
+    """Limit the working tree to ``paths`` (cone mode for plain directories).
+
+    With no paths, a sparse checkout left by earlier settings is disabled so
+    the whole tree comes back.
+    """
+    dest_dir = _expand_dir(dest_dir)
+    if not paths:
+        proc = _run(
+            ["git", "-C", dest_dir, "config", "--bool", "core.sparseCheckout"],
+            timeout_s=30.0,
+        )
+        if (proc.stdout or "").strip() != "true":
+            return
+        proc = _run(
+            ["git", "-C", dest_dir, "sparse-checkout", "disable"], timeout_s=300.0
+        )
+        _require_ok(proc, args=["git", "sparse-checkout", "disable"])
+        return
+    cone = not any(ch in path for path in paths for ch in "*?[!")
+    args = ["git", "-C", dest_dir, "sparse-checkout", "set"]
+    if not cone:
+        args.append("--no-cone")
+    proc = _run([*args, *paths], timeout_s=120.0)
+    _require_ok(proc, args=["git", "sparse-checkout", "set"])
+
+
 def _normalize_repo_slug(value: str) -> str:
     value = (value or "").strip()
     if not value:
@@ -91,7 +180,9 @@ def ensure_github_clone(
     *,
     prefer_gh: bool = True,
     recreate_if_needed: bool = False,
+    options: CloneOptions | None = None,
 ) -> None:
+    options = options or CloneOptions()
     repo = (repo or "").strip()
     if not repo:
         raise GhManagementError("missing GitHub repo")
@@ -117,6 +208,9 @@ def ensure_github_clone(
                         f"destination contains a different repo ({existing}), expected {desired}: {dest_dir}\n"
                         "delete it (or pick a different workspace) and try again"
                     )
+            else:
+                # Keep an existing clone's sparse set in sync with the settings.
+                apply_sparse_checkout(dest_dir, options.sparse_paths)
             return
         if os.path.isfile(dest_dir):
             raise GhManagementError(f"destination exists but is a file: {dest_dir}")
@@ -140,13 +234,19 @@ def ensure_github_clone(
                 "delete it (or pick a different workspace) and try again"
             )
 
+    clone_args = options.git_clone_args()
     proc: subprocess.CompletedProcess[str]
     if prefer_gh and is_gh_available():
-        proc = _run(["gh", "repo", "clone", repo, dest_dir], timeout_s=300.0)
+        gh_args = ["gh", "repo", "clone", repo, dest_dir]
+        if clone_args:
+            gh_args += ["--", *clone_args]
+        proc = _run(gh_args, timeout_s=300.0)
     else:
         proc = subprocess.CompletedProcess(
             args=["gh"], returncode=127, stdout="", stderr="gh not found"
         )
     if proc.returncode != 0:
-        proc = _run(["git", "clone", repo, dest_dir], timeout_s=300.0)
+        proc = _run(["git", "clone", *clone_args, repo, dest_dir], timeout_s=300.0)
     _require_ok(proc, args=["clone", repo, dest_dir])
+    if options.sparse_paths:
+        apply_sparse_checkout(dest_dir, options.sparse_paths)
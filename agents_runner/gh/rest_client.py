@@ -0,0 +1,376 @@
+"""In-process GitHub REST client.
+
+An optional alternative to shelling out to `gh` for the few API calls the
+runner makes (existing-PR lookup, PR creation, repo metadata). One client
+keeps a small pool of keep-alive connections, so concurrent callers do not
+wait on each other's round trips, sends ``If-None-Match`` for GETs
+it has seen before (a 304 is served from the local cache and does not count
+against the rate limit) and tracks the ``X-RateLimit-*`` headers so it can
+refuse requests until the window resets instead of hammering the API.
+
+The client is enabled with ``AGENTS_RUNNER_GITHUB_API``: ``1``/``true`` for
+api.github.com, or a base URL (GitHub Enterprise, a local stub server).
+Without it, or without a token, ``github_rest_client`` returns None and
+callers keep using `gh`.
+"""
+
+from __future__ import annotations
+
+import http.client
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import urlencode
+from urllib.parse import urlsplit
+
+from agents_runner.github_token import cached_github_token
+from agents_runner.security.token_redaction import redact_tokens
+
+from .errors import GhManagementError
+from .git_ops import git_remote_url
+from .git_ops import parse_github_url
+
+logger = logging.getLogger(__name__)
+
+API_ENV = "AGENTS_RUNNER_GITHUB_API"
+DEFAULT_API_URL = "https://api.github.com"
+_API_VERSION = "2022-11-28"
+_MAX_CACHED_RESPONSES = 256
+# Idle keep-alive connections kept for reuse; busier moments open more.
+_MAX_IDLE_CONNECTIONS = 4
+# Connection errors that mean a reused keep-alive socket was closed under us.
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    BrokenPipeError,
+    ConnectionResetError,
+)
+
+
+class GitHubApiError(GhManagementError):
+    def __init__(self, message: str, *, status: int = 0) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class GitHubRateLimited(GitHubApiError):
+    def __init__(self, message: str, *, status: int = 0, reset_at: float = 0.0):
+        super().__init__(message, status=status)
+        self.reset_at = reset_at
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimit:
+    limit: int | None = None
+    remaining: int | None = None
+    # Unix time when the window resets.
+    reset_at: float | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class ApiResponse:
+    status: int
+    data: Any
+    from_cache: bool = False
+
+
+def _int_header(headers: http.client.HTTPMessage, name: str) -> int | None:
+    value = headers.get(name)
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class GitHubRestClient:
+    """Thread-safe GitHub REST client over pooled keep-alive connections.
+
+    The lock only guards the ETag cache, the rate-limit state and the idle
+    connection pool; requests themselves run unlocked, each on a connection
+    checked out of the pool.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        *,
+        api_url: str = DEFAULT_API_URL,
+        timeout_s: float = 15.0,
+    ) -> None:
+        parts = urlsplit(api_url.rstrip("/"))
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"unsupported GitHub API URL: {api_url}")
+        self.api_url = api_url.rstrip("/")
+        self._scheme = parts.scheme
+        self._host = parts.hostname
+        self._port = parts.port
+        self._base_path = parts.path
+        self._token = token
+        self._timeout_s = float(timeout_s)
+        self._lock = threading.Lock()
+        self._idle: list[http.client.HTTPConnection] = []
+        # Bumped by close(); connections from an older generation are not
+        # returned to the pool.
+        self._generation = 0
+        self._etags: OrderedDict[str, tuple[str, Any]] = OrderedDict()
+        self._rate_limit = RateLimit()
+        self.connections_opened = 0
+
+    @property
+    def rate_limit(self) -> RateLimit:
+        return self._rate_limit
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+            self._generation += 1
+        for conn in idle:
+            conn.close()
+
+    def _checkout(self) -> tuple[http.client.HTTPConnection, bool, int]:
+        """An idle connection (reused=True) or a new one, plus its generation."""
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True, self._generation
+            self.connections_opened += 1
+            generation = self._generation
+        if self._scheme == "https":
+            conn: http.client.HTTPConnection = http.client.HTTPSConnection(
+                self._host, self._port, timeout=self._timeout_s
+            )
+        else:
+            conn = http.client.HTTPConnection(
+                self._host, self._port, timeout=self._timeout_s
+            )
+        return conn, False, generation
+
+    def _checkin(self, conn: http.client.HTTPConnection, generation: int) -> None:
+        with self._lock:
+            if (
+                generation == self._generation
+                and len(self._idle) < _MAX_IDLE_CONNECTIONS
+            ):
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        query: dict[str, str] | None = None,
+        payload: dict[str, Any] | None = None,
+    ) -> ApiResponse:
+        """Send one request; raises GitHubApiError on HTTP or transport errors."""
+        url = self._base_path + path
+        if query:
+            url += "?" + urlencode(query)
+        headers = {
+            "Accept": "application/vnd.github+json",
+            "Authorization": f"Bearer {self._token}",
+            "User-Agent": "agents-runner",
+            "X-GitHub-Api-Version": _API_VERSION,
+        }
+        body: bytes | None = None
+        if payload is not None:
+            body = json.dumps(payload).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+
+        with self._lock:
+            self._check_rate_limit_locked()
+            cached = self._etags.get(url) if method == "GET" else None
+        if cached is not None:
+            headers["If-None-Match"] = cached[0]
+        status, resp_headers, raw = self._send(method, url, headers, body)
+
+        data: Any = None
+        if raw and status != 304:
+            try:
+                data = json.loads(raw.decode("utf-8"))
+            except ValueError:
+                data = None
+
+        with self._lock:
+            self._update_rate_limit_locked(resp_headers)
+            if status == 304 and cached is not None:
+                if url in self._etags:
+                    self._etags.move_to_end(url)
+                return ApiResponse(status=200, data=cached[1], from_cache=True)
+            etag = resp_headers.get("ETag")
+            if method == "GET" and etag and status == 200:
+                self._etags[url] = (etag, data)
+                self._etags.move_to_end(url)
+                while len(self._etags) > _MAX_CACHED_RESPONSES:
+                    self._etags.popitem(last=False)
+
+        if status >= 400:
+            self._raise_for_status(status, data)
+        return ApiResponse(status=status, data=data)
+
+    def _send(
+        self, method: str, url: str, headers: dict[str, str], body: bytes | None
+    ) -> tuple[int, http.client.HTTPMessage, bytes]:
+        for _ in range(2):
+            conn, reused, generation = self._checkout()
+            try:
+                conn.request(method, url, body=body, headers=headers)
+                resp = conn.getresponse()
+                raw = resp.read()
+            except _STALE_CONNECTION_ERRORS as exc:
+                conn.close()
+                if reused:
+                    # The server closed the idle connection; retry on a new one.
+                    continue
+                raise GitHubApiError(f"{method} {url} failed: {exc}") from exc
+            except (OSError, http.client.HTTPException) as exc:
+                conn.close()
+                raise GitHubApiError(f"{method} {url} failed: {exc}") from exc
+            if resp.will_close:
+                conn.close()
+            else:
+                self._checkin(conn, generation)
+            return resp.status, resp.headers, raw
+        raise GitHubApiError(f"{method} {url} failed: connection closed")
+
+    def _check_rate_limit_locked(self) -> None:
+        limit = self._rate_limit
+        if limit.remaining != 0 or limit.reset_at is None:
+            return
+        if time.time() < limit.reset_at:
+            raise GitHubRateLimited(
+                "GitHub API rate limit exhausted; resets at "
+                + time.strftime("%H:%M:%S", time.localtime(limit.reset_at)),
+                reset_at=limit.reset_at,
+            )
+
+    def _update_rate_limit_locked(self, headers: http.client.HTTPMessage) -> None:
+        remaining = _int_header(headers, "X-RateLimit-Remaining")
+        if remaining is None:
+            return
+        limit = _int_header(headers, "X-RateLimit-Limit")
+        reset = _int_header(headers, "X-RateLimit-Reset")
+        self._rate_limit = RateLimit(
+            limit=limit,
+            remaining=remaining,
+            reset_at=float(reset) if reset is not None else None,
+        )
+        if limit and remaining < max(1, limit // 10):
+            logger.warning("GitHub API rate limit low: %s/%s left", remaining, limit)
+
+    def _raise_for_status(self, status: int, data: Any) -> None:
+        message = ""
+        if isinstance(data, dict):
+            message = str(data.get("message") or "")
+            errors = data.get("errors")
+            if isinstance(errors, list):
+                details = [
+                    str(e.get("message") or "") for e in errors if isinstance(e, dict)
+                ]
+                message = "; ".join([message, *filter(None, details)]).strip("; ")
+        message = redact_tokens(message) or f"HTTP {status}"
+        limit = self._rate_limit
+        if status in (403, 429) and (
+            limit.remaining == 0 or "rate limit" in message.lower()
+        ):
+            raise GitHubRateLimited(
+                message, status=status, reset_at=limit.reset_at or 0.0
+            )
+        raise GitHubApiError(message, status=status)
+
+    def repo(self, owner: str, repo: str) -> dict[str, Any]:
+        data = self.request("GET", f"/repos/{owner}/{repo}").data
+        return data if isinstance(data, dict) else {}
+
+    def find_pull_request(self, owner: str, repo: str, head: str) -> str | None:
+        """URL of the open PR whose head is ``owner:head``, if any."""
+        data = self.request(
+            "GET",
+            f"/repos/{owner}/{repo}/pulls",
+            query={"head": f"{owner}:{head}", "state": "open", "per_page": "1"},
+        ).data
+        if isinstance(data, list) and data and isinstance(data[0], dict):
+            url = str(data[0].get("html_url") or "")
+            return url or None
+        return None
+
+    def create_pull_request(
+        self,
+        owner: str,
+        repo: str,
+        *,
+        head: str,
+        base: str,
+        title: str,
+        body: str,
+    ) -> str:
+        """Open a PR and return its URL (or the existing PR's URL)."""
+        try:
+            data = self.request(
+                "POST",
+                f"/repos/{owner}/{repo}/pulls",
+                payload={"head": head, "base": base, "title": title, "body": body},
+            ).data
+        except GitHubApiError as exc:
+            if exc.status == 422 and "already exists" in str(exc).lower():
+                existing = self.find_pull_request(owner, repo, head)
+                if existing:
+                    return existing
+            raise
+        url = str(data.get("html_url") or "") if isinstance(data, dict) else ""
+        if not url:
+            raise GitHubApiError("PR created but the response has no html_url")
+        return url
+
+
+_clients_lock = threading.Lock()
+_clients: dict[tuple[str, str], GitHubRestClient] = {}
+
+
+def configured_api_url() -> str | None:
+    """API base URL from ``AGENTS_RUNNER_GITHUB_API``, or None when disabled."""
+    value = (os.environ.get(API_ENV) or "").strip()
+    if not value or value.lower() in ("0", "false", "no", "off"):
+        return None
+    if value.lower() in ("1", "true", "yes", "on"):
+        return DEFAULT_API_URL
+    return value.rstrip("/")
+
+
+def github_rest_client() -> GitHubRestClient | None:
+    """The shared client, or None when the API is not enabled or no token."""
+    api_url = configured_api_url()
+    if api_url is None:
+        return None
+    host = urlsplit(api_url).hostname or "github.com"
+    if host in ("api.github.com", "127.0.0.1", "localhost"):
+        host = "github.com"
+    token = cached_github_token(host=host)
+    if not token:
+        return None
+    with _clients_lock:
+        client = _clients.get((api_url, token))
+        if client is None:
+            try:
+                client = GitHubRestClient(token, api_url=api_url)
+            except ValueError as exc:
+                logger.warning("%s ignored: %s", API_ENV, exc)
+                return None
+            # A rotated token replaces the old client.
+            for key in [k for k in _clients if k[0] == api_url]:
+                _clients.pop(key).close()
+            _clients[(api_url, token)] = client
+        return client
+
+
+def repo_slug(repo_root: str) -> tuple[str, str] | None:
+    """(owner, repo) parsed from the origin remote, if it is on GitHub."""
+    owner, name = parse_github_url(git_remote_url(repo_root) or "")
+    if not owner or not name:
+        return None
+    return owner, name
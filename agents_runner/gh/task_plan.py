@@ -1,19 +1,27 @@
 import re
 
+from collections.abc import Callable
 from dataclasses import dataclass
 
 from ..agent_display import format_agent_markdown_link
 from ..prompts.loader import load_prompt
+from .branch_cache import cached_remote_branches
+from .branch_cache import note_pushed_branch
 from .errors import GhManagementError
+from .gh_cli import gh_is_authenticated
 from .gh_cli import is_gh_available
 from .git_ops import (
     git_current_branch,
     git_default_base_branch,
-    git_is_clean,
     git_list_branches,
     git_repo_root,
 )
+from .git_session import GitSession
 from .pr_retry import with_retry
+from .rest_client import GitHubApiError
+from .rest_client import GitHubRateLimited
+from .rest_client import github_rest_client
+from .rest_client import repo_slug
 from .process import _expand_dir, _require_ok, _run
 
 _TASK_BRANCH_PREFIXES: tuple[str, ...] = ("midoriaiagents/",)
@@ -70,12 +78,27 @@ def _is_task_branch(branch: str) -> bool:
     return any(branch.startswith(prefix) for prefix in _TASK_BRANCH_PREFIXES)
 
 
+def _api_default_branch(repo_root: str) -> str | None:
+    client = github_rest_client()
+    slug = repo_slug(repo_root) if client is not None else None
+    if client is None or slug is None:
+        return None
+    try:
+        branch = str(client.repo(*slug).get("default_branch") or "").strip()
+    except GitHubApiError:
+        return None
+    return branch or None
+
+
 def _pick_auto_base_branch(repo_root: str) -> str:
     repo_root = _expand_dir(repo_root)
     default = git_default_base_branch(repo_root)
     if default:
         return default
-    branches = git_list_branches(repo_root)
+    default = _api_default_branch(repo_root)
+    if default:
+        return default
+    branches = git_list_branches(repo_root) or cached_remote_branches(repo_root)
     if branches:
         for name in _COMMON_BASE_BRANCHES:
             if name in branches:
@@ -87,40 +110,25 @@ def _pick_auto_base_branch(repo_root: str) -> str:
     return "main"
 
 
-def _has_origin_branch(repo_root: str, branch: str) -> bool:
-    repo_root = _expand_dir(repo_root)
-    branch = (branch or "").strip()
-    if not branch:
-        return False
-    proc = _run(
-        [
-            "git",
-            "-C",
-            repo_root,
-            "show-ref",
-            "--verify",
-            "--quiet",
-            f"refs/remotes/origin/{branch}",
-        ],
-        timeout_s=8.0,
-    )
-    return proc.returncode == 0
+def resolve_base_branch(repo_root: str, base_branch: str = "") -> str:
+    """``base_branch`` if set, otherwise the repository's auto-picked base."""
+    return str(base_branch or "").strip() or _pick_auto_base_branch(repo_root)
 
 
-def _update_base_branch_from_origin(repo_root: str, base_branch: str) -> None:
-    repo_root = _expand_dir(repo_root)
+def _update_base_branch_from_origin(session: GitSession, base_branch: str) -> None:
     base_branch = (base_branch or "").strip()
     if not base_branch:
         return
-    if not _has_origin_branch(repo_root, base_branch):
+    origin_ref = f"origin/{base_branch}"
+    status = session.status()
+    if status.upstream == origin_ref and status.behind is not None:
+        # Tracking branch: porcelain v2 already tells us whether to merge.
+        # (No ``branch.ab`` line means the upstream is gone.)
+        if status.behind == 0:
+            return
+    elif not session.has_ref(f"refs/remotes/{origin_ref}"):
         return
-    _require_ok(
-        _run(
-            ["git", "-C", repo_root, "merge", "--ff-only", f"origin/{base_branch}"],
-            timeout_s=120.0,
-        ),
-        args=["git", "merge", "--ff-only"],
-    )
+    session.require("merge", "--ff-only", origin_ref, timeout_s=120.0)
 
 
 def prepare_branch_for_task(
@@ -128,13 +136,14 @@ def prepare_branch_for_task(
     *,
     branch: str,
     base_branch: str | None = None,
+    session: GitSession | None = None,
 ) -> tuple[str, str]:
-    repo_root = _expand_dir(repo_root)
+    session = session or GitSession(repo_root)
+    repo_root = session.repo_root
 
     # Fetch with retry for transient network issues
     def _fetch_with_retry() -> None:
-        proc = _run(["git", "-C", repo_root, "fetch", "--prune"], timeout_s=120.0)
-        _require_ok(proc, args=["git", "fetch"])
+        session.require("fetch", "--prune", timeout_s=120.0)
 
     with_retry(
         _fetch_with_retry,
@@ -143,36 +152,19 @@ def prepare_branch_for_task(
     )
     desired_base = str(base_branch or "").strip()
     base_branch = desired_base or _pick_auto_base_branch(repo_root)
-    checkout_proc = _run(
-        ["git", "-C", repo_root, "checkout", "-f", base_branch], timeout_s=20.0
-    )
+    checkout_proc = session.run("checkout", "-f", base_branch, timeout_s=20.0)
     if checkout_proc.returncode != 0:
-        _require_ok(
-            _run(
-                [
-                    "git",
-                    "-C",
-                    repo_root,
-                    "checkout",
-                    "-B",
-                    base_branch,
-                    f"origin/{base_branch}",
-                ],
-                timeout_s=20.0,
-            ),
-            args=["git", "checkout", "-B", base_branch],
+        session.require(
+            "checkout", "-B", base_branch, f"origin/{base_branch}", timeout_s=20.0
         )
-    _update_base_branch_from_origin(repo_root, base_branch)
+    _update_base_branch_from_origin(session, base_branch)
 
-    if not git_is_clean(repo_root):
+    if not session.status().clean:
         raise GhManagementError(
             "repo has uncommitted changes; commit/stash before running"
         )
 
-    _require_ok(
-        _run(["git", "-C", repo_root, "checkout", "-B", branch], timeout_s=20.0),
-        args=["git", "checkout", "-B"],
-    )
+    session.require("checkout", "-B", branch, timeout_s=20.0)
     return base_branch, branch
 
 
@@ -202,7 +194,9 @@ def _find_next_available_branch(
     """
     from .pr_validation import check_existing_pr
 
-    existing_branches = git_list_branches(repo_root)
+    # Remote branches pushed since our last fetch count as taken too.
+    existing_branches = set(git_list_branches(repo_root))
+    existing_branches.update(cached_remote_branches(repo_root))
 
     # Try base name first (without number suffix)
     if base_branch_name not in existing_branches:
@@ -267,83 +261,61 @@ def commit_push_and_pr(
     use_gh: bool = True,
     agent_cli: str = "",
     agent_cli_args: str = "",
+    session: GitSession | None = None,
 ) -> str | None:
-    repo_root = _expand_dir(repo_root)
-    base_branch = str(base_branch or "").strip() or _pick_auto_base_branch(repo_root)
-    body = _append_pr_attribution_footer(
-        body, agent_cli=agent_cli, agent_cli_args=agent_cli_args
+    session = session or GitSession(repo_root)
+    base_branch = resolve_base_branch(session.repo_root, base_branch)
+    if not commit_task_changes(
+        session, branch=branch, base_branch=base_branch, title=title
+    ):
+        return None
+    push_task_branch(session, branch)
+    return open_task_pull_request(
+        session,
+        branch=branch,
+        base_branch=base_branch,
+        title=title,
+        body=body,
+        use_gh=use_gh,
+        agent_cli=agent_cli,
+        agent_cli_args=agent_cli_args,
     )
 
-    def _porcelain_status() -> str:
-        proc = _run(["git", "-C", repo_root, "status", "--porcelain"], timeout_s=15.0)
-        _require_ok(proc, args=["git", "status"])
-        return str(proc.stdout or "")
+
+def commit_task_changes(
+    session: GitSession, *, branch: str, base_branch: str, title: str
+) -> bool:
+    """Commit the working tree on ``branch``; False when there is nothing to push."""
 
     def _ensure_local_branch() -> None:
-        branch_ref = f"refs/heads/{branch}"
-        exists_proc = _run(
-            ["git", "-C", repo_root, "show-ref", "--verify", "--quiet", branch_ref],
-            timeout_s=8.0,
-        )
-        if exists_proc.returncode == 0:
+        if session.has_ref(f"refs/heads/{branch}"):
             return
-        create_proc = _run(
-            ["git", "-C", repo_root, "branch", branch, base_branch], timeout_s=20.0
-        )
+        create_proc = session.run("branch", branch, base_branch, timeout_s=20.0)
         if create_proc.returncode != 0:
-            create_proc = _run(
-                ["git", "-C", repo_root, "branch", branch, f"origin/{base_branch}"],
-                timeout_s=20.0,
+            create_proc = session.run(
+                "branch", branch, f"origin/{base_branch}", timeout_s=20.0
             )
         _require_ok(create_proc, args=["git", "branch"])
 
     def _checkout_branch_for_commit() -> None:
-        current = git_current_branch(repo_root)
+        current = session.current_branch()
         if current == branch:
             return
 
         _ensure_local_branch()
-        if not _porcelain_status().strip():
-            _require_ok(
-                _run(["git", "-C", repo_root, "checkout", branch], timeout_s=20.0),
-                args=["git", "checkout"],
-            )
+        if session.status().clean:
+            session.require("checkout", branch, timeout_s=20.0)
             return
 
         # Common case: the repo is dirty on the base branch. If the task branch
         # has no unique commits yet, reset it to the current HEAD so we can
         # switch branches without overwriting local changes.
         if current == base_branch:
-            ahead_proc = _run(
-                [
-                    "git",
-                    "-C",
-                    repo_root,
-                    "rev-list",
-                    "--count",
-                    f"{base_branch}..{branch}",
-                ],
-                timeout_s=10.0,
-            )
-            ahead = None
-            if ahead_proc.returncode == 0:
-                try:
-                    ahead = int((ahead_proc.stdout or "").strip() or "0")
-                except ValueError:
-                    ahead = None
-            if ahead == 0:
-                _require_ok(
-                    _run(
-                        ["git", "-C", repo_root, "checkout", "-B", branch, "HEAD"],
-                        timeout_s=20.0,
-                    ),
-                    args=["git", "checkout", "-B"],
-                )
+            if session.rev_count(f"{base_branch}..{branch}") == 0:
+                session.require("checkout", "-B", branch, "HEAD", timeout_s=20.0)
                 return
 
-        merge_proc = _run(
-            ["git", "-C", repo_root, "checkout", "--merge", branch], timeout_s=20.0
-        )
+        merge_proc = session.run("checkout", "--merge", branch, timeout_s=20.0)
         if merge_proc.returncode != 0:
             combined = (
                 (merge_proc.stdout or "") + "\n" + (merge_proc.stderr or "")
@@ -353,64 +325,105 @@ def commit_push_and_pr(
                 "commit/stash your work (or switch back to the base branch) and rerun PR creation.\n"
                 f"{combined}".rstrip()
             )
-        unmerged_proc = _run(["git", "-C", repo_root, "ls-files", "-u"], timeout_s=8.0)
-        _require_ok(unmerged_proc, args=["git", "ls-files", "-u"])
-        if (unmerged_proc.stdout or "").strip():
+        if session.status().has_unmerged:
             raise GhManagementError(
                 "switching branches resulted in merge conflicts; resolve them and rerun PR creation."
             )
 
     _checkout_branch_for_commit()
 
-    has_worktree_changes = bool(_porcelain_status().strip())
+    has_worktree_changes = not session.status().clean
 
     if has_worktree_changes:
-        _require_ok(
-            _run(["git", "-C", repo_root, "add", "-A"], timeout_s=30.0),
-            args=["git", "add"],
-        )
-        commit_proc = _run(
-            ["git", "-C", repo_root, "commit", "-m", title], timeout_s=60.0
-        )
+        session.require("add", "-A", timeout_s=30.0)
+        commit_proc = session.run("commit", "-m", title, timeout_s=60.0)
         if commit_proc.returncode != 0:
             combined = (commit_proc.stdout or "") + "\n" + (commit_proc.stderr or "")
             if "nothing to commit" not in combined.lower():
                 _require_ok(commit_proc, args=["git", "commit"])
+    else:
+        # Only a clean tree needs the ahead count: is there anything to push?
+        ahead_count = None
+        for base_ref in (base_branch, f"origin/{base_branch}"):
+            ahead_count = session.rev_count(f"{base_ref}..HEAD")
+            if ahead_count is not None:
+                break
+        if ahead_count is not None and ahead_count <= 0:
+            return False
+    return True
+
+
+def push_task_branch(
+    session: GitSession,
+    branch: str,
+    *,
+    push: Callable[[str, str], None] | None = None,
+) -> None:
+    """Push ``branch`` to origin (with retry); ``push`` may batch it with others."""
 
-    ahead_count = None
-    for base_ref in (base_branch, f"origin/{base_branch}"):
-        count_proc = _run(
-            ["git", "-C", repo_root, "rev-list", "--count", f"{base_ref}..HEAD"],
-            timeout_s=15.0,
-        )
-        if count_proc.returncode == 0:
-            try:
-                ahead_count = int((count_proc.stdout or "").strip() or "0")
-            except ValueError:
-                ahead_count = None
-            break
-
-    if not has_worktree_changes and (ahead_count is not None and ahead_count <= 0):
-        return None
-
-    # Push with retry for transient network issues
     def _push_with_retry() -> None:
-        proc = _run(
-            ["git", "-C", repo_root, "push", "-u", "origin", branch], timeout_s=180.0
-        )
-        _require_ok(proc, args=["git", "push"])
+        if push is None:
+            session.require("push", "-u", "origin", branch, timeout_s=180.0)
+            return
+        with session.timed("push"):
+            push(session.repo_root, branch)
+        session.invalidate()
 
     with_retry(
         _push_with_retry,
         operation_name="git push",
         retry_on=(OSError, TimeoutError, GhManagementError),
     )
+    note_pushed_branch(session.repo_root, branch)
+
+
+def open_task_pull_request(
+    session: GitSession,
+    *,
+    branch: str,
+    base_branch: str,
+    title: str,
+    body: str,
+    use_gh: bool = True,
+    agent_cli: str = "",
+    agent_cli_args: str = "",
+) -> str | None:
+    """Open the PR for a pushed branch.
+
+    Returns its URL, or "" when PR creation is disabled or `gh` is missing.
+    """
+    repo_root = session.repo_root
+    body = _append_pr_attribution_footer(
+        body, agent_cli=agent_cli, agent_cli_args=agent_cli_args
+    )
+    if not use_gh:
+        return ""
+
+    client = github_rest_client()
+    slug = repo_slug(repo_root) if client is not None else None
+    if client is not None and slug is not None:
+        try:
+            with session.timed("api pr create"):
+                return client.create_pull_request(
+                    slug[0],
+                    slug[1],
+                    head=branch,
+                    base=base_branch,
+                    title=title,
+                    body=body,
+                )
+        except GitHubRateLimited:
+            raise
+        except GitHubApiError:
+            # Fall back to `gh`, which has its own auth and error reporting.
+            pass
 
-    if not use_gh or not is_gh_available():
+    if not is_gh_available():
         return ""
 
-    auth_proc = _run(["gh", "auth", "status"], timeout_s=10.0)
-    if auth_proc.returncode != 0:
+    with session.timed("gh auth status"):
+        authenticated = gh_is_authenticated()
+    if not authenticated:
         raise GhManagementError("`gh` is not authenticated; run `gh auth login`")
 
     # Create PR with retry for transient network issues
@@ -454,10 +467,11 @@ def commit_push_and_pr(
                         pr_url = line
                         break
 
-    with_retry(
-        _create_pr_with_retry,
-        operation_name="gh pr create",
-        retry_on=(OSError, TimeoutError, GhManagementError),
-    )
+    with session.timed("gh pr create"):
+        with_retry(
+            _create_pr_with_retry,
+            operation_name="gh pr create",
+            retry_on=(OSError, TimeoutError, GhManagementError),
+        )
 
     return pr_url
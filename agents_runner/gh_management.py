@@ -15,6 +15,8 @@ from agents_runner.gh.git_ops import (
     git_repo_root,
     is_git_repo,
 )
+from agents_runner.gh.git_session import GitSession
+from agents_runner.gh.repo_clone import CloneOptions
 from agents_runner.gh.repo_clone import ensure_github_clone
 from agents_runner.gh.task_plan import (
     RepoPlan,
@@ -72,6 +74,7 @@ def prepare_github_repo_for_task(
     prefer_gh: bool = True,
     recreate_if_needed: bool = True,
     on_log: Callable[[str], None] | None = None,
+    clone_options: CloneOptions | None = None,
 ) -> dict[str, str]:
     task_id = str(task_id or "").strip()
     repo = str(repo or "").strip()
@@ -153,11 +156,26 @@ def prepare_github_repo_for_task(
     for attempt in range(2):
         try:
             _log(format_log("gh", "clone", "INFO", f"cloning {repo} -> {dest_dir}"))
+            if clone_options is not None and not clone_options.is_full:
+                _log(
+                    format_log(
+                        "gh",
+                        "clone",
+                        "INFO",
+                        f"clone options: {' '.join(clone_options.git_clone_args())}"
+                        + (
+                            f" (sparse: {', '.join(clone_options.sparse_paths)})"
+                            if clone_options.sparse_paths
+                            else ""
+                        ),
+                    )
+                )
             ensure_github_clone(
                 repo,
                 dest_dir,
                 prefer_gh=bool(prefer_gh),
                 recreate_if_needed=bool(recreate_if_needed),
+                options=clone_options,
             )
 
             result: dict[str, str] = {"repo_root": "", "base_branch": "", "branch": ""}
@@ -182,7 +200,8 @@ def prepare_github_repo_for_task(
                 )
                 return result
 
-            current_branch = git_current_branch(plan.repo_root)
+            session = GitSession(plan.repo_root)
+            current_branch = session.current_branch()
             if current_branch and current_branch == plan.branch:
                 _log(
                     format_log(
@@ -198,7 +217,7 @@ def prepare_github_repo_for_task(
                     "branch": current_branch,
                 }
 
-            if not git_is_clean(plan.repo_root):
+            if not session.status().clean:
                 _log(
                     format_log(
                         "gh",
@@ -225,7 +244,9 @@ def prepare_github_repo_for_task(
                 plan.repo_root,
                 branch=plan.branch,
                 base_branch=plan.base_branch,
+                session=session,
             )
+            _log(format_log("gh", "branch", "DEBUG", f"git steps: {session.summary()}"))
             return {
                 "repo_root": plan.repo_root,
                 "base_branch": resolved_base_branch,
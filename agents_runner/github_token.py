@@ -1,24 +1,36 @@
+import logging
 import os
 import shutil
 import subprocess
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
 
+from agents_runner.security.token_redaction import redact_exception
+from agents_runner.security.token_redaction import redact_tokens
 
-def resolve_github_token(
-    *, host: str = "github.com", timeout_s: float = 8.0
-) -> str | None:
-    """Return a GitHub token from the host environment or `gh`, if available.
+logger = logging.getLogger(__name__)
+
+# `gh auth token` output rarely changes, but a re-login or token rotation on
+# the host should reach new containers without restarting the app.
+DEFAULT_TOKEN_TTL_S = 15 * 60.0
+# Refresh in the background once a cached token is this close to expiry.
+DEFAULT_REFRESH_AHEAD_S = 2 * 60.0
+# How long "no token available" is remembered, so bursts of launches on a
+# host without `gh` login do not each pay for a failing subprocess.
+DEFAULT_NEGATIVE_TTL_S = 30.0
 
-    Preference order:
-      1) `GH_TOKEN`
-      2) `GITHUB_TOKEN`
-      3) `gh auth token -h <host>`
-    """
 
+def _env_github_token() -> str | None:
     for key in ("GH_TOKEN", "GITHUB_TOKEN"):
         value = (os.environ.get(key) or "").strip()
         if value:
             return value
+    return None
 
+
+def _gh_auth_token(host: str, timeout_s: float = 8.0) -> str | None:
     if shutil.which("gh") is None:
         return None
 
@@ -36,10 +48,16 @@ def resolve_github_token(
             text=True,
             timeout=timeout_s,
         )
-    except (OSError, subprocess.TimeoutExpired):
+    except (OSError, subprocess.TimeoutExpired) as exc:
+        logger.debug("gh auth token failed: %s", redact_exception(exc))
         return None
 
     if proc.returncode != 0:
+        logger.debug(
+            "gh auth token exited %s: %s",
+            proc.returncode,
+            redact_tokens((proc.stderr or "").strip()),
+        )
         return None
 
     raw = (proc.stdout or "").strip()
@@ -47,3 +65,168 @@ def resolve_github_token(
         return None
     first = raw.splitlines()[0].strip()
     return first or None
+
+
+def resolve_github_token(
+    *, host: str = "github.com", timeout_s: float = 8.0
+) -> str | None:
+    """Return a GitHub token from the host environment or `gh`, if available.
+
+    Preference order:
+      1) `GH_TOKEN`
+      2) `GITHUB_TOKEN`
+      3) `gh auth token -h <host>`
+
+    This always runs `gh`; launch paths should use ``cached_github_token``.
+    """
+    return _env_github_token() or _gh_auth_token(host, timeout_s)
+
+
+@dataclass
+class _CachedToken:
+    token: str | None
+    expires_at: float
+    generation: int
+    refreshing: bool = False
+
+
+class GitHubTokenProvider:
+    """Process-wide, thread-safe cache in front of `gh auth token`.
+
+    ``GH_TOKEN``/``GITHUB_TOKEN`` in the environment always win and are never
+    cached. Otherwise one `gh` call per host fills the cache; concurrent
+    callers on a cold cache wait for that call instead of starting their own.
+    Tokens close to expiry are served from the cache while a background
+    thread refreshes them. ``invalidate`` drops the cache (e.g. after an auth
+    failure) so the next caller fetches a fresh token.
+
+    Token values are never logged.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_s: float = DEFAULT_TOKEN_TTL_S,
+        refresh_ahead_s: float = DEFAULT_REFRESH_AHEAD_S,
+        negative_ttl_s: float = DEFAULT_NEGATIVE_TTL_S,
+        fetch: Callable[[str], str | None] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl_s = float(ttl_s)
+        self._refresh_ahead_s = min(float(refresh_ahead_s), self._ttl_s)
+        self._negative_ttl_s = float(negative_ttl_s)
+        self._fetch = fetch or _gh_auth_token
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: dict[str, _CachedToken] = {}
+        self._fetch_locks: dict[str, threading.Lock] = {}
+        self._generation = 0
+
+    def get(self, *, host: str = "github.com") -> str | None:
+        env_token = _env_github_token()
+        if env_token:
+            return env_token
+        host = str(host or "github.com").strip() or "github.com"
+
+        token, hit = self._cached(host)
+        if hit:
+            return token
+
+        with self._fetch_lock(host):
+            # Another caller may have filled the cache while we waited.
+            token, hit = self._cached(host, refresh=False)
+            if hit:
+                return token
+            with self._lock:
+                generation = self._generation
+            token = self._fetch_safely(host)
+            self._store(host, token, generation)
+            return token
+
+    def invalidate(self, host: str | None = None) -> None:
+        with self._lock:
+            self._generation += 1
+            if host is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(str(host).strip() or "github.com", None)
+        logger.debug("github token cache invalidated (%s)", host or "all hosts")
+
+    def _fetch_lock(self, host: str) -> threading.Lock:
+        with self._lock:
+            return self._fetch_locks.setdefault(host, threading.Lock())
+
+    def _cached(self, host: str, *, refresh: bool = True) -> tuple[str | None, bool]:
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(host)
+            if entry is None or now >= entry.expires_at:
+                return None, False
+            start_refresh = (
+                refresh
+                and entry.token is not None
+                and not entry.refreshing
+                and now >= entry.expires_at - self._refresh_ahead_s
+            )
+            if start_refresh:
+                entry.refreshing = True
+            token = entry.token
+            generation = entry.generation
+        if start_refresh:
+            threading.Thread(
+                target=self._refresh,
+                args=(host, generation),
+                name="github-token-refresh",
+                daemon=True,
+            ).start()
+        return token, True
+
+    def _refresh(self, host: str, generation: int) -> None:
+        with self._fetch_lock(host):
+            token = self._fetch_safely(host)
+            if token is None:
+                # Keep serving the current token until it expires.
+                with self._lock:
+                    entry = self._entries.get(host)
+                    if entry is not None and entry.generation == generation:
+                        entry.refreshing = False
+                return
+            self._store(host, token, generation)
+
+    def _fetch_safely(self, host: str) -> str | None:
+        try:
+            return self._fetch(host)
+        except Exception as exc:
+            logger.warning("github token lookup failed: %s", redact_exception(exc))
+            return None
+
+    def _store(self, host: str, token: str | None, generation: int) -> None:
+        ttl = self._ttl_s if token else self._negative_ttl_s
+        with self._lock:
+            if generation != self._generation:
+                # Invalidated while fetching; the result may be the stale token.
+                return
+            self._entries[host] = _CachedToken(
+                token=token,
+                expires_at=self._clock() + ttl,
+                generation=generation,
+            )
+        logger.debug(
+            "github token for %s %s", host, "cached" if token else "unavailable"
+        )
+
+
+_provider = GitHubTokenProvider()
+
+
+def github_token_provider() -> GitHubTokenProvider:
+    return _provider
+
+
+def cached_github_token(*, host: str = "github.com") -> str | None:
+    """``resolve_github_token`` through the process-wide cache."""
+    return _provider.get(host=host)
+
+
+def invalidate_github_token(host: str | None = None) -> None:
+    _provider.invalidate(host)
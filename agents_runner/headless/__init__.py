@@ -0,0 +1,14 @@
+"""Headless task runner.
+
+Runs agent tasks without the Qt GUI, either one at a time from the command
+line or from a long-running daemon that accepts submissions over a Unix
+socket. Tasks, settings, environments and cooldowns use the same state files
+as the GUI, so headless runs show up in its task history.
+
+Nothing under this package may import PySide6.
+"""
+
+from agents_runner.headless.runner import HeadlessError
+from agents_runner.headless.runner import HeadlessRunner
+
+__all__ = ["HeadlessError", "HeadlessRunner"]
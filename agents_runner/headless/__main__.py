@@ -0,0 +1,6 @@
+import sys
+
+from agents_runner.headless.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+"""
+Command line for the headless runner.
+
+    python -m agents_runner.headless run --env ENV --prompt-file prompt.md
+    python -m agents_runner.headless daemon [--max-parallel N]
+    python -m agents_runner.headless submit --env ENV --prompt "..."
+    python -m agents_runner.headless status [TASK_ID]
+    python -m agents_runner.headless cancel TASK_ID
+    python -m agents_runner.headless shutdown
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import signal
+import sys
+import threading
+from pathlib import Path
+
+from agents_runner.execution.scheduler import UNLIMITED
+from agents_runner.headless.daemon import HeadlessDaemon
+from agents_runner.headless.daemon import default_socket_path
+from agents_runner.headless.daemon import send_request
+from agents_runner.headless.runner import HeadlessError
+from agents_runner.headless.runner import HeadlessRunner
+from agents_runner.persistence import default_state_path
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Run agent tasks without the GUI",
+        prog="python -m agents_runner.headless",
+    )
+    parser.add_argument(
+        "--state",
+        default="",
+        help="State file (default: AGENTS_RUNNER_STATE_PATH or ~/.midoriai/agents-runner/state.toml)",
+    )
+    parser.add_argument(
+        "--socket",
+        default="",
+        help="Daemon socket (default: headless.sock next to the state file)",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add_task_args(p: argparse.ArgumentParser) -> None:
+        p.add_argument("--env", required=True, help="Environment id")
+        prompt = p.add_mutually_exclusive_group(required=True)
+        prompt.add_argument("--prompt", help="Prompt text")
+        prompt.add_argument("--prompt-file", help="Read the prompt from a file")
+        p.add_argument("--base-branch", default="", help="Base branch (cloned repos)")
+        p.add_argument(
+            "--no-pr", action="store_true", help="Skip pull request creation"
+        )
+
+    run = sub.add_parser("run", help="Run one task in the foreground")
+    add_task_args(run)
+
+    daemon = sub.add_parser("daemon", help="Serve task submissions on a socket")
+    daemon.add_argument(
+        "--max-parallel",
+        type=int,
+        default=UNLIMITED,
+        help="Global limit on running tasks (default: settings, else unlimited)",
+    )
+
+    submit = sub.add_parser("submit", help="Queue a task on the running daemon")
+    add_task_args(submit)
+
+    status = sub.add_parser("status", help="Show daemon tasks")
+    status.add_argument("task_id", nargs="?", default="")
+    status.add_argument(
+        "--tail", type=int, default=20, help="Log lines to show for one task"
+    )
+
+    cancel = sub.add_parser("cancel", help="Cancel a daemon task")
+    cancel.add_argument("task_id")
+    cancel.add_argument("--kill", action="store_true", help="Force kill")
+
+    sub.add_parser("shutdown", help="Cancel running tasks and stop the daemon")
+    return parser
+
+
+def _read_prompt(args: argparse.Namespace) -> str:
+    if args.prompt_file:
+        return Path(args.prompt_file).read_text(encoding="utf-8")
+    return str(args.prompt or "")
+
+
+def _run(args: argparse.Namespace, state_path: str) -> int:
+    runner = HeadlessRunner(state_path)
+    task = runner.create_task(
+        _read_prompt(args), env_id=args.env, base_branch=args.base_branch
+    )
+    print(f"task {task.task_id} ({task.agent_cli})", file=sys.stderr, flush=True)
+
+    def on_signal(signum: int, _frame: object) -> None:
+        runner.stop_task(task.task_id, kill=signum == signal.SIGTERM)
+
+    signal.signal(signal.SIGINT, on_signal)
+    signal.signal(signal.SIGTERM, on_signal)
+    runner.run_task(
+        task, on_log=lambda line: print(line, flush=True), create_pr=not args.no_pr
+    )
+    summary = f"task {task.task_id} {task.status} (exit {task.exit_code})"
+    if task.gh_pr_url:
+        summary += f" {task.gh_pr_url}"
+    print(summary, file=sys.stderr, flush=True)
+    if task.status == "done":
+        return 0
+    return int(task.exit_code or 1)
+
+
+def _daemon(args: argparse.Namespace, state_path: str, socket_path: str) -> int:
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s"
+    )
+    runner = HeadlessRunner(state_path)
+    max_parallel = int(args.max_parallel)
+    if max_parallel == UNLIMITED:
+        try:
+            max_parallel = int(runner.settings.get("max_total_agents_running", -1))
+        except (TypeError, ValueError):
+            max_parallel = UNLIMITED
+    daemon = HeadlessDaemon(runner, socket_path=socket_path, max_parallel=max_parallel)
+
+    def on_signal(_signum: int, _frame: object) -> None:
+        threading.Thread(target=daemon.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGINT, on_signal)
+    signal.signal(signal.SIGTERM, on_signal)
+    daemon.serve_forever()
+    return 0
+
+
+def _client(args: argparse.Namespace, socket_path: str) -> int:
+    if args.command == "submit":
+        request = {
+            "op": "submit",
+            "env_id": args.env,
+            "prompt": _read_prompt(args),
+            "base_branch": args.base_branch,
+            "create_pr": not args.no_pr,
+        }
+    elif args.command == "status":
+        request = {"op": "status", "task_id": args.task_id, "tail": args.tail}
+    elif args.command == "cancel":
+        request = {"op": "cancel", "task_id": args.task_id, "kill": args.kill}
+    else:
+        request = {"op": "shutdown"}
+    try:
+        reply = send_request(socket_path, request)
+    except OSError as exc:
+        print(f"daemon not reachable at {socket_path}: {exc}", file=sys.stderr)
+        return 2
+    print(json.dumps(reply, indent=2))
+    return 0 if reply.get("ok") else 1
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    state_path = os.path.expanduser(args.state) if args.state else default_state_path()
+    socket_path = (
+        os.path.expanduser(args.socket)
+        if args.socket
+        else default_socket_path(state_path)
+    )
+
+    try:
+        if args.command == "run":
+            return _run(args, state_path)
+        if args.command == "daemon":
+            return _daemon(args, state_path, socket_path)
+        return _client(args, socket_path)
+    except (HeadlessError, OSError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
@@ -0,0 +1,317 @@
+"""
+Long-running headless daemon.
+
+Accepts task submissions on a Unix socket (one JSON object per line, one
+JSON reply per request) and runs them through ``HeadlessRunner`` on worker
+threads. Admission uses the same ``TaskScheduler`` as the GUI, with each
+environment's ``max_agents_running`` and an optional global limit. Finished
+tasks are saved by the runner; the daemon only keeps the most recent ones
+for ``status``.
+
+Requests:
+  {"op": "submit", "env_id": ..., "prompt": ..., "base_branch": ..., "create_pr": true}
+  {"op": "status"} or {"op": "status", "task_id": ..., "tail": 50}
+  {"op": "cancel", "task_id": ..., "kill": false}
+  {"op": "shutdown"}
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import socketserver
+import threading
+from collections import OrderedDict
+from typing import Any
+
+from agents_runner.execution.scheduler import UNLIMITED
+from agents_runner.execution.scheduler import TaskScheduler
+from agents_runner.headless.runner import HeadlessError
+from agents_runner.headless.runner import HeadlessRunner
+from agents_runner.ui.task_model import Task
+
+logger = logging.getLogger(__name__)
+
+SOCKET_FILENAME = "headless.sock"
+# Finished tasks still answered by ``status``.
+MAX_FINISHED_TASKS = 50
+
+
+def default_socket_path(state_path: str) -> str:
+    return os.path.join(os.path.dirname(state_path), SOCKET_FILENAME)
+
+
+def send_request(
+    socket_path: str, payload: dict[str, Any], *, timeout_s: float = 30.0
+) -> dict[str, Any]:
+    """Send one request to a running daemon and return its reply."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout_s)
+        sock.connect(socket_path)
+        sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as reader:
+            line = reader.readline()
+    if not line:
+        raise ConnectionError("daemon closed the connection without replying")
+    reply = json.loads(line.decode("utf-8"))
+    if not isinstance(reply, dict):
+        raise ConnectionError("daemon sent an invalid reply")
+    return reply
+
+
+def _task_summary(task: Task, *, tail: int = 0) -> dict[str, Any]:
+    summary: dict[str, Any] = {
+        "task_id": task.task_id,
+        "env_id": task.environment_id,
+        "status": task.status,
+        "agent_cli": task.agent_cli,
+        "exit_code": task.exit_code,
+        "error": task.error,
+        "pr_url": task.gh_pr_url,
+        "finalization_state": task.finalization_state,
+        "prompt": task.prompt_one_line(),
+    }
+    if tail > 0:
+        summary["logs"] = list(task.logs[-tail:])
+    return summary
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    server: _DaemonServer
+
+    def handle(self) -> None:
+        for raw in self.rfile:
+            line = raw.decode("utf-8", errors="replace").strip()
+            if not line:
+                continue
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("request must be a JSON object")
+                reply = self.server.daemon.handle_request(request)
+            except (ValueError, HeadlessError) as exc:
+                reply = {"ok": False, "error": str(exc)}
+            except Exception as exc:
+                logger.exception("headless request failed")
+                reply = {"ok": False, "error": f"internal error: {exc}"}
+            self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class _DaemonServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, daemon: HeadlessDaemon) -> None:
+        self.daemon = daemon
+        super().__init__(socket_path, _RequestHandler)
+
+
+class HeadlessDaemon:
+    """Queue and run submitted tasks until asked to shut down."""
+
+    def __init__(
+        self,
+        runner: HeadlessRunner,
+        *,
+        socket_path: str,
+        max_parallel: int = UNLIMITED,
+    ) -> None:
+        self._runner = runner
+        self._socket_path = socket_path
+        self._cond = threading.Condition()
+        # Queued and running tasks; finished ones move to ``_finished``.
+        self._tasks: dict[str, Task] = {}
+        self._finished: OrderedDict[str, Task] = OrderedDict()
+        self._create_pr: dict[str, bool] = {}
+        self._workers: dict[str, threading.Thread] = {}
+        # Stops ("cancel"/"kill") for admitted tasks whose supervisor may not
+        # be registered yet; ``run_task`` checks these before launching.
+        self._pending_stops: dict[str, str] = {}
+        self._scheduler = TaskScheduler(
+            env_limit=self._env_limit, global_limit=max_parallel
+        )
+        self._server: _DaemonServer | None = None
+        self._stopping = False
+
+    def _env_limit(self, env_id: str) -> int:
+        # Same as the GUI: negative is unlimited, 0 admits nothing.
+        env = self._runner.environments.get(env_id)
+        try:
+            if env is not None:
+                return int(getattr(env, "max_agents_running", UNLIMITED))
+            return int(self._runner.settings.get("max_agents_running", UNLIMITED))
+        except (TypeError, ValueError):
+            return UNLIMITED
+
+    # Requests
+
+    def handle_request(self, request: dict[str, Any]) -> dict[str, Any]:
+        op = str(request.get("op") or "").strip().lower()
+        if op == "submit":
+            task = self.submit(
+                str(request.get("prompt") or ""),
+                env_id=str(request.get("env_id") or ""),
+                base_branch=str(request.get("base_branch") or ""),
+                create_pr=bool(request.get("create_pr", True)),
+            )
+            return {"ok": True, "task": _task_summary(task)}
+        if op == "status":
+            task_id = str(request.get("task_id") or "").strip()
+            with self._cond:
+                if task_id:
+                    task = self._tasks.get(task_id) or self._finished.get(task_id)
+                    if task is None:
+                        raise ValueError(f"unknown task: {task_id}")
+                    tail = int(request.get("tail") or 0)
+                    return {"ok": True, "task": _task_summary(task, tail=tail)}
+                tasks = [
+                    _task_summary(task)
+                    for task in (*self._finished.values(), *self._tasks.values())
+                ]
+            return {"ok": True, "tasks": tasks}
+        if op == "cancel":
+            task_id = str(request.get("task_id") or "").strip()
+            return {
+                "ok": self.cancel(task_id, kill=bool(request.get("kill", False))),
+                "task_id": task_id,
+            }
+        if op == "shutdown":
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {"ok": True}
+        raise ValueError(f"unknown op: {op or '(missing)'}")
+
+    def submit(
+        self, prompt: str, *, env_id: str, base_branch: str = "", create_pr: bool = True
+    ) -> Task:
+        # Pick up environment and settings edits made in the GUI meanwhile.
+        self._runner.reload(cooldowns=False)
+        task = self._runner.create_task(prompt, env_id=env_id, base_branch=base_branch)
+        with self._cond:
+            if self._stopping:
+                raise HeadlessError("daemon is shutting down")
+            self._tasks[task.task_id] = task
+            self._create_pr[task.task_id] = create_pr
+            self._scheduler.enqueue(
+                task.task_id,
+                env_id=task.environment_id,
+                agent_cli=task.agent_cli,
+                created_at_s=task.created_at_s,
+            )
+            self._admit_locked()
+        return task
+
+    def cancel(self, task_id: str, *, kill: bool = False) -> bool:
+        with self._cond:
+            task = self._tasks.get(task_id)
+            if task is None:
+                return False
+            if self._scheduler.is_queued(task_id):
+                self._scheduler.discard(task_id)
+                self._runner.cancel_queued(task)
+                self._retire_locked(task_id)
+                return True
+            pending = task_id in self._workers
+            if pending:
+                self._pending_stops[task_id] = "kill" if kill else "cancel"
+        return self._runner.stop_task(task_id, kill=kill) or pending
+
+    def _take_pending_stop(self, task_id: str) -> str | None:
+        with self._cond:
+            return self._pending_stops.pop(task_id, None)
+
+    def _retire_locked(self, task_id: str) -> None:
+        """Forget a finished (and already saved) task, keeping recent ones."""
+        self._create_pr.pop(task_id, None)
+        task = self._tasks.pop(task_id, None)
+        if task is None:
+            return
+        self._finished[task_id] = task
+        while len(self._finished) > MAX_FINISHED_TASKS:
+            self._finished.popitem(last=False)
+
+    # Scheduling
+
+    def _admit_locked(self) -> None:
+        for task_id in self._scheduler.admit():
+            task = self._tasks[task_id]
+            worker = threading.Thread(
+                target=self._run_worker,
+                args=(task,),
+                name=f"headless-task-{task_id}",
+                daemon=True,
+            )
+            self._workers[task_id] = worker
+            worker.start()
+
+    def _run_worker(self, task: Task) -> None:
+        task_id = task.task_id
+        try:
+            self._runner.run_task(
+                task,
+                on_log=lambda line: logger.info("[%s] %s", task_id, line),
+                create_pr=self._create_pr.get(task_id, True),
+                pending_stop=lambda: self._take_pending_stop(task_id),
+            )
+        except Exception:
+            logger.exception("headless task %s failed", task_id)
+        finally:
+            with self._cond:
+                self._scheduler.mark_finished(task_id)
+                self._workers.pop(task_id, None)
+                self._pending_stops.pop(task_id, None)
+                # run_task saved the task before returning.
+                self._retire_locked(task_id)
+                if not self._stopping:
+                    self._admit_locked()
+                self._cond.notify_all()
+        logger.info("task %s finished: %s", task_id, task.status)
+
+    # Lifecycle
+
+    def serve_forever(self) -> None:
+        if os.path.exists(self._socket_path):
+            try:
+                send_request(self._socket_path, {"op": "status"}, timeout_s=1.0)
+            except OSError:
+                os.unlink(self._socket_path)
+            else:
+                raise HeadlessError(
+                    f"a daemon is already listening on {self._socket_path}"
+                )
+        os.makedirs(os.path.dirname(self._socket_path) or ".", exist_ok=True)
+        # Owner-only from the moment it exists (no chmod race after bind).
+        old_umask = os.umask(0o077)
+        try:
+            self._server = _DaemonServer(self._socket_path, self)
+        finally:
+            os.umask(old_umask)
+        logger.info("headless daemon listening on %s", self._socket_path)
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            try:
+                os.unlink(self._socket_path)
+            except OSError:
+                pass
+
+    def shutdown(self, *, timeout_s: float = 60.0) -> None:
+        """Drop queued tasks, cancel running ones and stop serving."""
+        with self._cond:
+            self._stopping = True
+            for task_id, task in list(self._tasks.items()):
+                if self._scheduler.is_queued(task_id):
+                    self._scheduler.discard(task_id)
+                    self._runner.cancel_queued(task)
+                    self._retire_locked(task_id)
+            running = list(self._workers)
+            for task_id in running:
+                self._pending_stops[task_id] = "cancel"
+        for task_id in running:
+            self._runner.stop_task(task_id)
+        with self._cond:
+            self._cond.wait_for(lambda: not self._workers, timeout=timeout_s)
+        if self._server is not None:
+            self._server.shutdown()
@@ -0,0 +1,521 @@
+"""
+Headless task execution.
+
+``HeadlessRunner`` loads the GUI's persisted settings, environments and agent
+cooldowns, builds tasks with the same launch code as the main window, runs
+them through ``TaskSupervisor`` on the calling thread and finalizes them
+(artifacts, pull request, workspace cleanup) the way the GUI does. Finished
+tasks are written with ``save_task_payload`` so the GUI lists them.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from datetime import timezone
+from typing import Callable
+from uuid import uuid4
+
+from agents_runner.agent_cli import normalize_agent
+from agents_runner.agent_cli import resolve_agent_config_dir
+from agents_runner.artifacts import collect_artifacts_from_container_with_timeout
+from agents_runner.core.agent.cooldown_registry import CooldownRegistry
+from agents_runner.environments import WORKSPACE_CLONED
+from agents_runner.environments import WORKSPACE_MOUNTED
+from agents_runner.environments import Environment
+from agents_runner.environments import load_environments
+from agents_runner.environments import managed_repo_checkout_path
+from agents_runner.environments.cleanup import cleanup_task_workspace
+from agents_runner.environments.cow_workspace import finish_workspace_snapshot
+from agents_runner.environments.cow_workspace import snapshot_workdir
+from agents_runner.execution.launch import build_launch_context
+from agents_runner.execution.launch import pinned_agent_missing
+from agents_runner.execution.launch import prepare_task_launch
+from agents_runner.execution.supervisor import SupervisorConfig
+from agents_runner.execution.supervisor import TaskSupervisor
+from agents_runner.gh.pr_finalize import create_task_pull_request
+from agents_runner.log_format import format_log
+from agents_runner.persistence import default_state_path
+from agents_runner.persistence import load_state
+from agents_runner.persistence import load_watch_state
+from agents_runner.persistence import save_state
+from agents_runner.persistence import save_task_payload
+from agents_runner.persistence import save_watch_state
+from agents_runner.persistence import serialize_task
+from agents_runner.prompt_sanitizer import sanitize_prompt
+from agents_runner.ui.task_git_metadata import derive_task_git_metadata
+from agents_runner.ui.task_model import Task
+
+logger = logging.getLogger(__name__)
+
+
+def _watch_state_stamp(watch_state: object) -> float:
+    stamps = [
+        value.timestamp()
+        for value in (
+            getattr(watch_state, "last_rate_limited_at", None),
+            getattr(watch_state, "last_checked_at", None),
+        )
+        if value is not None
+    ]
+    return max(stamps, default=0.0)
+
+
+def merge_watch_states(stored: dict, ours: dict) -> dict:
+    """``stored`` with each provider replaced by ours where ours is newer."""
+    merged = dict(stored)
+    for name, watch_state in ours.items():
+        current = merged.get(name)
+        if current is None or _watch_state_stamp(watch_state) > _watch_state_stamp(
+            current
+        ):
+            merged[name] = watch_state
+    return merged
+
+
+class HeadlessError(Exception):
+    """A task could not be created (bad environment, workspace or flags)."""
+
+
+class HeadlessRunner:
+    """Create, run and finalize tasks against the GUI's persisted state.
+
+    ``run_task`` blocks until the task is finalized; the daemon calls it from
+    worker threads, so shared state (cooldowns, round-robin cursors, the
+    state file) is guarded by a lock.
+    """
+
+    def __init__(self, state_path: str | None = None) -> None:
+        self.state_path = state_path or default_state_path()
+        self.data_dir = os.path.dirname(self.state_path)
+        self._lock = threading.Lock()
+        self._round_robin: dict[str, int] = {}
+        self._supervisors: dict[str, TaskSupervisor] = {}
+        self.settings: dict[str, object] = {}
+        self.environments: dict[str, Environment] = {}
+        self.watch_states: dict = {}
+        self.cooldowns = CooldownRegistry(self.watch_states)
+        self.reload()
+
+    def reload(self, *, cooldowns: bool = True) -> None:
+        """Re-read settings, environments and (optionally) cooldowns from disk.
+
+        Skip cooldowns while tasks are running: theirs are only written back
+        once each task finishes.
+        """
+        try:
+            state = load_state(self.state_path)
+        except Exception:
+            state = {}
+        settings = state.get("settings")
+        with self._lock:
+            self.settings = dict(settings) if isinstance(settings, dict) else {}
+            self.environments = load_environments(data_dir=self.data_dir)
+            if cooldowns:
+                self.watch_states.clear()
+                self.watch_states.update(load_watch_state(state))
+        if cooldowns:
+            self.cooldowns.rebuild()
+
+    # Task creation
+
+    def create_task(self, prompt: str, *, env_id: str, base_branch: str = "") -> Task:
+        """Build a queued task for ``env_id`` with its runner config filled in.
+
+        Raises HeadlessError when the environment or its workspace is not
+        usable.
+        """
+        prompt = sanitize_prompt((prompt or "").strip())
+        if not prompt:
+            raise HeadlessError("prompt is empty")
+        env = self.environments.get(str(env_id or "").strip())
+        if env is None:
+            raise HeadlessError(f"unknown environment: {env_id}")
+        if pinned_agent_missing(env):
+            raise HeadlessError(
+                f"environment {env.env_id} is pinned to an agent that is not configured"
+            )
+        try:
+            ctx = build_launch_context(
+                env_id=env.env_id,
+                env=env,
+                settings=self.settings,
+                base_branch=base_branch,
+                interactive=False,
+            )
+        except ValueError as exc:
+            raise HeadlessError(f"invalid agent CLI flags: {exc}") from exc
+
+        task_id = uuid4().hex[:10]
+        agent_cli, config_dir, agent_instance_id = self._select_agent(env)
+        workdir = self._task_workdir(env, task_id)
+        snapshot_root = ""
+        if env.workspace_type == WORKSPACE_MOUNTED and env.mounted_snapshots:
+            snapshot_root = managed_repo_checkout_path(
+                env.env_id, data_dir=self.data_dir, task_id=task_id
+            )
+            workdir = snapshot_workdir(snapshot_root)
+        if not config_dir or not os.path.isdir(config_dir):
+            raise HeadlessError(
+                f"{agent_cli} config folder does not exist: {config_dir}"
+            )
+
+        task = Task(
+            task_id=task_id,
+            prompt=prompt,
+            image=ctx.image,
+            host_workdir=workdir,
+            host_config_dir=config_dir,
+            environment_id=env.env_id,
+            created_at_s=time.time(),
+            status="queued",
+            agent_cli=agent_cli,
+            agent_instance_id=agent_instance_id,
+            agent_cli_args=" ".join(ctx.agent_cli_args),
+            headless_desktop_enabled=ctx.headless_desktop_enabled,
+            workspace_type=ctx.workspace_type,
+            workspace_snapshot=snapshot_root,
+        )
+        prepare_task_launch(
+            ctx,
+            task,
+            data_dir=self.data_dir,
+            on_log=lambda line: task.logs.append(line),
+        )
+        self.save_task(task)
+        return task
+
+    def _select_agent(self, env: Environment) -> tuple[str, str, str]:
+        """Pick (agent_cli, config_dir, agent_instance_id) like the GUI does.
+
+        Pinned environments use the pinned agent; every other selection mode
+        rotates through the environment's agents.
+        """
+        selection = env.agent_selection
+        agents = list(getattr(selection, "agents", None) or [])
+        if not agents:
+            agent_cli = normalize_agent(str(self.settings.get("use") or "codex"))
+            config_dir = resolve_agent_config_dir(
+                agent_cli, env=env, settings=self.settings
+            )
+            return agent_cli, config_dir, ""
+
+        mode = str(selection.selection_mode or "round-robin").strip().lower()
+        chosen = agents[0]
+        if mode == "pinned":
+            pinned = str(selection.pinned_agent_id or "").strip().lower()
+            chosen = next(
+                (a for a in agents if str(a.agent_id or "").strip().lower() == pinned),
+                chosen,
+            )
+        else:
+            with self._lock:
+                cursor = self._round_robin.get(env.env_id, 0)
+                self._round_robin[env.env_id] = cursor + 1
+            chosen = agents[cursor % len(agents)]
+
+        agent_cli = normalize_agent(str(chosen.agent_cli or "codex"))
+        config_dir = os.path.expanduser(str(chosen.config_dir or "").strip())
+        if not config_dir:
+            config_dir = resolve_agent_config_dir(
+                agent_cli, env=env, settings=self.settings
+            )
+        if agent_cli == "codex" and env.host_codex_dir:
+            config_dir = os.path.expanduser(str(env.host_codex_dir).strip())
+        return agent_cli, config_dir, str(chosen.agent_id or "").strip()
+
+    def _task_workdir(self, env: Environment, task_id: str) -> str:
+        target = str(env.workspace_target or "").strip()
+        if env.workspace_type == WORKSPACE_MOUNTED:
+            path = os.path.expanduser(target)
+            if not path or not os.path.isdir(path):
+                raise HeadlessError(f"local folder does not exist: {path or '—'}")
+            return path
+        if env.workspace_type == WORKSPACE_CLONED:
+            if not target:
+                raise HeadlessError(
+                    f"environment {env.env_id} has no GitHub repo configured"
+                )
+            path = managed_repo_checkout_path(
+                env.env_id, data_dir=self.data_dir, task_id=task_id
+            )
+            try:
+                os.makedirs(path, exist_ok=True)
+            except OSError as exc:
+                raise HeadlessError(
+                    f"could not create workspace directory: {exc}"
+                ) from exc
+            return path
+        raise HeadlessError(
+            f"environment {env.env_id} has no local folder or GitHub repo workspace"
+        )
+
+    # Execution
+
+    def run_task(
+        self,
+        task: Task,
+        *,
+        on_log: Callable[[str], None] | None = None,
+        create_pr: bool = True,
+        pending_stop: Callable[[], str | None] | None = None,
+    ) -> Task:
+        """Run ``task`` to completion, finalize it and persist the result.
+
+        ``pending_stop`` reports a stop ("cancel" or "kill") requested before
+        the supervisor was registered; ``stop_task`` covers the rest.
+        """
+        task_id = task.task_id
+
+        def log(line: str) -> None:
+            task.logs.append(line)
+            if on_log is not None:
+                on_log(line)
+
+        for line in list(task.logs):
+            if on_log is not None:
+                on_log(line)
+
+        def on_state(state: dict) -> None:
+            incoming = str(state.get("Status") or "").lower()
+            if incoming and task.status not in {"cancelled", "killed"}:
+                task.status = incoming
+            if supervisor.container_id:
+                task.container_id = supervisor.container_id
+
+        supervisor = TaskSupervisor(
+            config=task._runner_config,
+            prompt=task._runner_prompt,
+            agent_selection=task._agent_selection,
+            supervisor_config=SupervisorConfig(
+                max_retries_per_agent=0,
+                enable_fallback=True,
+            ),
+            on_state=on_state,
+            on_log=log,
+            on_retry=lambda attempt, agent, delay: log(
+                format_log(
+                    "supervisor",
+                    "retry",
+                    "INFO",
+                    f"starting attempt {attempt} with {agent} (fallback)",
+                )
+            ),
+            on_agent_switch=lambda from_agent, to_agent: log(
+                format_log(
+                    "supervisor",
+                    "fallback",
+                    "INFO",
+                    f"switching from {from_agent} to {to_agent} (fallback)",
+                )
+            ),
+            watch_states=self.watch_states,
+            cooldowns=self.cooldowns,
+        )
+        with self._lock:
+            self._supervisors[task_id] = supervisor
+        stop = pending_stop() if pending_stop is not None else None
+        if stop is not None:
+            with self._lock:
+                self._supervisors.pop(task_id, None)
+            log(
+                format_log(
+                    "supervisor", "none", "INFO", f"user_{stop} requested before start"
+                )
+            )
+            self.cancel_queued(task, kill=stop == "kill")
+            return task
+        cooldown_version = self.cooldowns.version
+        task.status = "pulling"
+        task.started_at = datetime.now(tz=timezone.utc)
+        self.save_task(task)
+        try:
+            result = supervisor.run()
+        except Exception as exc:
+            logger.exception("headless task %s crashed", task_id)
+            result = None
+            error: object = f"Worker exception: {exc}"
+            exit_code = 1
+            metadata: dict = {}
+        else:
+            error = result.error
+            exit_code = result.exit_code
+            metadata = dict(result.metadata or {})
+        finally:
+            with self._lock:
+                self._supervisors.pop(task_id, None)
+
+        task.container_id = supervisor.container_id or task.container_id
+        if supervisor.gh_repo_root:
+            task.gh_repo_root = supervisor.gh_repo_root
+        if supervisor.gh_base_branch and not task.gh_base_branch:
+            task.gh_base_branch = supervisor.gh_base_branch
+        if supervisor.gh_branch:
+            task.gh_branch = supervisor.gh_branch
+        if result is not None and result.artifacts:
+            task.artifacts = list(result.artifacts)
+        if metadata.get("agent_used"):
+            task.agent_cli = str(metadata["agent_used"])
+        if metadata.get("agent_id"):
+            task.agent_instance_id = str(metadata["agent_id"])
+        if isinstance(metadata.get("attempt_history"), list):
+            task.attempt_history = metadata["attempt_history"]
+
+        task.finished_at = datetime.now(tz=timezone.utc)
+        task.exit_code = int(exit_code)
+        user_stop = str(metadata.get("user_stop") or "").strip().lower()
+        if user_stop in {"cancel", "kill"}:
+            task.status = "killed" if user_stop == "kill" else "cancelled"
+            task.error = None
+        elif error:
+            task.status = "failed"
+            task.error = str(error)
+        else:
+            task.status = "done" if int(exit_code) == 0 else "failed"
+        task.git = derive_task_git_metadata(task)
+        self.save_task(task)
+
+        self._finalize(task, log, create_pr=create_pr)
+        if self.cooldowns.version != cooldown_version:
+            self._save_cooldowns()
+        return task
+
+    def stop_task(self, task_id: str, *, kill: bool = False) -> bool:
+        """Ask a running task to stop; False when it is not running here."""
+        with self._lock:
+            supervisor = self._supervisors.get(task_id)
+        if supervisor is None:
+            return False
+        if kill:
+            supervisor.request_user_kill()
+        else:
+            supervisor.request_user_cancel()
+        return True
+
+    def cancel_queued(self, task: Task, *, kill: bool = False) -> None:
+        """Mark a task that never started as cancelled and drop its workspace."""
+        task.status = "killed" if kill else "cancelled"
+        task.finished_at = datetime.now(tz=timezone.utc)
+        if task.workspace_type == WORKSPACE_CLONED or task.workspace_snapshot:
+            cleanup_task_workspace(
+                env_id=task.environment_id,
+                task_id=task.task_id,
+                data_dir=self.data_dir,
+            )
+        task.finalization_state = "done"
+        self.save_task(task)
+
+    def _finalize(
+        self, task: Task, log: Callable[[str], None], *, create_pr: bool
+    ) -> None:
+        task_id = task.task_id
+        task.finalization_state = "running"
+        try:
+            user_stop = task.status in {"cancelled", "killed"}
+            if not user_stop and task.container_id:
+                log(
+                    format_log(
+                        "host",
+                        "artifacts",
+                        "INFO",
+                        "collecting artifacts from staging...",
+                    )
+                )
+                timeout_s = float(
+                    getattr(task._runner_config, "artifact_collection_timeout_s", 30.0)
+                    or 30.0
+                )
+                artifact_uuids = collect_artifacts_from_container_with_timeout(
+                    str(task.container_id or ""),
+                    {
+                        "task_id": task_id,
+                        "image": str(task.image or ""),
+                        "agent_cli": str(task.agent_cli or ""),
+                        "created_at": float(task.created_at_s or 0.0),
+                    },
+                    str(task.environment_id or ""),
+                    timeout_s=timeout_s,
+                )
+                if artifact_uuids:
+                    task.artifacts = list(artifact_uuids)
+
+            cloned = task.workspace_type == WORKSPACE_CLONED
+            if (
+                create_pr
+                and cloned
+                and not user_stop
+                and task.gh_repo_root
+                and task.gh_branch
+                and not task.gh_pr_url
+            ):
+                pr_url = create_task_pull_request(
+                    task_id=task_id,
+                    repo_root=task.gh_repo_root,
+                    branch=task.gh_branch,
+                    base_branch=task.gh_base_branch,
+                    prompt_text=task.prompt,
+                    task_token=task_id,
+                    use_gh=bool(task.gh_use_host_cli),
+                    on_log=log,
+                    pr_metadata_path=task.gh_pr_metadata_path or None,
+                    agent_cli=task.agent_cli,
+                    agent_cli_args=task.agent_cli_args,
+                )
+                if pr_url:
+                    task.gh_pr_url = pr_url
+                    task.git = derive_task_git_metadata(task)
+            elif cloned:
+                log(format_log("gh", "pr", "INFO", "PR creation skipped"))
+
+            removable = cloned
+            if task.workspace_snapshot:
+                removable = finish_workspace_snapshot(
+                    task.workspace_snapshot, merge=not user_stop, on_log=log
+                )
+            if removable:
+                cleanup_task_workspace(
+                    env_id=task.environment_id,
+                    task_id=task_id,
+                    data_dir=self.data_dir,
+                    on_log=log,
+                )
+            task.finalization_state = "done"
+            task.finalization_error = ""
+        except Exception as exc:
+            task.finalization_state = "error"
+            task.finalization_error = str(exc)
+            log(format_log("host", "finalize", "ERROR", f"finalization failed: {exc}"))
+        self.save_task(task)
+
+    # Persistence
+
+    def save_task(self, task: Task) -> None:
+        archived = task.finalization_state == "done" and (
+            task.is_done() or task.is_failed()
+        )
+        try:
+            save_task_payload(self.state_path, serialize_task(task), archived=archived)
+        except Exception as exc:
+            logger.warning("failed to save task %s: %s", task.task_id, exc)
+
+    def _save_cooldowns(self) -> None:
+        """Merge cooldowns into the state file, keeping the GUI's settings.
+
+        The GUI (or another runner) may have saved newer cooldowns since ours
+        were loaded, so each provider keeps whichever entry is newer.
+        """
+        with self._lock:
+            try:
+                state = load_state(self.state_path)
+            except Exception:
+                state = {}
+            save_watch_state(
+                state, merge_watch_states(load_watch_state(state), self.watch_states)
+            )
+            try:
+                save_state(self.state_path, state)
+            except Exception as exc:
+                logger.warning("failed to save agent cooldowns: %s", exc)
@@ -323,6 +323,7 @@ def serialize_task(task: Any) -> dict[str, Any]:
         "environment_id": getattr(task, "environment_id", ""),
         "created_at_s": task.created_at_s,
         "status": task.status,
+        "priority": int(getattr(task, "priority", 0) or 0),
         "exit_code": task.exit_code,
         "error": task.error,
         "container_id": task.container_id,
@@ -330,6 +331,7 @@ def serialize_task(task: Any) -> dict[str, Any]:
         "finished_at": _dt_to_str(task.finished_at),
         "gh_use_host_cli": bool(getattr(task, "gh_use_host_cli", True)),
         "workspace_type": getattr(task, "workspace_type", "none"),
+        "workspace_snapshot": getattr(task, "workspace_snapshot", ""),
         "gh_repo_root": getattr(task, "gh_repo_root", ""),
         "gh_base_branch": getattr(task, "gh_base_branch", ""),
         "gh_branch": getattr(task, "gh_branch", ""),
@@ -387,6 +389,7 @@ def deserialize_task(task_cls: type, data: dict[str, Any]) -> Any:
         environment_id=str(data.get("environment_id") or ""),
         created_at_s=float(data.get("created_at_s") or 0.0),
         status=str(data.get("status") or "queued"),
+        priority=int(data.get("priority") or 0),
         exit_code=data.get("exit_code"),
         error=data.get("error"),
         container_id=data.get("container_id"),
@@ -396,6 +399,7 @@ def deserialize_task(task_cls: type, data: dict[str, Any]) -> Any:
             data.get("gh_use_host_cli") if "gh_use_host_cli" in data else True
         ),
         workspace_type=workspace_type,
+        workspace_snapshot=str(data.get("workspace_snapshot") or ""),
         gh_repo_root=str(data.get("gh_repo_root") or ""),
         gh_base_branch=str(data.get("gh_base_branch") or ""),
         gh_branch=str(data.get("gh_branch") or ""),
@@ -437,6 +441,7 @@ def deserialize_task(task_cls: type, data: dict[str, Any]) -> Any:
 
 def _deserialize_runner_config(payload: dict[str, Any], *, task_id: str) -> Any:
     try:
+        from agents_runner.docker.resources import ContainerResources
         from agents_runner.docker_runner import DockerRunnerConfig
     except Exception:
         return None
@@ -475,6 +480,16 @@ def _deserialize_runner_config(payload: dict[str, Any], *, task_id: str) -> Any:
         if artifact_collection_timeout_s <= 0.0:
             artifact_collection_timeout_s = 30.0
 
+        resources = ContainerResources()
+        raw_resources = payload.get("resources")
+        if isinstance(raw_resources, dict):
+            # The CPU set is assigned per start, so it is not restored.
+            resources = ContainerResources(
+                cpus=float(raw_resources.get("cpus") or 0.0),
+                memory_mb=int(raw_resources.get("memory_mb") or 0),
+                pids_limit=int(raw_resources.get("pids_limit") or 0),
+            )
+
         agent_cli = str(payload.get("agent_cli") or "codex")
         agent_cli_lower = agent_cli.strip().lower()
         container_config_dir = str(payload.get("container_config_dir") or "").strip()
@@ -523,6 +538,15 @@ def _deserialize_runner_config(payload: dict[str, Any], *, task_id: str) -> Any:
             ports=ports,
             agent_cli_args=agent_cli_args,
             artifact_collection_timeout_s=artifact_collection_timeout_s,
+            resources=resources,
+            workspace_snapshot_source=str(
+                payload.get("workspace_snapshot_source") or ""
+            ).strip()
+            or None,
+            workspace_snapshot_root=str(
+                payload.get("workspace_snapshot_root") or ""
+            ).strip()
+            or None,
         )
     except Exception:
         return None
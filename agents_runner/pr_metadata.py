@@ -47,6 +47,18 @@ class GitHubMetadataV2:
     body: str = ""
 
 
+def github_context_payload(github_context: GitHubContext) -> dict[str, str | None]:
+    """The ``github`` table written to context files."""
+    return {
+        "repo_url": github_context.repo_url,
+        "repo_owner": github_context.repo_owner,
+        "repo_name": github_context.repo_name,
+        "base_branch": github_context.base_branch,
+        "task_branch": github_context.task_branch,
+        "head_commit": github_context.head_commit,
+    }
+
+
 def github_context_container_path(task_id: str) -> str:
     """V2 container path with new naming."""
     task_token = _safe_task_token(task_id)
@@ -124,14 +136,7 @@ def ensure_github_context_file(
 
     # Add github object if provided
     if github_context:
-        payload["github"] = {
-            "repo_url": github_context.repo_url,
-            "repo_owner": github_context.repo_owner,
-            "repo_name": github_context.repo_name,
-            "base_branch": github_context.base_branch,
-            "task_branch": github_context.task_branch,
-            "head_commit": github_context.head_commit,
-        }
+        payload["github"] = github_context_payload(github_context)
 
     with open(path, "wb") as f:
         tomli_w.dump(_strip_none_for_toml(payload), f)
@@ -173,14 +178,7 @@ def update_github_context_after_clone(
         raise ValueError("Invalid GitHub context file format")
 
     # Update github object
-    payload["github"] = {
-        "repo_url": github_context.repo_url,
-        "repo_owner": github_context.repo_owner,
-        "repo_name": github_context.repo_name,
-        "base_branch": github_context.base_branch,
-        "task_branch": github_context.task_branch,
-        "head_commit": github_context.head_commit,
-    }
+    payload["github"] = github_context_payload(github_context)
 
     with open(path, "wb") as f:
         tomli_w.dump(_strip_none_for_toml(payload), f)
@@ -0,0 +1,95 @@
+"""Prompt lists for batch task submission.
+
+A batch is plain text with one prompt per non-empty line, or, when any line
+is exactly ``---``, multi-line prompts separated by those lines. ``.jsonl``
+files hold one JSON string (or object with a ``prompt`` key) per line.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+from agents_runner.prompt_sanitizer import sanitize_prompt
+
+BATCH_FLAG = "--batch-prompts"
+BATCH_ENV_FLAG = "--batch-env"
+BATCH_BASE_BRANCH_FLAG = "--batch-base-branch"
+
+PROMPT_SEPARATOR = "---"
+
+
+@dataclass(frozen=True, slots=True)
+class PromptBatchRequest:
+    """A batch requested on the command line."""
+
+    path: str
+    env_id: str = ""
+    base_branch: str = ""
+
+
+def parse_prompt_batch(text: str) -> list[str]:
+    lines = str(text or "").splitlines()
+    if any(line.strip() == PROMPT_SEPARATOR for line in lines):
+        chunks: list[str] = []
+        current: list[str] = []
+        for line in lines:
+            if line.strip() == PROMPT_SEPARATOR:
+                chunks.append("\n".join(current))
+                current = []
+            else:
+                current.append(line)
+        chunks.append("\n".join(current))
+    else:
+        chunks = lines
+    prompts = (sanitize_prompt(chunk.strip()) for chunk in chunks)
+    return [prompt for prompt in prompts if prompt]
+
+
+def parse_prompt_batch_jsonl(text: str) -> list[str]:
+    prompts: list[str] = []
+    for number, line in enumerate(str(text or "").splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            value = json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"line {number}: {exc.msg}") from exc
+        if isinstance(value, dict):
+            value = value.get("prompt")
+        if not isinstance(value, str):
+            raise ValueError(f"line {number}: expected a string or a 'prompt' key")
+        prompt = sanitize_prompt(value.strip())
+        if prompt:
+            prompts.append(prompt)
+    return prompts
+
+
+def load_prompt_batch(path: str | Path) -> list[str]:
+    """Read a prompt list file; raises OSError/ValueError on bad input."""
+    path = Path(path).expanduser()
+    text = path.read_text(encoding="utf-8")
+    if path.suffix.lower() == ".jsonl":
+        return parse_prompt_batch_jsonl(text)
+    return parse_prompt_batch(text)
+
+
+def strip_batch_flags(argv: list[str]) -> tuple[list[str], PromptBatchRequest | None]:
+    """Remove batch flags from ``argv``; return (argv, request)."""
+    values = {BATCH_FLAG: "", BATCH_ENV_FLAG: "", BATCH_BASE_BRANCH_FLAG: ""}
+    cleaned: list[str] = []
+    args = iter(argv)
+    for arg in args:
+        flag, sep, value = arg.partition("=")
+        if flag not in values:
+            cleaned.append(arg)
+            continue
+        values[flag] = value if sep else next(args, "")
+    if not values[BATCH_FLAG]:
+        return cleaned, None
+    return cleaned, PromptBatchRequest(
+        path=values[BATCH_FLAG],
+        env_id=values[BATCH_ENV_FLAG].strip(),
+        base_branch=values[BATCH_BASE_BRANCH_FLAG].strip(),
+    )
@@ -4,10 +4,15 @@ import os
 import shutil
 import signal
 import subprocess
+import threading
 import time
 
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Callable
+
+# 100 ms of 16 kHz mono s16le audio.
+PCM_CHUNK_BYTES = 3200
 
 
 @dataclass(frozen=True, slots=True)
@@ -15,6 +20,7 @@ class MicRecording:
     output_path: Path
     started_at_s: float
     process: subprocess.Popen[bytes]
+    pcm_thread: threading.Thread | None = None
 
 
 class MicRecorderError(RuntimeError):
@@ -31,7 +37,13 @@ class FfmpegPulseRecorder:
     def is_available() -> bool:
         return shutil.which("ffmpeg") is not None
 
-    def start(self) -> MicRecording:
+    def start(self, *, on_pcm: Callable[[bytes], None] | None = None) -> MicRecording:
+        """Start recording to a WAV file.
+
+        When ``on_pcm`` is given, ffmpeg also writes raw 16 kHz mono s16le PCM
+        to stdout and a reader thread hands it over in ~100 ms chunks while
+        recording, so speech-to-text can run before :meth:`stop`.
+        """
         if not self.is_available():
             raise MicRecorderError("Could not find `ffmpeg` in PATH.")
 
@@ -56,17 +68,53 @@ class FfmpegPulseRecorder:
             "pcm_s16le",
             str(output_path),
         ]
+        if on_pcm is not None:
+            args += ["-ac", "1", "-ar", "16000", "-f", "s16le", "pipe:1"]
 
         process = subprocess.Popen(
             args,
             stdin=subprocess.DEVNULL,
-            stdout=subprocess.DEVNULL,
+            stdout=subprocess.PIPE if on_pcm is not None else subprocess.DEVNULL,
             stderr=subprocess.PIPE,
         )
+
+        pcm_thread: threading.Thread | None = None
+        if on_pcm is not None:
+            pcm_thread = threading.Thread(
+                target=self._pump_pcm,
+                args=(process, on_pcm),
+                name="stt-mic-pcm",
+                daemon=True,
+            )
+            pcm_thread.start()
+
         return MicRecording(
-            output_path=output_path, started_at_s=time.time(), process=process
+            output_path=output_path,
+            started_at_s=time.time(),
+            process=process,
+            pcm_thread=pcm_thread,
         )
 
+    @staticmethod
+    def _pump_pcm(
+        process: subprocess.Popen[bytes], on_pcm: Callable[[bytes], None]
+    ) -> None:
+        stream = process.stdout
+        if stream is None:
+            return
+        while True:
+            try:
+                chunk = stream.read(PCM_CHUNK_BYTES)
+            except (OSError, ValueError):
+                return
+            if not chunk:
+                return
+            try:
+                on_pcm(chunk)
+            except Exception:
+                # Consumer errors must not stall ffmpeg on a full pipe.
+                pass
+
     def stop(self, recording: MicRecording, *, timeout_s: float = 2.0) -> Path:
         if recording.process.poll() is None:
             try:
@@ -74,16 +122,19 @@ class FfmpegPulseRecorder:
             except Exception:
                 recording.process.terminate()
 
-        try:
-            _stdout, stderr = recording.process.communicate(timeout=timeout_s)
-        except subprocess.TimeoutExpired:
-            recording.process.kill()
+        if recording.pcm_thread is not None:
+            stderr = self._wait_streaming(recording, timeout_s=timeout_s)
+        else:
             try:
                 _stdout, stderr = recording.process.communicate(timeout=timeout_s)
-            except subprocess.TimeoutExpired as exc:
-                raise MicRecorderError(
-                    "Timed out while stopping the microphone recording."
-                ) from exc
+            except subprocess.TimeoutExpired:
+                recording.process.kill()
+                try:
+                    _stdout, stderr = recording.process.communicate(timeout=timeout_s)
+                except subprocess.TimeoutExpired as exc:
+                    raise MicRecorderError(
+                        "Timed out while stopping the microphone recording."
+                    ) from exc
 
         if (
             recording.process.returncode not in (0, 255)
@@ -111,3 +162,28 @@ class FfmpegPulseRecorder:
             raise MicRecorderError("Could not stat recording output file.") from exc
 
         return recording.output_path
+
+    @staticmethod
+    def _wait_streaming(recording: MicRecording, *, timeout_s: float) -> bytes:
+        # stdout belongs to the PCM reader thread, so communicate() cannot be used.
+        try:
+            recording.process.wait(timeout=timeout_s)
+        except subprocess.TimeoutExpired:
+            recording.process.kill()
+            try:
+                recording.process.wait(timeout=timeout_s)
+            except subprocess.TimeoutExpired as exc:
+                raise MicRecorderError(
+                    "Timed out while stopping the microphone recording."
+                ) from exc
+
+        if recording.pcm_thread is not None:
+            recording.pcm_thread.join(timeout=timeout_s)
+
+        stderr = b""
+        if recording.process.stderr is not None:
+            try:
+                stderr = recording.process.stderr.read() or b""
+            except (OSError, ValueError):
+                stderr = b""
+        return stderr
@@ -0,0 +1,462 @@
+"""Resident speech-to-text service.
+
+Runs faster-whisper in a long-lived child process so the model is loaded once
+per app session instead of once per dictation. Callers open a session, stream
+16 kHz mono s16le PCM into it while the user is speaking, and receive partial
+transcripts as the audio arrives plus a final transcript once the session is
+finished.
+
+Session callbacks are invoked from a background reader thread; UI code must
+marshal them onto its own thread (see ``agents_runner.ui.stt.qt_worker``).
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import queue
+import threading
+import uuid
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import Callable
+
+from agents_runner.stt.transcribe import DEFAULT_MODEL_NAME
+from agents_runner.stt.transcribe import TranscribeError
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+BYTES_PER_SAMPLE = 2
+
+# Re-decode the live window after this much new audio.
+PARTIAL_STEP_S = 1.0
+# Segments ending this close to the live edge may still change.
+STABLE_MARGIN_S = 1.5
+# Force-commit audio that never produced stable segments (e.g. silence).
+MAX_WINDOW_S = 24.0
+
+TextCallback = Callable[[str], None]
+
+
+@dataclass(frozen=True, slots=True)
+class TranscriptSegment:
+    start_s: float
+    end_s: float
+    text: str
+
+
+class StreamingTranscript:
+    """Incremental transcript state for one streamed dictation.
+
+    Audio is kept only for the uncommitted tail ("window"). After each decode,
+    segments that end well before the live edge are committed and their audio
+    dropped, so decode cost stays bounded by the window size rather than the
+    length of the dictation.
+    """
+
+    def __init__(
+        self,
+        *,
+        sample_rate: int = SAMPLE_RATE,
+        stable_margin_s: float = STABLE_MARGIN_S,
+        max_window_s: float = MAX_WINDOW_S,
+    ) -> None:
+        self._sample_rate = int(sample_rate)
+        self._stable_margin_s = float(stable_margin_s)
+        self._max_window_s = float(max_window_s)
+        self._window = bytearray()
+        self._committed: list[str] = []
+        self._tentative = ""
+        self._undecoded_bytes = 0
+
+    def append(self, pcm: bytes) -> None:
+        self._window.extend(pcm)
+        self._undecoded_bytes += len(pcm)
+
+    @property
+    def window_seconds(self) -> float:
+        return len(self._window) / float(self._sample_rate * BYTES_PER_SAMPLE)
+
+    @property
+    def undecoded_seconds(self) -> float:
+        return self._undecoded_bytes / float(self._sample_rate * BYTES_PER_SAMPLE)
+
+    @property
+    def committed_text(self) -> str:
+        return " ".join(self._committed).strip()
+
+    @property
+    def text(self) -> str:
+        return " ".join([*self._committed, self._tentative]).strip()
+
+    def window_pcm(self) -> bytes:
+        """Return the uncommitted audio and mark it as decoded."""
+        self._undecoded_bytes = 0
+        return bytes(self._window)
+
+    def apply_segments(
+        self, segments: list[TranscriptSegment], *, final: bool = False
+    ) -> str:
+        """Fold decoded window segments into the transcript and return its text."""
+        window_s = self.window_seconds
+        stable_until = window_s if final else window_s - self._stable_margin_s
+
+        commit_end_s = 0.0
+        tentative: list[str] = []
+        for segment in segments:
+            text = segment.text.strip()
+            if segment.end_s <= stable_until:
+                if text:
+                    self._committed.append(text)
+                commit_end_s = max(commit_end_s, segment.end_s)
+            elif text:
+                tentative.append(text)
+
+        if final:
+            commit_end_s = window_s
+        elif commit_end_s <= 0.0 and not tentative and window_s > self._max_window_s:
+            # Nothing recognisable in a long window; drop all but the live edge.
+            commit_end_s = stable_until
+
+        self._drop_seconds(commit_end_s)
+        self._tentative = " ".join(tentative)
+        return self.text
+
+    def _drop_seconds(self, seconds: float) -> None:
+        if seconds <= 0.0:
+            return
+        cut = int(seconds * self._sample_rate) * BYTES_PER_SAMPLE
+        del self._window[: min(cut, len(self._window))]
+
+
+def _decode_window(
+    model: Any, pcm: bytes, *, prompt: str, final: bool
+) -> list[TranscriptSegment]:
+    import numpy as np
+
+    if not pcm:
+        return []
+    audio = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+    segments, _info = model.transcribe(
+        audio,
+        vad_filter=True,
+        beam_size=5 if final else 1,
+        condition_on_previous_text=False,
+        initial_prompt=prompt[-200:] or None,
+    )
+    return [
+        TranscriptSegment(
+            start_s=float(getattr(seg, "start", 0.0) or 0.0),
+            end_s=float(getattr(seg, "end", 0.0) or 0.0),
+            text=str(getattr(seg, "text", "") or ""),
+        )
+        for seg in segments
+    ]
+
+
+def _service_main(
+    request_q: multiprocessing.Queue,  # type: ignore[type-arg]
+    result_q: multiprocessing.Queue,  # type: ignore[type-arg]
+    model_name: str,
+) -> None:
+    from agents_runner.stt.transcribe import load_whisper_model
+    from agents_runner.stt.transcribe import transcribe_with_model
+
+    try:
+        model = load_whisper_model(model_name=model_name)
+    except Exception as exc:
+        result_q.put(("fatal", "", str(exc) or type(exc).__name__))
+        return
+    result_q.put(("ready", "", ""))
+
+    streams: dict[str, StreamingTranscript] = {}
+    while True:
+        batch = [request_q.get()]
+        # Coalesce queued PCM chunks so a slow decode never falls further behind.
+        while True:
+            try:
+                batch.append(request_q.get_nowait())
+            except queue.Empty:
+                break
+
+        finishing: list[str] = []
+        for kind, session_id, payload in batch:
+            if kind == "shutdown":
+                return
+            if kind == "begin":
+                streams[session_id] = StreamingTranscript()
+            elif kind == "pcm":
+                stream = streams.get(session_id)
+                if stream is not None:
+                    stream.append(payload)
+            elif kind == "end":
+                finishing.append(session_id)
+            elif kind == "cancel":
+                streams.pop(session_id, None)
+            elif kind == "file":
+                try:
+                    result_q.put(
+                        ("final", session_id, transcribe_with_model(model, payload))
+                    )
+                except Exception as exc:
+                    result_q.put(
+                        ("error", session_id, str(exc) or "Transcription failed.")
+                    )
+
+        for session_id, stream in list(streams.items()):
+            final = session_id in finishing
+            if not final and stream.undecoded_seconds < PARTIAL_STEP_S:
+                continue
+            try:
+                segments = _decode_window(
+                    model,
+                    stream.window_pcm(),
+                    prompt=stream.committed_text,
+                    final=final,
+                )
+                text = stream.apply_segments(segments, final=final)
+            except Exception as exc:
+                streams.pop(session_id, None)
+                result_q.put(("error", session_id, str(exc) or "Transcription failed."))
+                continue
+            if final:
+                streams.pop(session_id, None)
+                result_q.put(("final", session_id, text))
+            else:
+                result_q.put(("partial", session_id, text))
+
+
+@dataclass
+class _SessionCallbacks:
+    on_partial: TextCallback | None
+    on_final: TextCallback | None
+    on_error: TextCallback | None
+    done: threading.Event = field(default_factory=threading.Event)
+    result: str = ""
+    error: str = ""
+
+
+class SttSession:
+    """Handle for one streamed dictation on a :class:`SttService`."""
+
+    def __init__(self, service: SttService, session_id: str) -> None:
+        self._service = service
+        self.session_id = session_id
+
+    def feed(self, pcm: bytes) -> None:
+        """Queue raw 16 kHz mono s16le PCM. Safe to call from any thread."""
+        if pcm:
+            self._service._send("pcm", self.session_id, bytes(pcm))
+
+    def finish(self) -> None:
+        self._service._send("end", self.session_id, None)
+
+    def cancel(self) -> None:
+        self._service._send("cancel", self.session_id, None)
+        self._service._forget(self.session_id)
+
+
+class SttService:
+    """Long-lived faster-whisper worker process with streaming sessions."""
+
+    def __init__(self, *, model_name: str = DEFAULT_MODEL_NAME) -> None:
+        self._model_name = model_name
+        self._lock = threading.Lock()
+        self._process: multiprocessing.process.BaseProcess | None = None
+        self._request_q: Any = None
+        self._result_q: Any = None
+        self._reader: threading.Thread | None = None
+        self._ready = threading.Event()
+        self._failure = ""
+        self._sessions: dict[str, _SessionCallbacks] = {}
+
+    @property
+    def failure(self) -> str:
+        return self._failure
+
+    def is_running(self) -> bool:
+        process = self._process
+        return process is not None and process.is_alive() and not self._failure
+
+    def is_ready(self) -> bool:
+        return self._ready.is_set() and self.is_running()
+
+    def start(self) -> None:
+        """Spawn the worker (and begin loading the model) if not already up."""
+        with self._lock:
+            if self._process is not None and self._process.is_alive():
+                return
+            ctx = multiprocessing.get_context("spawn")
+            self._ready.clear()
+            self._failure = ""
+            self._request_q = ctx.Queue()
+            self._result_q = ctx.Queue()
+            self._process = ctx.Process(
+                target=_service_main,
+                args=(self._request_q, self._result_q, self._model_name),
+                name="agents-runner-stt",
+                daemon=True,
+            )
+            self._process.start()
+            self._reader = threading.Thread(
+                target=self._read_results,
+                args=(self._result_q, self._process),
+                name="agents-runner-stt-results",
+                daemon=True,
+            )
+            self._reader.start()
+            logger.info("[STT] Service process started (model=%s)", self._model_name)
+
+    def begin_session(
+        self,
+        *,
+        on_partial: TextCallback | None = None,
+        on_final: TextCallback | None = None,
+        on_error: TextCallback | None = None,
+    ) -> SttSession:
+        self.start()
+        session_id = uuid.uuid4().hex
+        with self._lock:
+            self._sessions[session_id] = _SessionCallbacks(
+                on_partial=on_partial, on_final=on_final, on_error=on_error
+            )
+        self._send("begin", session_id, None)
+        return SttSession(self, session_id)
+
+    def transcribe_file(self, audio_path: str, *, timeout_s: float = 300.0) -> str:
+        """Transcribe a finished recording on the warm model (blocking)."""
+        self.start()
+        session_id = uuid.uuid4().hex
+        callbacks = _SessionCallbacks(on_partial=None, on_final=None, on_error=None)
+        with self._lock:
+            self._sessions[session_id] = callbacks
+        self._send("file", session_id, str(audio_path))
+        finished = callbacks.done.wait(timeout=timeout_s)
+        self._forget(session_id)
+        if not finished:
+            raise TranscribeError("Timed out waiting for speech-to-text.")
+        if callbacks.error:
+            raise TranscribeError(callbacks.error)
+        return callbacks.result
+
+    def shutdown(self, *, timeout_s: float = 2.0) -> None:
+        with self._lock:
+            process = self._process
+            self._process = None
+            request_q = self._request_q
+        if process is None:
+            return
+        try:
+            request_q.put(("shutdown", "", None))
+        except Exception:
+            pass
+        process.join(timeout=timeout_s)
+        if process.is_alive():
+            process.terminate()
+            process.join(timeout=timeout_s)
+        self._fail_sessions("Speech-to-text service stopped.")
+
+    def _send(self, kind: str, session_id: str, payload: object) -> None:
+        request_q = self._request_q
+        if request_q is None or self._failure:
+            self._dispatch_error(
+                session_id, self._failure or "STT service not running."
+            )
+            return
+        request_q.put((kind, session_id, payload))
+
+    def _forget(self, session_id: str) -> None:
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def _read_results(
+        self,
+        result_q: Any,
+        process: multiprocessing.process.BaseProcess,
+    ) -> None:
+        while True:
+            try:
+                kind, session_id, text = result_q.get(timeout=0.5)
+            except queue.Empty:
+                if not process.is_alive():
+                    if self._process is process:
+                        self._failure = (
+                            self._failure
+                            or f"STT service exited (exit_code={process.exitcode})."
+                        )
+                    self._fail_sessions(self._failure or "STT service exited.")
+                    return
+                continue
+            except (EOFError, OSError):
+                return
+
+            if kind == "ready":
+                self._ready.set()
+                logger.info("[STT] Model loaded and ready")
+            elif kind == "fatal":
+                self._failure = str(text or "STT service failed to start.")
+                logger.warning("[STT] Service failed: %s", self._failure)
+                self._fail_sessions(self._failure)
+            elif kind == "partial":
+                callbacks = self._sessions.get(session_id)
+                if callbacks is not None and callbacks.on_partial is not None:
+                    callbacks.on_partial(str(text or ""))
+            elif kind == "final":
+                with self._lock:
+                    callbacks = self._sessions.pop(session_id, None)
+                if callbacks is not None:
+                    callbacks.result = str(text or "")
+                    callbacks.done.set()
+                    if callbacks.on_final is not None:
+                        callbacks.on_final(callbacks.result)
+            elif kind == "error":
+                self._dispatch_error(session_id, str(text or ""))
+
+    def _dispatch_error(self, session_id: str, message: str) -> None:
+        with self._lock:
+            callbacks = self._sessions.pop(session_id, None)
+        if callbacks is None:
+            return
+        callbacks.error = message or "Speech-to-text failed."
+        callbacks.done.set()
+        if callbacks.on_error is not None:
+            callbacks.on_error(callbacks.error)
+
+    def _fail_sessions(self, message: str) -> None:
+        with self._lock:
+            session_ids = list(self._sessions)
+        for session_id in session_ids:
+            self._dispatch_error(session_id, message)
+
+
+_SERVICE: SttService | None = None
+_SERVICE_LOCK = threading.Lock()
+
+
+def get_stt_service() -> SttService:
+    """Return the process-wide STT service (created lazily, not started)."""
+    global _SERVICE
+    with _SERVICE_LOCK:
+        if _SERVICE is None:
+            _SERVICE = SttService()
+        return _SERVICE
+
+
+def running_stt_service() -> SttService | None:
+    service = _SERVICE
+    if service is not None and service.is_running():
+        return service
+    return None
+
+
+def prewarm_stt_service() -> None:
+    """Start the service so the model is loaded before the first dictation."""
+    get_stt_service().start()
+
+
+def shutdown_stt_service() -> None:
+    service = _SERVICE
+    if service is not None:
+        service.shutdown()
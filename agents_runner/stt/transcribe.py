@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import os
+import threading
 
 from enum import StrEnum
 from pathlib import Path
+from typing import Any
 
 
 class SttMode(StrEnum):
@@ -15,11 +17,36 @@ class TranscribeError(RuntimeError):
     pass
 
 
-def transcribe_audio_file(*, mode: str, audio_path: str) -> str:
-    return _transcribe_offline(audio_path)
+DEFAULT_MODEL_NAME = "base"
 
+_MODEL_LOCK = threading.Lock()
+_MODEL: Any = None
 
-def _transcribe_offline(audio_path: str) -> str:
+
+def model_download_root() -> Path:
+    download_root = Path(
+        os.path.expanduser("~/.midoriai/agents-runner/models/faster-whisper")
+    )
+    download_root.mkdir(parents=True, exist_ok=True)
+    return download_root
+
+
+def default_cpu_threads() -> int:
+    """Pick a CTranslate2 thread count from the cores this process may use.
+
+    Leaves one core for the UI on larger machines; CTranslate2 gains little
+    past eight threads for the small Whisper models.
+    """
+    try:
+        count = len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        count = os.cpu_count() or 1
+    if count > 2:
+        count -= 1
+    return max(1, min(count, 8))
+
+
+def load_whisper_model(*, model_name: str = DEFAULT_MODEL_NAME) -> Any:
     try:
         from faster_whisper import WhisperModel
     except Exception as exc:
@@ -27,17 +54,38 @@ def _transcribe_offline(audio_path: str) -> str:
             "Offline speech-to-text requires the `faster-whisper` dependency."
         ) from exc
 
-    download_root = Path(
-        os.path.expanduser("~/.midoriai/agents-runner/models/faster-whisper")
-    )
-    download_root.mkdir(parents=True, exist_ok=True)
-
-    model = WhisperModel(
-        "base",
+    return WhisperModel(
+        model_name,
         device="cpu",
         compute_type="int8",
-        download_root=str(download_root),
+        cpu_threads=default_cpu_threads(),
+        download_root=str(model_download_root()),
     )
+
+
+def transcribe_audio_file(*, mode: str, audio_path: str) -> str:
+    from agents_runner.stt.service import running_stt_service
+
+    service = running_stt_service()
+    if service is not None:
+        try:
+            return service.transcribe_file(audio_path)
+        except TranscribeError:
+            # Fall back to the in-process model if the resident service died.
+            pass
+    return _transcribe_offline(audio_path)
+
+
+def _transcribe_offline(audio_path: str) -> str:
+    global _MODEL
+
+    with _MODEL_LOCK:
+        if _MODEL is None:
+            _MODEL = load_whisper_model()
+        return transcribe_with_model(_MODEL, audio_path)
+
+
+def transcribe_with_model(model: Any, audio_path: str) -> str:
     segments, _info = model.transcribe(audio_path, vad_filter=True)
     parts: list[str] = []
     for segment in segments:
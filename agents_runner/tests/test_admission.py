@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import time
+
+from agents_runner.execution import admission
+from agents_runner.execution.admission import AdmissionController
+from agents_runner.execution.admission import AdmissionThresholds
+from agents_runner.execution.admission import ContainerUsage
+from agents_runner.execution.admission import HostSample
+from agents_runner.execution.admission import evaluate
+from agents_runner.execution.admission import parse_size
+
+_MIB = 1024 * 1024
+
+
+def _sample(**overrides: object) -> HostSample:
+    values: dict[str, object] = {
+        "sampled_at_s": 0.0,
+        "cpu_count": 4,
+        "load_1m": 1.0,
+        "mem_total_bytes": 16_384 * _MIB,
+        "mem_available_bytes": 8_192 * _MIB,
+        "disk_free_bytes": 50_000 * _MIB,
+    }
+    values.update(overrides)
+    return HostSample(**values)  # type: ignore[arg-type]
+
+
+def test_evaluate_thresholds_and_pending_starts() -> None:
+    thresholds = AdmissionThresholds(
+        max_load_per_cpu=2.0, min_free_memory_mb=1024, min_free_disk_mb=2048
+    )
+    assert evaluate(_sample(), thresholds).allowed
+    assert evaluate(None, thresholds).resource == "sample"
+    assert evaluate(_sample(load_1m=8.0), thresholds).resource == "load"
+    assert evaluate(_sample(disk_free_bytes=100 * _MIB), thresholds).resource == "disk"
+
+    # Each pending start reserves the average container footprint.
+    busy = _sample(
+        mem_available_bytes=4_096 * _MIB,
+        containers={"a": ContainerUsage(memory_bytes=1_000 * _MIB)},
+    )
+    assert evaluate(busy, thresholds, pending_starts=1).allowed
+    assert evaluate(busy, thresholds, pending_starts=3).resource == "memory"
+
+    disabled = AdmissionThresholds(enabled=False)
+    assert evaluate(_sample(load_1m=100.0), disabled).allowed
+
+
+def test_thresholds_from_settings_and_sizes() -> None:
+    thresholds = AdmissionThresholds.from_settings(
+        {"admission_max_load_per_cpu": "1.5", "admission_min_free_memory_mb": ""}
+    )
+    assert thresholds.max_load_per_cpu == 1.5
+    assert thresholds.min_free_memory_mb == 1024
+    assert parse_size("512MiB") == 512 * _MIB
+    assert parse_size("1.5GB") == 1_500_000_000
+    assert parse_size("n/a") is None
+
+
+def test_pending_starts_outlive_samples_taken_before_they_settle(monkeypatch) -> None:
+    sampled_at = [time.monotonic()]
+    monkeypatch.setattr(
+        admission,
+        "sample_host",
+        lambda *args, **kwargs: _sample(
+            sampled_at_s=sampled_at[0], mem_available_bytes=2_000 * _MIB
+        ),
+    )
+    controller = AdmissionController("/tmp", AdmissionThresholds())
+    controller._refresh([])
+    assert controller.check().allowed
+    controller.note_started()
+    controller.note_started()
+
+    # A sample right after the starts does not include them yet.
+    controller._refresh([])
+    assert controller.check().resource == "memory"
+
+    sampled_at[0] = time.monotonic() + admission.START_SETTLE_S + 1
+    controller._refresh([])
+    assert controller.check().allowed
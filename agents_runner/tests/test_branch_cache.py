@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+
+from agents_runner.gh.branch_cache import RemoteBranchCache
+from agents_runner.gh.branch_cache import repo_cache_key
+
+
+def test_cache_key_normalizes_github_targets() -> None:
+    assert repo_cache_key("Owner/Repo") == "owner/repo"
+    assert repo_cache_key("https://github.com/Owner/Repo.git") == "owner/repo"
+    assert repo_cache_key("git@github.com:owner/repo.git") == "owner/repo"
+
+
+def test_stale_listing_persists_and_refreshes_once(tmp_path: Path) -> None:
+    path = str(tmp_path / "remote-branches.json")
+    calls: list[str] = []
+    gate = threading.Event()
+    answers = iter([["main"], ["dev", "main"], []])
+
+    def fetch(repo: str) -> list[str]:
+        calls.append(repo)
+        gate.wait(5)
+        return next(answers)
+
+    cache = RemoteBranchCache(path, ttl_s=60, fetch=fetch)
+    assert cache.peek("o/r") is None
+    gate.set()
+    assert cache.get("https://github.com/o/r") == ["main"]
+    assert cache.get("o/r") == ["main"] and len(calls) == 1
+
+    # A new process sees the persisted listing immediately.
+    reloaded = RemoteBranchCache(path, ttl_s=0.01, fetch=fetch)
+    listing = reloaded.peek("o/r")
+    assert listing is not None and listing.branches == ("main",)
+    time.sleep(0.02)
+    assert reloaded.is_stale(listing)
+
+    gate.clear()
+    results: list[list[str]] = []
+    threads = [
+        threading.Thread(target=lambda: results.append(reloaded.refresh("o/r")))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    gate.set()
+    for thread in threads:
+        thread.join(5)
+    assert len(calls) == 2 and results == [["dev", "main"]] * 5
+
+    # A failed (empty) ls-remote keeps the last listing.
+    time.sleep(0.02)
+    assert reloaded.refresh("o/r") == ["dev", "main"]
+    reloaded.add_branch("o/r", "midoriaiagents/t1")
+    assert "midoriaiagents/t1" in RemoteBranchCache(path).peek("o/r").branches
+
+
+def test_concurrent_add_branch_keeps_every_branch(tmp_path: Path) -> None:
+    path = tmp_path / "remote-branches.json"
+    cache = RemoteBranchCache(str(path), fetch=lambda repo: ["main"])
+    cache.put("o/r", ["main"])
+    threads = [
+        threading.Thread(target=cache.add_branch, args=("o/r", f"task{index}"))
+        for index in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert len(cache.peek("o/r").branches) == 9
+    assert len(RemoteBranchCache(str(path)).peek("o/r").branches) == 9
+
+    # A failed write leaves no temporary file behind.
+    path.unlink()
+    path.mkdir()
+    cache.add_branch("o/r", "late")
+    assert [item.name for item in tmp_path.iterdir()] == ["remote-branches.json"]
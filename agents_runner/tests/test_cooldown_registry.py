@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import time
+
+from agents_runner.core.agent.cooldown_registry import CooldownRegistry
+from agents_runner.core.agent.watch_state import AgentStatus
+from agents_runner.execution.scheduler import TaskScheduler
+
+
+def test_registry_indexes_cooldowns_and_expires_them_in_order() -> None:
+    changes: list[list[str]] = []
+    watch_states: dict = {}
+    registry = CooldownRegistry(watch_states, on_change=changes.append)
+
+    registry.set_cooldown("codex::/cfg/a::", 60, "429")
+    registry.set_cooldown("claude::/cfg/b::", 10, "429")
+    assert registry.is_on_cooldown("codex::/cfg/a::")
+    # A bare CLI matches any of its keys on cooldown.
+    assert registry.is_on_cooldown("claude")
+    assert not registry.is_on_cooldown("gemini")
+
+    now = time.time()
+    assert registry.next_expiry() is not None
+    assert abs(registry.next_expiry() - (now + 10)) < 5
+    assert registry.expire_due(now) == []
+
+    # Extending a cooldown supersedes the older heap entry.
+    registry.set_cooldown("claude::/cfg/b::", 30, "429 again")
+    assert registry.expire_due(now + 20) == []
+    assert registry.expire_due(now + 35) == ["claude::/cfg/b::"]
+    assert watch_states["claude::/cfg/b::"].status == AgentStatus.READY
+    assert registry.expire_due(now + 120) == ["codex::/cfg/a::"]
+    assert registry.next_expiry() is None
+    assert changes[-1] == ["codex::/cfg/a::"]
+
+    rebuilt = CooldownRegistry(watch_states)
+    registry.set_cooldown("codex::/cfg/a::", 60)
+    rebuilt.rebuild()
+    assert rebuilt.is_on_cooldown("codex")
+
+
+def test_held_queue_head_only_blocks_its_environment() -> None:
+    scheduler = TaskScheduler()
+    scheduler.enqueue("a0", env_id="a", created_at_s=0.0)
+    scheduler.enqueue("a1", env_id="a", created_at_s=1.0)
+    scheduler.enqueue("b0", env_id="b", created_at_s=2.0)
+
+    assert scheduler.admit(is_held=lambda task_id: task_id == "a0") == ["b0"]
+    assert scheduler.admit() == ["a0", "a1"]
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from agents_runner.environments.cleanup import cleanup_old_task_workspaces
+from agents_runner.environments.cleanup import cleanup_task_workspace
+from agents_runner.environments.cow_workspace import MODE_OVERLAY
+from agents_runner.environments.cow_workspace import MODE_REFLINK
+from agents_runner.environments.cow_workspace import create_workspace_snapshot
+from agents_runner.environments.cow_workspace import finish_workspace_snapshot
+from agents_runner.environments.cow_workspace import merge_snapshot
+from agents_runner.environments.cow_workspace import release_workspace_snapshot
+from agents_runner.environments.cow_workspace import snapshot_changes
+from agents_runner.environments.cow_workspace import snapshot_kept_unmerged
+from agents_runner.environments.disk_usage import WorkspaceUsage
+from agents_runner.environments.paths import managed_repo_checkout_path
+from agents_runner.ui.main_window_disk_usage import _MainWindowDiskUsageMixin
+
+
+def _make_source(path: Path) -> None:
+    (path / "src").mkdir(parents=True)
+    (path / "src" / "app.py").write_text("print('a')\n")
+    (path / "README.md").write_text("readme\n")
+    (path / "notes.txt").write_text("notes\n")
+    (path / "shared.txt").write_text("v1\n")
+    (path / ".git").mkdir()
+    (path / ".git" / "HEAD").write_text("ref: refs/heads/main\n")
+
+
+@pytest.mark.parametrize("mode", [MODE_REFLINK, MODE_OVERLAY])
+def test_snapshot_diff_and_merge_back(tmp_path: Path, mode: str) -> None:
+    source = tmp_path / "folder"
+    _make_source(source)
+    root = managed_repo_checkout_path("env", str(tmp_path / "data"), "t1")
+    try:
+        snapshot = create_workspace_snapshot(str(source), root, modes=(mode,))
+    except OSError as exc:
+        pytest.skip(f"{mode} snapshots unavailable here: {exc}")
+    view = Path(snapshot.workdir)
+    assert (view / "src" / "app.py").read_text() == "print('a')\n"
+
+    (view / "src" / "app.py").write_text("print('changed')\n")
+    (view / "src" / "new.py").write_text("new\n")
+    (view / "notes.txt").unlink()
+    (view / "shared.txt").write_text("task version\n")
+    (view / ".git" / "HEAD").write_text("ref: refs/heads/task\n")
+    # Someone edits the real folder while the task runs.
+    (source / "shared.txt").write_text("user version, longer\n")
+
+    changes = snapshot_changes(snapshot)
+    assert changes.changed == ("shared.txt", "src/app.py", "src/new.py")
+    assert changes.deleted == ("notes.txt",)
+    assert (source / "src" / "app.py").read_text() == "print('a')\n"
+
+    result = merge_snapshot(snapshot)
+    assert result.applied == ("src/app.py", "src/new.py")
+    assert result.deleted == ("notes.txt",)
+    assert result.conflicts == ("shared.txt",)
+    assert (source / "src" / "app.py").read_text() == "print('changed')\n"
+    assert (source / "src" / "new.py").read_text() == "new\n"
+    assert not (source / "notes.txt").exists()
+    assert (source / "shared.txt").read_text() == "user version, longer\n"
+    assert (source / ".git" / "HEAD").read_text() == "ref: refs/heads/main\n"
+
+    # Merging again only reports the unresolved conflict.
+    again = merge_snapshot(snapshot)
+    assert again.applied == () and again.deleted == ()
+    assert again.conflicts == ("shared.txt",)
+
+    assert cleanup_task_workspace("env", "t1", data_dir=str(tmp_path / "data"))
+    assert not os.path.exists(root)
+    assert (source / "README.md").read_text() == "readme\n"
+
+
+def test_one_mounted_overlay_per_folder(tmp_path: Path) -> None:
+    source = tmp_path / "folder"
+    _make_source(source)
+    data_dir = str(tmp_path / "data")
+    first_root = managed_repo_checkout_path("env", data_dir, "t1")
+    try:
+        first = create_workspace_snapshot(
+            str(source), first_root, modes=(MODE_OVERLAY,)
+        )
+    except OSError as exc:
+        pytest.skip(f"overlay snapshots unavailable here: {exc}")
+    try:
+        second = create_workspace_snapshot(
+            str(source), managed_repo_checkout_path("env", data_dir, "t2")
+        )
+        assert second.mode == MODE_REFLINK
+
+        (Path(first.workdir) / "notes.txt").write_text("merged\n")
+        result = merge_snapshot(first)
+        assert result.applied == ("notes.txt",)
+        assert not os.path.ismount(first.workdir)
+        assert (source / "notes.txt").read_text() == "merged\n"
+    finally:
+        cleanup_task_workspace("env", "t1", data_dir=data_dir)
+        cleanup_task_workspace("env", "t2", data_dir=data_dir)
+
+
+def test_reflink_merge_waits_for_mounted_overlay(tmp_path: Path) -> None:
+    source = tmp_path / "folder"
+    _make_source(source)
+    data_dir = str(tmp_path / "data")
+    try:
+        overlay = create_workspace_snapshot(
+            str(source),
+            managed_repo_checkout_path("env", data_dir, "t1"),
+            modes=(MODE_OVERLAY,),
+        )
+    except OSError as exc:
+        pytest.skip(f"overlay snapshots unavailable here: {exc}")
+    try:
+        reflink_root = managed_repo_checkout_path("env", data_dir, "t2")
+        reflink = create_workspace_snapshot(str(source), reflink_root)
+        assert reflink.mode == MODE_REFLINK
+        (Path(reflink.workdir) / "notes.txt").write_text("from B\n")
+
+        # Writing now would change the running overlay's lower layer.
+        with pytest.raises(OSError):
+            merge_snapshot(reflink)
+        assert not finish_workspace_snapshot(reflink_root)
+        assert (Path(overlay.workdir) / "notes.txt").read_text() == "notes\n"
+        assert (source / "notes.txt").read_text() == "notes\n"
+
+        assert release_workspace_snapshot(overlay.root)
+        assert merge_snapshot(reflink).applied == ("notes.txt",)
+        assert (source / "notes.txt").read_text() == "from B\n"
+    finally:
+        cleanup_task_workspace("env", "t1", data_dir=data_dir)
+        cleanup_task_workspace("env", "t2", data_dir=data_dir)
+
+
+def test_kept_snapshot_survives_cleanup(tmp_path: Path) -> None:
+    source = tmp_path / "folder"
+    _make_source(source)
+    data_dir = str(tmp_path / "data")
+    kept_root = managed_repo_checkout_path("env", data_dir, "kept")
+    merged_root = managed_repo_checkout_path("env", data_dir, "merged")
+    kept = create_workspace_snapshot(str(source), kept_root, modes=(MODE_REFLINK,))
+    create_workspace_snapshot(str(source), merged_root, modes=(MODE_REFLINK,))
+    (Path(kept.workdir) / "shared.txt").write_text("task version\n")
+    (source / "shared.txt").write_text("user version, longer\n")
+
+    assert not finish_workspace_snapshot(kept_root)
+    assert snapshot_kept_unmerged(kept_root)
+    assert finish_workspace_snapshot(merged_root)
+    assert not snapshot_kept_unmerged(merged_root)
+
+    # Both finished long ago; only the merged one may go.
+    window = SimpleNamespace(
+        _evictable_task_ids=frozenset({"kept", "merged"}),
+        _known_task_ids=frozenset({"kept", "merged"}),
+    )
+    for task_id, root in (("kept", kept_root), ("merged", merged_root)):
+        usage = WorkspaceUsage("env", task_id, root, 1, 0.0)
+        evictable = _MainWindowDiskUsageMixin._workspace_evictable(window, usage)
+        assert evictable == (task_id == "merged")
+        old = time.time() - 48 * 3600
+        os.utime(root, (old, old))
+
+    assert cleanup_old_task_workspaces("env", data_dir=data_dir) == 1
+    assert os.path.isdir(kept_root)
+    assert not os.path.exists(merged_root)
+    assert (Path(kept.changes_dir) / "shared.txt").read_text() == "task version\n"
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import os
+import shutil
+from pathlib import Path
+
+from agents_runner.environments.disk_usage import DiskUsageTracker
+from agents_runner.environments.disk_usage import WorkspaceUsage
+
+
+def _make_task(root: Path, env_id: str, task_id: str, size: int, mtime: int) -> Path:
+    path = root / env_id / "tasks" / task_id
+    (path / "src").mkdir(parents=True)
+    (path / "src" / "blob.bin").write_bytes(b"x" * size)
+    for item in (path / "src" / "blob.bin", path / "src", path):
+        os.utime(item, (mtime, mtime))
+    return path
+
+
+def test_scan_caches_sizes_until_workspace_changes(tmp_path: Path) -> None:
+    root = tmp_path / "managed-repos"
+    first = _make_task(root, "env-a", "t1", 1000, 1_000_000)
+    _make_task(root, "env-a", "t2", 3000, 1_000_100)
+    _make_task(root, "env-b", "t3", 500, 1_000_200)
+    tracker = DiskUsageTracker(str(root))
+
+    report = tracker.scan()
+    assert report.total_bytes == 4500
+    assert report.by_environment() == {"env-a": 4000, "env-b": 500}
+    sized = tracker.sized
+
+    assert tracker.scan().total_bytes == 4500
+    assert tracker.sized == sized
+
+    (first / "notes.txt").write_bytes(b"y" * 24)
+    assert tracker.scan().total_bytes == 4524
+    assert tracker.sized == sized + 1
+
+    tracker.invalidate(str(first))
+    tracker.scan()
+    assert tracker.sized == sized + 2
+
+    summary = report.summary()
+    assert summary.splitlines()[0].startswith("Total: 4.4 KB")
+    assert "t2 (env-a): 2.9 KB" in summary
+
+
+def test_quota_evicts_least_recently_used_finished_workspaces(tmp_path: Path) -> None:
+    root = tmp_path / "managed-repos"
+    _make_task(root, "env", "old", 1000, 1_000_000)
+    _make_task(root, "env", "running", 1000, 999_000)
+    _make_task(root, "env", "middle", 1000, 1_000_500)
+    _make_task(root, "env", "new", 1000, 1_001_000)
+    evicted: list[str] = []
+
+    def evict(usage: WorkspaceUsage) -> bool:
+        evicted.append(usage.task_id)
+        shutil.rmtree(usage.path)
+        return True
+
+    tracker = DiskUsageTracker(str(root))
+    tracker.configure(
+        quota_bytes=2500,
+        is_evictable=lambda usage: usage.task_id != "running",
+        evict=evict,
+    )
+
+    report = tracker.refresh()
+    assert evicted == ["old", "middle"]
+    assert report.total_bytes == 2000
+    remaining = {item.task_id for item in report.workspaces if item.task_id}
+    assert remaining == {"running", "new"}
+
+    tracker.configure(quota_bytes=0)
+    tracker.refresh()
+    assert evicted == ["old", "middle"]
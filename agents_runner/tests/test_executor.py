@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from agents_runner.execution.executor import POOL_IO
+from agents_runner.execution.executor import POOL_RUN
+from agents_runner.execution.executor import ExecutorService
+from agents_runner.execution.executor import PoolSaturated
+from agents_runner.execution.executor import WorkerPool
+
+
+def test_worker_pool_back_pressure_and_stats() -> None:
+    pool = WorkerPool("t", max_workers=1, max_queue=1)
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocker() -> str:
+        started.set()
+        release.wait(5)
+        return "done"
+
+    first = pool.submit(blocker)
+    assert started.wait(5)
+    queued = pool.submit(lambda: 1 / 0)
+    assert not pool.has_capacity()
+    with pytest.raises(PoolSaturated):
+        pool.submit(lambda: None)
+
+    stats = pool.stats()
+    assert (stats["active"], stats["queued"], stats["rejected"]) == (1, 1, 1)
+
+    release.set()
+    assert first.result(5) == "done"
+    with pytest.raises(ZeroDivisionError):
+        queued.result(5)
+    assert pool.shutdown(timeout_s=5)
+    stats = pool.stats()
+    assert (stats["completed"], stats["failed"], stats["peak_active"]) == (2, 1, 1)
+    with pytest.raises(RuntimeError):
+        pool.submit(lambda: None)
+
+
+def test_executor_shutdown_cancels_queued_work() -> None:
+    executor = ExecutorService({POOL_IO: (1, 0)})
+    release = threading.Event()
+    started = threading.Semaphore(0)
+
+    def blocker() -> bool:
+        started.release()
+        return release.wait(5)
+
+    executor.submit(POOL_IO, blocker)
+    running = executor.submit(POOL_RUN, blocker)
+    assert started.acquire(timeout=5) and started.acquire(timeout=5)
+    pending = executor.submit(POOL_IO, lambda: None)
+
+    assert not executor.shutdown(timeout_s=0.05)
+    assert pending.cancelled()
+    assert executor.try_submit(POOL_IO, lambda: None) is None
+
+    release.set()
+    assert running.result(5) is True
+    assert executor.shutdown(timeout_s=5)
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from agents_runner.execution.failure_signals import FailureSignalDetector
+from agents_runner.execution.supervisor_types import ErrorType
+
+
+def test_detector_classifies_rate_limit_and_bounds_tail() -> None:
+    detector = FailureSignalDetector("codex", tail_lines=100)
+    detector.feed("Error: 429 Too Many Requests")
+    for index in range(5000):
+        detector.feed(f"working {index}")
+
+    failure = detector.classify_failure(
+        exit_code=1, container_state={}, exit_summary=None
+    )
+    assert failure.failure_category == "rate_limit"
+    assert "contains: 429" in failure.matched_signals
+    assert len(detector.tail()) == 100
+    # Tail-windowed checks only see recent lines.
+    assert detector.rate_limit(exit_code=1) == (False, 0)
+    assert detector.classify_error(exit_code=1, container_state={}) == (
+        ErrorType.RETRYABLE
+    )
+
+
+def test_detector_rate_limit_extracts_duration() -> None:
+    detector = FailureSignalDetector("copilot")
+    detector.feed("please wait 5 seconds before retrying")
+    assert detector.rate_limit(exit_code=1) == (True, 5)
+
+
+def test_detector_exit_summary_and_crash_priority() -> None:
+    detector = FailureSignalDetector()
+    detector.feed("connection reset by peer")
+    oom = detector.classify_failure(
+        exit_code=137, container_state={}, exit_summary="invalid api key"
+    )
+    assert oom.matched_signals == ("container_crash",)
+
+    network = detector.classify_failure(
+        exit_code=1, container_state={}, exit_summary=None
+    )
+    assert network.failure_category == "network"
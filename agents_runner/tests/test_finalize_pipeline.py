@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import shutil
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from agents_runner.execution.finalize_pipeline import STAGE_ARTIFACTS
+from agents_runner.execution.finalize_pipeline import STAGE_CLEANUP
+from agents_runner.execution.finalize_pipeline import STAGE_COMMIT
+from agents_runner.execution.finalize_pipeline import STAGE_PUSH
+from agents_runner.execution.finalize_pipeline import FinalizePipeline
+from agents_runner.execution.finalize_pipeline import PipelineStep
+from agents_runner.gh.push_batch import PushBatcher
+from agents_runner.gh.push_batch import parse_push_porcelain
+
+
+def test_stages_chain_stop_early_and_report_throughput() -> None:
+    pipeline = FinalizePipeline()
+    seen: list[tuple[str, str]] = []
+    finished: dict[str, BaseException | None] = {}
+
+    def step(job: str, stage: str, result: object = True) -> PipelineStep:
+        def fn() -> object:
+            seen.append((job, stage))
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        return PipelineStep(stage, fn, always=stage == STAGE_CLEANUP)
+
+    jobs = {
+        "ok": [step("ok", STAGE_ARTIFACTS), step("ok", STAGE_PUSH)],
+        "skip": [
+            step("skip", STAGE_ARTIFACTS, False),
+            step("skip", STAGE_COMMIT),
+            step("skip", STAGE_CLEANUP),
+        ],
+        "boom": [
+            step("boom", STAGE_ARTIFACTS, RuntimeError("boom")),
+            step("boom", STAGE_COMMIT),
+            step("boom", STAGE_CLEANUP, ValueError("cleanup")),
+        ],
+    }
+    futures = [
+        pipeline.submit(
+            name,
+            steps,
+            on_finish=lambda error, name=name: finished.__setitem__(name, error),
+        )
+        for name, steps in jobs.items()
+    ]
+    for future in futures:
+        future.exception(timeout=5)
+
+    assert [s for j, s in seen if j == "ok"] == [STAGE_ARTIFACTS, STAGE_PUSH]
+    # Returning False or raising skips to cleanup; the first error is kept.
+    assert [s for j, s in seen if j == "skip"] == [STAGE_ARTIFACTS, STAGE_CLEANUP]
+    assert [s for j, s in seen if j == "boom"] == [STAGE_ARTIFACTS, STAGE_CLEANUP]
+    assert finished["ok"] is None
+    assert isinstance(finished["boom"], RuntimeError)
+    assert str(finished["boom"]) == "boom"
+
+    stats = pipeline.stats()
+    assert stats[STAGE_ARTIFACTS]["completed"] == 3
+    assert stats[STAGE_ARTIFACTS]["failed"] == 1
+    assert stats[STAGE_COMMIT]["completed"] == 0
+    assert stats[STAGE_CLEANUP]["failed"] == 1
+    assert "artifacts 3 done" in pipeline.summary()
+    pipeline.shutdown(timeout_s=1.0)
+
+
+def test_parse_push_porcelain() -> None:
+    output = (
+        "To /tmp/origin.git\n"
+        "*\trefs/heads/a:refs/heads/a\t[new branch]\n"
+        "!\trefs/x/b:refs/heads/b\t[rejected] (fetch first)\n"
+        "Done\n"
+    )
+    assert parse_push_porcelain(output) == {
+        "refs/heads/a": True,
+        "refs/heads/b": False,
+    }
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git missing")
+def test_concurrent_pushes_share_one_push(tmp_path: Path) -> None:
+    def git(cwd: Path, *args: str) -> str:
+        return subprocess.run(
+            ["git", "-C", str(cwd), *args], check=True, capture_output=True, text=True
+        ).stdout
+
+    origin = tmp_path / "origin.git"
+    subprocess.run(
+        ["git", "init", "-q", "--bare", "-b", "main", str(origin)], check=True
+    )
+    clones: list[Path] = []
+    for index in range(3):
+        clone = tmp_path / f"clone{index}"
+        subprocess.run(["git", "clone", "-q", str(origin), str(clone)], check=True)
+        git(clone, "config", "user.email", "t@example.com")
+        git(clone, "config", "user.name", "t")
+        git(clone, "checkout", "-q", "-b", f"midoriaiagents/t{index}")
+        (clone / "f.txt").write_text(f"{index}\n")
+        git(clone, "add", "-A")
+        git(clone, "commit", "-q", "-m", f"task {index}")
+        clones.append(clone)
+
+    batcher = PushBatcher(window_s=0.3)
+    errors: list[Exception] = []
+
+    def push(clone: Path, branch: str) -> None:
+        try:
+            batcher.push(str(clone), branch)
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [
+        threading.Thread(target=push, args=(clone, f"midoriaiagents/t{index}"))
+        for index, clone in enumerate(clones)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(30)
+
+    # The first push goes out alone; the two that arrive meanwhile share one.
+    assert not errors and batcher.batches_pushed == 1
+    heads = git(origin, "for-each-ref", "--format=%(refname)", "refs/heads")
+    assert heads.split() == [f"refs/heads/midoriaiagents/t{i}" for i in range(3)]
+    # Each clone looks as if it ran `git push -u` itself.
+    assert (
+        git(clones[2], "rev-parse", "--abbrev-ref", "@{upstream}").strip()
+        == "origin/midoriaiagents/t2"
+    )
+    assert not git(clones[0], "for-each-ref", "refs/agents-runner").strip()
+
+    # A push with nothing else in flight does not wait for a batch window.
+    (clones[0] / "f.txt").write_text("again\n")
+    git(clones[0], "commit", "-q", "-am", "again")
+    lone = PushBatcher(window_s=30.0)
+    start = time.monotonic()
+    lone.push(str(clones[0]), "midoriaiagents/t0")
+    assert time.monotonic() - start < 10.0 and lone.batches_pushed == 0
+    assert git(origin, "rev-parse", "refs/heads/midoriaiagents/t0") == git(
+        clones[0], "rev-parse", "HEAD"
+    )
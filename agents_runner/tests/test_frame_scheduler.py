@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("PySide6.QtCore")
+pytest.importorskip("midori_ai_logger")
+
+from agents_runner.ui.frame_scheduler import FRAME_INTERVAL_MS  # noqa: E402
+from agents_runner.ui.frame_scheduler import MAX_FRAME_INTERVAL_MS  # noqa: E402
+from agents_runner.ui.frame_scheduler import UNFOCUSED_FRAME_INTERVAL_MS  # noqa: E402
+from agents_runner.ui.frame_scheduler import FrameStats  # noqa: E402
+from agents_runner.ui.frame_scheduler import frame_interval_ms  # noqa: E402
+
+
+def _interval(**overrides: object) -> int | None:
+    state: dict[str, object] = {
+        "visible": True,
+        "minimized": False,
+        "focused": True,
+        "reduced_motion": False,
+    }
+    state.update(overrides)
+    return frame_interval_ms(**state)  # type: ignore[arg-type]
+
+
+def test_frame_interval_follows_window_state() -> None:
+    assert _interval() == FRAME_INTERVAL_MS
+    assert _interval(focused=False) == UNFOCUSED_FRAME_INTERVAL_MS
+    assert _interval(visible=False) is None
+    assert _interval(minimized=True) is None
+    assert _interval(reduced_motion=True) is None
+
+
+def test_frame_interval_stretches_with_paint_cost() -> None:
+    # Cheap frames keep the base rate; 40 ms frames at a 20% budget need 200 ms.
+    assert _interval(avg_frame_ms=5.0) == FRAME_INTERVAL_MS
+    assert _interval(avg_frame_ms=40.0) == 200
+    assert _interval(avg_frame_ms=40.0, focused=False) == UNFOCUSED_FRAME_INTERVAL_MS
+    assert _interval(avg_frame_ms=5000.0) == MAX_FRAME_INTERVAL_MS
+
+    stats = FrameStats(max_samples=2)
+    assert stats.avg_ms() == 0.0
+    for elapsed in (10.0, 30.0, 50.0):
+        stats.record(elapsed)
+    assert (stats.frames, stats.avg_ms(), stats.max_ms()) == (3, 40.0, 50.0)
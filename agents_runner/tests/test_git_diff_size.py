@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import subprocess
+from pathlib import Path
+
+from agents_runner.gh.git_ops import git_diff_size
+
+
+def _git(repo: Path, *args: str) -> None:
+    subprocess.run(["git", "-C", str(repo), *args], check=True, capture_output=True)
+
+
+def test_diff_size_counts_untracked_files(tmp_path: Path) -> None:
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _git(repo, "init", "-q", "-b", "main")
+    (repo / "a.txt").write_text("one\ntwo\n")
+    (repo / ".gitignore").write_text("build/\n")
+    _git(repo, "add", "-A")
+    _git(repo, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", "init")
+    assert git_diff_size(str(repo), "main") == 0
+
+    (repo / "new.py").write_text("a\nb\nc")
+    (repo / "blob.bin").write_bytes(b"\0\1\2")
+    (repo / "build").mkdir()
+    (repo / "build" / "out.txt").write_text("ignored\n" * 50)
+    assert git_diff_size(str(repo), "main") == 4
+
+    (repo / "a.txt").write_text("one\n")
+    assert git_diff_size(str(repo), "main") == 5
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from agents_runner.gh.git_session import GitSession
+from agents_runner.gh.git_session import parse_porcelain_v2
+from agents_runner.gh.task_plan import commit_push_and_pr
+from agents_runner.gh.task_plan import prepare_branch_for_task
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git missing")
+
+
+def _git(cwd: Path, *args: str) -> None:
+    subprocess.run(["git", "-C", str(cwd), *args], check=True, capture_output=True)
+
+
+def test_parse_porcelain_v2() -> None:
+    status = parse_porcelain_v2(
+        "# branch.oid abc123\n"
+        "# branch.head main\n"
+        "# branch.upstream origin/main\n"
+        "# branch.ab +2 -1\n"
+        "u UU N... 100644 100644 100644 100644 a b c f.txt\n"
+        "? new.txt\n"
+    )
+    assert (status.branch, status.head, status.upstream) == (
+        "main",
+        "abc123",
+        "origin/main",
+    )
+    assert (status.ahead, status.behind) == (2, 1)
+    assert not status.clean and status.has_unmerged
+
+
+def _clone_with_main(tmp_path: Path) -> Path:
+    origin = tmp_path / "origin.git"
+    repo = tmp_path / "repo"
+    subprocess.run(
+        ["git", "init", "-q", "--bare", "-b", "main", str(origin)], check=True
+    )
+    subprocess.run(["git", "clone", "-q", str(origin), str(repo)], check=True)
+    _git(repo, "config", "user.email", "t@example.com")
+    _git(repo, "config", "user.name", "t")
+    _git(repo, "checkout", "-q", "-b", "main")
+    (repo / "a.txt").write_text("a\n")
+    _git(repo, "add", "-A")
+    _git(repo, "commit", "-q", "-m", "init")
+    _git(repo, "push", "-q", "-u", "origin", "main")
+    return repo
+
+
+def test_task_branch_round_trip_reuses_status(tmp_path: Path) -> None:
+    repo = _clone_with_main(tmp_path)
+    session = GitSession(str(repo))
+    assert prepare_branch_for_task(
+        str(repo), branch="midoriaiagents/t1", base_branch="main", session=session
+    ) == ("main", "midoriaiagents/t1")
+    labels = [step.label for step in session.steps]
+    # Up to date with origin/main: status shows behind 0, so no merge runs.
+    assert "merge" not in labels and labels.count("status") == 1
+
+    (repo / "b.txt").write_text("b\n")
+    session = GitSession(str(repo))
+    assert (
+        commit_push_and_pr(
+            str(repo),
+            branch="midoriaiagents/t1",
+            base_branch="main",
+            title="t1",
+            body="",
+            use_gh=False,
+            session=session,
+        )
+        == ""
+    )
+    labels = [step.label for step in session.steps]
+    assert labels == ["status", "add", "commit", "push"]
+    assert "push" in session.summary()
+
+
+def test_base_branch_with_deleted_upstream_is_not_merged(tmp_path: Path) -> None:
+    repo = _clone_with_main(tmp_path)
+    _git(repo, "checkout", "-q", "-b", "dev")
+    _git(repo, "push", "-q", "-u", "origin", "dev")
+    _git(repo, "push", "-q", "origin", "--delete", "dev")
+
+    session = GitSession(str(repo))
+    assert prepare_branch_for_task(
+        str(repo), branch="midoriaiagents/t2", base_branch="dev", session=session
+    ) == ("dev", "midoriaiagents/t2")
+    assert "merge" not in [step.label for step in session.steps]
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from agents_runner.environments import git_operations
+from agents_runner.gh.context_cache import GitHubContextCache
+from agents_runner.gh.context_cache import read_head_commit
+
+
+def _git(repo: Path, *args: str) -> str:
+    proc = subprocess.run(
+        ["git", "-C", str(repo), *args],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return proc.stdout.strip()
+
+
+def _commit(repo: Path, text: str) -> str:
+    (repo / "file.txt").write_text(text)
+    _git(repo, "add", "file.txt")
+    _git(repo, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", text)
+    return _git(repo, "rev-parse", "HEAD")
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _git(repo, "init", "-q", "-b", "main")
+    _git(repo, "remote", "add", "origin", "https://github.com/Owner/Repo.git")
+    _commit(repo, "one")
+    return repo
+
+
+def test_read_head_commit_matches_git(repo: Path) -> None:
+    assert read_head_commit(str(repo)) == _git(repo, "rev-parse", "HEAD")
+    _git(repo, "checkout", "-qb", "task/1")
+    _git(repo, "pack-refs", "--all")
+    assert read_head_commit(str(repo)) == _git(repo, "rev-parse", "HEAD")
+
+
+def test_context_reused_until_head_moves(
+    repo: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    calls: list[str] = []
+    real = git_operations.get_git_info
+
+    def counting(path: str):
+        calls.append(path)
+        return real(path)
+
+    monkeypatch.setattr(git_operations, "get_git_info", counting)
+    cache = GitHubContextCache()
+
+    first = cache.resolve(
+        str(repo), repo="owner/repo", base_branch="main", task_branch="task/1"
+    )
+    second = cache.resolve(
+        str(repo),
+        repo="https://github.com/owner/repo",
+        base_branch="main",
+        task_branch="task/2",
+    )
+    assert first is not None and second is not None
+    assert len(calls) == 1
+    assert (second.repo_owner, second.repo_name) == ("Owner", "Repo")
+    assert second.head_commit == first.head_commit
+    assert (first.task_branch, second.task_branch) == ("task/1", "task/2")
+
+    moved = _commit(repo, "two")
+    third = cache.resolve(
+        str(repo), repo="owner/repo", base_branch="main", task_branch="task/3"
+    )
+    assert third is not None and third.head_commit == moved
+    assert len(calls) == 2
+
+    # No base branch: the fallback is task-specific, so nothing is cached.
+    cache.resolve(str(repo), repo="owner/repo", base_branch=None, task_branch=None)
+    cache.resolve(str(repo), repo="owner/repo", base_branch=None, task_branch=None)
+    assert len(calls) == 4
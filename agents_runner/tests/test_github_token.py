@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+import pytest
+
+from agents_runner.github_token import GitHubTokenProvider
+
+TOKEN = "ghp_" + "a" * 36
+ROTATED = "ghp_" + "b" * 36
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def _no_env_token(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("GH_TOKEN", raising=False)
+    monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+
+
+def test_concurrent_callers_share_one_fetch() -> None:
+    calls: list[str] = []
+    gate = threading.Event()
+
+    def fetch(host: str) -> str:
+        calls.append(host)
+        gate.wait(5)
+        return TOKEN
+
+    provider = GitHubTokenProvider(fetch=fetch)
+    results: list[str | None] = []
+    threads = [
+        threading.Thread(target=lambda: results.append(provider.get()))
+        for _ in range(20)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    gate.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert calls == ["github.com"]
+    assert results == [TOKEN] * 20
+
+
+def test_refresh_ahead_invalidate_and_no_token_in_logs(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    clock = _Clock()
+    tokens = iter([TOKEN, ROTATED, TOKEN])
+    refreshed = threading.Event()
+
+    def fetch(_host: str) -> str:
+        token = next(tokens)
+        if token == ROTATED:
+            refreshed.set()
+        return token
+
+    provider = GitHubTokenProvider(
+        ttl_s=100, refresh_ahead_s=10, fetch=fetch, clock=clock
+    )
+    caplog.set_level(logging.DEBUG, logger="agents_runner.github_token")
+
+    assert provider.get() == TOKEN
+    clock.now += 95
+    # Still served from the cache while the refresh runs in the background.
+    assert provider.get() == TOKEN
+    assert refreshed.wait(5)
+    for _ in range(100):
+        if provider.get() == ROTATED:
+            break
+        time.sleep(0.01)
+    assert provider.get() == ROTATED
+
+    provider.invalidate()
+    assert provider.get() == TOKEN
+    assert TOKEN not in caplog.text and ROTATED not in caplog.text
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+from agents_runner.core.agent.watch_state import AgentWatchState
+from agents_runner.execution.scheduler import UNLIMITED
+from agents_runner.headless.daemon import HeadlessDaemon
+from agents_runner.headless.daemon import send_request
+from agents_runner.headless.runner import merge_watch_states
+from agents_runner.ui.task_model import Task
+
+
+def test_headless_does_not_import_qt() -> None:
+    code = (
+        "import sys, agents_runner.headless.cli, agents_runner.headless.daemon; "
+        "sys.exit('PySide6' in sys.modules)"
+    )
+    assert subprocess.run([sys.executable, "-c", code], check=False).returncode == 0
+
+
+class _FakeRunner:
+    def __init__(self) -> None:
+        self.environments: dict[str, object] = {}
+        self.settings: dict[str, object] = {}
+        self.release = threading.Event()
+
+    def reload(self, *, cooldowns: bool = True) -> None:
+        pass
+
+    def create_task(self, prompt: str, *, env_id: str, base_branch: str = "") -> Task:
+        return Task(
+            task_id=f"t{len(prompt)}",
+            prompt=prompt,
+            image="img",
+            host_workdir="/tmp",
+            host_config_dir="/tmp",
+            created_at_s=time.time(),
+            environment_id=env_id,
+        )
+
+    def run_task(
+        self, task: Task, *, on_log, create_pr: bool = True, pending_stop=None
+    ) -> Task:
+        task.status = "running"
+        self.release.wait(5)
+        task.status = "done"
+        return task
+
+    def stop_task(self, task_id: str, *, kill: bool = False) -> bool:
+        self.release.set()
+        return True
+
+    def cancel_queued(self, task: Task) -> None:
+        task.status = "cancelled"
+
+
+def test_daemon_queues_over_socket(tmp_path: Path) -> None:
+    runner = _FakeRunner()
+    sock = str(tmp_path / "d.sock")
+    daemon = HeadlessDaemon(runner, socket_path=sock, max_parallel=1)
+    server = threading.Thread(target=daemon.serve_forever, daemon=True)
+    server.start()
+    for _ in range(100):
+        if Path(sock).exists():
+            break
+        time.sleep(0.02)
+
+    assert os.stat(sock).st_mode & 0o077 == 0
+    first = send_request(sock, {"op": "submit", "env_id": "e", "prompt": "a"})
+    second = send_request(sock, {"op": "submit", "env_id": "e", "prompt": "bb"})
+    assert first["ok"] and second["ok"]
+    status = send_request(sock, {"op": "status", "task_id": "t2"})
+    assert status["task"]["status"] == "queued"
+    assert send_request(sock, {"op": "cancel", "task_id": "t2"})["ok"]
+    assert send_request(sock, {"op": "bogus"}) == {
+        "ok": False,
+        "error": "unknown op: bogus",
+    }
+
+    runner.release.set()
+    assert send_request(sock, {"op": "shutdown"})["ok"]
+    server.join(5)
+    assert not server.is_alive()
+    # Finished tasks are dropped from the live tables but still reported.
+    assert not daemon._tasks and not daemon._create_pr
+    assert {t.task_id: t.status for t in daemon._finished.values()} == {
+        "t1": "done",
+        "t2": "cancelled",
+    }
+
+
+class _SlowStartRunner(_FakeRunner):
+    """Admitted tasks sit between admission and supervisor registration."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.admitted = threading.Event()
+        self.registered = threading.Event()
+
+    def run_task(
+        self, task: Task, *, on_log, create_pr: bool = True, pending_stop=None
+    ) -> Task:
+        self.admitted.set()
+        self.registered.wait(5)
+        stop = pending_stop() if pending_stop is not None else None
+        task.status = {"cancel": "cancelled", "kill": "killed"}.get(stop, "done")
+        return task
+
+    def stop_task(self, task_id: str, *, kill: bool = False) -> bool:
+        # No supervisor yet.
+        return False
+
+
+def test_daemon_cancel_before_supervisor_starts() -> None:
+    runner = _SlowStartRunner()
+    daemon = HeadlessDaemon(runner, socket_path="unused.sock")
+    daemon.submit("a", env_id="e")
+    assert runner.admitted.wait(5)
+    assert daemon.cancel("t1", kill=True)
+    worker = daemon._workers["t1"]
+    runner.registered.set()
+    worker.join(5)
+    assert daemon._finished["t1"].status == "killed"
+    assert not daemon._pending_stops
+
+    runner = _SlowStartRunner()
+    daemon = HeadlessDaemon(runner, socket_path="unused.sock")
+    daemon.submit("a", env_id="e")
+    assert runner.admitted.wait(5)
+    stopper = threading.Thread(target=daemon.shutdown, kwargs={"timeout_s": 5})
+    stopper.start()
+    for _ in range(100):
+        with daemon._cond:
+            if "t1" in daemon._pending_stops:
+                break
+        time.sleep(0.02)
+    runner.registered.set()
+    stopper.join(5)
+    assert daemon._finished["t1"].status == "cancelled"
+
+
+def test_daemon_env_limits_match_the_gui() -> None:
+    runner = _FakeRunner()
+    runner.environments = {
+        "none": SimpleNamespace(max_agents_running=0),
+        "two": SimpleNamespace(max_agents_running=2),
+        "any": SimpleNamespace(max_agents_running=-1),
+    }
+    runner.settings = {"max_agents_running": 3}
+    daemon = HeadlessDaemon(runner, socket_path="unused.sock")
+    assert daemon._env_limit("none") == 0
+    assert daemon._env_limit("two") == 2
+    assert daemon._env_limit("any") == UNLIMITED
+    assert daemon._env_limit("missing") == 3
+
+
+def test_saved_cooldowns_keep_newer_entries_from_disk() -> None:
+    now = datetime.now(timezone.utc)
+    stored = {
+        "codex": AgentWatchState("codex", last_rate_limited_at=now),
+        "gemini": AgentWatchState("gemini"),
+    }
+    ours = {
+        "codex": AgentWatchState("codex", last_rate_limited_at=now - timedelta(1)),
+        "claude": AgentWatchState("claude", last_rate_limited_at=now),
+    }
+    merged = merge_watch_states(stored, ours)
+    assert merged["codex"] is stored["codex"]
+    assert merged["claude"] is ours["claude"]
+    assert merged["gemini"] is stored["gemini"]
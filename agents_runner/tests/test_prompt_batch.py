@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from agents_runner.prompt_batch import PromptBatchRequest
+from agents_runner.prompt_batch import load_prompt_batch
+from agents_runner.prompt_batch import parse_prompt_batch
+from agents_runner.prompt_batch import strip_batch_flags
+
+
+def test_parse_prompt_batch_lines_and_sections(tmp_path: Path) -> None:
+    assert parse_prompt_batch('fix "a"\n\n  fix b  \n') == ["fix `a`", "fix b"]
+    assert parse_prompt_batch("first\nstill first\n---\n\n---\nsecond\n") == [
+        "first\nstill first",
+        "second",
+    ]
+
+    jsonl = tmp_path / "batch.jsonl"
+    jsonl.write_text('"one"\n\n{"prompt": "two\\nlines"}\n', encoding="utf-8")
+    assert load_prompt_batch(jsonl) == ["one", "two\nlines"]
+    jsonl.write_text('{"text": "nope"}\n', encoding="utf-8")
+    with pytest.raises(ValueError, match="line 1"):
+        load_prompt_batch(jsonl)
+
+
+def test_strip_batch_flags() -> None:
+    argv, batch = strip_batch_flags(
+        ["app", "--batch-prompts", "p.txt", "--batch-env=env-1", "-style", "x"]
+    )
+    assert argv == ["app", "-style", "x"]
+    assert batch == PromptBatchRequest(path="p.txt", env_id="env-1")
+    assert strip_batch_flags(["app"]) == (["app"], None)
+
+
+_RUN_APP_WITH_BATCH = textwrap.dedent(
+    """
+    import json
+    import sys
+
+    from PySide6.QtCore import QTimer
+    from PySide6.QtWidgets import QApplication
+
+    import agents_runner.setup.orchestrator as orchestrator
+    from agents_runner.environments import Environment
+    from agents_runner.environments import save_environment
+    from agents_runner.prompt_batch import PromptBatchRequest
+    from agents_runner.ui.main_window import MainWindow
+    from agents_runner.ui.runtime.app import run_app
+
+    result_path = sys.argv[1]
+    save_environment(Environment(env_id="env-1", name="One"))
+    orchestrator.check_setup_complete = lambda: True
+
+    def _record(self, prompts, host_codex, env_id, base_branch):
+        with open(result_path, "w", encoding="utf-8") as fh:
+            json.dump(
+                {
+                    "prompts": prompts,
+                    "env_known": env_id in self._environments,
+                    "tasks_restored": self._tasks_restored,
+                },
+                fh,
+            )
+        QApplication.quit()
+        return []
+
+    MainWindow._start_task_batch_from_ui = _record
+    QTimer.singleShot(20000, QApplication.quit)
+    run_app(
+        ["agents-runner"],
+        batch=PromptBatchRequest(path=sys.argv[2], env_id="env-1"),
+    )
+    """
+)
+
+
+def test_run_app_starts_batch_after_startup_phases(tmp_path: Path) -> None:
+    pytest.importorskip("PySide6.QtWidgets")
+    pytest.importorskip("midori_ai_logger")
+    prompts = tmp_path / "prompts.txt"
+    prompts.write_text("first\nsecond\n", encoding="utf-8")
+    result = tmp_path / "result.json"
+    env = dict(
+        os.environ,
+        HOME=str(tmp_path / "home"),
+        AGENTS_RUNNER_STATE_PATH=str(tmp_path / "state"),
+        QT_QPA_PLATFORM="offscreen",
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", _RUN_APP_WITH_BATCH, str(result), str(prompts)],
+        cwd=Path(__file__).resolve().parents[2],
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.exists(), proc.stderr
+    assert json.loads(result.read_text(encoding="utf-8")) == {
+        "prompts": ["first", "second"],
+        "env_known": True,
+        "tasks_restored": True,
+    }
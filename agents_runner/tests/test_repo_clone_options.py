@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from agents_runner.gh.git_session import GitSession
+from agents_runner.gh.repo_clone import CloneOptions
+from agents_runner.gh.repo_clone import ensure_github_clone
+from agents_runner.gh.repo_clone import parse_sparse_paths
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git missing")
+
+
+def _git(cwd: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-C", str(cwd), *args], check=True, capture_output=True, text=True
+    ).stdout
+
+
+def _commit(repo: Path, name: str) -> None:
+    path = repo / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"{name}\n")
+    _git(repo, "add", "-A")
+    _git(repo, "commit", "-q", "-m", name)
+
+
+def test_parse_sparse_paths() -> None:
+    assert parse_sparse_paths("src/app, docs/\n src/app") == ("src/app", "docs")
+    assert CloneOptions().is_full and CloneOptions().git_clone_args() == []
+
+
+def test_shallow_sparse_clone_deepens_for_base_comparison(tmp_path: Path) -> None:
+    upstream = tmp_path / "upstream"
+    upstream.mkdir()
+    _git(upstream, "init", "-q", "-b", "main")
+    _git(upstream, "config", "user.email", "t@example.com")
+    _git(upstream, "config", "user.name", "t")
+    _commit(upstream, "a/one.txt")
+    _git(upstream, "branch", "feature")
+    _commit(upstream, "b/two.txt")
+    _commit(upstream, "a/three.txt")
+    _git(upstream, "checkout", "-q", "feature")
+    _commit(upstream, "a/four.txt")
+    _git(upstream, "checkout", "-q", "main")
+
+    dest = tmp_path / "clone"
+    options = CloneOptions(partial=True, depth=1, sparse_paths=("a",))
+    ensure_github_clone(
+        f"file://{upstream}", str(dest), prefer_gh=False, options=options
+    )
+
+    assert (dest / "a" / "three.txt").exists()
+    assert not (dest / "b").exists()
+    assert _git(dest, "config", "remote.origin.partialclonefilter").strip() == (
+        "blob:none"
+    )
+    session = GitSession(str(dest))
+    assert session.is_shallow()
+    # Both main commits since the fork point, which the depth-1 clone lacks.
+    assert session.rev_count("origin/feature..origin/main") == 2
+    assert "deepen" in [step.label for step in session.steps]
+
+    # Clearing the sparse paths brings the whole tree back.
+    ensure_github_clone(
+        f"file://{upstream}",
+        str(dest),
+        prefer_gh=False,
+        options=CloneOptions(partial=True, depth=1),
+    )
+    assert (dest / "b" / "two.txt").exists()
+    assert _git(dest, "config", "--bool", "core.sparseCheckout").strip() == "false"
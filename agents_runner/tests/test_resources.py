@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from agents_runner.docker.resources import RESOURCE_PROFILES
+from agents_runner.docker.resources import ContainerResources
+from agents_runner.docker.resources import CpusetAllocator
+from agents_runner.docker.resources import parse_resource_profile
+
+
+def test_parse_resource_profile_presets_and_custom_specs() -> None:
+    assert parse_resource_profile("") == ContainerResources()
+    assert parse_resource_profile("Medium") == RESOURCE_PROFILES["medium"]
+    custom = parse_resource_profile("cpus=1.5, memory=4g, pids=256, bogus=1")
+    assert custom == ContainerResources(cpus=1.5, memory_mb=4096, pids_limit=256)
+    assert custom.docker_args() == [
+        "--cpus",
+        "1.5",
+        "--memory",
+        "4096m",
+        "--memory-swap",
+        "4096m",
+        "--pids-limit",
+        "256",
+    ]
+    assert parse_resource_profile("cpus=abc").is_unlimited()
+
+
+def test_cpuset_allocator_spreads_tasks_across_cores() -> None:
+    allocator = CpusetAllocator(cpus=[0, 1, 2, 3])
+    assert allocator.allocate("a", 2.0) == "0,1"
+    assert allocator.allocate("b", 1.5) == "2,3"
+    # Every core is taken once; the next task shares the least-used ones.
+    assert allocator.allocate("c", 0) == "0"
+    allocator.release("b")
+    assert allocator.assigned("b") == ""
+    assert allocator.allocate("d", 2.0) == "2,3"
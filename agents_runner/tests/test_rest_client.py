@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from typing import Any
+
+import pytest
+
+from agents_runner.gh.rest_client import GitHubRateLimited
+from agents_runner.gh.rest_client import GitHubRestClient
+
+
+class _StubGitHub(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    peers: list[tuple[str, int]] = []
+    remaining = 100
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+    def _reply(self, status: int, payload: Any, **headers: str) -> None:
+        raw = json.dumps(payload).encode() if payload is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(raw)))
+        self.send_header("X-RateLimit-Limit", "100")
+        self.send_header("X-RateLimit-Remaining", str(type(self).remaining))
+        self.send_header("X-RateLimit-Reset", str(int(time.time()) + 60))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def do_GET(self) -> None:
+        type(self).peers.append(self.client_address)
+        assert self.headers["Authorization"] == "Bearer secret"
+        if self.path.startswith("/repos/o/r/pulls"):
+            if self.headers.get("If-None-Match") == '"v1"':
+                self._reply(304, None, ETag='"v1"')
+                return
+            self._reply(200, [{"html_url": "https://x/pull/1"}], ETag='"v1"')
+        elif self.path == "/repos/o/r":
+            self._reply(200, {"default_branch": "trunk"})
+        elif self.path == "/repos/o/slow":
+            time.sleep(0.5)
+            self._reply(200, {"default_branch": "main"})
+        else:
+            self._reply(404, {"message": "Not Found"})
+
+    def do_POST(self) -> None:
+        type(self).peers.append(self.client_address)
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if payload["head"] == "dup":
+            self._reply(
+                422,
+                {
+                    "message": "Validation Failed",
+                    "errors": [{"message": "A pull request already exists"}],
+                },
+            )
+            return
+        self._reply(201, {"html_url": "https://x/pull/2"})
+
+
+@pytest.fixture
+def stub_url() -> Any:
+    _StubGitHub.peers = []
+    _StubGitHub.remaining = 100
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubGitHub)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_keep_alive_etag_and_pr_calls(stub_url: str) -> None:
+    client = GitHubRestClient("secret", api_url=stub_url)
+    assert client.find_pull_request("o", "r", "b") == "https://x/pull/1"
+    first = client.request("GET", "/repos/o/r/pulls", query={"head": "o:b"})
+    assert client.request("GET", "/repos/o/r/pulls", query={"head": "o:b"}).from_cache
+    assert not first.from_cache
+    assert client.repo("o", "r")["default_branch"] == "trunk"
+    assert (
+        client.create_pull_request("o", "r", head="b", base="main", title="t", body="")
+        == "https://x/pull/2"
+    )
+    # 422 "already exists" resolves to the open PR.
+    assert (
+        client.create_pull_request(
+            "o", "r", head="dup", base="main", title="t", body=""
+        )
+        == "https://x/pull/1"
+    )
+    assert client.connections_opened == 1
+    assert len(set(_StubGitHub.peers)) == 1
+    assert client.rate_limit.remaining == 100
+    client.close()
+
+
+def test_exhausted_rate_limit_short_circuits(stub_url: str) -> None:
+    client = GitHubRestClient("secret", api_url=stub_url)
+    _StubGitHub.remaining = 0
+    client.repo("o", "r")
+    calls = len(_StubGitHub.peers)
+    with pytest.raises(GitHubRateLimited):
+        client.repo("o", "r")
+    assert len(_StubGitHub.peers) == calls
+    client.close()
+
+
+def test_concurrent_requests_do_not_wait_for_each_other(stub_url: str) -> None:
+    client = GitHubRestClient("secret", api_url=stub_url)
+    results: list[str] = []
+
+    def fetch() -> None:
+        results.append(client.repo("o", "slow")["default_branch"])
+
+    threads = [threading.Thread(target=fetch) for _ in range(3)]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    assert results == ["main"] * 3
+    assert time.monotonic() - start < 1.2
+    assert client.connections_opened == 3
+
+    # The connections went back to the pool and are reused.
+    client.repo("o", "r")
+    assert client.connections_opened == 3
+    client.close()
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from agents_runner.docker.agent_worker_setup import RuntimeEnvironment
+from agents_runner.docker.config import DockerRunnerConfig
+from agents_runner.docker.run_plan import clear_run_plans
+from agents_runner.docker.run_plan import run_plan_for
+from agents_runner.environments import load_environments_cached
+from agents_runner.midoriai_template import MidoriAITemplateDetection
+
+
+def _runtime_env(task_id: str, *, desktop: bool) -> RuntimeEnvironment:
+    return RuntimeEnvironment(
+        forced_platform=None,
+        platform_args=[],
+        rosetta_available=False,
+        host_mount=f"/work/{task_id}",
+        container_cwd="/home/midori-ai/workspace",
+        config_container_dir="/home/midori-ai/.codex",
+        config_extra_mounts=["/host/claude:/home/midori-ai/.claude"],
+        template_detection=MidoriAITemplateDetection(0.0, False, None),
+        container_name=f"agents-runner-{task_id}",
+        task_token=task_id,
+        artifacts_staging_dir=Path(f"/artifacts/{task_id}"),
+        settings_container_path="",
+        environment_container_path="",
+        settings_preflight_tmp_path=None,
+        environment_preflight_tmp_path=None,
+        runtime_image="img",
+        desktop_enabled=desktop,
+        desktop_cached=False,
+        desktop_cache_key=None,
+        desktop_display=":1",
+        container_caching_enabled=False,
+        agent_cli="codex",
+        prompt_for_agent="hi",
+    )
+
+
+def _config(task_id: str) -> DockerRunnerConfig:
+    return DockerRunnerConfig(
+        task_id=task_id,
+        image="img",
+        host_config_dir="/host/codex",
+        host_workdir=f"/work/{task_id}",
+        env_vars={"B": "2", "A": "1"},
+        extra_mounts=["/data:/data:ro", "/other:/home/midori-ai/workspace"],
+        ports=["8080:80", "6080:6080"],
+    )
+
+
+def test_plan_is_shared_between_tasks_and_substitutes_task_fields() -> None:
+    clear_run_plans()
+    first, cached = run_plan_for(_config("t1"), _runtime_env("t1", desktop=True))
+    assert not cached
+    second, cached = run_plan_for(_config("t2"), _runtime_env("t2", desktop=True))
+    assert cached and second is first
+    assert first.env_args == ("-e", "A=1", "-e", "B=2")
+    assert first.port_args == ("-p", "8080:80", "-p", "127.0.0.1::6080")
+
+    args = second.docker_run_args(
+        container_name="agents-runner-t2",
+        container_cwd="/home/midori-ai/workspace",
+        image="img",
+        task_mounts=["/work/t2:/home/midori-ai/workspace"],
+        preflight_mounts=[],
+        preflight_clause="",
+        agent_cmd="codex exec hi",
+        task_token="t2",
+        forward_github_token=True,
+    )
+    assert args[args.index("--name") + 1] == "agents-runner-t2"
+    mounts = [args[i + 1] for i, a in enumerate(args) if a == "-v"]
+    # The task's workspace wins over the configured mount on the same path.
+    assert mounts == [
+        "/work/t2:/home/midori-ai/workspace",
+        "/data:/data:ro",
+        "/host/claude:/home/midori-ai/.claude",
+    ]
+    assert "AGENTS_RUNNER_TASK_ID=t2" in args and "GH_TOKEN" in args
+    assert args[-1].endswith("exec codex exec hi")
+
+    other, cached = run_plan_for(_config("t3"), _runtime_env("t3", desktop=False))
+    assert not cached and other.key != first.key and not other.desktop_clause
+
+
+def test_environments_cache_follows_file_changes(tmp_path: Path) -> None:
+    path = tmp_path / "environments.json"
+    path.write_text(json.dumps({"environments": []}), encoding="utf-8")
+    first = load_environments_cached(str(tmp_path))
+    assert load_environments_cached(str(tmp_path)) is first
+
+    path.write_text(json.dumps({"environments": [], "v": 2}), encoding="utf-8")
+    assert load_environments_cached(str(tmp_path)) is not first
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from agents_runner.execution.scheduler import TaskScheduler
+from agents_runner.execution.scheduler import parse_agent_limits
+
+
+def test_round_robin_between_environments_respects_limits() -> None:
+    limits = {"a": 2, "b": 2}
+    scheduler = TaskScheduler(env_limit=lambda env_id: limits.get(env_id, -1))
+    for index in range(4):
+        scheduler.enqueue(f"a{index}", env_id="a", created_at_s=float(index))
+    for index in range(4):
+        scheduler.enqueue(f"b{index}", env_id="b", created_at_s=10.0 + index)
+
+    assert scheduler.admit() == ["a0", "b0", "a1", "b1"]
+    assert scheduler.running_count("a") == 2
+    assert scheduler.admit() == []
+
+    scheduler.mark_finished("b0")
+    assert scheduler.admit() == ["b2"]
+
+
+def test_priority_global_and_agent_limits() -> None:
+    scheduler = TaskScheduler(global_limit=2, agent_limits={"claude": 1})
+    scheduler.enqueue("low", env_id="a", agent_cli="codex", priority=0)
+    scheduler.enqueue("c1", env_id="b", agent_cli="claude", priority=5)
+    scheduler.enqueue("c2", env_id="c", agent_cli="claude", priority=5)
+
+    assert scheduler.admit() == ["c1", "low"]
+    assert not scheduler.can_start("d")
+
+    scheduler.forget("low")
+    # c2 is still held back by the claude limit.
+    assert scheduler.admit() == []
+    scheduler.mark_finished("c1")
+    assert scheduler.admit() == ["c2"]
+
+
+def test_sync_rebuilds_counters_and_queue() -> None:
+    scheduler = TaskScheduler(env_limit=lambda _env_id: 1)
+    scheduler.mark_running("stale", env_id="a")
+    scheduler.enqueue("gone", env_id="a")
+    scheduler.sync(
+        running={"r1": ("a", "codex")},
+        queued=[("q1", "b", "codex", 0, 1.0), ("q2", "a", "codex", 0, 2.0)],
+    )
+
+    assert not scheduler.is_running("stale")
+    assert not scheduler.is_queued("gone")
+    assert scheduler.admit() == ["q1"]
+    assert parse_agent_limits("Codex=2, bad, claude = 1") == {"codex": 2, "claude": 1}
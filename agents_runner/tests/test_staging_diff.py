@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from agents_runner.artifacts import diff_staging_snapshots
+from agents_runner.artifacts import snapshot_staging_dir
+
+
+def test_diff_staging_snapshots_reports_added_modified_removed(
+    tmp_path: Path,
+) -> None:
+    (tmp_path / "keep.txt").write_text("same", encoding="utf-8")
+    (tmp_path / "grow.log").write_text("a", encoding="utf-8")
+    (tmp_path / "gone.png").write_bytes(b"\x89PNG")
+    (tmp_path / "subdir").mkdir()
+    before = snapshot_staging_dir(tmp_path)
+
+    (tmp_path / "grow.log").write_text("abc", encoding="utf-8")
+    (tmp_path / "gone.png").unlink()
+    (tmp_path / "new.md").write_text("# hi", encoding="utf-8")
+    after = snapshot_staging_dir(tmp_path)
+
+    diff = diff_staging_snapshots(before, after)
+
+    assert [a.filename for a in diff.added] == ["new.md"]
+    assert [a.filename for a in diff.modified] == ["grow.log"]
+    assert diff.removed == ["gone.png"]
+    assert "subdir" not in after
+
+
+def test_diff_staging_snapshots_detects_mtime_only_change(tmp_path: Path) -> None:
+    target = tmp_path / "out.txt"
+    target.write_text("x", encoding="utf-8")
+    before = snapshot_staging_dir(tmp_path)
+
+    stat = target.stat()
+    os.utime(target, (stat.st_atime, stat.st_mtime + 5))
+    diff = diff_staging_snapshots(before, snapshot_staging_dir(tmp_path))
+
+    assert [a.filename for a in diff.modified] == ["out.txt"]
+    assert diff_staging_snapshots(before, before).is_empty()
+
+
+def test_snapshot_staging_dir_missing_directory(tmp_path: Path) -> None:
+    assert snapshot_staging_dir(tmp_path / "missing") == {}
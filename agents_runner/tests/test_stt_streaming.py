@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from agents_runner.stt.service import StreamingTranscript
+from agents_runner.stt.service import TranscriptSegment
+
+
+def _silence(seconds: float) -> bytes:
+    return b"\x00\x00" * int(16000 * seconds)
+
+
+def test_streaming_transcript_commits_stable_segments_and_trims_window() -> None:
+    stream = StreamingTranscript(stable_margin_s=1.0)
+    stream.append(_silence(4.0))
+    assert stream.undecoded_seconds == 4.0
+
+    stream.window_pcm()
+    text = stream.apply_segments(
+        [
+            TranscriptSegment(0.0, 2.0, " hello there"),
+            TranscriptSegment(2.0, 3.8, " general"),
+        ]
+    )
+
+    assert text == "hello there general"
+    assert stream.committed_text == "hello there"
+    assert stream.undecoded_seconds == 0.0
+    # Committed audio is dropped so the next decode only sees the tail.
+    assert stream.window_seconds == 2.0
+
+
+def test_streaming_transcript_final_commits_everything() -> None:
+    stream = StreamingTranscript(stable_margin_s=1.0)
+    stream.append(_silence(2.0))
+    stream.apply_segments([TranscriptSegment(0.0, 1.9, " tentative")])
+    assert stream.committed_text == ""
+
+    text = stream.apply_segments([TranscriptSegment(0.0, 1.9, " kenobi")], final=True)
+
+    assert text == "kenobi"
+    assert stream.window_seconds == 0.0
+
+
+def test_streaming_transcript_drops_long_silent_window() -> None:
+    stream = StreamingTranscript(stable_margin_s=1.0, max_window_s=5.0)
+    stream.append(_silence(6.0))
+
+    assert stream.apply_segments([]) == ""
+    assert stream.window_seconds == 1.0
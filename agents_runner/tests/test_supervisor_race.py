@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+from agents_runner.artifacts import get_staging_dir
+from agents_runner.docker.config import DockerRunnerConfig
+from agents_runner.environments.model import AgentInstance
+from agents_runner.environments.model import AgentSelection
+from agents_runner.execution import supervisor as supervisor_module
+from agents_runner.execution import supervisor_race
+from agents_runner.execution.supervisor import TaskSupervisor
+from agents_runner.execution.supervisor_types import SupervisorConfig
+
+
+class _FakeWorker:
+    """Stands in for DockerAgentWorker: "slow" agents run until killed."""
+
+    def __init__(self, *, config, prompt, on_state, on_log, on_done) -> None:
+        self._config = config
+        self._on_done = on_done
+        self._killed = threading.Event()
+        self.container_id = f"cid-{config.agent_cli}"
+        self.resource_usage: dict[str, Any] = {}
+        self.gh_repo_root = config.host_workdir
+        self.gh_base_branch = "main"
+        self.gh_branch = f"agents-runner-{config.task_id}"
+
+    def run(self) -> None:
+        os.makedirs(self._config.host_workdir, exist_ok=True)
+        Path(self._config.host_workdir, "by").write_text(self._config.agent_cli)
+        staging = get_staging_dir(self._config.artifacts_key or self._config.task_id)
+        staging.mkdir(exist_ok=True)
+        (staging / f"{self._config.agent_cli}.txt").write_text("artifact")
+        if self._config.agent_cli == "slow":
+            self._killed.wait(5.0)
+            self._on_done(137, None, [])
+            return
+        if self._config.agent_cli == "broken":
+            self._on_done(1, None, [])
+            return
+        self._on_done(0, None, [])
+
+    def request_kill(self) -> None:
+        self._killed.set()
+
+    def request_stop(self) -> None:
+        self._killed.set()
+
+
+def test_race_keeps_first_success_and_adopts_its_workspace(
+    tmp_path: Path, monkeypatch
+) -> None:
+    monkeypatch.setattr(supervisor_race, "DockerAgentWorker", _FakeWorker)
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    workdir = tmp_path / "task"
+    config = DockerRunnerConfig(
+        task_id="t1",
+        image="img",
+        host_config_dir=str(tmp_path / "cfg"),
+        host_workdir=str(workdir),
+        gh_repo="owner/repo",
+    )
+    selection = AgentSelection(
+        agents=[
+            AgentInstance("a", "slow", config_dir=str(tmp_path / "a")),
+            AgentInstance("b", "fast", config_dir=str(tmp_path / "b")),
+            AgentInstance("c", "unused", config_dir=str(tmp_path / "c")),
+        ],
+        selection_mode="race",
+        race_width=2,
+    )
+    done: list[tuple[int, dict[str, Any]]] = []
+    supervisor = TaskSupervisor(
+        config=config,
+        prompt="do it",
+        agent_selection=selection,
+        supervisor_config=SupervisorConfig(),
+        on_state=lambda state: None,
+        on_log=lambda line: None,
+        on_retry=lambda *args: None,
+        on_agent_switch=lambda *args: None,
+        on_done=lambda code, err, artifacts, meta: done.append((code, meta)),
+    )
+
+    result = supervisor.run()
+
+    assert result.exit_code == 0
+    assert result.metadata["agent_id"] == "b"
+    outcomes = {
+        entry["agent_id"]: entry["race_outcome"]
+        for entry in result.metadata["attempt_history"]
+    }
+    assert outcomes == {"a": "cancelled", "b": "won"}
+    assert (workdir / "by").read_text() == "fast"
+    assert not (tmp_path / "task-race1").exists()
+    assert supervisor.gh_repo_root == str(workdir)
+    # Only the winner's staged artifacts reach the task.
+    assert sorted(p.name for p in get_staging_dir("t1").iterdir()) == ["fast.txt"]
+    artifacts_root = get_staging_dir("t1").parent.parent
+    assert sorted(p.name for p in artifacts_root.iterdir()) == ["t1"]
+    assert done and done[0][0] == 0
+
+
+def test_race_without_clone_falls_back_along_the_agent_chain(
+    tmp_path: Path, monkeypatch
+) -> None:
+    monkeypatch.setattr(supervisor_module, "DockerAgentWorker", _FakeWorker)
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    config = DockerRunnerConfig(
+        task_id="t2",
+        image="img",
+        host_config_dir=str(tmp_path / "cfg"),
+        host_workdir=str(tmp_path / "task"),
+    )
+    selection = AgentSelection(
+        agents=[
+            AgentInstance("a", "broken", config_dir=str(tmp_path / "a")),
+            AgentInstance("b", "skipped", config_dir=str(tmp_path / "b")),
+            AgentInstance("c", "fallback", config_dir=str(tmp_path / "c")),
+        ],
+        selection_mode="race",
+        agent_fallbacks={"a": "c"},
+    )
+    supervisor = TaskSupervisor(
+        config=config,
+        prompt="do it",
+        agent_selection=selection,
+        supervisor_config=SupervisorConfig(max_retries_per_agent=0),
+        on_state=lambda state: None,
+        on_log=lambda line: None,
+        on_retry=lambda *args: None,
+        on_agent_switch=lambda *args: None,
+    )
+
+    result = supervisor.run()
+
+    assert result.exit_code == 0
+    assert result.metadata["agent_id"] == "c"
+    tried = [entry["agent_id"] for entry in result.metadata["attempt_history"]]
+    assert tried == ["a", "c"]
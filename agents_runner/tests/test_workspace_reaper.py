@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from agents_runner.environments.cleanup import cleanup_task_workspace
+from agents_runner.environments.paths import managed_repo_checkout_path
+from agents_runner.environments.paths import workspace_trash_dir
+from agents_runner.environments.reaper import PurgeResult
+from agents_runner.environments.reaper import WorkspaceReaper
+from agents_runner.environments.reaper import workspace_reaper
+
+
+def _make_tree(root: Path) -> int:
+    total = 0
+    for index in range(6):
+        sub = root / f"pkg{index}" / "lib" / "deep"
+        sub.mkdir(parents=True)
+        for name in ("a.js", "b.js"):
+            (sub / name).write_bytes(b"z" * 100)
+            total += 100
+    objects = root / ".git" / "objects" / "ab"
+    objects.mkdir(parents=True)
+    (objects / "cdef").write_bytes(b"o" * 50)
+    os.chmod(objects / "cdef", 0o444)
+    os.chmod(objects, 0o555)
+    return total + 50
+
+
+def test_cleanup_moves_workspace_to_trash_and_reaps_it(tmp_path: Path) -> None:
+    data_dir = str(tmp_path / "data")
+    workspace = managed_repo_checkout_path("env", data_dir, "t1")
+    expected = _make_tree(Path(workspace))
+    reaper = workspace_reaper(data_dir)
+    results: list[PurgeResult] = []
+    reaper.add_listener(results.append)
+
+    assert cleanup_task_workspace("env", "t1", data_dir=data_dir)
+    assert not os.path.exists(workspace)
+
+    assert reaper.wait_idle(10.0)
+    assert os.listdir(workspace_trash_dir(data_dir)) == []
+    assert len(results) == 1
+    assert results[0].files == 13
+    assert results[0].bytes_freed == expected
+    assert results[0].leftovers == ()
+    assert reaper.status().freed_bytes == expected
+
+
+def test_start_resumes_entries_left_in_trash(tmp_path: Path) -> None:
+    trash = tmp_path / "trash"
+    _make_tree(trash / "123-old-task")
+    (trash / "stray-file").write_text("x")
+
+    reaper = WorkspaceReaper(str(trash), workers=2)
+    reaper.start()
+    try:
+        assert reaper.wait_idle(10.0)
+    finally:
+        reaper.stop(timeout_s=5.0)
+    assert os.listdir(trash) == []
+    status = reaper.status()
+    assert status.leftovers == ()
+    assert "reclaimed" in status.summary()
@@ -1,5 +1,19 @@
 from __future__ import annotations
 
-from agents_runner.ui.main_window import MainWindow
+from typing import TYPE_CHECKING
+from typing import Any
+
+if TYPE_CHECKING:
+    from agents_runner.ui.main_window import MainWindow
 
 __all__ = ["MainWindow"]
+
+
+def __getattr__(name: str) -> Any:
+    # Resolved lazily so importing any ``agents_runner.ui`` submodule (e.g. the
+    # runtime entry point) does not pull in every page and widget.
+    if name == "MainWindow":
+        from agents_runner.ui.main_window import MainWindow
+
+        return MainWindow
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,7 +2,10 @@
 File watcher for artifact staging directory.
 
 Provides debounced notifications when files are added, modified, or deleted
-in the staging directory during task runtime.
+in the staging directory during task runtime. Change notifications come from
+``QFileSystemWatcher`` (inotify-backed on Linux, polling elsewhere); each
+debounced burst is turned into a structured delta by diffing a cached
+(name, size, mtime) snapshot of the directory.
 """
 
 from __future__ import annotations
@@ -22,14 +25,21 @@ from PySide6.QtCore import (
 )
 from PySide6.QtWidgets import QApplication
 
+from agents_runner.artifacts import StagingArtifactDiff
+from agents_runner.artifacts import StagingArtifactMeta
+from agents_runner.artifacts import diff_staging_snapshots
+from agents_runner.artifacts import snapshot_staging_dir
+
 logger = logging.getLogger(__name__)
 
 
 class ArtifactFileWatcher(QObject):
     """Watch artifact staging directory for changes.
 
-    Emits :attr:`files_changed` when files are added, modified, or deleted.
-    Changes are debounced to avoid excessive UI updates.
+    Emits :attr:`artifacts_changed` with a :class:`StagingArtifactDiff` when
+    files are added, modified, or deleted, followed by :attr:`files_changed`.
+    Changes are debounced to avoid excessive UI updates, and bursts that leave
+    the snapshot unchanged emit nothing.
 
     Threading:
         Qt timers (and most QObject operations) must be performed from the thread that
@@ -46,6 +56,7 @@ class ArtifactFileWatcher(QObject):
     """
 
     files_changed = Signal()
+    artifacts_changed = Signal(object)  # StagingArtifactDiff
 
     def __init__(
         self,
@@ -86,6 +97,7 @@ class ArtifactFileWatcher(QObject):
         self._debounce_ms = debounce_ms
         self._watcher: QFileSystemWatcher | None = None
         self._debounce_timer: QTimer | None = None
+        self._snapshot: dict[str, StagingArtifactMeta] = {}
 
         if QThread.currentThread() is not gui_thread:
             # Construct Qt children on the GUI thread to avoid cross-thread parenting
@@ -138,6 +150,9 @@ class ArtifactFileWatcher(QObject):
         if self._watcher is None:
             return
 
+        # Baseline for diffing; later bursts only report what changed since.
+        self._snapshot = self._take_snapshot()
+
         # Watch directory
         self._watcher.addPath(str(self._staging_dir))
 
@@ -210,9 +225,30 @@ class ArtifactFileWatcher(QObject):
 
         self._debounce_timer.start(self._debounce_ms)
 
+    def snapshot(self) -> dict[str, StagingArtifactMeta]:
+        """Return a copy of the last cached staging snapshot."""
+        return dict(self._snapshot)
+
+    def _take_snapshot(self) -> dict[str, StagingArtifactMeta]:
+        try:
+            return snapshot_staging_dir(self._staging_dir)
+        except Exception as e:
+            logger.error(f"Failed to snapshot staging directory: {e}")
+            return dict(self._snapshot)
+
     def _emit_change(self) -> None:
-        """Emit files_changed signal."""
-        logger.debug("Emitting files_changed signal")
+        """Diff against the cached snapshot and emit the resulting delta."""
+        current = self._take_snapshot()
+        diff: StagingArtifactDiff = diff_staging_snapshots(self._snapshot, current)
+        self._snapshot = current
+        if diff.is_empty():
+            return
+
+        logger.debug(
+            "Emitting artifacts_changed: "
+            f"+{len(diff.added)} ~{len(diff.modified)} -{len(diff.removed)}"
+        )
+        self.artifacts_changed.emit(diff)
         self.files_changed.emit()
 
     def _refresh_watched_files(self) -> None:
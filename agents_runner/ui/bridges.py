@@ -4,6 +4,7 @@ from PySide6.QtCore import QObject
 from PySide6.QtCore import Signal
 from PySide6.QtCore import Slot
 
+from agents_runner.core.agent.cooldown_registry import CooldownRegistry
 from agents_runner.docker_runner import DockerAgentWorker
 from agents_runner.docker_runner import DockerPreflightWorker
 from agents_runner.docker_runner import DockerRunnerConfig
@@ -32,6 +33,7 @@ class TaskRunnerBridge(QObject):
         agent_selection: AgentSelection | None = None,
         use_supervisor: bool = True,
         watch_states: dict | None = None,
+        cooldowns: CooldownRegistry | None = None,
     ) -> None:
         super().__init__()
         self.task_id = task_id
@@ -69,6 +71,7 @@ class TaskRunnerBridge(QObject):
                     self.task_id, code, err, artifacts, metadata
                 ),
                 watch_states=watch_states or {},
+                cooldowns=cooldowns,
             )
         else:
             # Legacy mode without supervisor
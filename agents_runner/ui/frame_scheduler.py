@@ -0,0 +1,169 @@
+"""Frame scheduling for animated theme backgrounds.
+
+The background animation only needs to advance while somebody can see it.
+``FrameScheduler`` owns the tick timer for a widget and picks its interval
+from the top-level window state: paused while hidden or minimized, slowed
+down while the window is not focused, and stopped entirely when reduced
+motion is requested. Paint cost is measured and stretches the interval when
+frames get expensive (large windows, software rendering).
+"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from collections.abc import Callable
+
+from midori_ai_logger import MidoriAiLogger
+from PySide6.QtCore import QEvent
+from PySide6.QtCore import QObject
+from PySide6.QtCore import QTimer
+from PySide6.QtWidgets import QWidget
+
+logger = MidoriAiLogger(channel=None, name=__name__)
+
+FRAME_INTERVAL_MS = 100
+UNFOCUSED_FRAME_INTERVAL_MS = 1000
+MAX_FRAME_INTERVAL_MS = 2000
+
+# Keep background painting under roughly this share of one core.
+FRAME_BUDGET_FRACTION = 0.2
+
+_FRAME_SAMPLES = 60
+
+_WINDOW_EVENTS = {
+    QEvent.Type.WindowStateChange,
+    QEvent.Type.ActivationChange,
+    QEvent.Type.Show,
+    QEvent.Type.Hide,
+}
+
+
+def frame_interval_ms(
+    *,
+    visible: bool,
+    minimized: bool,
+    focused: bool,
+    reduced_motion: bool,
+    avg_frame_ms: float = 0.0,
+) -> int | None:
+    """Return the tick interval for the given window state, or None to pause."""
+    if reduced_motion or not visible or minimized:
+        return None
+    interval = FRAME_INTERVAL_MS if focused else UNFOCUSED_FRAME_INTERVAL_MS
+    if avg_frame_ms > 0.0:
+        interval = max(interval, int(avg_frame_ms / FRAME_BUDGET_FRACTION))
+    return min(interval, MAX_FRAME_INTERVAL_MS)
+
+
+class FrameStats:
+    """Rolling paint-time statistics over the most recent frames."""
+
+    def __init__(self, max_samples: int = _FRAME_SAMPLES) -> None:
+        self._samples: deque[float] = deque(maxlen=max(1, int(max_samples)))
+        self.frames = 0
+
+    def record(self, elapsed_ms: float) -> None:
+        self._samples.append(max(0.0, float(elapsed_ms)))
+        self.frames += 1
+
+    def avg_ms(self) -> float:
+        if not self._samples:
+            return 0.0
+        return sum(self._samples) / len(self._samples)
+
+    def max_ms(self) -> float:
+        return max(self._samples, default=0.0)
+
+
+class FrameScheduler(QObject):
+    def __init__(self, widget: QWidget, tick: Callable[[], None]) -> None:
+        super().__init__(widget)
+        self._widget = widget
+        self._window: QWidget | None = None
+        self._reduced_motion = False
+        self._state = "paused"
+        self._stats = FrameStats()
+
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(tick)
+        widget.installEventFilter(self)
+
+    def set_reduced_motion(self, enabled: bool) -> None:
+        enabled = bool(enabled)
+        if enabled == self._reduced_motion:
+            return
+        self._reduced_motion = enabled
+        self.reschedule()
+
+    def reduced_motion(self) -> bool:
+        return self._reduced_motion
+
+    def is_running(self) -> bool:
+        return self._timer.isActive()
+
+    def measure_frame(self, started_s: float) -> None:
+        """Record one paint that began at ``started_s`` (``perf_counter``)."""
+        self._stats.record((time.perf_counter() - started_s) * 1000.0)
+        # Re-evaluate occasionally so slow paints stretch the interval.
+        if self._stats.frames % 20 == 0:
+            self.reschedule()
+
+    def stats(self) -> dict[str, object]:
+        return {
+            "state": self._state,
+            "interval_ms": self._timer.interval() if self._timer.isActive() else None,
+            "frames": self._stats.frames,
+            "avg_frame_ms": round(self._stats.avg_ms(), 2),
+            "max_frame_ms": round(self._stats.max_ms(), 2),
+        }
+
+    def reschedule(self) -> None:
+        window = self._widget.window()
+        minimized = bool(window.isMinimized()) if window is not None else False
+        focused = bool(window.isActiveWindow()) if window is not None else True
+        interval = frame_interval_ms(
+            visible=self._widget.isVisible(),
+            minimized=minimized,
+            focused=focused,
+            reduced_motion=self._reduced_motion,
+            avg_frame_ms=self._stats.avg_ms(),
+        )
+        if interval is None:
+            self._timer.stop()
+            state = "static" if self._reduced_motion else "paused"
+        else:
+            if self._timer.interval() != interval or not self._timer.isActive():
+                self._timer.start(interval)
+            state = "active" if interval == FRAME_INTERVAL_MS else "throttled"
+
+        if state != self._state:
+            self._state = state
+            logger.rprint(
+                f"[frames] background {state} "
+                f"(interval={interval} ms, avg paint={self._stats.avg_ms():.1f} ms)",
+                mode="debug",
+            )
+
+    def _watch_window(self) -> None:
+        window = self._widget.window()
+        if window is self._window:
+            return
+        if self._window is not None:
+            self._window.removeEventFilter(self)
+        self._window = window
+        if window is not None and window is not self._widget:
+            window.installEventFilter(self)
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        event_type = event.type()
+        if watched is self._widget and event_type in (
+            QEvent.Type.Show,
+            QEvent.Type.Hide,
+            QEvent.Type.ParentChange,
+        ):
+            self._watch_window()
+            self.reschedule()
+        elif watched is self._window and event_type in _WINDOW_EVENTS:
+            self.reschedule()
+        return False
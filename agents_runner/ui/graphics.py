@@ -9,11 +9,11 @@ from PySide6.QtCore import (
     Property,
     QPropertyAnimation,
     Qt,
-    QTimer,
 )
 from PySide6.QtGui import QColor, QPainter, QPaintEvent, QResizeEvent
 from PySide6.QtWidgets import QWidget
 
+from agents_runner.ui.frame_scheduler import FrameScheduler
 from agents_runner.ui.themes.types import ThemeBackground
 
 _BACKGROUND_CACHE: dict[str, ThemeBackground | None] = {}
@@ -191,10 +191,20 @@ class GlassRoot(QWidget):
 
         self._ensure_theme_runtime(self._theme_name)
 
-        ticker = QTimer(self)
-        ticker.setInterval(100)
-        ticker.timeout.connect(self._update_background_animation)
-        ticker.start()
+        self._frames = FrameScheduler(self, self._update_background_animation)
+
+    def set_reduced_motion(self, enabled: bool) -> None:
+        """Freeze the background on its current frame and skip theme fades."""
+        enabled = bool(enabled)
+        if enabled and self._theme_to_name is not None:
+            self._apply_theme_immediately(self._theme_to_name)
+        self._tick_last_s = time.monotonic()
+        self._frames.set_reduced_motion(enabled)
+        self.update()
+
+    def frame_stats(self) -> dict[str, object]:
+        """Return background paint timing and the current scheduling state."""
+        return self._frames.stats()
 
     def _ensure_theme_runtime(self, theme_name: str) -> object | None:
         resolved = _resolve_theme_name(theme_name)
@@ -290,14 +300,14 @@ class GlassRoot(QWidget):
         self._set_theme_blend(0.0)
 
     def set_theme_name(self, theme_name: str) -> None:
-        if not self.isVisible():
+        if not self.isVisible() or self._frames.reduced_motion():
             self._apply_theme_immediately(theme_name)
             return
         self._transition_to_theme(theme_name)
 
     def set_agent_theme(self, agent_cli: str) -> None:
         resolved = _theme_name_for_agent(agent_cli)
-        if not self.isVisible():
+        if not self.isVisible() or self._frames.reduced_motion():
             self._apply_theme_immediately(resolved)
             return
         self._transition_to_theme(resolved)
@@ -365,6 +375,7 @@ class GlassRoot(QWidget):
 
     def paintEvent(self, event: QPaintEvent) -> None:
         del event
+        started_s = time.perf_counter()
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing, True)
 
@@ -377,3 +388,5 @@ class GlassRoot(QWidget):
             alpha_to = self._paint_theme(painter, self._theme_to_name)
             painter.fillRect(self.rect(), QColor(0, 0, 0, int(alpha_to)))
             painter.restore()
+        painter.end()
+        self._frames.measure_frame(started_s)
@@ -14,6 +14,7 @@ from agents_runner.docker_platform import docker_platform_args_for_pixelarch
 from agents_runner.environments import WORKSPACE_CLONED
 from agents_runner.environments.cleanup import cleanup_task_workspace
 from agents_runner.environments.git_operations import get_git_info
+from agents_runner.gh.repo_clone import CloneOptions
 from agents_runner.gh_management import GhManagementError
 from agents_runner.gh_management import prepare_github_repo_for_task
 from agents_runner.log_format import format_log
@@ -59,6 +60,7 @@ class InteractivePrepWorker(QObject):
         apply_full_prompting: bool,
         desktop_enabled: bool,
         prep_id: str = "",
+        clone_options: CloneOptions | None = None,
     ) -> None:
         super().__init__()
         self._task_id = str(task_id or "").strip()
@@ -78,6 +80,7 @@ class InteractivePrepWorker(QObject):
         self._is_help_launch = bool(is_help_launch)
         self._apply_full_prompting = bool(apply_full_prompting)
         self._desktop_enabled = bool(desktop_enabled)
+        self._clone_options = clone_options
         self._prep_id = str(prep_id or "").strip()
         self._stop_requested = False
 
@@ -271,6 +274,7 @@ class InteractivePrepWorker(QObject):
                         on_log=lambda line: self.log.emit(
                             self._task_id, str(line or "")
                         ),
+                        clone_options=self._clone_options,
                     )
                 except GhManagementError as exc:
                     raise RuntimeError(str(exc)) from exc
@@ -4,6 +4,10 @@ import os
 import re
 import threading
 
+from concurrent.futures import Future
+from typing import TYPE_CHECKING
+from typing import cast
+
 from PySide6.QtCore import Qt
 from PySide6.QtCore import QThread
 from PySide6.QtCore import QTimer
@@ -15,6 +19,8 @@ from PySide6.QtWidgets import QVBoxLayout
 from PySide6.QtWidgets import QWidget
 
 from agents_runner.environments import Environment
+from agents_runner.execution.executor import ExecutorService
+from agents_runner.execution.finalize_pipeline import FinalizePipeline
 from agents_runner.persistence import default_state_path
 from agents_runner.ui.bridges import TaskRunnerBridge
 from agents_runner.ui.constants import APP_TITLE
@@ -22,21 +28,22 @@ from agents_runner.ui.graphics import GlassRoot
 from agents_runner.ui.lucide_icons import lucide_icon
 from agents_runner.ui.radio import RadioController
 from agents_runner.ui.pages import DashboardPage
-from agents_runner.ui.pages import EnvironmentsPage
 from agents_runner.ui.pages import NewTaskPage
-from agents_runner.ui.pages import SettingsPage
 from agents_runner.ui.pages import TaskDetailsPage
 from agents_runner.ui.task_model import Task
 from agents_runner.ui.widgets import GlassCard
+from agents_runner.ui.widgets import LazyPageHost
 from agents_runner.ui.widgets.radio_control import RadioControlWidget
 
 from agents_runner.ui.main_window_capacity import _MainWindowCapacityMixin
 from agents_runner.ui.main_window_dashboard import _MainWindowDashboardMixin
+from agents_runner.ui.main_window_disk_usage import _MainWindowDiskUsageMixin
 from agents_runner.ui.main_window_environment import _MainWindowEnvironmentMixin
 from agents_runner.ui.main_window_navigation import _MainWindowNavigationMixin
 from agents_runner.ui.main_window_persistence import _MainWindowPersistenceMixin
 from agents_runner.ui.main_window_preflight import _MainWindowPreflightMixin
 from agents_runner.ui.main_window_settings import _MainWindowSettingsMixin
+from agents_runner.ui.main_window_startup import _MainWindowStartupMixin
 from agents_runner.ui.main_window_task_events import _MainWindowTaskEventsMixin
 from agents_runner.ui.main_window_task_recovery import _MainWindowTaskRecoveryMixin
 from agents_runner.ui.main_window_task_review import _MainWindowTaskReviewMixin
@@ -48,10 +55,15 @@ from agents_runner.ui.main_window_tasks_interactive_finalize import (
     _MainWindowTasksInteractiveFinalizeMixin,
 )
 
+if TYPE_CHECKING:
+    from agents_runner.ui.pages import EnvironmentsPage
+    from agents_runner.ui.pages import SettingsPage
+
 
 class MainWindow(
     QMainWindow,
     _MainWindowCapacityMixin,
+    _MainWindowDiskUsageMixin,
     _MainWindowNavigationMixin,
     _MainWindowSettingsMixin,
     _MainWindowEnvironmentMixin,
@@ -64,12 +76,18 @@ class MainWindow(
     _MainWindowTaskRecoveryMixin,
     _MainWindowTaskEventsMixin,
     _MainWindowPersistenceMixin,
+    _MainWindowStartupMixin,
 ):
     host_log = Signal(str, str)
     host_pr_url = Signal(str, str)
     host_artifacts = Signal(str, object)
     interactive_finished = Signal(str, int)
     repo_branches_ready = Signal(int, object)
+    task_restore_ready = Signal(str, object)
+    host_sample_ready = Signal()
+    cooldowns_changed = Signal(object)
+    run_worker_freed = Signal()
+    disk_usage_ready = Signal(object)
 
     def __init__(self) -> None:
         super().__init__()
@@ -98,6 +116,13 @@ class MainWindow(
             "window_w": 1280,
             "window_h": 720,
             "max_agents_running": -1,
+            "max_total_agents_running": -1,
+            "agent_cli_max_running": {},
+            "admission_control_enabled": True,
+            "admission_max_load_per_cpu": 2.0,
+            "admission_min_free_memory_mb": 1024,
+            "admission_min_free_disk_mb": 2048,
+            "workspace_disk_quota_gb": 0.0,
             "append_pixelarch_context": False,
             "headless_desktop_enabled": False,
             "ui_theme": "auto",
@@ -142,6 +167,14 @@ class MainWindow(
         self.repo_branches_ready.connect(
             self._on_repo_branches_ready, Qt.QueuedConnection
         )
+        self.task_restore_ready.connect(
+            self._on_task_restore_ready, Qt.QueuedConnection
+        )
+        self.host_sample_ready.connect(
+            self._try_start_queued_tasks, Qt.QueuedConnection
+        )
+        self.cooldowns_changed.connect(self._on_cooldowns_changed, Qt.QueuedConnection)
+        self.run_worker_freed.connect(self._try_start_queued_tasks, Qt.QueuedConnection)
 
         self._dashboard_ticker = QTimer(self)
         self._dashboard_ticker.setInterval(1000)
@@ -149,8 +182,11 @@ class MainWindow(
         self._dashboard_ticker.start()
 
         self._recovery_log_stop: dict[str, threading.Event] = {}
-        self._finalization_threads: dict[str, threading.Thread] = {}
+        self._executor = ExecutorService()
+        self._finalize_pipeline = FinalizePipeline()
+        self._finalization_futures: dict[str, Future] = {}
         self._radio_channel_options: list[str] = []
+        self._radio_channel_options_enabled = False
         self._recovery_ticker = QTimer(self)
         # Recovery tick interval: 5 seconds (reduced from 1 second)
         # Rationale: Event-driven paths handle normal operation immediately.
@@ -228,6 +264,7 @@ class MainWindow(
         self._dashboard.task_discard_requested.connect(self._discard_task_from_ui)
         self._new_task = NewTaskPage()
         self._new_task.requested_run.connect(self._start_task_from_ui)
+        self._new_task.requested_batch.connect(self._start_task_batch_from_ui)
         self._new_task.requested_launch.connect(self._start_interactive_task_from_ui)
         self._new_task.environment_changed.connect(self._on_new_task_env_changed)
         self._new_task.back_requested.connect(self._show_dashboard)
@@ -236,20 +273,12 @@ class MainWindow(
         self._details.back_requested.connect(self._show_dashboard)
         self._details.pr_requested.connect(self._on_task_pr_requested)
         self._details.container_action_requested.connect(self._on_task_container_action)
-        self._envs_page = EnvironmentsPage()
-        self._envs_page.back_requested.connect(self._show_dashboard)
-        self._envs_page.updated.connect(self._reload_environments, Qt.QueuedConnection)
-        self._envs_page.test_preflight_requested.connect(
-            self._on_environment_test_preflight, Qt.QueuedConnection
-        )
-        self._settings = SettingsPage(
-            radio_supported=self._radio_controller.qt_available
-        )
-        self._settings.back_requested.connect(self._show_dashboard)
-        self._settings.saved.connect(self._apply_settings, Qt.QueuedConnection)
-        self._settings.test_preflight_requested.connect(
-            self._on_settings_test_preflight, Qt.QueuedConnection
+        # Environments and settings are built on first navigation; set
+        # AGENTS_RUNNER_EAGER_PAGES=1 to build them during startup instead.
+        self._envs_host = LazyPageHost(
+            self._create_environments_page, name="environments"
         )
+        self._settings_host = LazyPageHost(self._create_settings_page, name="settings")
 
         self._stack = QWidget()
         self._stack_layout = QVBoxLayout(self._stack)
@@ -258,23 +287,71 @@ class MainWindow(
         self._stack_layout.addWidget(self._dashboard)
         self._stack_layout.addWidget(self._new_task)
         self._stack_layout.addWidget(self._details)
-        self._stack_layout.addWidget(self._envs_page)
-        self._stack_layout.addWidget(self._settings)
+        self._stack_layout.addWidget(self._envs_host)
+        self._stack_layout.addWidget(self._settings_host)
         self._dashboard.show()
         self._new_task.hide()
         self._details.hide()
-        self._envs_page.hide()
-        self._settings.hide()
+        self._envs_host.hide()
+        self._settings_host.hide()
         outer.addWidget(self._stack, 1)
 
+        # Only settings are loaded before the first paint; environments and
+        # tasks are filled in by queued startup phases.
         self._load_state()
+        self._create_scheduler()
+        self.disk_usage_ready.connect(self._on_disk_usage_ready, Qt.QueuedConnection)
+        self._create_disk_usage_tracker()
         self._sync_radio_controller_from_settings(user_initiated=False)
         self._apply_window_prefs()
-        self._reload_environments()
-        self._apply_settings_to_pages()
-        self._refresh_radio_channel_options(disable_on_failure=True)
+        self._apply_background_motion()
         self._on_radio_state_changed(self._radio_controller.state_snapshot())
-        self._try_start_queued_tasks()
+        self._schedule_startup_phases()
+
+    @property
+    def _envs_page(self) -> EnvironmentsPage:
+        return cast("EnvironmentsPage", self._envs_host.page())
+
+    @property
+    def _settings(self) -> SettingsPage:
+        return cast("SettingsPage", self._settings_host.page())
+
+    def _create_environments_page(self) -> EnvironmentsPage:
+        from agents_runner.ui.pages.environments import EnvironmentsPage
+
+        page = EnvironmentsPage()
+        page.back_requested.connect(self._show_dashboard)
+        page.updated.connect(self._reload_environments, Qt.QueuedConnection)
+        page.test_preflight_requested.connect(
+            self._on_environment_test_preflight, Qt.QueuedConnection
+        )
+        page.set_settings_data(self._settings_data)
+        return page
+
+    def _create_settings_page(self) -> SettingsPage:
+        from agents_runner.ui.pages.settings import SettingsPage
+
+        page = SettingsPage(radio_supported=self._radio_controller.qt_available)
+        page.back_requested.connect(self._show_dashboard)
+        page.saved.connect(self._apply_settings, Qt.QueuedConnection)
+        page.test_preflight_requested.connect(
+            self._on_settings_test_preflight, Qt.QueuedConnection
+        )
+        page.disk_usage_refresh_requested.connect(
+            self._on_disk_usage_refresh_requested, Qt.QueuedConnection
+        )
+        page.set_settings(self._settings_data)
+        page.set_radio_channel_options(
+            self._radio_channel_options,
+            selected=RadioController.normalize_channel(
+                self._settings_data.get("radio_channel")
+            ),
+            enabled=self._radio_channel_options_enabled,
+        )
+        report = self._disk_usage.report()
+        if report is not None:
+            page.set_disk_usage(self._disk_usage_text(report))
+        return page
 
     def resizeEvent(self, event) -> None:
         super().resizeEvent(event)
@@ -286,10 +363,17 @@ class MainWindow(
     def closeEvent(self, event) -> None:
         if hasattr(self, "_radio_controller"):
             self._radio_controller.shutdown()
+        from agents_runner.stt.service import shutdown_stt_service
+
+        shutdown_stt_service()
         try:
             self._save_state()
         except Exception:
             pass
+        # Let in-flight finalization and cleanup jobs finish briefly.
+        self._executor.shutdown(timeout_s=2.0)
+        self._finalize_pipeline.shutdown(timeout_s=2.0)
+        self._disk_usage.stop()
         # Clean up external viewer process
         if hasattr(self, "_details"):
             self._details.cleanup()
@@ -361,7 +445,8 @@ class MainWindow(
         if not bool(self._settings_data.get("radio_enabled") or False):
             self._settings_data["radio_enabled"] = True
             self._radio_controller.set_enabled(True, start_when_enabled=False)
-            self._settings.set_settings(self._settings_data)
+            if self._settings_host.is_loaded():
+                self._settings.set_settings(self._settings_data)
 
         self._radio_controller.toggle_playback()
         self._schedule_save()
@@ -428,7 +513,7 @@ class MainWindow(
             self._settings_data.get("radio_channel")
         )
         if not self._radio_controller.qt_available:
-            self._settings.set_radio_channel_options(
+            self._push_radio_channel_options(
                 self._radio_channel_options,
                 selected=selected_channel,
                 enabled=False,
@@ -442,7 +527,7 @@ class MainWindow(
 
             if error_text or not isinstance(channels, list):
                 if disable_on_failure:
-                    self._settings.set_radio_channel_options(
+                    self._push_radio_channel_options(
                         self._radio_channel_options,
                         selected=current_selected,
                         enabled=False,
@@ -457,7 +542,7 @@ class MainWindow(
                 normalized.append(channel)
             normalized.sort()
             self._radio_channel_options = normalized
-            self._settings.set_radio_channel_options(
+            self._push_radio_channel_options(
                 normalized,
                 selected=current_selected,
                 enabled=True,
@@ -465,6 +550,16 @@ class MainWindow(
 
         self._radio_controller.fetch_channels(_handle_channels)
 
+    def _push_radio_channel_options(
+        self, channels: list[str], *, selected: str, enabled: bool
+    ) -> None:
+        self._radio_channel_options_enabled = bool(enabled)
+        if not self._settings_host.is_loaded():
+            return
+        self._settings.set_radio_channel_options(
+            channels, selected=selected, enabled=enabled
+        )
+
     @staticmethod
     def _normalize_radio_window_track_title(value: object) -> str:
         track = " ".join(str(value or "").split())
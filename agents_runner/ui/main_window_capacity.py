@@ -1,16 +1,131 @@
 from __future__ import annotations
 
+import os
+import time
+from datetime import datetime
+
+from PySide6.QtCore import QTimer
+
+from agents_runner.core.agent.cooldown_registry import CooldownRegistry
+from agents_runner.docker.resources import CpusetAllocator
+from agents_runner.execution.admission import AdmissionController
+from agents_runner.execution.admission import AdmissionThresholds
+from agents_runner.execution.executor import DEFAULT_POOL_SIZES
+from agents_runner.execution.executor import POOL_RUN
+from agents_runner.execution.scheduler import TaskScheduler
+from agents_runner.execution.supervisor import agent_chain_for
+from agents_runner.execution.supervisor import attempt_key_for
+from agents_runner.log_format import format_log
+from agents_runner.ui.task_model import Task
+
+_RUNNING_STATUSES = {"pulling", "created", "running", "starting"}
+# QTimer intervals are int milliseconds; re-arm at least daily.
+_MAX_COOLDOWN_TIMER_MS = 24 * 60 * 60 * 1000
+
 
 class _MainWindowCapacityMixin:
+    """Concurrency limits for agent runs, backed by ``TaskScheduler``.
+
+    The scheduler keeps running counters per environment and agent CLI. Call
+    sites that change a task's status report it via ``_sync_task_schedule``;
+    the recovery tick resyncs everything as a safety net.
+
+    Queued starts are also gated by ``AdmissionController`` on host load,
+    memory and disk. A delayed task is retried when the next host sample
+    lands or on the recovery tick.
+
+    A queued task whose whole agent chain is on cooldown also waits. The
+    ``CooldownRegistry`` arms a single timer for the earliest expiry and
+    wakes the queue when it fires, so no polling is involved.
+
+    Environments with CPU-set partitioning get cores from ``CpusetAllocator``
+    at start; the cores are released when the task leaves the running set.
+
+    Started tasks run on the executor's ``run`` pool, sized to the global
+    limit; a task also waits while that pool has no free worker.
+    """
+
+    def _create_scheduler(self) -> None:
+        self._scheduler = TaskScheduler(env_limit=self._max_agents_running_for_env)
+        self._admission = AdmissionController(
+            os.path.dirname(self._state_path),
+            on_sample=self.host_sample_ready.emit,
+        )
+        self._admission_waits: dict[str, str] = {}
+        self._cpusets = CpusetAllocator()
+        self._cooldowns = CooldownRegistry(
+            self._watch_states, on_change=self.cooldowns_changed.emit
+        )
+        self._cooldown_timer = QTimer(self)
+        self._cooldown_timer.setSingleShot(True)
+        self._cooldown_timer.timeout.connect(self._on_cooldown_timer)
+        self._arm_cooldown_timer()
+        self._apply_scheduler_limits()
+
+    def _on_cooldown_timer(self) -> None:
+        # Re-arm even if nothing expired: the timer can fire a little early,
+        # and long cooldowns are waited out in capped steps.
+        self._cooldowns.expire_due()
+        self._arm_cooldown_timer()
+
+    def _arm_cooldown_timer(self) -> None:
+        expiry = self._cooldowns.next_expiry()
+        if expiry is None:
+            self._cooldown_timer.stop()
+            return
+        delay_ms = int(max(0.0, expiry - time.time()) * 1000) + 50
+        self._cooldown_timer.start(min(delay_ms, _MAX_COOLDOWN_TIMER_MS))
+
+    def _on_cooldowns_changed(self, _keys: object = None) -> None:
+        """A cooldown was set, cleared or expired (queued from any thread)."""
+        self._arm_cooldown_timer()
+        self._schedule_save()
+        self._try_start_queued_tasks()
+
+    def _cooldown_blocker(self, task: Task) -> str | None:
+        """Describe the cooldown blocking ``task``, or None if an agent is free."""
+        config = getattr(task, "_runner_config", None)
+        if config is None:
+            return None
+        chain = agent_chain_for(config, getattr(task, "_agent_selection", None))
+        earliest: datetime | None = None
+        for agent in chain:
+            state = self._cooldowns.check(attempt_key_for(agent, config).cooldown_key())
+            if state is None or not state.is_on_cooldown():
+                return None
+            until = state.cooldown_until
+            if until is not None and (earliest is None or until < earliest):
+                earliest = until
+        if earliest is None:
+            return "agents on cooldown"
+        until = earliest.astimezone().strftime("%H:%M:%S")
+        return f"agents on cooldown until {until}"
+
+    def _apply_scheduler_limits(self) -> None:
+        try:
+            global_limit = int(self._settings_data.get("max_total_agents_running", -1))
+        except Exception:
+            global_limit = -1
+        raw_limits = self._settings_data.get("agent_cli_max_running") or {}
+        agent_limits: dict[str, int] = {}
+        if isinstance(raw_limits, dict):
+            for name, value in raw_limits.items():
+                try:
+                    agent_limits[str(name)] = int(value)
+                except (TypeError, ValueError):
+                    continue
+        self._scheduler.configure(global_limit=global_limit, agent_limits=agent_limits)
+        # One run worker per running task; the global limit (if set) bounds it.
+        self._executor.pool(POOL_RUN).resize(
+            global_limit if global_limit > 0 else DEFAULT_POOL_SIZES[POOL_RUN][0]
+        )
+        self._admission.configure(
+            AdmissionThresholds.from_settings(self._settings_data)
+        )
+
     def _count_running_agents(self, env_id: str | None = None) -> int:
-        count = 0
         env_id = str(env_id or "").strip() or None
-        for task in self._tasks.values():
-            if env_id and str(getattr(task, "environment_id", "") or "") != env_id:
-                continue
-            if task.status.lower() in {"pulling", "created", "running", "starting"}:
-                count += 1
-        return count
+        return self._scheduler.running_count(env_id)
 
     def _max_agents_running_for_env(self, env_id: str | None) -> int:
         env_id = str(env_id or "").strip()
@@ -25,20 +140,123 @@ class _MainWindowCapacityMixin:
         except Exception:
             return -1
 
-    def _can_start_new_agent_for_env(self, env_id: str | None) -> bool:
-        max_agents = self._max_agents_running_for_env(env_id)
-        if max_agents < 0:
+    def _can_start_new_agent_for_env(
+        self, env_id: str | None, agent_cli: str = ""
+    ) -> bool:
+        # Running tasks are unknown until the startup restore completes.
+        if not getattr(self, "_tasks_restored", True):
+            return self._max_agents_running_for_env(env_id) < 0
+        return self._scheduler.can_start(str(env_id or ""), agent_cli)
+
+    def _sync_task_schedule(self, task: Task) -> None:
+        """Report a status change of ``task`` to the scheduler."""
+        status = (task.status or "").lower()
+        if status in _RUNNING_STATUSES:
+            self._scheduler.mark_running(
+                task.task_id, env_id=task.environment_id, agent_cli=task.agent_cli
+            )
+        elif status == "queued":
+            self._scheduler.mark_finished(task.task_id)
+            self._cpusets.release(task.task_id)
+        else:
+            self._scheduler.forget(task.task_id)
+            self._admission_waits.pop(task.task_id, None)
+            self._cpusets.release(task.task_id)
+
+    def _enqueue_task(self, task: Task) -> None:
+        self._scheduler.enqueue(
+            task.task_id,
+            env_id=task.environment_id,
+            agent_cli=task.agent_cli,
+            priority=int(task.priority or 0),
+            created_at_s=float(task.created_at_s or 0.0),
+        )
+
+    def _resync_scheduler(self) -> None:
+        """Rebuild scheduler state from ``self._tasks`` (full scan)."""
+        running: dict[str, tuple[str, str]] = {}
+        queued: list[tuple[str, str, str, int, float]] = []
+        for task in self._tasks.values():
+            status = (task.status or "").lower()
+            if status in _RUNNING_STATUSES:
+                running[task.task_id] = (task.environment_id, task.agent_cli)
+            elif status == "queued":
+                queued.append(
+                    (
+                        task.task_id,
+                        task.environment_id,
+                        task.agent_cli,
+                        int(task.priority or 0),
+                        float(task.created_at_s or 0.0),
+                    )
+                )
+        self._scheduler.sync(running=running, queued=queued)
+
+    def _running_container_ids(self) -> list[str]:
+        ids: list[str] = []
+        for task_id in self._scheduler.running_task_ids():
+            task = self._tasks.get(task_id)
+            if task is not None and task.container_id:
+                ids.append(str(task.container_id))
+        return ids
+
+    def _held_by_cooldown(self, task_id: str) -> bool:
+        task = self._tasks.get(task_id)
+        blocker = self._cooldown_blocker(task) if task is not None else None
+        if blocker is None:
+            return False
+        if self._admission_waits.get(task_id) != "cooldown":
+            self._admission_waits[task_id] = "cooldown"
+            self._on_task_log(
+                task_id,
+                format_log("queue", "cooldown", "INFO", f"Waiting: {blocker}"),
+            )
+        return True
+
+    def _admission_allows(self, task_id: str) -> bool:
+        if not self._executor.pool(POOL_RUN).has_capacity():
+            if self._admission_waits.get(task_id) != "workers":
+                self._admission_waits[task_id] = "workers"
+                self._on_task_log(
+                    task_id,
+                    format_log(
+                        "queue", "admission", "INFO", "Waiting for a free run worker"
+                    ),
+                )
+            return False
+        decision = self._admission.check(self._running_container_ids())
+        if decision.allowed:
+            self._admission_waits.pop(task_id, None)
+            self._admission.note_started()
             return True
-        return self._count_running_agents(env_id) < max_agents
+        # Log once per blocking resource, not on every retry.
+        if decision.resource != "sample" and (
+            self._admission_waits.get(task_id) != decision.resource
+        ):
+            self._admission_waits[task_id] = decision.resource
+            self._on_task_log(
+                task_id,
+                format_log(
+                    "queue",
+                    "admission",
+                    "INFO",
+                    f"Waiting for host resources: {decision.reason}",
+                ),
+            )
+        return False
 
     def _try_start_queued_tasks(self) -> None:
-        queued = [t for t in self._tasks.values() if t.status.lower() == "queued"]
-        if not queued:
+        if not getattr(self, "_tasks_restored", True):
             return
-        queued.sort(key=lambda t: t.created_at_s)
-        for task in queued:
-            if not self._can_start_new_agent_for_env(
-                getattr(task, "environment_id", "")
-            ):
+        for task_id in self._scheduler.admit(
+            can_admit=self._admission_allows, is_held=self._held_by_cooldown
+        ):
+            task = self._tasks.get(task_id)
+            if task is None or (task.status or "").lower() != "queued":
+                self._scheduler.mark_finished(task_id)
                 continue
-            self._actually_start_task(task)
+            started = self._actually_start_task(task)
+            # Releases the slot again if the start bailed out early.
+            self._sync_task_schedule(task)
+            if not started and (task.status or "").lower() == "queued":
+                self._enqueue_task(task)
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import os
+import re
+import time
+
+from agents_runner.environments import managed_repo_checkout_path
+from agents_runner.environments import managed_repos_dir
+from agents_runner.environments.cleanup import cleanup_task_workspace
+from agents_runner.environments.cow_workspace import snapshot_kept_unmerged
+from agents_runner.environments.disk_usage import DiskUsageReport
+from agents_runner.environments.disk_usage import DiskUsageTracker
+from agents_runner.environments.disk_usage import WorkspaceUsage
+from agents_runner.environments.disk_usage import format_bytes
+from agents_runner.environments.reaper import workspace_reaper
+from agents_runner.log_format import format_log
+from agents_runner.persistence import load_task_payload
+from agents_runner.ui.task_model import Task
+
+# Matches Task.is_done() / Task.is_failed().
+_FINISHED_STATUSES = frozenset(
+    {"done", "cancelled", "killed", "failed", "error", "dead", "exited"}
+)
+_GIB = 1024**3
+# Workspaces no loaded or saved task refers to are only evicted once they
+# have been left alone this long; headless runs and archived tasks that are
+# not loaded keep their task files, but a file can still be written late.
+_ORPHAN_MIN_AGE_S = 24 * 60 * 60
+# Race clones (``<task_id>-raceN``) belong to a task that is still settling.
+_RACE_CLONE = re.compile(r"-race\d+$")
+
+
+def _finished(status: object, finalization_state: object) -> bool:
+    return (
+        str(status or "").lower() in _FINISHED_STATUSES
+        and str(finalization_state or "") == "done"
+    )
+
+
+class _MainWindowDiskUsageMixin:
+    """Size accounting and quota eviction for ``managed-repos/``.
+
+    ``DiskUsageTracker`` scans on its own thread; reports are handed to the
+    UI thread through ``disk_usage_ready``. Over the quota, finished tasks'
+    workspaces (and old ones no task refers to any more) are removed, least
+    recently modified first. Removed workspaces go through the shared
+    ``WorkspaceReaper``, whose progress is shown next to the usage.
+
+    The tracker thread never reads ``self._tasks``; it works from frozen id
+    sets that the UI thread replaces in ``_snapshot_evictable_tasks``.
+    """
+
+    def _create_disk_usage_tracker(self) -> None:
+        # None until the saved tasks are back; before that every workspace
+        # would look orphaned.
+        self._evictable_task_ids: frozenset[str] | None = None
+        self._known_task_ids: frozenset[str] = frozenset()
+        data_dir = os.path.dirname(self._state_path)
+        self._disk_usage = DiskUsageTracker(
+            managed_repos_dir(data_dir), on_update=self.disk_usage_ready.emit
+        )
+        self._apply_disk_quota()
+        self._disk_usage.start()
+        # Also resumes deleting whatever an earlier run left in the trash.
+        self._reaper = workspace_reaper(data_dir)
+        self._reaper.add_listener(lambda _result: self._disk_usage.request_scan())
+
+    def _apply_disk_quota(self) -> None:
+        try:
+            quota_gb = float(self._settings_data.get("workspace_disk_quota_gb") or 0)
+        except (TypeError, ValueError):
+            quota_gb = 0.0
+        self._disk_usage.configure(
+            quota_bytes=int(max(0.0, quota_gb) * _GIB),
+            is_evictable=self._workspace_evictable,
+            evict=self._evict_task_workspace,
+        )
+
+    def _snapshot_evictable_tasks(self) -> None:
+        """Publish the loaded tasks' ids for the tracker thread (UI thread)."""
+        if not getattr(self, "_tasks_restored", False):
+            return
+        tasks = list(self._tasks.values())
+        self._known_task_ids = frozenset(task.task_id for task in tasks)
+        self._evictable_task_ids = frozenset(
+            task.task_id
+            for task in tasks
+            if _finished(task.status, task.finalization_state)
+        )
+
+    def _workspace_evictable(self, usage: WorkspaceUsage) -> bool:
+        # Called from the tracker thread.
+        evictable = self._evictable_task_ids
+        task_id = usage.task_id
+        if evictable is None or not task_id or _RACE_CLONE.search(task_id):
+            return False
+        # A snapshot kept for its unmerged edits is the only copy of them.
+        if snapshot_kept_unmerged(usage.path):
+            return False
+        if task_id in evictable:
+            return True
+        if task_id in self._known_task_ids:
+            return False
+        if time.time() - usage.modified_at < _ORPHAN_MIN_AGE_S:
+            return False
+        # Not loaded here: a headless run or a task from another window may
+        # still own it, so go by what was saved.
+        if load_task_payload(self._state_path, task_id, archived=False) is not None:
+            return False
+        payload = load_task_payload(self._state_path, task_id, archived=True)
+        if payload is None:
+            return True
+        return _finished(payload.get("status"), payload.get("finalization_state"))
+
+    def _evict_task_workspace(self, usage: WorkspaceUsage) -> bool:
+        # Called from the tracker thread.
+        task_id = usage.task_id
+        known = task_id in self._known_task_ids
+        message = format_log(
+            "cleanup",
+            "quota",
+            "INFO",
+            f"workspace over disk quota; removing {usage.path} "
+            f"({format_bytes(usage.size_bytes)})",
+        )
+        if known:
+            self.host_log.emit(task_id, message)
+        return cleanup_task_workspace(
+            env_id=usage.env_id,
+            task_id=task_id,
+            data_dir=os.path.dirname(self._state_path),
+            on_log=(lambda line: self.host_log.emit(task_id, line)) if known else None,
+        )
+
+    def _note_task_workspace_changed(self, task: Task) -> None:
+        """Rescan soon; the task's workspace size may have moved."""
+        env_id = str(task.environment_id or "").strip()
+        if env_id and task.task_id:
+            self._disk_usage.invalidate(
+                managed_repo_checkout_path(
+                    env_id,
+                    data_dir=os.path.dirname(self._state_path),
+                    task_id=task.task_id,
+                )
+            )
+        self._snapshot_evictable_tasks()
+        self._disk_usage.request_scan()
+
+    def _on_disk_usage_ready(self, report: DiskUsageReport) -> None:
+        self._snapshot_evictable_tasks()
+        if self._settings_host.is_loaded():
+            self._settings.set_disk_usage(self._disk_usage_text(report))
+
+    def _disk_usage_text(self, report: DiskUsageReport) -> str:
+        return f"{report.summary()}\n{self._reaper.status().summary()}"
+
+    def _on_disk_usage_refresh_requested(self) -> None:
+        self._snapshot_evictable_tasks()
+        self._disk_usage.request_scan()
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import os
-import threading
 
 
 from agents_runner.environments import Environment
@@ -13,7 +12,8 @@ from agents_runner.environments import SYSTEM_ENV_NAME
 from agents_runner.environments import load_environments
 from agents_runner.environments import managed_repo_checkout_path
 from agents_runner.environments import save_environment
-from agents_runner.gh_management import git_list_remote_heads
+from agents_runner.execution.executor import POOL_GIT
+from agents_runner.gh.branch_cache import remote_branch_cache
 from agents_runner.gh_management import is_gh_available
 
 
@@ -114,14 +114,22 @@ class _MainWindowEnvironmentMixin:
             self._repo_branches_request_id += 1
             request_id = int(self._repo_branches_request_id)
 
+            # Show the last known branches now; refresh them if stale.
+            cache = remote_branch_cache(self._state_path)
+            cached = cache.peek(target)
+            if cached is not None:
+                self._on_repo_branches_ready(request_id, list(cached.branches))
+                if not cache.is_stale(cached):
+                    return
+
             def _worker() -> None:
-                branches = git_list_remote_heads(target)
+                branches = cache.refresh(target)
                 try:
                     self.repo_branches_ready.emit(request_id, branches)
                 except Exception:
                     pass
 
-            threading.Thread(target=_worker, daemon=True).start()
+            self._executor.try_submit(POOL_GIT, _worker)
 
     def _on_repo_branches_ready(self, request_id: int, branches: object) -> None:
         try:
@@ -140,9 +148,12 @@ class _MainWindowEnvironmentMixin:
         cleaned = [b for b in cleaned if b]
         self._new_task.set_repo_controls_visible(True)
 
-        # Restore last selected branch for cloned environments
-        selected_branch = None
-        if env and env.workspace_type == WORKSPACE_CLONED:
+        # Keep the user's pick across a background refresh; otherwise
+        # restore the last selected branch for cloned environments.
+        selected_branch = self._new_task.selected_base_branch() or None
+        if selected_branch not in cleaned:
+            selected_branch = None
+        if selected_branch is None and env and env.workspace_type == WORKSPACE_CLONED:
             last_branch = str(getattr(env, "gh_last_base_branch", "") or "").strip()
             if last_branch and last_branch in cleaned:
                 selected_branch = last_branch
@@ -403,7 +414,7 @@ class _MainWindowEnvironmentMixin:
         for task in self._tasks.values():
             if not task.environment_id:
                 task.environment_id = self._active_environment_id()
-        if self._envs_page.isVisible():
+        if self._envs_host.isVisible():
             selected = (
                 preferred_env_id
                 or self._envs_page.selected_environment_id()
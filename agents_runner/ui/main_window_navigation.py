@@ -21,8 +21,8 @@ class _MainWindowNavigationMixin:
             self._dashboard,
             self._new_task,
             self._details,
-            self._envs_page,
-            self._settings,
+            self._envs_host,
+            self._settings_host,
         ]
         current_page = None
 
@@ -102,7 +102,7 @@ class _MainWindowNavigationMixin:
         self._transition_to_page(self._details)
 
     def _show_environments(self) -> None:
-        if self._envs_page.isVisible():
+        if self._envs_host.isVisible():
             return
         if not self._try_autosave_before_navigation():
             return
@@ -112,21 +112,21 @@ class _MainWindowNavigationMixin:
         ) and self._is_internal_environment_id(active_id):
             active_id = "default"
         self._envs_page.set_environments(self._user_environment_map(), active_id)
-        self._transition_to_page(self._envs_page)
+        self._transition_to_page(self._envs_host)
 
     def _show_settings(self) -> None:
-        if self._settings.isVisible():
+        if self._settings_host.isVisible():
             return
         if not self._try_autosave_before_navigation():
             return
         self._settings.set_settings(self._settings_data)
         if hasattr(self, "_refresh_radio_channel_options"):
             self._refresh_radio_channel_options(disable_on_failure=True)
-        self._transition_to_page(self._settings)
+        self._transition_to_page(self._settings_host)
 
     def _try_autosave_before_navigation(self) -> bool:
-        if self._envs_page.isVisible() and not self._envs_page.try_autosave():
+        if self._envs_host.isVisible() and not self._envs_page.try_autosave():
             return False
-        if self._settings.isVisible() and not self._settings.try_autosave():
+        if self._settings_host.isVisible() and not self._settings.try_autosave():
             return False
         return True
@@ -3,9 +3,9 @@ from __future__ import annotations
 import os
 
 from agents_runner.agent_cli import normalize_agent
+from agents_runner.environments import Environment
 from agents_runner.log_format import prettify_log_line
 from agents_runner.persistence import deserialize_task
-from agents_runner.persistence import load_active_task_payloads
 from agents_runner.persistence import load_state
 from agents_runner.persistence import save_task_payload
 from agents_runner.persistence import save_state
@@ -13,7 +13,6 @@ from agents_runner.persistence import serialize_task
 from agents_runner.ui.task_model import Task
 from agents_runner.ui.radio import RadioController
 from agents_runner.ui.utils import _parse_docker_time
-from agents_runner.ui.utils import _stain_color
 
 
 class _MainWindowPersistenceMixin:
@@ -119,8 +118,16 @@ class _MainWindowPersistenceMixin:
 
         payload = {"settings": dict(self._settings_data)}
 
-        # Save watch states
-        save_watch_state(payload, self._watch_states)
+        # Watch states only change through the cooldown registry; reuse the
+        # serialized form until its version moves.
+        cooldowns = getattr(self, "_cooldowns", None)
+        version = cooldowns.version if cooldowns is not None else None
+        cached = getattr(self, "_watch_state_payload", None)
+        if version is None or cached is None or cached[0] != version:
+            save_watch_state(payload, self._watch_states)
+            self._watch_state_payload = (version, payload.get("agent_watch"))
+        else:
+            payload["agent_watch"] = cached[1]
 
         save_state(self._state_path, payload)
         for task in sorted(self._tasks.values(), key=lambda t: t.created_at_s):
@@ -154,6 +161,19 @@ class _MainWindowPersistenceMixin:
             )
         except Exception:
             self._settings_data["max_agents_running"] = -1
+        try:
+            self._settings_data["max_total_agents_running"] = int(
+                str(self._settings_data.get("max_total_agents_running", -1)).strip()
+            )
+        except Exception:
+            self._settings_data["max_total_agents_running"] = -1
+        if not isinstance(self._settings_data.get("agent_cli_max_running"), dict):
+            self._settings_data["agent_cli_max_running"] = {}
+        self._settings_data.setdefault("admission_control_enabled", True)
+        self._settings_data.setdefault("admission_max_load_per_cpu", 2.0)
+        self._settings_data.setdefault("admission_min_free_memory_mb", 1024)
+        self._settings_data.setdefault("admission_min_free_disk_mb", 2048)
+        self._settings_data.setdefault("workspace_disk_quota_gb", 0.0)
         self._settings_data.setdefault(
             "host_claude_dir", os.path.expanduser("~/.claude")
         )
@@ -176,6 +196,8 @@ class _MainWindowPersistenceMixin:
         )
         self._settings_data.setdefault("headless_desktop_enabled", False)
         self._settings_data.setdefault("spellcheck_enabled", True)
+        self._settings_data.setdefault("stt_prewarm", False)
+        self._settings_data.setdefault("reduce_motion", False)
         self._settings_data.setdefault("ui_theme", "auto")
         self._settings_data.setdefault("radio_enabled", False)
         self._settings_data.setdefault("radio_channel", "")
@@ -246,7 +268,8 @@ class _MainWindowPersistenceMixin:
             )
         )
 
-        items = load_active_task_payloads(self._state_path)
+    def _deserialize_active_tasks(self, items: list[object]) -> list[Task]:
+        """Build tasks from persisted payloads exactly as they were saved."""
         loaded: list[Task] = []
         for item in items:
             if not isinstance(item, dict):
@@ -260,18 +283,33 @@ class _MainWindowPersistenceMixin:
                     for line in task.logs
                     if isinstance(line, str)
                 ]
+            loaded.append(task)
+        loaded.sort(key=lambda t: t.created_at_s)
+        return loaded
+
+    def _restore_active_tasks(
+        self, items: list[object], environments: dict[str, Environment]
+    ) -> tuple[list[Task], set[str]]:
+        """Sync persisted active tasks with Docker and repair git metadata.
+
+        Blocking; runs on the startup restore thread and touches no widgets.
+        Returns the tasks to keep plus the ids that were archived instead.
+        """
+        loaded: list[Task] = []
+        archived_ids: set[str] = set()
+        for task in self._deserialize_active_tasks(items):
             synced = False
             status = (task.status or "").lower()
             if status != "queued":
                 synced = self._try_sync_container_state(task)
             if self._should_archive_task(task):
                 save_task_payload(self._state_path, serialize_task(task), archived=True)
+                archived_ids.add(task.task_id)
                 continue
             status = (task.status or "").lower()
             if not synced and task.is_active() and status != "queued":
                 task.status = "unknown"
             loaded.append(task)
-        loaded.sort(key=lambda t: t.created_at_s)
 
         # Repair missing git metadata for cloned repo tasks
         repair_count = 0
@@ -282,7 +320,7 @@ class _MainWindowPersistenceMixin:
                 success, msg = repair_task_git_metadata(
                     task,
                     state_path=self._state_path,
-                    environments=self._environments,
+                    environments=environments,
                 )
                 if success:
                     repair_count += 1
@@ -298,19 +336,4 @@ class _MainWindowPersistenceMixin:
 
             logger = logging.getLogger(__name__)
             logger.info(f"Repaired git metadata for {repair_count} tasks")
-
-        for task in loaded:
-            self._tasks[task.task_id] = task
-            env = self._environments.get(task.environment_id)
-            stain = env.color if env else None
-            spinner = _stain_color(env.color) if env else None
-            self._dashboard.upsert_task(task, stain=stain, spinner_color=spinner)
-
-        # Run startup reconciliation once
-        # Guard prevents accidental re-runs if _load_state() is called multiple times
-        try:
-            if not getattr(self, "_reconcile_has_run", False):
-                self._reconcile_has_run = True
-                self._reconcile_tasks_after_restart()
-        except Exception:
-            pass
+        return loaded, archived_ids
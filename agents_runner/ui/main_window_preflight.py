@@ -16,6 +16,7 @@ from agents_runner.docker_runner import DockerRunnerConfig
 from agents_runner.environments import Environment
 from agents_runner.environments import WORKSPACE_CLONED
 from agents_runner.environments import WORKSPACE_NONE
+from agents_runner.gh.repo_clone import clone_options_for_environment
 from agents_runner.gh_management import is_gh_available
 from agents_runner.ui.bridges import TaskRunnerBridge
 from agents_runner.ui.constants import PIXELARCH_EMERALD_IMAGE
@@ -97,6 +98,7 @@ class _MainWindowPreflightMixin:
             status="pulling",
         )
         self._tasks[task_id] = task
+        self._sync_task_schedule(task)
         stain = env.color if env else None
         spinner = _stain_color(env.color) if env else None
         self._dashboard.upsert_task(task, stain=stain, spinner_color=spinner)
@@ -123,6 +125,7 @@ class _MainWindowPreflightMixin:
             gh_prefer_gh_cli=gh_prefer_gh_cli,
             gh_recreate_if_needed=gh_recreate_if_needed,
             gh_base_branch=gh_base_branch,
+            gh_clone_options=clone_options_for_environment(env),
         )
 
         # Clean up any existing bridge/thread for this task to prevent duplicate log emissions
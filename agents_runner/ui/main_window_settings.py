@@ -10,6 +10,8 @@ from agents_runner.agent_cli import normalize_agent
 from agents_runner.agent_cli import container_config_dir
 from agents_runner.agent_cli import additional_config_mounts
 from agents_runner.agent_cli import available_agents
+from agents_runner.agent_cli import resolve_agent_config_dir
+from agents_runner.execution.admission import AdmissionThresholds
 from agents_runner.ui.radio import RadioController
 from agents_runner.ui.utils import _looks_like_agent_help_command
 from agents_runner.environments import Environment
@@ -19,16 +21,29 @@ logger = logging.getLogger(__name__)
 
 class _MainWindowSettingsMixin:
     def _apply_settings_to_pages(self) -> None:
-        self._settings.set_settings(self._settings_data)
-        self._envs_page.set_settings_data(
-            self._settings_data
-        )  # Pass settings to environments page
+        # Lazy pages pick up the current settings when they are first built.
+        if self._settings_host.is_loaded():
+            self._settings.set_settings(self._settings_data)
+        if self._envs_host.is_loaded():
+            self._envs_page.set_settings_data(
+                self._settings_data
+            )  # Pass settings to environments page
         self._apply_active_environment_to_new_task()
 
         # Apply spellcheck setting to new task page
         spellcheck_enabled = bool(self._settings_data.get("spellcheck_enabled", True))
         self._new_task.set_spellcheck_enabled(spellcheck_enabled)
         self._new_task.set_stt_mode("offline")
+        self._apply_background_motion()
+        self._apply_scheduler_limits()
+        self._apply_disk_quota()
+        if bool(self._settings_data.get("stt_prewarm") or False):
+            from agents_runner.stt.service import prewarm_stt_service
+
+            prewarm_stt_service()
+
+    def _apply_background_motion(self) -> None:
+        self._root.set_reduced_motion(bool(self._settings_data.get("reduce_motion")))
 
     def _apply_settings(self, settings: dict) -> None:
         previous_radio_enabled = bool(self._settings_data.get("radio_enabled") or False)
@@ -131,6 +146,24 @@ class _MainWindowSettingsMixin:
             )
         except Exception:
             merged["max_agents_running"] = -1
+        try:
+            merged["max_total_agents_running"] = int(
+                str(merged.get("max_total_agents_running", -1)).strip()
+            )
+        except Exception:
+            merged["max_total_agents_running"] = -1
+        if not isinstance(merged.get("agent_cli_max_running"), dict):
+            merged["agent_cli_max_running"] = {}
+        thresholds = AdmissionThresholds.from_settings(merged)
+        merged["admission_max_load_per_cpu"] = thresholds.max_load_per_cpu
+        merged["admission_min_free_memory_mb"] = thresholds.min_free_memory_mb
+        merged["admission_min_free_disk_mb"] = thresholds.min_free_disk_mb
+        try:
+            merged["workspace_disk_quota_gb"] = max(
+                0.0, float(str(merged.get("workspace_disk_quota_gb", 0)).strip() or 0)
+            )
+        except Exception:
+            merged["workspace_disk_quota_gb"] = 0.0
         self._settings_data = merged
         self._sync_radio_controller_from_settings(
             user_initiated=True,
@@ -138,6 +171,8 @@ class _MainWindowSettingsMixin:
         )
         self._apply_settings_to_pages()
         self._schedule_save()
+        # Raised limits may free slots for queued tasks.
+        self._try_start_queued_tasks()
 
     def _interactive_command_key(self, agent_cli: str) -> str:
         agent_cli = normalize_agent(agent_cli)
@@ -220,44 +255,9 @@ class _MainWindowSettingsMixin:
     ) -> str:
         """Resolve a host config directory for an agent CLI.
 
-        Precedence:
-        1. Environment agent_selection (first matching agent instance with config_dir)
-        2. Global per-agent settings (host_*_dir)
-        3. Legacy env.host_codex_dir override (deprecated)
+        See :func:`agents_runner.agent_cli.resolve_agent_config_dir`.
         """
-        agent_cli = normalize_agent(agent_cli)
-
-        if env and env.agent_selection and getattr(env.agent_selection, "agents", None):
-            for inst in env.agent_selection.agents or []:
-                if normalize_agent(getattr(inst, "agent_cli", "")) != agent_cli:
-                    continue
-                inst_dir = os.path.expanduser(
-                    str(getattr(inst, "config_dir", "") or "").strip()
-                )
-                if inst_dir:
-                    return inst_dir
-
-        # Fall back to global settings-based config dir
-        config_dir = ""
-        if agent_cli == "claude":
-            config_dir = str(settings.get("host_claude_dir") or "")
-        elif agent_cli == "copilot":
-            config_dir = str(settings.get("host_copilot_dir") or "")
-        elif agent_cli == "gemini":
-            config_dir = str(settings.get("host_gemini_dir") or "")
-        else:
-            config_dir = str(
-                settings.get("host_codex_dir")
-                or os.environ.get(
-                    "CODEX_HOST_CODEX_DIR", os.path.expanduser("~/.codex")
-                )
-            )
-
-        # Legacy: check env.host_codex_dir override (deprecated) — only apply for codex
-        if agent_cli == "codex" and env and env.host_codex_dir:
-            config_dir = env.host_codex_dir
-
-        return os.path.expanduser(str(config_dir or "").strip())
+        return resolve_agent_config_dir(agent_cli, env=env, settings=settings)
 
     def _select_agent_instance_for_env(
         self,
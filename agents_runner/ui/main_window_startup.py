@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import os
+from collections.abc import Callable
+
+from PySide6.QtCore import QEvent
+from PySide6.QtCore import QObject
+from PySide6.QtCore import QTimer
+
+from agents_runner.execution.executor import POOL_IO
+from agents_runner.persistence import load_active_task_payloads
+from agents_runner.prompt_batch import PromptBatchRequest
+from agents_runner.ui.runtime.startup_profile import mark_startup_phase
+from agents_runner.ui.task_model import Task
+from agents_runner.ui.utils import _stain_color
+
+# Upper bound on waiting for the first paint (e.g. when started minimized).
+_FIRST_PAINT_FALLBACK_MS = 250
+
+
+class _FirstPaintTrigger(QObject):
+    def __init__(self, target: QObject, callback: Callable[[], None]) -> None:
+        super().__init__(target)
+        self._callback: Callable[[], None] | None = callback
+        target.installEventFilter(self)
+        QTimer.singleShot(_FIRST_PAINT_FALLBACK_MS, self.fire)
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        if event.type() == QEvent.Type.Paint:
+            watched.removeEventFilter(self)
+            # Let the paint finish before any queued work starts.
+            QTimer.singleShot(0, self.fire)
+        return False
+
+    def fire(self) -> None:
+        callback, self._callback = self._callback, None
+        if callback is not None:
+            callback()
+
+
+class _MainWindowStartupMixin:
+    """Deferred startup: the shell paints first, state fills in afterwards.
+
+    ``MainWindow.__init__`` only builds widgets and loads settings. Everything
+    that scales with the number of environments or tasks runs as queued
+    phases once the event loop is up, one phase per event-loop turn so the
+    window keeps painting between them. Docker syncs and git repairs for
+    restored tasks run on a background thread.
+    """
+
+    def _schedule_startup_phases(self) -> None:
+        self._tasks_restored = False
+        # Tasks as saved, shown (and openable) until the restore replaces them.
+        self._startup_tasks: dict[str, Task] = {}
+        # A ``--batch-prompts`` request waits here until startup has finished.
+        self._pending_prompt_batch: PromptBatchRequest | None = None
+        self._startup_phases: list[tuple[str, Callable[[], None]]] = [
+            ("environments", self._startup_load_environments),
+            ("task_restore", self._begin_task_restore),
+        ]
+        self._dashboard.set_startup_status("Loading environments…")
+        self._first_paint_trigger = _FirstPaintTrigger(
+            self._root, self._run_next_startup_phase
+        )
+
+    def _run_next_startup_phase(self) -> None:
+        if not self._startup_phases:
+            return
+        label, phase = self._startup_phases.pop(0)
+        phase()
+        mark_startup_phase(f"startup_phase:{label}")
+        if self._startup_phases:
+            QTimer.singleShot(0, self._run_next_startup_phase)
+
+    def _startup_load_environments(self) -> None:
+        self._reload_environments()
+        self._apply_settings_to_pages()
+        eager_pages = str(os.environ.get("AGENTS_RUNNER_EAGER_PAGES", "")).strip()
+        if eager_pages.lower() in {"1", "true", "yes", "on"}:
+            self._envs_host.page()
+            self._settings_host.page()
+
+    def _begin_task_restore(self) -> None:
+        self._dashboard.set_startup_status("Restoring tasks…")
+        environments = dict(self._environments)
+
+        def _worker() -> None:
+            try:
+                items = load_active_task_payloads(self._state_path)
+            except Exception:
+                items = []
+            try:
+                snapshot = self._deserialize_active_tasks(items)
+                self.task_restore_ready.emit("snapshot", snapshot)
+                restored = self._restore_active_tasks(items, environments)
+            except Exception:
+                restored = ([], set())
+            self.task_restore_ready.emit("restored", restored)
+
+        self._executor.submit(POOL_IO, _worker)
+
+    def _on_task_restore_ready(self, stage: str, payload: object) -> None:
+        if self._tasks_restored:
+            return
+        if stage == "snapshot":
+            # Persisted state only: rows appear now and are corrected when the
+            # container sync finishes.
+            if not isinstance(payload, list):
+                return
+            for task in payload:
+                self._startup_tasks[task.task_id] = task
+                self._upsert_dashboard_row(task)
+            if payload:
+                self._dashboard.set_startup_status(
+                    f"Syncing {len(payload)} task(s) with Docker…"
+                )
+            return
+
+        if stage != "restored":
+            return
+        loaded, archived_ids = payload if isinstance(payload, tuple) else ([], set())
+        self._dashboard.remove_tasks(set(archived_ids))
+        for task in loaded:
+            if task.task_id in self._tasks:
+                continue
+            self._tasks[task.task_id] = task
+            self._upsert_dashboard_row(task)
+        # A details page opened from the snapshot switches to the live task.
+        shown = self._details.current_task_id()
+        if shown in self._startup_tasks and shown in self._tasks:
+            self._details.show_task(self._tasks[shown])
+        self._startup_tasks = {}
+        self._tasks_restored = True
+        self._snapshot_evictable_tasks()
+        self._resync_scheduler()
+        self._dashboard.set_startup_status("")
+        mark_startup_phase("tasks_restored")
+
+        # Run startup reconciliation once
+        # Guard prevents accidental re-runs if the restore is triggered twice
+        try:
+            if not getattr(self, "_reconcile_has_run", False):
+                self._reconcile_has_run = True
+                self._reconcile_tasks_after_restart()
+        except Exception:
+            pass
+        self._try_start_queued_tasks()
+
+        batch, self._pending_prompt_batch = self._pending_prompt_batch, None
+        if batch is not None:
+            self.run_prompt_batch(batch)
+
+    def _upsert_dashboard_row(self, task: Task) -> None:
+        env = self._environments.get(task.environment_id)
+        stain = env.color if env else None
+        spinner = _stain_color(env.color) if env else None
+        self._dashboard.upsert_task(task, stain=stain, spinner_color=spinner)
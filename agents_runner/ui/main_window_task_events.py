@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import subprocess
-import threading
 import time
 
 from datetime import datetime
@@ -12,6 +11,8 @@ from PySide6.QtWidgets import QMessageBox
 
 from agents_runner.environments import WORKSPACE_CLONED
 from agents_runner.environments.cleanup import cleanup_task_workspace
+from agents_runner.execution.executor import POOL_FINALIZE
+from agents_runner.execution.executor import POOL_IO
 from agents_runner.log_format import format_log
 from agents_runner.log_format import format_log_display
 from agents_runner.log_format import prettify_log_line
@@ -33,7 +34,9 @@ class _MainWindowTaskEventsMixin:
         if not task_id:
             return
 
-        task = self._tasks.get(task_id)
+        # During startup the dashboard lists saved tasks before the restore
+        # finishes; open those from the saved state.
+        task = self._tasks.get(task_id) or self._startup_tasks.get(task_id)
         if task is None:
             payload = load_task_payload(self._state_path, task_id, archived=True)
             if not isinstance(payload, dict):
@@ -74,6 +77,7 @@ class _MainWindowTaskEventsMixin:
 
             is_kill = action == "kill"
             task.status = "killed" if is_kill else "cancelled"
+            self._sync_task_schedule(task)
             if task.finished_at is None:
                 task.finished_at = datetime.now(tz=timezone.utc)
             task.git = derive_task_git_metadata(task)
@@ -221,6 +225,7 @@ class _MainWindowTaskEventsMixin:
             return
 
         task.status = "discarded"
+        self._sync_task_schedule(task)
         if task.finished_at is None:
             task.finished_at = datetime.now(tz=timezone.utc)
         task.git = derive_task_git_metadata(task)
@@ -272,6 +277,7 @@ class _MainWindowTaskEventsMixin:
 
         self._dashboard.remove_tasks({task_id})
         self._tasks.pop(task_id, None)
+        self._scheduler.forget(task_id)
         self._threads.pop(task_id, None)
         self._bridges.pop(task_id, None)
         prep_threads.pop(task_id, None)
@@ -287,19 +293,18 @@ class _MainWindowTaskEventsMixin:
             self._show_dashboard()
 
         if container_id:
-            threading.Thread(
-                target=self._force_remove_container,
-                args=(container_id,),
-                daemon=True,
-            ).start()
+            self._executor.try_submit(
+                POOL_IO, self._force_remove_container, container_id
+            )
 
         # Clean up task workspace (if using cloned GitHub repo)
         if task.workspace_type == WORKSPACE_CLONED and task.environment_id:
-            threading.Thread(
-                target=self._cleanup_task_workspace_async,
-                args=(task_id, task.environment_id),
-                daemon=True,
-            ).start()
+            self._executor.try_submit(
+                POOL_IO,
+                self._cleanup_task_workspace_async,
+                task_id,
+                task.environment_id,
+            )
 
     def _force_remove_container(self, container_id: str) -> None:
         container_id = str(container_id or "").strip()
@@ -496,6 +501,7 @@ class _MainWindowTaskEventsMixin:
                 self._dashboard.upsert_task(task, stain=stain, spinner_color=spinner)
         if "docker pull" in cleaned and (task.status or "").lower() != "pulling":
             task.status = "pulling"
+            self._sync_task_schedule(task)
             env = self._environments.get(task.environment_id)
             stain = env.color if env else None
             spinner = _stain_color(env.color) if env else None
@@ -562,9 +568,11 @@ class _MainWindowTaskEventsMixin:
                 )
                 if task.finished_at is None:
                     task.finished_at = datetime.now(tz=timezone.utc)
+                self._sync_task_schedule(task)
                 self._try_start_queued_tasks()
             else:
                 task.status = incoming
+                self._sync_task_schedule(task)
 
         env = self._environments.get(task.environment_id)
         stain = env.color if env else None
@@ -620,6 +628,7 @@ class _MainWindowTaskEventsMixin:
                 task.error = str(error)
             else:
                 task.status = "done" if int(exit_code) == 0 else "failed"
+            self._sync_task_schedule(task)
 
             task.git = derive_task_git_metadata(task)
 
@@ -809,4 +818,4 @@ class _MainWindowTaskEventsMixin:
                     ),
                 )
 
-        threading.Thread(target=_worker, daemon=True).start()
+        self._executor.try_submit(POOL_FINALIZE, _worker)
@@ -4,17 +4,50 @@ import os
 import subprocess
 import threading
 import time
+from collections.abc import Callable
+from concurrent.futures import Future
+from dataclasses import dataclass
 
 
 from agents_runner.artifacts import collect_artifacts_from_container_with_timeout
 from agents_runner.environments import WORKSPACE_CLONED
 from agents_runner.environments.cleanup import cleanup_task_workspace
+from agents_runner.environments.cow_workspace import finish_workspace_snapshot
+from agents_runner.environments.cow_workspace import release_workspace_snapshot
+from agents_runner.execution.executor import PoolSaturated
+from agents_runner.execution.finalize_pipeline import STAGE_ARTIFACTS
+from agents_runner.execution.finalize_pipeline import STAGE_CLEANUP
+from agents_runner.execution.finalize_pipeline import STAGE_COMMIT
+from agents_runner.execution.finalize_pipeline import STAGE_PR
+from agents_runner.execution.finalize_pipeline import STAGE_PUSH
+from agents_runner.execution.finalize_pipeline import PipelineStep
+from agents_runner.gh.pr_finalize import PullRequestDraft
+from agents_runner.gh.pr_finalize import commit_pull_request_changes
+from agents_runner.gh.pr_finalize import log_git_steps
+from agents_runner.gh.pr_finalize import open_pull_request
+from agents_runner.gh.pr_finalize import prepare_task_pull_request
+from agents_runner.gh.pr_finalize import push_pull_request_branch
+from agents_runner.gh.push_batch import push_batcher
 from agents_runner.log_format import format_log
 from agents_runner.log_format import wrap_container_log
 from agents_runner.ui.task_model import Task
 from agents_runner.ui.utils import _stain_color
 
 
+@dataclass(slots=True)
+class _TaskFinalization:
+    """What one task's finalization stages hand to each other."""
+
+    task_id: str
+    reason: str
+    task: Task | None = None
+    draft: PullRequestDraft | None = None
+    pr_started_s: float | None = None
+    keep_workspace: bool = False
+    # Set when a stage raised; ``always`` stages still run after that.
+    failed: bool = False
+
+
 class _MainWindowTaskRecoveryMixin:
     def _reconcile_tasks_after_restart(self) -> None:
         """Reconcile tasks after app restart.
@@ -74,6 +107,11 @@ class _MainWindowTaskRecoveryMixin:
         Safety net for tasks that complete during runtime but miss event-driven finalization.
         This is different from startup_reconcile which handles tasks from previous session.
         """
+        if getattr(self, "_tasks_restored", True):
+            # Scheduler counters are event-driven; resync them here in case a
+            # status change was missed, then admit anything that now fits.
+            self._resync_scheduler()
+            self._try_start_queued_tasks()
         for task in list(self._tasks.values()):
             # Skip tasks that have already completed finalization to avoid log spam
             if (task.finalization_state or "").lower().strip() == "done":
@@ -109,12 +147,12 @@ class _MainWindowTaskRecoveryMixin:
             if task.task_id in self._bridges:
                 return
 
-            # Additional defensive check: thread existence check
-            # Prevents creating duplicate threads even if state hasn't been updated yet
+            # Additional defensive check: job existence check
+            # Prevents queueing duplicate jobs even if state hasn't been updated yet
             task_id = str(task.task_id or "").strip()
             if task_id:
-                existing_thread = self._finalization_threads.get(task_id)
-                if existing_thread is not None and existing_thread.is_alive():
+                existing = self._finalization_futures.get(task_id)
+                if existing is not None and not existing.done():
                     return
 
             self.host_log.emit(
@@ -217,11 +255,14 @@ class _MainWindowTaskRecoveryMixin:
         four defensive mechanisms:
         1. Early state check: Returns immediately if finalization is "pending" or "running"
         2. Needs-finalization check: task.finalization_state must not be "done"
-        3. Thread existence check: Prevents creating duplicate threads
-        4. State reset: If somehow in "running" state without a live thread, resets to "pending"
+        3. Job existence check: Prevents queueing duplicate finalization jobs
+        4. State reset: If somehow in "running" state without a live job, resets to "pending"
 
         These guards coordinate finalization between task_done and recovery_tick paths,
-        ensuring exactly one finalization thread runs per task.
+        ensuring exactly one finalization job runs per task. Jobs run on the
+        finalization pipeline (one worker pool per stage); when its entry
+        queue is full the task stays "pending" and the recovery tick queues
+        it again later.
         """
         task_id = str(task_id or "").strip()
         if not task_id:
@@ -262,26 +303,26 @@ class _MainWindowTaskRecoveryMixin:
         if not self._task_needs_finalization(task):
             return
 
-        # DEDUPLICATION GUARD 2: Check if finalization thread already exists
-        # This handles edge cases where state might not be set yet but thread exists
-        existing = self._finalization_threads.get(task_id)
-        if existing is not None and existing.is_alive():
+        # DEDUPLICATION GUARD 2: Check if a finalization job is already queued or running
+        # This handles edge cases where state might not be set yet but the job exists
+        existing = self._finalization_futures.get(task_id)
+        if existing is not None and not existing.done():
             self.host_log.emit(
                 task_id,
                 format_log(
                     "host",
                     "finalize",
                     "INFO",
-                    f"Task {task_id}: skipping finalization (reason=thread already alive, state={finalization_state_lower}, trigger={reason})",
+                    f"Task {task_id}: skipping finalization (reason=job already queued, state={finalization_state_lower}, trigger={reason})",
                 ),
             )
             return
 
         # ORPHANED STATE RECOVERY:
-        # If state shows "running" but no live thread exists, this indicates an orphaned
+        # If state shows "running" but no live job exists, this indicates an orphaned
         # state from an app crash or unexpected termination. We reset to "pending" to allow
         # finalization to retry. This is safe because:
-        # 1. No thread is actually running (verified by guard check above)
+        # 1. No job is actually running (verified by guard check above)
         # 2. finalization_state="running" means work was interrupted mid-flight
         # 3. Finalization operations are idempotent (safe to retry)
         # 4. This ensures tasks don't get stuck in "running" state forever
@@ -292,7 +333,7 @@ class _MainWindowTaskRecoveryMixin:
                     "host",
                     "finalize",
                     "WARN",
-                    f"Task {task_id}: state was running but no thread found, resetting (state=running→pending, trigger={reason})",
+                    f"Task {task_id}: state was running but no job found, resetting (state=running→pending, trigger={reason})",
                 ),
             )
             task.finalization_state = "pending"
@@ -308,36 +349,79 @@ class _MainWindowTaskRecoveryMixin:
             ),
         )
 
-        thread = threading.Thread(
-            target=self._finalize_task_worker,
-            args=(task_id, reason),
-            daemon=True,
-        )
-        self._finalization_threads[task_id] = thread
+        try:
+            future = self._submit_task_finalization(task_id, reason)
+        except (PoolSaturated, RuntimeError) as exc:
+            self.host_log.emit(
+                task_id,
+                format_log(
+                    "host",
+                    "finalize",
+                    "WARN",
+                    f"Task {task_id}: finalization deferred ({exc}); recovery will retry",
+                ),
+            )
+            return
+        self._finalization_futures[task_id] = future
         self.host_log.emit(
             task_id,
             format_log(
                 "host",
                 "finalize",
                 "DEBUG",
-                f"Task {task_id}: finalization thread created (reason={reason})",
+                f"Task {task_id}: finalization job queued (reason={reason})",
             ),
         )
-        thread.start()
-        self.host_log.emit(
-            task_id,
-            format_log(
-                "host",
-                "finalize",
-                "DEBUG",
-                f"Task {task_id}: finalization thread started (reason={reason})",
+
+    def _submit_task_finalization(self, task_id: str, reason: str) -> Future:
+        """Queue the task on the finalization pipeline (one step per stage).
+
+        Raises PoolSaturated when the pipeline's entry queue is full.
+        """
+        run = _TaskFinalization(task_id=task_id, reason=reason)
+
+        def tracked(fn: Callable[[_TaskFinalization], bool]) -> Callable[[], bool]:
+            def call() -> bool:
+                try:
+                    return fn(run)
+                except Exception:
+                    run.failed = True
+                    raise
+
+            return call
+
+        steps = [
+            PipelineStep(STAGE_ARTIFACTS, tracked(self._finalize_artifacts_step)),
+            PipelineStep(STAGE_COMMIT, tracked(self._finalize_commit_step)),
+            PipelineStep(STAGE_PUSH, tracked(self._finalize_push_step)),
+            PipelineStep(STAGE_PR, tracked(self._finalize_pr_step)),
+            PipelineStep(
+                STAGE_CLEANUP, lambda: self._finalize_cleanup_step(run), always=True
             ),
+        ]
+        task = self._tasks.get(task_id)
+        if task is not None and task.workspace_snapshot:
+            steps.insert(
+                -1,
+                PipelineStep(
+                    STAGE_COMMIT,
+                    lambda: self._finalize_snapshot_step(run),
+                    always=True,
+                ),
+            )
+        return self._finalize_pipeline.submit(
+            task_id,
+            steps,
+            on_finish=lambda error: self._finish_task_finalization(run, error),
         )
 
-    def _finalize_task_worker(self, task_id: str, reason: str) -> None:
+    def _finalize_artifacts_step(self, run: _TaskFinalization) -> bool:
+        task_id = run.task_id
+        reason = run.reason
         task = self._tasks.get(task_id)
         if task is None:
-            return
+            return False
+        run.task = task
 
         self.host_log.emit(
             task_id,
@@ -358,177 +442,239 @@ class _MainWindowTaskRecoveryMixin:
             ),
         )
 
-        try:
-            # ARTIFACT COLLECTION LOGIC:
-            # Skip artifact collection for user-stopped tasks because:
-            # 1. User explicitly canceled, so they don't want the incomplete work
-            # 2. Artifacts may be in inconsistent state (task didn't finish)
-            # 3. Saves time and resources for unwanted output
-            user_stop = (task.status or "").lower() in {"cancelled", "killed"}
-            if not user_stop:
-                runner_config = getattr(task, "_runner_config", None)
-                timeout_s = 30.0
-                if runner_config is not None:
-                    try:
-                        timeout_s = float(
-                            getattr(runner_config, "artifact_collection_timeout_s")
-                        )
-                    except Exception:
-                        timeout_s = 30.0
-                if timeout_s <= 0.0:
+        # ARTIFACT COLLECTION LOGIC:
+        # Skip artifact collection for user-stopped tasks because:
+        # 1. User explicitly canceled, so they don't want the incomplete work
+        # 2. Artifacts may be in inconsistent state (task didn't finish)
+        # 3. Saves time and resources for unwanted output
+        user_stop = (task.status or "").lower() in {"cancelled", "killed"}
+        if not user_stop:
+            runner_config = getattr(task, "_runner_config", None)
+            timeout_s = 30.0
+            if runner_config is not None:
+                try:
+                    timeout_s = float(
+                        getattr(runner_config, "artifact_collection_timeout_s")
+                    )
+                except Exception:
                     timeout_s = 30.0
+            if timeout_s <= 0.0:
+                timeout_s = 30.0
 
-                task_dict = {
-                    "task_id": str(task.task_id or ""),
-                    "image": str(task.image or ""),
-                    "agent_cli": str(task.agent_cli or ""),
-                    "created_at": float(task.created_at_s or 0.0),
-                }
-                env_name = str(task.environment_id or "")
-                start_s = time.monotonic()
-                self.host_log.emit(
-                    task_id,
-                    format_log(
-                        "host",
-                        "artifacts",
-                        "INFO",
-                        "collecting artifacts from staging...",
-                    ),
-                )
-                artifact_uuids = collect_artifacts_from_container_with_timeout(
-                    str(task.container_id or ""),
-                    task_dict,
-                    env_name,
-                    timeout_s=timeout_s,
-                )
-                elapsed_s = time.monotonic() - start_s
-                self.host_log.emit(
-                    task_id,
-                    format_log(
-                        "host",
-                        "finalize",
-                        "INFO",
-                        f"artifact collection finished in {elapsed_s:.1f}s ({len(artifact_uuids)} artifact(s))",
-                    ),
-                )
-                if artifact_uuids:
-                    self.host_artifacts.emit(task_id, artifact_uuids)
+            task_dict = {
+                "task_id": str(task.task_id or ""),
+                "image": str(task.image or ""),
+                "agent_cli": str(task.agent_cli or ""),
+                "created_at": float(task.created_at_s or 0.0),
+            }
+            env_name = str(task.environment_id or "")
+            start_s = time.monotonic()
+            self.host_log.emit(
+                task_id,
+                format_log(
+                    "host",
+                    "artifacts",
+                    "INFO",
+                    "collecting artifacts from staging...",
+                ),
+            )
+            artifact_uuids = collect_artifacts_from_container_with_timeout(
+                str(task.container_id or ""),
+                task_dict,
+                env_name,
+                timeout_s=timeout_s,
+            )
+            elapsed_s = time.monotonic() - start_s
+            self.host_log.emit(
+                task_id,
+                format_log(
+                    "host",
+                    "finalize",
+                    "INFO",
+                    f"artifact collection finished in {elapsed_s:.1f}s ({len(artifact_uuids)} artifact(s))",
+                ),
+            )
+            if artifact_uuids:
+                self.host_artifacts.emit(task_id, artifact_uuids)
+
+        skip_reason: str | None = None
+        skip_level = "INFO"
+        if user_stop:
+            skip_reason = f"user stopped task ({task.status})"
+        elif task.workspace_type != WORKSPACE_CLONED:
+            skip_reason = f"not a cloned workspace (type={task.workspace_type})"
+        elif not task.gh_repo_root:
+            skip_reason = "missing repository root information"
+            skip_level = "WARN"
+        elif not task.gh_branch:
+            skip_reason = "missing branch information"
+            skip_level = "WARN"
+        elif task.gh_pr_url:
+            skip_reason = "PR already created"
+
+        if skip_reason is not None:
+            self.host_log.emit(
+                task_id,
+                format_log(
+                    "host",
+                    "finalize",
+                    skip_level,
+                    f"Task {task_id}: skipping PR creation (reason={skip_reason}, state={task.status})",
+                ),
+            )
+            self.host_log.emit(
+                task_id,
+                format_log("gh", "pr", "INFO", f"PR creation skipped: {skip_reason}"),
+            )
+            return False
 
-            should_create_pr = False
-            skip_reason: str | None = None
-            if user_stop:
-                skip_reason = f"user stopped task ({task.status})"
-                self.host_log.emit(
-                    task_id,
-                    format_log(
-                        "host",
-                        "finalize",
-                        "INFO",
-                        f"Task {task_id}: skipping PR creation (reason={skip_reason}, state={task.status})",
-                    ),
-                )
-            elif task.workspace_type != WORKSPACE_CLONED:
-                skip_reason = f"not a cloned workspace (type={task.workspace_type})"
-                self.host_log.emit(
-                    task_id,
-                    format_log(
-                        "host",
-                        "finalize",
-                        "INFO",
-                        f"Task {task_id}: skipping PR creation (reason={skip_reason}, state={task.status})",
-                    ),
-                )
-            elif not task.gh_repo_root:
-                skip_reason = "missing repository root information"
-                self.host_log.emit(
-                    task_id,
-                    format_log(
-                        "host",
-                        "finalize",
-                        "WARN",
-                        f"Task {task_id}: skipping PR creation (reason={skip_reason}, state={task.status})",
-                    ),
-                )
-            elif not task.gh_branch:
-                skip_reason = "missing branch information"
-                self.host_log.emit(
-                    task_id,
-                    format_log(
-                        "host",
-                        "finalize",
-                        "WARN",
-                        f"Task {task_id}: skipping PR creation (reason={skip_reason}, state={task.status})",
-                    ),
-                )
-            elif task.gh_pr_url:
-                skip_reason = "PR already created"
-                self.host_log.emit(
-                    task_id,
-                    format_log(
-                        "host",
-                        "finalize",
-                        "INFO",
-                        f"Task {task_id}: skipping PR creation (reason={skip_reason}, state={task.status})",
-                    ),
-                )
-            else:
-                should_create_pr = True
-                self.host_log.emit(
-                    task_id,
-                    format_log(
-                        "host",
-                        "finalize",
-                        "INFO",
-                        f"Task {task_id}: proceeding with PR creation (reason=all checks passed, state={task.status})",
-                    ),
-                )
+        self.host_log.emit(
+            task_id,
+            format_log(
+                "host",
+                "finalize",
+                "INFO",
+                f"Task {task_id}: proceeding with PR creation (reason=all checks passed, state={task.status})",
+            ),
+        )
+        run.pr_started_s = time.monotonic()
+        return True
+
+    def _finalize_commit_step(self, run: _TaskFinalization) -> bool:
+        task = run.task
+        task_id = run.task_id
+        draft = prepare_task_pull_request(
+            task_id=task_id,
+            repo_root=str(task.gh_repo_root or "").strip(),
+            branch=str(task.gh_branch or "").strip(),
+            base_branch=str(task.gh_base_branch or "").strip(),
+            prompt_text=str(task.prompt or ""),
+            task_token=str(task.task_id or task_id),
+            use_gh=bool(task.gh_use_host_cli),
+            on_log=lambda line: self.host_log.emit(task_id, line),
+            pr_metadata_path=(str(task.gh_pr_metadata_path or "").strip() or None),
+            agent_cli=str(task.agent_cli or "").strip(),
+            agent_cli_args=str(task.agent_cli_args or "").strip(),
+        )
+        if draft is None:
+            return False
+        run.draft = draft
+        if draft.existing_url:
+            self._record_task_pr_url(run, draft.existing_url)
+            return False
+        return commit_pull_request_changes(
+            draft, lambda line: self.host_log.emit(task_id, line)
+        )
 
-            pr_worker_ran = False
-            if should_create_pr:
-                pr_worker_ran = True
-                self._finalize_gh_management_worker(
-                    task_id,
-                    str(task.gh_repo_root or "").strip(),
-                    str(task.gh_branch or "").strip(),
-                    str(task.gh_base_branch or "").strip(),
-                    str(task.prompt or ""),
-                    str(task.task_id or task_id),
-                    bool(task.gh_use_host_cli),
-                    (str(task.gh_pr_metadata_path or "").strip() or None),
-                    str(task.agent_cli or "").strip(),
-                    str(task.agent_cli_args or "").strip(),
-                )
-            else:
-                self.host_log.emit(
-                    task_id,
-                    format_log(
-                        "gh", "pr", "INFO", f"PR creation skipped: {skip_reason}"
-                    ),
-                )
+    def _finalize_push_step(self, run: _TaskFinalization) -> bool:
+        # Pushes to the same remote from tasks finishing together share one
+        # `git push`.
+        return push_pull_request_branch(
+            run.draft,
+            lambda line: self.host_log.emit(run.task_id, line),
+            push=push_batcher().push,
+        )
 
-            # WORKSPACE CLEANUP LOGIC:
-            # Cleanup happens here ONLY if:
-            # 1. PR worker did NOT run (PR worker cleans in its finally block)
-            # 2. reason != "recovery_tick" (recovery_tick is monitoring, not modifying)
-            # 3. workspace is cloned (non-cloned workspaces don't need cleanup)
-            #
-            # Why recovery_tick skips cleanup:
-            # - recovery_tick is a safety net that runs every 5 seconds
-            # - It should verify finalization state but not modify workspaces
-            # - Cleanup is handled by the primary paths (task_done, user_stop, startup_reconcile)
-            # - This prevents recovery_tick from accidentally removing resources still in use
-            if (
-                not pr_worker_ran
-                and reason != "recovery_tick"  # Skip cleanup during recovery
-                and task.workspace_type == WORKSPACE_CLONED
-                and str(task.environment_id or "").strip()
-                and str(task.task_id or "").strip()
-            ):
-                self._cleanup_task_workspace_for_finalization(
-                    task_id,
-                    str(task.environment_id or "").strip(),
-                )
+    def _finalize_pr_step(self, run: _TaskFinalization) -> bool:
+        pr_url = open_pull_request(
+            run.draft, lambda line: self.host_log.emit(run.task_id, line)
+        )
+        if pr_url:
+            self._record_task_pr_url(run, pr_url)
+        return True
+
+    def _finalize_snapshot_step(self, run: _TaskFinalization) -> None:
+        task = run.task
+        if task is None or not task.workspace_snapshot:
+            return
+        # Like artifacts, the work of a user-stopped task is not kept.
+        user_stop = (task.status or "").lower() in {"cancelled", "killed"}
+        removable = finish_workspace_snapshot(
+            task.workspace_snapshot,
+            merge=not user_stop,
+            on_log=lambda line: self.host_log.emit(run.task_id, line),
+        )
+        run.keep_workspace = not removable
+
+    def _record_task_pr_url(self, run: _TaskFinalization, pr_url: str) -> None:
+        self.host_pr_url.emit(run.task_id, pr_url)
+        run.task.gh_pr_url = pr_url
+        self._schedule_save()
+
+    def _finalize_cleanup_step(self, run: _TaskFinalization) -> None:
+        task = run.task
+        if task is None:
+            return
+        task_id = run.task_id
+        if run.draft is not None:
+            log_git_steps(run.draft, lambda line: self.host_log.emit(task_id, line))
+
+        env_id = str(task.environment_id or "").strip()
+        if run.pr_started_s is not None:
+            # Once PR work started the task repo is always removed so the
+            # next attempt gets a fresh clone without git conflicts.
+            if env_id and task_id:
+                self._cleanup_task_workspace_for_finalization(task_id, env_id)
+            elapsed_s = time.monotonic() - run.pr_started_s
+            self.host_log.emit(
+                task_id,
+                format_log(
+                    "host",
+                    "finalize",
+                    "INFO",
+                    f"PR preparation finished in {elapsed_s:.1f}s",
+                ),
+            )
+            return
+
+        if run.failed:
+            # An earlier stage failed before any PR work: keep the workspace
+            # so the retry still has the task's changes, but do not leave a
+            # snapshot's overlay mounted.
+            if task.workspace_snapshot:
+                release_workspace_snapshot(task.workspace_snapshot)
+            self.host_log.emit(
+                task_id,
+                format_log(
+                    "host",
+                    "finalize",
+                    "INFO",
+                    "keeping task workspace for the finalization retry",
+                ),
+            )
+            return
+
+        # WORKSPACE CLEANUP LOGIC (no PR work):
+        # Cleanup happens here ONLY if:
+        # 1. reason != "recovery_tick" (recovery_tick is monitoring, not modifying)
+        # 2. workspace is cloned or a snapshot that merged back cleanly
+        #    (other workspaces are the user's own folder)
+        #
+        # Why recovery_tick skips cleanup:
+        # - recovery_tick is a safety net that runs every 5 seconds
+        # - It should verify finalization state but not modify workspaces
+        # - Cleanup is handled by the primary paths (task_done, user_stop, startup_reconcile)
+        # - This prevents recovery_tick from accidentally removing resources still in use
+        if (
+            run.reason != "recovery_tick"  # Skip cleanup during recovery
+            and (
+                task.workspace_type == WORKSPACE_CLONED
+                or (task.workspace_snapshot and not run.keep_workspace)
+            )
+            and env_id
+            and str(task.task_id or "").strip()
+        ):
+            self._cleanup_task_workspace_for_finalization(task_id, env_id)
 
+    def _finish_task_finalization(
+        self, run: _TaskFinalization, error: BaseException | None
+    ) -> None:
+        task = run.task
+        if task is None:
+            return
+        task_id = run.task_id
+        reason = run.reason
+        if error is None:
             task.finalization_state = "done"
             task.finalization_error = ""
             self._schedule_save()
@@ -545,9 +691,10 @@ class _MainWindowTaskRecoveryMixin:
                 task_id,
                 format_log("host", "finalize", "INFO", "finalization complete"),
             )
-        except Exception as exc:
+            self._note_task_workspace_changed(task)
+        else:
             task.finalization_state = "error"
-            task.finalization_error = str(exc)
+            task.finalization_error = str(error)
             self._schedule_save()
             self.host_log.emit(
                 task_id,
@@ -560,8 +707,19 @@ class _MainWindowTaskRecoveryMixin:
             )
             self.host_log.emit(
                 task_id,
-                format_log("host", "finalize", "ERROR", f"finalization failed: {exc}"),
+                format_log(
+                    "host", "finalize", "ERROR", f"finalization failed: {error}"
+                ),
             )
+        self.host_log.emit(
+            task_id,
+            format_log(
+                "host",
+                "finalize",
+                "INFO",
+                f"pipeline throughput: {self._finalize_pipeline.summary()}",
+            ),
+        )
 
     def _cleanup_task_workspace_for_finalization(
         self, task_id: str, env_id: str
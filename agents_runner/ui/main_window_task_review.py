@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import os
-import threading
 import webbrowser
 
 from PySide6.QtCore import QUrl
@@ -9,6 +8,7 @@ from PySide6.QtGui import QDesktopServices
 from PySide6.QtWidgets import QMessageBox
 
 from agents_runner.environments import WORKSPACE_CLONED
+from agents_runner.execution.executor import POOL_GIT
 from agents_runner.log_format import format_log
 
 
@@ -130,20 +130,25 @@ class _MainWindowTaskReviewMixin:
                 "gh", "pr", "INFO", f"PR requested ({branch} -> {base_display})"
             ),
         )
-        threading.Thread(
-            target=self._finalize_gh_management_worker,
-            args=(
+        future = self._executor.try_submit(
+            POOL_GIT,
+            self._finalize_gh_management_worker,
+            task_id,
+            repo_root,
+            branch,
+            base_branch,
+            prompt_text,
+            task_token,
+            bool(task.gh_use_host_cli),
+            pr_metadata_path,
+            str(task.agent_cli or "").strip(),
+            str(task.agent_cli_args or "").strip(),
+            is_override,
+        )
+        if future is None:
+            self._on_task_log(
                 task_id,
-                repo_root,
-                branch,
-                base_branch,
-                prompt_text,
-                task_token,
-                bool(task.gh_use_host_cli),
-                pr_metadata_path,
-                str(task.agent_cli or "").strip(),
-                str(task.agent_cli_args or "").strip(),
-                is_override,
-            ),
-            daemon=True,
-        ).start()
+                format_log(
+                    "gh", "pr", "ERROR", "PR request dropped: git queue is full"
+                ),
+            )
@@ -6,38 +6,35 @@ import shlex
 import shutil
 import time
 
+from dataclasses import replace
+from datetime import datetime
+from datetime import timezone
+from typing import Callable
 from uuid import uuid4
 
 from PySide6.QtCore import Qt
-from PySide6.QtCore import QThread
 
 from PySide6.QtWidgets import QMessageBox
+from PySide6.QtWidgets import QProgressDialog
 
 from agents_runner.environments import WORKSPACE_CLONED
 from agents_runner.environments import WORKSPACE_MOUNTED
+from agents_runner.environments import managed_repo_checkout_path
 from agents_runner.environments import save_environment
 from agents_runner.environments.cleanup import cleanup_task_workspace
-from agents_runner.environments.git_operations import get_git_info
-from agents_runner.gh_management import is_gh_available
-from agents_runner.docker_runner import DockerRunnerConfig
+from agents_runner.environments.cow_workspace import snapshot_workdir
+from agents_runner.execution.executor import POOL_RUN
+from agents_runner.execution.launch import TaskLaunchContext
+from agents_runner.execution.launch import build_launch_context
+from agents_runner.execution.launch import pinned_agent_missing
+from agents_runner.execution.launch import prepare_task_launch
 from agents_runner.log_format import format_log
-from agents_runner.pr_metadata import ensure_github_context_file
-from agents_runner.pr_metadata import github_context_host_path
-from agents_runner.pr_metadata import github_context_prompt_instructions
-from agents_runner.pr_metadata import GitHubContext
-from agents_runner.pr_metadata import ensure_pr_metadata_file
-from agents_runner.pr_metadata import pr_metadata_container_path
-from agents_runner.pr_metadata import pr_metadata_host_path
-from agents_runner.pr_metadata import pr_metadata_prompt_instructions
+from agents_runner.prompt_batch import PromptBatchRequest
+from agents_runner.prompt_batch import load_prompt_batch
 from agents_runner.prompt_sanitizer import sanitize_prompt
 from agents_runner.persistence import save_task_payload
 from agents_runner.persistence import serialize_task
 from agents_runner.ui.bridges import TaskRunnerBridge
-from agents_runner.ui.constants import PIXELARCH_AGENT_CONTEXT_SUFFIX
-from agents_runner.ui.constants import PIXELARCH_EMERALD_IMAGE
-from agents_runner.ui.constants import PIXELARCH_GIT_CONTEXT_SUFFIX
-from agents_runner.environments.model import AgentInstance
-from agents_runner.environments.model import AgentSelection
 from agents_runner.ui.task_model import Task
 from agents_runner.ui.utils import _stain_color
 
@@ -86,6 +83,7 @@ class _MainWindowTasksAgentMixin:
         self._dashboard.remove_tasks(to_remove)
         for task_id in to_remove:
             self._tasks.pop(task_id, None)
+            self._scheduler.forget(task_id)
             self._threads.pop(task_id, None)
             self._bridges.pop(task_id, None)
             self._run_started_s.pop(task_id, None)
@@ -103,59 +101,216 @@ class _MainWindowTasksAgentMixin:
         env_id: str,
         base_branch: str,
     ) -> str | None:
+        ctx = self._task_launch_context(
+            host_codex=host_codex,
+            env_id=env_id,
+            base_branch=base_branch,
+            interactive=True,
+        )
+        if ctx is None:
+            return None
+        task = self._create_queued_task(
+            ctx, sanitize_prompt((prompt or "").strip()), pull_image=True
+        )
+        if task is None:
+            return None
+
+        self._enqueue_task(task)
+        self._try_start_queued_tasks()
+        self._note_waiting_for_slot(task)
+
+        self._show_dashboard()
+        self._new_task.reset_for_new_run()
+        return task.task_id
+
+    def _submit_task_batch(
+        self,
+        prompts: list[str],
+        host_codex: str,
+        env_id: str,
+        base_branch: str,
+        *,
+        on_progress: Callable[[int, int], bool] | None = None,
+    ) -> list[str]:
+        """Create one queued task per prompt and hand them to the queue at once.
+
+        Environment resolution, prompt templating and the image pull are done
+        once for the whole batch. ``on_progress(done, total)`` is called after
+        each task is created; returning False stops the batch there. Tasks
+        created before a failure or a stop are still queued.
+        """
+        prompts = [
+            p for p in (sanitize_prompt(str(p or "").strip()) for p in prompts) if p
+        ]
+        if not prompts:
+            QMessageBox.warning(self, "Empty batch", "No prompts to run.")
+            return []
+        ctx = self._task_launch_context(
+            host_codex=host_codex,
+            env_id=env_id,
+            base_branch=base_branch,
+            interactive=False,
+        )
+        if ctx is None:
+            return []
+
+        created: list[Task] = []
+        for prompt in prompts:
+            # Only the first task pulls; the rest reuse the image (or pull it
+            # themselves if it is still missing when they start).
+            task = self._create_queued_task(ctx, prompt, pull_image=not created)
+            if task is None:
+                break
+            created.append(task)
+            if on_progress is not None and not on_progress(len(created), len(prompts)):
+                break
+
+        for task in created:
+            self._enqueue_task(task)
+        self._try_start_queued_tasks()
+        for task in created:
+            self._note_waiting_for_slot(task)
+        self._schedule_save()
+
+        logger.info(
+            format_log(
+                "queue",
+                "batch",
+                "INFO",
+                f"queued {len(created)}/{len(prompts)} task(s) for environment {ctx.env_id}",
+            )
+        )
+        if created:
+            self._show_dashboard()
+        return [task.task_id for task in created]
+
+    def _start_task_batch_from_ui(
+        self,
+        prompts: list[str],
+        host_codex: str,
+        env_id: str,
+        base_branch: str,
+    ) -> list[str]:
+        progress = QProgressDialog("Creating tasks…", "Stop", 0, len(prompts), self)
+        progress.setWindowTitle("Run batch")
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(300)
+
+        def on_progress(done: int, total: int) -> bool:
+            progress.setLabelText(f"Creating tasks… {done}/{total}")
+            progress.setValue(done)
+            return not progress.wasCanceled()
+
+        try:
+            task_ids = self._submit_task_batch(
+                prompts,
+                host_codex,
+                env_id,
+                base_branch,
+                on_progress=on_progress,
+            )
+        finally:
+            progress.close()
+        if task_ids:
+            self._new_task.reset_for_new_run()
+        if 0 < len(task_ids) < len(prompts):
+            QMessageBox.information(
+                self,
+                "Run batch",
+                f"Queued {len(task_ids)} of {len(prompts)} task(s).",
+            )
+        return task_ids
+
+    def queue_prompt_batch(self, request: PromptBatchRequest) -> None:
+        """Run a ``--batch-prompts`` request once environments and tasks are loaded."""
+        if self._tasks_restored:
+            self.run_prompt_batch(request)
+        else:
+            self._pending_prompt_batch = request
+
+    def run_prompt_batch(self, request: PromptBatchRequest) -> list[str]:
+        """Queue the prompts of a ``--batch-prompts`` file."""
+        try:
+            prompts = load_prompt_batch(request.path)
+        except (OSError, UnicodeDecodeError, ValueError) as exc:
+            QMessageBox.warning(
+                self, "Could not read prompts", f"{request.path}: {exc}"
+            )
+            return []
+        if not prompts:
+            QMessageBox.warning(
+                self, "Empty batch", f"No prompts found in {request.path}."
+            )
+            return []
+        return self._start_task_batch_from_ui(
+            prompts, "", request.env_id, request.base_branch
+        )
+
+    def _note_waiting_for_slot(self, task: Task) -> None:
+        if (task.status or "").lower() != "queued":
+            return
+        self._on_task_log(
+            task.task_id,
+            format_log("queue", "slot", "INFO", "Waiting for available slot..."),
+        )
+        env = self._environments.get(task.environment_id)
+        stain = env.color if env else None
+        spinner = _stain_color(env.color) if env else None
+        self._dashboard.upsert_task(task, stain=stain, spinner_color=spinner)
+        self._schedule_save()
+
+    def _task_launch_context(
+        self,
+        *,
+        host_codex: str,
+        env_id: str,
+        base_branch: str,
+        interactive: bool,
+    ) -> TaskLaunchContext | None:
         if shutil.which("docker") is None:
             QMessageBox.critical(
                 self, "Docker not found", "Could not find `docker` in PATH."
             )
-            return
-        prompt = sanitize_prompt((prompt or "").strip())
+            return None
 
-        task_id = uuid4().hex[:10]
         env_id = str(env_id or "").strip() or self._active_environment_id()
         if env_id not in self._environments:
             QMessageBox.warning(
                 self, "Unknown environment", "Pick an environment first."
             )
-            return
+            return None
         self._settings_data["active_environment_id"] = env_id
         env = self._environments.get(env_id)
 
-        if (
-            env
-            and env.agent_selection
-            and str(getattr(env.agent_selection, "selection_mode", "") or "")
-            .strip()
-            .lower()
-            == "pinned"
-        ):
-            pinned_id = str(
-                getattr(env.agent_selection, "pinned_agent_id", "") or ""
-            ).strip()
-            pinned_lower = pinned_id.lower()
-            pinned_inst = next(
-                (
-                    inst
-                    for inst in list(getattr(env.agent_selection, "agents", []) or [])
-                    if str(getattr(inst, "agent_id", "") or "").strip() == pinned_id
-                ),
-                None,
-            ) or next(
-                (
-                    inst
-                    for inst in list(getattr(env.agent_selection, "agents", []) or [])
-                    if str(getattr(inst, "agent_id", "") or "").strip().lower()
-                    == pinned_lower
-                ),
-                None,
+        if pinned_agent_missing(env):
+            QMessageBox.warning(
+                self,
+                "Pinned agent missing",
+                "This environment is set to Pinned mode, but the pinned agent ID is missing or invalid.",
             )
-            if pinned_inst is None:
-                QMessageBox.warning(
-                    self,
-                    "Pinned agent missing",
-                    "This environment is set to Pinned mode, but the pinned agent ID is missing or invalid.",
-                )
-                return
-
+            return None
+
+        try:
+            return build_launch_context(
+                env_id=env_id,
+                env=env,
+                settings=self._settings_data,
+                host_codex=host_codex,
+                base_branch=base_branch,
+                interactive=interactive,
+            )
+        except ValueError as exc:
+            QMessageBox.warning(self, "Invalid agent CLI flags", str(exc))
+            return None
+
+    def _select_task_agent(self, ctx: TaskLaunchContext) -> tuple[str, str, str] | None:
+        """Pick (agent_cli, config_dir, agent_instance_id) for the next task.
+
+        Round-robin advances per task. The cooldown prompt is only shown for
+        single submissions; batch tasks are held by the queue until their agent
+        is off cooldown (and the supervisor still falls back on its own).
+        """
+        env = ctx.env
         # Get effective agent and config dir (environment agent_selection overrides settings)
         agent_instance_id = ""
         if env and env.agent_selection and getattr(env.agent_selection, "agents", None):
@@ -170,16 +325,16 @@ class _MainWindowTasksAgentMixin:
             agent_cli, auto_config_dir = self._effective_agent_and_config(
                 env=env, advance_round_robin=True
             )
+        if not ctx.interactive:
+            return agent_cli, auto_config_dir, agent_instance_id
 
         # Check cooldown for selected agent
-        from agents_runner.core.agent.cooldown_manager import CooldownManager
         from agents_runner.core.agent.keys import cooldown_key
         from agents_runner.ui.dialogs.cooldown_modal import (
             CooldownAction,
             CooldownModal,
         )
 
-        cooldown_mgr = CooldownManager(self._watch_states)
         selected_cli_flags = ""
         if env and env.agent_selection and agent_instance_id:
             inst = next(
@@ -212,7 +367,7 @@ class _MainWindowTasksAgentMixin:
             host_config_dir=auto_config_dir,
             agent_cli_args=cooldown_args,
         )
-        watch_state = cooldown_mgr.check_cooldown(selected_key)
+        watch_state = self._cooldowns.check(selected_key)
 
         # Show cooldown modal if agent is on cooldown
         if watch_state and watch_state.is_on_cooldown():
@@ -265,12 +420,11 @@ class _MainWindowTasksAgentMixin:
             action = modal.get_result()
 
             if action == CooldownAction.CANCEL:
-                return  # Don't start task
+                return None  # Don't start task
 
             elif action == CooldownAction.BYPASS:
                 # Clear cooldown and continue with original agent
-                cooldown_mgr.clear_cooldown(selected_key)
-                self._schedule_save()  # Persist cooldown clear
+                self._cooldowns.clear_cooldown(selected_key)
 
             elif action == CooldownAction.USE_FALLBACK:
                 # Override agent for this task only (task-scoped)
@@ -287,14 +441,28 @@ class _MainWindowTasksAgentMixin:
                         )
                     agent_instance_id = fallback_agent.agent_id
                     # Don't modify environment, just use fallback for this task
+        return agent_cli, auto_config_dir, agent_instance_id
+
+    def _create_queued_task(
+        self, ctx: TaskLaunchContext, prompt: str, *, pull_image: bool
+    ) -> Task | None:
+        """Create a queued task (with its runner config) but do not enqueue it."""
+        env = ctx.env
+        env_id = ctx.env_id
+        task_id = uuid4().hex[:10]
+
+        selected = self._select_task_agent(ctx)
+        if selected is None:
+            return None
+        agent_cli, auto_config_dir, agent_instance_id = selected
 
-        workspace_type = env.workspace_type if env else "none"
+        workspace_type = ctx.workspace_type
         effective_workdir, ready, message = self._new_task_workspace(
             env, task_id=task_id
         )
         if not ready:
             QMessageBox.warning(self, "Workspace not configured", message)
-            return
+            return None
         if workspace_type == WORKSPACE_CLONED:
             try:
                 os.makedirs(effective_workdir, exist_ok=True)
@@ -312,122 +480,44 @@ class _MainWindowTasksAgentMixin:
                     "Directory Creation Failed",
                     f"Could not create workspace directory: {exc}",
                 )
-                return
+                return None
         elif not os.path.isdir(effective_workdir):
             QMessageBox.warning(self, "Invalid Workdir", "Host Workdir does not exist.")
-            return
+            return None
 
         self._settings_data["host_workdir"] = effective_workdir
 
-        resolved_agent_selection: AgentSelection | None = None
-        if env and env.agent_selection and getattr(env.agent_selection, "agents", None):
-            selection_mode = str(
-                getattr(env.agent_selection, "selection_mode", "") or "round-robin"
-            ).strip()
-            pinned_agent_id = str(
-                getattr(env.agent_selection, "pinned_agent_id", "") or ""
-            ).strip()
-            pinned_lower = pinned_agent_id.lower()
-            resolved_agents: list[AgentInstance] = []
-            for inst in list(env.agent_selection.agents or []):
-                if (
-                    selection_mode.lower() == "pinned"
-                    and pinned_agent_id
-                    and str(getattr(inst, "agent_id", "") or "").strip()
-                    != pinned_agent_id
-                    and str(getattr(inst, "agent_id", "") or "").strip().lower()
-                    != pinned_lower
-                ):
-                    continue
-                inst_cli = str(getattr(inst, "agent_cli", "") or "").strip()
-                inst_dir = os.path.expanduser(
-                    str(getattr(inst, "config_dir", "") or "").strip()
-                )
-                if not inst_dir:
-                    inst_dir = self._resolve_config_dir_for_agent(
-                        agent_cli=inst_cli,
-                        env=env,
-                        settings=self._settings_data,
-                    )
-                resolved_agents.append(
-                    AgentInstance(
-                        agent_id=str(getattr(inst, "agent_id", "") or "").strip()
-                        or inst_cli,
-                        agent_cli=inst_cli,
-                        config_dir=inst_dir,
-                        cli_flags=str(getattr(inst, "cli_flags", "") or "").strip(),
-                    )
-                )
-            resolved_agent_selection = AgentSelection(
-                agents=resolved_agents,
-                selection_mode=selection_mode,
-                agent_fallbacks=(
-                    {}
-                    if selection_mode.lower() == "pinned"
-                    else dict(getattr(env.agent_selection, "agent_fallbacks", {}) or {})
-                ),
-                pinned_agent_id=pinned_agent_id,
+        # The snapshot itself is taken by the worker right before the run.
+        snapshot_root = ""
+        if (
+            env
+            and workspace_type == WORKSPACE_MOUNTED
+            and bool(getattr(env, "mounted_snapshots", False))
+        ):
+            snapshot_root = managed_repo_checkout_path(
+                env.env_id,
+                data_dir=os.path.dirname(self._state_path),
+                task_id=task_id,
             )
+            effective_workdir = snapshot_workdir(snapshot_root)
 
-        host_codex = os.path.expanduser(str(host_codex or "").strip())
         host_config_dir = auto_config_dir
-        if agent_cli == "codex" and host_codex:
-            host_config_dir = host_codex
+        if agent_cli == "codex" and ctx.host_codex:
+            host_config_dir = ctx.host_codex
         if not host_config_dir:
             host_config_dir = auto_config_dir
 
-        if not self._ensure_agent_config_dir(agent_cli, host_config_dir):
-            return
+        config_dir_key = (agent_cli, host_config_dir)
+        if config_dir_key not in ctx.checked_config_dirs:
+            if not self._ensure_agent_config_dir(agent_cli, host_config_dir):
+                return None
+            ctx.checked_config_dirs.add(config_dir_key)
         self._settings_data[self._host_config_dir_key(agent_cli)] = host_config_dir
 
-        image = PIXELARCH_EMERALD_IMAGE
-
-        agent_cli_args: list[str] = []
-        if env and env.agent_cli_args.strip():
-            try:
-                agent_cli_args = shlex.split(env.agent_cli_args)
-            except ValueError as exc:
-                QMessageBox.warning(self, "Invalid agent CLI flags", str(exc))
-                return
-
-        settings_preflight_script: str | None = None
-        if (
-            self._settings_data.get("preflight_enabled")
-            and str(self._settings_data.get("preflight_script") or "").strip()
-        ):
-            settings_preflight_script = str(
-                self._settings_data.get("preflight_script") or ""
-            )
-
-        environment_preflight_script: str | None = None
-        if env and env.preflight_enabled and (env.preflight_script or "").strip():
-            environment_preflight_script = env.preflight_script
-
-        force_headless_desktop = bool(
-            self._settings_data.get("headless_desktop_enabled") or False
-        )
-        env_headless_desktop = (
-            bool(getattr(env, "headless_desktop_enabled", False)) if env else False
-        )
-        headless_desktop_enabled = bool(force_headless_desktop or env_headless_desktop)
-        desktop_cache_enabled = (
-            bool(getattr(env, "cache_desktop_build", False)) if env else False
-        )
-        container_caching_enabled = (
-            bool(getattr(env, "container_caching_enabled", False)) if env else False
-        )
-        cached_preflight_script = (
-            str(getattr(env, "cached_preflight_script", "") or "").strip()
-            if env
-            else ""
-        )
-        # Only enable cache if desktop is enabled
-        desktop_cache_enabled = desktop_cache_enabled and headless_desktop_enabled
-
         task = Task(
             task_id=task_id,
             prompt=prompt,
-            image=image,
+            image=ctx.image,
             host_workdir=effective_workdir,
             host_config_dir=host_config_dir,
             environment_id=env_id,
@@ -435,9 +525,10 @@ class _MainWindowTasksAgentMixin:
             status="queued",
             agent_cli=agent_cli,
             agent_instance_id=agent_instance_id,
-            agent_cli_args=" ".join(agent_cli_args),
-            headless_desktop_enabled=headless_desktop_enabled,
+            agent_cli_args=" ".join(ctx.agent_cli_args),
+            headless_desktop_enabled=ctx.headless_desktop_enabled,
             workspace_type=workspace_type,
+            workspace_snapshot=snapshot_root,
         )
         self._tasks[task_id] = task
         stain = env.color if env else None
@@ -445,58 +536,20 @@ class _MainWindowTasksAgentMixin:
         self._dashboard.upsert_task(task, stain=stain, spinner_color=spinner)
         self._schedule_save()
 
-        use_host_gh = bool(getattr(env, "gh_use_host_cli", True)) if env else True
-        use_host_gh = bool(use_host_gh and is_gh_available())
-        task.gh_use_host_cli = use_host_gh
-
-        desired_base = str(base_branch or "").strip()
+        desired_base = ctx.desired_base
 
         # Save the selected branch for cloned environments
-        if env and env.workspace_type == WORKSPACE_CLONED and desired_base:
+        if (
+            env
+            and env.workspace_type == WORKSPACE_CLONED
+            and desired_base
+            and env.gh_last_base_branch != desired_base
+        ):
             env.gh_last_base_branch = desired_base
             save_environment(env)
             # Update in-memory copy to persist across tab changes and reloads
             self._environments[env.env_id] = env
 
-        runner_prompt = prompt
-        if bool(self._settings_data.get("append_pixelarch_context") or False):
-            runner_prompt = f"{runner_prompt.rstrip()}{PIXELARCH_AGENT_CONTEXT_SUFFIX}"
-
-        # Inject git context when cloned workspace is used
-        if workspace_type == WORKSPACE_CLONED:
-            runner_prompt = f"{runner_prompt.rstrip()}{PIXELARCH_GIT_CONTEXT_SUFFIX}"
-
-        enabled_env_prompts: list[str] = []
-        if env and bool(getattr(env, "prompts_unlocked", False)):
-            for p in getattr(env, "prompts", None) or []:
-                text = str(getattr(p, "text", "") or "").strip()
-                if not text or not bool(getattr(p, "enabled", False)):
-                    continue
-                enabled_env_prompts.append(sanitize_prompt(text))
-
-        if enabled_env_prompts:
-            runner_prompt = f"{runner_prompt.rstrip()}\n\n" + "\n\n".join(
-                enabled_env_prompts
-            )
-            self._on_task_log(
-                task_id,
-                format_log(
-                    "env",
-                    "prompts",
-                    "INFO",
-                    f"appended {len(enabled_env_prompts)} environment prompt(s) (non-interactive)",
-                ),
-            )
-        env_vars_for_task = dict(env.env_vars) if env else {}
-        extra_mounts_for_task = list(env.extra_mounts) if env else []
-        ports_for_task = list(getattr(env, "ports", []) or []) if env else []
-
-        # Add host cache mount if enabled in settings
-        if self._settings_data.get("mount_host_cache", False):
-            host_cache = os.path.expanduser("~/.cache")
-            container_cache = "/home/midori-ai/.cache"
-            extra_mounts_for_task.append(f"{host_cache}:{container_cache}:rw")
-
         # Add cross-agent config mounts if enabled
         cross_agent_mounts = self._compute_cross_agent_config_mounts(
             env=env,
@@ -504,256 +557,54 @@ class _MainWindowTasksAgentMixin:
             primary_config_dir=host_config_dir,
             settings=self._settings_data,
         )
-        extra_mounts_for_task.extend(cross_agent_mounts)
-
-        # GitHub context preparation
-        # For cloned: Create empty file before clone, populate after clone completes
-        # For mounted: Detect git and populate immediately if it's a git repo
-        # For non-git: Skip gracefully (never fail the task)
-        if env and bool(getattr(env, "gh_context_enabled", False)):
-            # Detect git for mounted environments
-            should_generate = False
-            github_context = None
-
-            if env.workspace_type == WORKSPACE_MOUNTED:
-                # Mounted: Try to detect git repo
-                folder_path = str(env.workspace_target or "").strip()
-                if folder_path:
-                    try:
-                        git_info = get_git_info(folder_path)
-                        if git_info:
-                            should_generate = True
-                            github_context = GitHubContext(
-                                repo_url=git_info.repo_url,
-                                repo_owner=git_info.repo_owner,
-                                repo_name=git_info.repo_name,
-                                base_branch=git_info.branch,
-                                task_branch=None,
-                                head_commit=git_info.commit_sha,
-                            )
-                            # Populate task.git immediately for mounted environments
-                            task.git = {
-                                "repo_url": git_info.repo_url,
-                                "repo_owner": git_info.repo_owner,
-                                "repo_name": git_info.repo_name,
-                                "base_branch": git_info.branch,
-                                "target_branch": None,
-                                "head_commit": git_info.commit_sha,
-                            }
-                            # Also set gh_repo_root for mounted tasks
-                            if folder_path and os.path.isdir(folder_path):
-                                task.gh_repo_root = folder_path
-                            self._on_task_log(
-                                task_id,
-                                format_log(
-                                    "gh",
-                                    "context",
-                                    "INFO",
-                                    f"detected git repo: {git_info.repo_url}",
-                                ),
-                            )
-                        else:
-                            self._on_task_log(
-                                task_id,
-                                format_log(
-                                    "gh",
-                                    "context",
-                                    "INFO",
-                                    "folder is not a git repository; skipping context",
-                                ),
-                            )
-                    except Exception as exc:
-                        logger.warning(
-                            format_log(
-                                "gh", "context", "WARN", f"git detection failed: {exc}"
-                            )
-                        )
-                        self._on_task_log(
-                            task_id,
-                            format_log(
-                                "gh",
-                                "context",
-                                "WARN",
-                                f"git detection failed: {exc}; continuing without context",
-                            ),
-                        )
-            elif env.workspace_type == WORKSPACE_CLONED:
-                # Cloned: Will populate after clone
-                should_generate = True
-
-            # Create GitHub context file
-            if should_generate:
-                host_context_path = github_context_host_path(
-                    os.path.dirname(self._state_path), task_id
-                )
-                pr_host_path = pr_metadata_host_path(
-                    os.path.dirname(self._state_path), task_id
-                )
-                pr_container_path = pr_metadata_container_path(task_id)
-                try:
-                    ensure_github_context_file(
-                        host_context_path,
-                        task_id=task_id,
-                        github_context=github_context,
-                    )
-                    ensure_pr_metadata_file(
-                        pr_host_path,
-                        task_id=task_id,
-                    )
-                except Exception as exc:
-                    logger.error(
-                        format_log(
-                            "gh",
-                            "context",
-                            "ERROR",
-                            f"failed to create GitHub context file: {exc}",
-                        )
-                    )
-                    self._on_task_log(
-                        task_id,
-                        format_log(
-                            "gh",
-                            "context",
-                            "ERROR",
-                            f"failed to create GitHub context file: {exc}; continuing without context",
-                        ),
-                    )
-                else:
-                    task.gh_context_path = host_context_path
-                    task.gh_pr_metadata_path = pr_host_path
-
-                    # Only mount the PR title/body TOML into the container (agents edit this).
-                    extra_mounts_for_task.append(
-                        f"{pr_host_path}:{pr_container_path}:rw"
-                    )
-
-                    # Provide read-only repo context inline; do not mount the repo metadata file.
-                    repo_url = ""
-                    repo_owner = ""
-                    repo_name = ""
-                    base_branch = ""
-                    task_branch = ""
-                    head_commit = ""
-                    if github_context is not None:
-                        repo_url = github_context.repo_url
-                        repo_owner = github_context.repo_owner or ""
-                        repo_name = github_context.repo_name or ""
-                        base_branch = github_context.base_branch
-                        task_branch = github_context.task_branch or ""
-                        head_commit = github_context.head_commit
-                    else:
-                        # For cloned repos, we may not know branch/commit until after clone.
-                        repo_url = str(
-                            getattr(env, "workspace_target", "") or ""
-                        ).strip()
-                        base_branch = str(desired_base or "").strip() or "auto"
-                        task_branch = "(already created by runner)"
-                        head_commit = "(set after clone)"
-
-                    runner_prompt = (
-                        f"{runner_prompt}"
-                        f"{github_context_prompt_instructions(repo_url=repo_url, repo_owner=repo_owner, repo_name=repo_name, base_branch=base_branch, task_branch=task_branch, head_commit=head_commit)}"
-                        f"{pr_metadata_prompt_instructions(pr_container_path)}"
-                    )
-                    # Clarify two-phase process for cloned repo environments
-                    if workspace_type == WORKSPACE_CLONED:
-                        self._on_task_log(
-                            task_id,
-                            format_log(
-                                "gh",
-                                "context",
-                                "INFO",
-                                "GitHub context enabled (host-only) and PR metadata file mounted",
-                            ),
-                        )
-                        self._on_task_log(
-                            task_id,
-                            format_log(
-                                "gh",
-                                "context",
-                                "INFO",
-                                "Repository metadata will be populated after clone completes",
-                            ),
-                        )
-                    else:
-                        self._on_task_log(
-                            task_id,
-                            format_log(
-                                "gh",
-                                "context",
-                                "INFO",
-                                "GitHub context enabled (host-only) and PR metadata file mounted",
-                            ),
-                        )
-
-        # Build config with GitHub repo info if needed
-        # Get the host GitHub context path if it was created (regardless of mode)
-        gh_context_file = getattr(task, "gh_context_path", None)
-        gh_repo: str | None = None
-        if workspace_type == WORKSPACE_CLONED and env:
-            gh_repo = str(env.workspace_target or "").strip() or None
-
-        config = DockerRunnerConfig(
-            task_id=task_id,
-            image=image,
-            host_config_dir=host_config_dir,
-            host_workdir=effective_workdir,
-            agent_cli=agent_cli,
-            environment_id=env_id,
-            auto_remove=True,
-            pull_before_run=True,
-            settings_preflight_script=settings_preflight_script,
-            environment_preflight_script=environment_preflight_script,
-            headless_desktop_enabled=headless_desktop_enabled,
-            desktop_cache_enabled=desktop_cache_enabled,
-            container_caching_enabled=container_caching_enabled,
-            cached_preflight_script=cached_preflight_script or None,
-            env_vars=env_vars_for_task,
-            extra_mounts=extra_mounts_for_task,
-            ports=ports_for_task,
-            agent_cli_args=agent_cli_args,
-            gh_repo=gh_repo,
-            gh_prefer_gh_cli=use_host_gh,
-            gh_recreate_if_needed=True,
-            gh_base_branch=desired_base or None,
-            gh_context_file_path=gh_context_file,
-        )
-        task._runner_config = config
-        task._runner_prompt = runner_prompt
-        task._agent_selection = resolved_agent_selection or (
-            env.agent_selection if env else None
+        prepare_task_launch(
+            ctx,
+            task,
+            data_dir=os.path.dirname(self._state_path),
+            on_log=lambda line: self._on_task_log(task_id, line),
+            extra_mounts=cross_agent_mounts,
+            pull_image=pull_image,
         )
+        return task
 
-        if self._can_start_new_agent_for_env(env_id):
-            self._actually_start_task(task)
-        else:
-            self._on_task_log(
-                task_id,
-                format_log("queue", "slot", "INFO", "Waiting for available slot..."),
-            )
-            self._dashboard.upsert_task(task, stain=stain, spinner_color=spinner)
-            self._schedule_save()
-
-        self._show_dashboard()
-        self._new_task.reset_for_new_run()
-        return task_id
+    def _actually_start_task(self, task: Task) -> bool:
+        """Hand an admitted task to a run worker; False if it did not start.
 
-    def _actually_start_task(self, task: Task) -> None:
+        A task that can never start is marked failed; one that only missed a
+        run worker is left ``queued`` for the caller to re-queue.
+        """
         config = getattr(task, "_runner_config", None)
         prompt = getattr(task, "_runner_prompt", None)
         agent_selection = getattr(task, "_agent_selection", None)
         if config is None or prompt is None:
-            return
+            task.status = "failed"
+            task.error = "launch configuration missing; start the task again"
+            task.exit_code = 1
+            task.finished_at = datetime.now(tz=timezone.utc)
+            task.finalization_state = "done"
+            self._on_task_log(
+                task.task_id, format_log("queue", "start", "ERROR", task.error)
+            )
+            self._dashboard.upsert_task(task)
+            self._schedule_save()
+            return False
 
-        task.status = "pulling"
         env = self._environments.get(task.environment_id)
+        if env is not None and env.cpuset_partitioning:
+            cpuset = self._cpusets.allocate(task.task_id, config.resources.cpus)
+            config = replace(
+                config, resources=replace(config.resources, cpuset_cpus=cpuset)
+            )
+            task._runner_config = config
+
+        task.status = "pulling"
+        self._sync_task_schedule(task)
         stain = env.color if env else None
         spinner = _stain_color(env.color) if env else None
         self._dashboard.upsert_task(task, stain=stain, spinner_color=spinner)
 
-        # Clean up any existing bridge/thread for this task to prevent duplicate log emissions
+        # Clean up any existing bridge for this task to prevent duplicate log emissions
         old_bridge = self._bridges.pop(task.task_id, None)
-        old_thread = self._threads.pop(task.task_id, None)
         if old_bridge is not None:
             try:
                 # Disconnect all signal connections to prevent duplicate log emissions
@@ -765,22 +616,10 @@ class _MainWindowTasksAgentMixin:
             except Exception:
                 pass
             try:
-                # Request the bridge to stop
+                # Request the bridge to stop; it is deleted once its run returns
                 old_bridge.request_stop()
             except Exception:
                 pass
-            try:
-                # Schedule deletion on next event loop iteration
-                old_bridge.deleteLater()
-            except Exception:
-                pass
-        if old_thread is not None:
-            try:
-                # Request thread to quit and wait for it to finish
-                old_thread.quit()
-                old_thread.wait(100)  # Wait up to 100ms for graceful shutdown
-            except Exception:
-                pass
 
         bridge = TaskRunnerBridge(
             task_id=task.task_id,
@@ -788,11 +627,8 @@ class _MainWindowTasksAgentMixin:
             prompt=prompt,
             agent_selection=agent_selection,
             watch_states=self._watch_states,
+            cooldowns=self._cooldowns,
         )
-        thread = QThread(self)
-        bridge.moveToThread(thread)
-        thread.started.connect(bridge.run)
-
         bridge.state.connect(self._on_bridge_state, Qt.QueuedConnection)
         bridge.log.connect(self._on_bridge_log, Qt.QueuedConnection)
         bridge.done.connect(self._on_bridge_done, Qt.QueuedConnection)
@@ -801,13 +637,26 @@ class _MainWindowTasksAgentMixin:
             self._on_bridge_agent_switched, Qt.QueuedConnection
         )
 
-        bridge.done.connect(thread.quit, Qt.QueuedConnection)
-        bridge.done.connect(bridge.deleteLater, Qt.QueuedConnection)
-        thread.finished.connect(thread.deleteLater)
-
+        # The bridge stays on the UI thread; its signals are queued back to it
+        # from the run worker. Delete it only once run() has returned.
+        def _on_run_finished(_future: object) -> None:
+            bridge.deleteLater()
+            self.run_worker_freed.emit()
+
+        try:
+            future = self._executor.submit(POOL_RUN, bridge.run)
+        except RuntimeError as exc:
+            # Saturated or shut down: back to the queue instead of stuck.
+            bridge.deleteLater()
+            task.status = "queued"
+            self._dashboard.upsert_task(task, stain=stain, spinner_color=spinner)
+            self._on_task_log(
+                task.task_id,
+                format_log("queue", "start", "WARN", f"could not start yet: {exc}"),
+            )
+            return False
         self._bridges[task.task_id] = bridge
-        self._threads[task.task_id] = thread
         self._run_started_s[task.task_id] = time.time()
-
-        thread.start()
+        future.add_done_callback(_on_run_finished)
         self._schedule_save()
+        return True
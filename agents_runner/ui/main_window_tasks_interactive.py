@@ -24,6 +24,7 @@ from agents_runner.agent_cli import additional_config_mounts
 from agents_runner.agent_cli import container_config_dir
 from agents_runner.environments import WORKSPACE_CLONED
 from agents_runner.environments import save_environment
+from agents_runner.gh.repo_clone import clone_options_for_environment
 from agents_runner.gh_management import is_gh_available
 from agents_runner.log_format import format_log
 from agents_runner.prompt_sanitizer import sanitize_prompt
@@ -283,6 +284,7 @@ class _MainWindowTasksInteractiveMixin:
             agent_cli_args=" ".join(agent_cli_args),
         )
         self._tasks[task_id] = task
+        self._sync_task_schedule(task)
         stain = env.color if env else None
         spinner = _stain_color(env.color) if env else None
         self._dashboard.upsert_task(task, stain=stain, spinner_color=spinner)
@@ -314,6 +316,7 @@ class _MainWindowTasksInteractiveMixin:
             apply_full_prompting=apply_full_prompting,
             desktop_enabled=desktop_enabled,
             prep_id=prep_id,
+            clone_options=clone_options_for_environment(env),
         )
         prep_thread = QThread(self)
         prep_worker.moveToThread(prep_thread)
@@ -465,6 +468,7 @@ class _MainWindowTasksInteractiveMixin:
         if status_text:
             task.status = status_text
             task.error = None
+            self._sync_task_schedule(task)
         self._refresh_interactive_prep_task_card(task)
 
     def _on_interactive_prep_log(self, task_id: str, line: str) -> None:
@@ -485,6 +489,7 @@ class _MainWindowTasksInteractiveMixin:
             self._clear_interactive_prep_refs(task_id)
             return
         task.status = "failed"
+        self._sync_task_schedule(task)
         task.error = str(error_message or "").strip() or "Interactive prep failed"
         task.exit_code = 1
         task.finished_at = datetime.now(tz=timezone.utc)
@@ -23,7 +23,7 @@ from agents_runner.docker_platform import ROSETTA_INSTALL_COMMAND
 from agents_runner.docker_platform import docker_platform_args_for_pixelarch
 from agents_runner.docker_platform import has_rosetta
 from agents_runner.environments import Environment
-from agents_runner.github_token import resolve_github_token
+from agents_runner.github_token import cached_github_token
 from agents_runner.log_format import format_log
 from agents_runner.terminal_apps import launch_in_terminal
 from agents_runner.core.shell_templates import git_identity_clause
@@ -150,7 +150,7 @@ def launch_docker_terminal_task(
             or (env and getattr(env, "gh_context_enabled", False))
         )
         if forward_gh_token:
-            gh_token = resolve_github_token()
+            gh_token = cached_github_token()
             if gh_token:
                 env_args.extend(
                     ["-e", f"GH_TOKEN={gh_token}", "-e", f"GITHUB_TOKEN={gh_token}"]
@@ -308,6 +308,7 @@ def launch_docker_terminal_task(
 
         # Update task status to running
         task.status = "running"
+        main_window._sync_task_schedule(task)
         task.started_at = datetime.now(tz=timezone.utc)
         main_window._dashboard.upsert_task(task, stain=stain, spinner_color=spinner)
         main_window._details.update_task(task)
@@ -702,6 +703,7 @@ def _handle_launch_error(
     """
     _cleanup_temp_files(tmp_paths)
     task.status = "failed"
+    main_window._sync_task_schedule(task)
     task.error = error_message
     task.exit_code = 1
     task.finished_at = datetime.now(tz=timezone.utc)
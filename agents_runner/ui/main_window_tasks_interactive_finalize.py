@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import os
-import threading
 import time
 
 from datetime import datetime
@@ -10,15 +9,11 @@ from datetime import timezone
 from PySide6.QtWidgets import QApplication
 from PySide6.QtWidgets import QMessageBox
 
-from agents_runner.agent_display import format_agent_markdown_link
-from agents_runner.agent_display import get_agent_display_name
 from agents_runner.environments import WORKSPACE_CLONED
 from agents_runner.environments.cleanup import cleanup_task_workspace
-from agents_runner.gh_management import commit_push_and_pr
-from agents_runner.gh_management import GhManagementError
+from agents_runner.execution.executor import POOL_GIT
+from agents_runner.gh.pr_finalize import create_task_pull_request
 from agents_runner.log_format import format_log
-from agents_runner.pr_metadata import load_pr_metadata
-from agents_runner.pr_metadata import normalize_pr_title
 from agents_runner.ui.task_git_metadata import derive_task_git_metadata
 from agents_runner.ui.utils import _stain_color
 
@@ -51,6 +46,7 @@ class _MainWindowTasksInteractiveFinalizeMixin:
             task.exit_code = 1
         task.finished_at = datetime.now(tz=timezone.utc)
         task.status = "done" if (task.exit_code or 0) == 0 else "failed"
+        self._sync_task_schedule(task)
         task.git = derive_task_git_metadata(task)
 
         # Validate git metadata for cloned repo tasks
@@ -105,22 +101,27 @@ class _MainWindowTasksInteractiveFinalizeMixin:
                         f"Task {task_id}: creating PR after interactive run (branch={task.gh_branch}, base={base_display})",
                     ),
                 )
-                threading.Thread(
-                    target=self._finalize_gh_management_worker,
-                    args=(
+                future = self._executor.try_submit(
+                    POOL_GIT,
+                    self._finalize_gh_management_worker,
+                    task_id,
+                    str(task.gh_repo_root or "").strip(),
+                    str(task.gh_branch or "").strip(),
+                    str(base).strip(),
+                    str(task.prompt or ""),
+                    str(task.task_id or task_id),
+                    bool(task.gh_use_host_cli),
+                    (str(task.gh_pr_metadata_path or "").strip() or None),
+                    str(task.agent_cli or "").strip(),
+                    str(task.agent_cli_args or "").strip(),
+                )
+                if future is None:
+                    self.host_log.emit(
                         task_id,
-                        str(task.gh_repo_root or "").strip(),
-                        str(task.gh_branch or "").strip(),
-                        str(base).strip(),
-                        str(task.prompt or ""),
-                        str(task.task_id or task_id),
-                        bool(task.gh_use_host_cli),
-                        (str(task.gh_pr_metadata_path or "").strip() or None),
-                        str(task.agent_cli or "").strip(),
-                        str(task.agent_cli_args or "").strip(),
-                    ),
-                    daemon=True,
-                ).start()
+                        format_log(
+                            "gh", "pr", "ERROR", "PR request dropped: git queue is full"
+                        ),
+                    )
             else:
                 self.host_log.emit(
                     task_id,
@@ -172,169 +173,26 @@ class _MainWindowTasksInteractiveFinalizeMixin:
             env_id = str(task.environment_id or "").strip()
 
         try:
-            # Step 1: Pre-flight validation
-            self.host_log.emit(
-                task_id,
-                format_log("gh", "pr", "INFO", "[1/6] Validating repository..."),
-            )
-
-            from agents_runner.gh.pr_validation import check_existing_pr
-            from agents_runner.gh.pr_validation import validate_pr_prerequisites
-
-            checks = validate_pr_prerequisites(
+            pr_url = create_task_pull_request(
+                task_id=task_id,
                 repo_root=repo_root,
                 branch=branch,
+                base_branch=base_branch,
+                prompt_text=prompt_text,
+                task_token=task_token,
                 use_gh=use_gh,
+                on_log=lambda line: self.host_log.emit(task_id, line),
+                pr_metadata_path=pr_metadata_path,
+                agent_cli=agent_cli,
+                agent_cli_args=agent_cli_args,
+                is_override=is_override,
             )
-
-            # Check for failures
-            failed_checks = [(name, msg) for name, passed, msg in checks if not passed]
-            if failed_checks:
-                for name, msg in failed_checks:
-                    self.host_log.emit(
-                        task_id,
-                        format_log(
-                            "gh", "pr", "ERROR", f"validation failed: {name}: {msg}"
-                        ),
-                    )
-                return
-
-            # Check for existing PR (informational)
-            existing_pr = check_existing_pr(repo_root, branch)
-            if existing_pr:
-                self.host_log.emit(
-                    task_id,
-                    format_log(
-                        "gh",
-                        "pr",
-                        "INFO",
-                        f"[2/6] Pull request already exists: {existing_pr}",
-                    ),
-                )
-                self.host_pr_url.emit(task_id, existing_pr)
+            if pr_url:
+                self.host_pr_url.emit(task_id, pr_url)
+                # Update task PR URL
                 if task:
-                    task.gh_pr_url = existing_pr
+                    task.gh_pr_url = pr_url
                     self._schedule_save()
-                return
-
-            self.host_log.emit(
-                task_id,
-                format_log(
-                    "gh", "pr", "INFO", "[2/6] No existing PR found, proceeding..."
-                ),
-            )
-
-            self.host_log.emit(
-                task_id,
-                format_log("gh", "pr", "INFO", "[3/6] Preparing PR metadata..."),
-            )
-
-            prompt_line = (
-                (prompt_text or "").strip().splitlines()[0] if prompt_text else ""
-            )
-            default_title = f"Agent Runner: {prompt_line or task_id}"
-            default_title = normalize_pr_title(default_title, fallback=default_title)
-
-            agent_display = get_agent_display_name(agent_cli) if agent_cli else "Agent"
-            agent_link = (
-                format_agent_markdown_link(agent_cli) if agent_cli else agent_display
-            )
-            runners_link = (
-                "[Agents Runner](https://github.com/Midori-AI-OSS/Agents-Runner)"
-            )
-
-            default_body = (
-                f"Automated by {runners_link}.\n\n"
-                f"Agent: {agent_link}\n\n"
-                f"Task: {task_token}\n\n"
-                "Prompt:\n"
-                f"{(prompt_text or '').strip()}\n"
-            )
-            metadata = (
-                load_pr_metadata(pr_metadata_path or "") if pr_metadata_path else None
-            )
-            if metadata is not None and (metadata.title or metadata.body):
-                self.host_log.emit(
-                    task_id,
-                    format_log(
-                        "gh", "pr", "INFO", f"using PR metadata from {pr_metadata_path}"
-                    ),
-                )
-            title = (
-                normalize_pr_title(str(metadata.title or ""), fallback=default_title)
-                if metadata is not None
-                else default_title
-            )
-            body = str(metadata.body or "").strip() if metadata is not None else ""
-            if not body:
-                body = default_body
-
-            # Add override note for non-cloned-repo modes
-            if is_override:
-                body += "\n\n---\n**Note:** This is an override PR created manually for a cloned repo environment."
-
-            self.host_log.emit(
-                task_id,
-                format_log(
-                    "gh",
-                    "pr",
-                    "INFO",
-                    f"[4/6] Creating PR from {branch} -> {base_branch or 'auto'}",
-                ),
-            )
-            try:
-                pr_url = commit_push_and_pr(
-                    repo_root,
-                    branch=branch,
-                    base_branch=base_branch,
-                    title=title,
-                    body=body,
-                    use_gh=bool(use_gh),
-                    agent_cli=agent_cli,
-                    agent_cli_args=agent_cli_args,
-                )
-            except GhManagementError as exc:
-                self.host_log.emit(
-                    task_id, format_log("gh", "pr", "ERROR", f"failed: {exc}")
-                )
-                return
-            except Exception as exc:
-                self.host_log.emit(
-                    task_id, format_log("gh", "pr", "ERROR", f"failed: {exc}")
-                )
-                return
-
-            if pr_url is None:
-                self.host_log.emit(
-                    task_id,
-                    format_log(
-                        "gh", "pr", "INFO", "[5/6] No changes to commit; skipping PR"
-                    ),
-                )
-                return
-            if pr_url == "":
-                self.host_log.emit(
-                    task_id,
-                    format_log(
-                        "gh",
-                        "pr",
-                        "INFO",
-                        "[5/6] Branch pushed; PR creation skipped (gh disabled or missing)",
-                    ),
-                )
-                return
-            self.host_log.emit(
-                task_id,
-                format_log(
-                    "gh", "pr", "INFO", f"[6/6] PR created successfully: {pr_url}"
-                ),
-            )
-            self.host_pr_url.emit(task_id, pr_url)
-
-            # Update task PR URL
-            if task:
-                task.gh_pr_url = pr_url
-                self._schedule_save()
         finally:
             # Clean up task-specific repo after PR creation (or failure)
             # This ensures each task gets a fresh clone and prevents git conflicts
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
-from agents_runner.ui.pages.dashboard import DashboardPage
-from agents_runner.ui.pages.environments import EnvironmentsPage
-from agents_runner.ui.pages.new_task import NewTaskPage
-from agents_runner.ui.pages.settings import SettingsPage
-from agents_runner.ui.pages.task_details import TaskDetailsPage
+import importlib
+from typing import TYPE_CHECKING
+from typing import Any
+
+if TYPE_CHECKING:
+    from agents_runner.ui.pages.dashboard import DashboardPage
+    from agents_runner.ui.pages.environments import EnvironmentsPage
+    from agents_runner.ui.pages.new_task import NewTaskPage
+    from agents_runner.ui.pages.settings import SettingsPage
+    from agents_runner.ui.pages.task_details import TaskDetailsPage
 
 __all__ = [
     "DashboardPage",
@@ -13,3 +18,20 @@ __all__ = [
     "EnvironmentsPage",
     "SettingsPage",
 ]
+
+# Pages are imported on first access so hidden pages (settings, environments)
+# stay off the startup import path until they are opened.
+_PAGE_MODULES = {
+    "DashboardPage": "agents_runner.ui.pages.dashboard",
+    "EnvironmentsPage": "agents_runner.ui.pages.environments",
+    "NewTaskPage": "agents_runner.ui.pages.new_task",
+    "SettingsPage": "agents_runner.ui.pages.settings",
+    "TaskDetailsPage": "agents_runner.ui.pages.task_details",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _PAGE_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module_name), name)
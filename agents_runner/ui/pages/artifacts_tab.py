@@ -24,6 +24,7 @@ from agents_runner.artifacts import (
     ArtifactMeta,
     list_staging_artifacts,
     get_staging_dir,
+    StagingArtifactDiff,
     StagingArtifactMeta,
 )
 from agents_runner.ui.artifacts.file_watcher import ArtifactFileWatcher
@@ -72,9 +73,6 @@ class ArtifactsTab(QWidget):
         self._temp_files: list[Path] = []
         self._mode: str = "encrypted"  # "staging" or "encrypted"
         self._file_watcher: ArtifactFileWatcher | None = None
-        self._refresh_timer = QTimer(self)
-        self._refresh_timer.setSingleShot(True)
-        self._refresh_timer.timeout.connect(self._refresh_file_list)
         self._preview_loader: PreviewLoader | None = None
 
         layout = QVBoxLayout(self)
@@ -289,7 +287,7 @@ class ArtifactsTab(QWidget):
             # This prevents QTimer cross-thread warnings when filesystem callbacks arrive
             # after the watcher has been stopped and its reference cleared (Issue #141).
             try:
-                watcher.files_changed.disconnect(self._on_files_changed)
+                watcher.artifacts_changed.disconnect(self._on_artifacts_changed)
             except RuntimeError:
                 # Signal may already be disconnected or never connected
                 pass
@@ -315,7 +313,7 @@ class ArtifactsTab(QWidget):
                 f"create task_id={self._current_task.task_id} staging_dir={staging_dir}"
             )
             self._file_watcher = ArtifactFileWatcher(staging_dir, parent=self)
-            self._file_watcher.files_changed.connect(self._on_files_changed)
+            self._file_watcher.artifacts_changed.connect(self._on_artifacts_changed)
             self._file_watcher.start()
             _emit_watcher_lifecycle_debug(
                 "[watcher-lifecycle] "
@@ -344,10 +342,97 @@ class ArtifactsTab(QWidget):
             self._artifacts = []
         self._update_artifact_list()
 
-    def _on_files_changed(self) -> None:
-        """Handle file watcher notification (debounced)."""
-        # Debounce: Wait 500ms before refreshing
-        self._refresh_timer.start(500)
+    def _on_artifacts_changed(self, diff: StagingArtifactDiff) -> None:
+        """Apply a debounced staging delta from the file watcher."""
+        if self._mode != "staging" or not self._current_task:
+            return
+
+        had_items = bool(self._artifacts)
+        self._apply_staging_diff(diff)
+        if not self._artifacts or not had_items:
+            # Empty-state transitions are rare; rebuild to reset the panels.
+            self._update_artifact_list()
+
+    def _apply_staging_diff(self, diff: StagingArtifactDiff) -> None:
+        """Patch the list widget in place instead of rebuilding it."""
+        selected_row = self._artifact_list.currentRow()
+        selected_name = ""
+        if 0 <= selected_row < len(self._artifacts):
+            selected = self._artifacts[selected_row]
+            if isinstance(selected, StagingArtifactMeta):
+                selected_name = selected.filename
+
+        rows = {
+            artifact.filename: row
+            for row, artifact in enumerate(self._artifacts)
+            if isinstance(artifact, StagingArtifactMeta)
+        }
+        refresh_preview = False
+
+        self._artifact_list.blockSignals(True)
+        try:
+            for name in diff.removed:
+                row = rows.get(name)
+                if row is None:
+                    continue
+                self._artifacts.pop(row)
+                self._artifact_list.takeItem(row)
+                rows = {
+                    artifact.filename: idx
+                    for idx, artifact in enumerate(self._artifacts)
+                    if isinstance(artifact, StagingArtifactMeta)
+                }
+                if name == selected_name:
+                    selected_name = ""
+                    refresh_preview = True
+
+            # A modified file's mtime moved, so it is taken out and placed
+            # again like an added one. An "added" file that is already listed
+            # raced the initial listing.
+            changed = [*diff.modified, *diff.added]
+            stale_rows = sorted(
+                {rows[a.filename] for a in changed if a.filename in rows},
+                reverse=True,
+            )
+            for row in stale_rows:
+                self._artifacts.pop(row)
+                self._artifact_list.takeItem(row)
+            for artifact in changed:
+                if artifact.filename == selected_name:
+                    refresh_preview = True
+                # The list is newest first.
+                row = next(
+                    (
+                        idx
+                        for idx, other in enumerate(self._artifacts)
+                        if isinstance(other, StagingArtifactMeta)
+                        and other.modified_at < artifact.modified_at
+                    ),
+                    len(self._artifacts),
+                )
+                self._artifacts.insert(row, artifact)
+                item = QListWidgetItem()
+                self._artifact_list.insertItem(row, item)
+                self._set_item_widget(item, artifact)
+
+            new_row = 0
+            for row, artifact in enumerate(self._artifacts):
+                if (
+                    isinstance(artifact, StagingArtifactMeta)
+                    and artifact.filename == selected_name
+                ):
+                    new_row = row
+                    break
+            else:
+                refresh_preview = True
+            if self._artifacts:
+                self._artifact_list.setCurrentRow(new_row)
+        finally:
+            self._artifact_list.blockSignals(False)
+
+        self._artifact_count.setText(f"({len(self._artifacts)})")
+        if refresh_preview and self._artifacts:
+            self._on_selection_changed(self._artifact_list.currentRow())
 
     def _refresh_file_list(self) -> None:
         """Refresh artifact list from current mode."""
@@ -387,38 +472,44 @@ class ArtifactsTab(QWidget):
 
         for artifact in self._artifacts:
             item = QListWidgetItem()
-            item.setData(Qt.UserRole, artifact)
+            self._artifact_list.addItem(item)
+            self._set_item_widget(item, artifact)
 
-            widget = QWidget()
-            layout = QVBoxLayout(widget)
-            layout.setContentsMargins(8, 6, 8, 6)
-            layout.setSpacing(2)
+        if self._artifacts:
+            self._artifact_list.setCurrentRow(0)
 
-            if isinstance(artifact, StagingArtifactMeta):
-                # Staging artifact - green color
-                name = QLabel(artifact.filename)
-                name.setStyleSheet("font-weight: 600; color: rgba(100, 255, 100, 235);")
+    def _set_item_widget(
+        self, item: QListWidgetItem, artifact: ArtifactMeta | StagingArtifactMeta
+    ) -> None:
+        """Render (or re-render) one artifact row."""
+        item.setData(Qt.UserRole, artifact)
 
-                info_text = f"{format_size(artifact.size_bytes)} • {format_timestamp(artifact.modified_at.isoformat())}"
-            else:
-                # Encrypted artifact - normal color
-                name = QLabel(artifact.original_filename)
-                name.setStyleSheet("font-weight: 600; color: rgba(237, 239, 245, 235);")
+        widget = QWidget()
+        layout = QVBoxLayout(widget)
+        layout.setContentsMargins(8, 6, 8, 6)
+        layout.setSpacing(2)
 
-                info_text = f"{format_size(artifact.size_bytes)} • {format_timestamp(artifact.encrypted_at)}"
+        if isinstance(artifact, StagingArtifactMeta):
+            # Staging artifact - green color
+            name = QLabel(artifact.filename)
+            name.setStyleSheet("font-weight: 600; color: rgba(100, 255, 100, 235);")
 
-            info = QLabel(info_text)
-            info.setStyleSheet("font-size: 11px; color: rgba(237, 239, 245, 140);")
+            info_text = f"{format_size(artifact.size_bytes)} • {format_timestamp(artifact.modified_at.isoformat())}"
+        else:
+            # Encrypted artifact - normal color
+            name = QLabel(artifact.original_filename)
+            name.setStyleSheet("font-weight: 600; color: rgba(237, 239, 245, 235);")
 
-            layout.addWidget(name)
-            layout.addWidget(info)
+            info_text = f"{format_size(artifact.size_bytes)} • {format_timestamp(artifact.encrypted_at)}"
 
-            item.setSizeHint(widget.sizeHint())
-            self._artifact_list.addItem(item)
-            self._artifact_list.setItemWidget(item, widget)
+        info = QLabel(info_text)
+        info.setStyleSheet("font-size: 11px; color: rgba(237, 239, 245, 140);")
 
-        if self._artifacts:
-            self._artifact_list.setCurrentRow(0)
+        layout.addWidget(name)
+        layout.addWidget(info)
+
+        item.setSizeHint(widget.sizeHint())
+        self._artifact_list.setItemWidget(item, widget)
 
     def _on_selection_changed(self, current_row: int) -> None:
         if current_row < 0 or current_row >= len(self._artifacts):
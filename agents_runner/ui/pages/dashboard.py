@@ -227,6 +227,13 @@ class DashboardPage(QWidget):
         )
         self._past_loading_indicator.hide()
 
+        self._startup_indicator = QLabel()
+        self._startup_indicator.setStyleSheet(
+            "color: rgba(237, 239, 245, 150); font-size: 11px; padding: 8px;"
+        )
+        self._startup_indicator.hide()
+        active_layout.addWidget(self._startup_indicator, 0, Qt.AlignCenter)
+
         past_layout.addWidget(self._scroll_past, 1)
         past_layout.addWidget(self._past_loading_indicator, 0, Qt.AlignCenter)
 
@@ -414,6 +421,12 @@ class DashboardPage(QWidget):
             self._set_selected_task_id(row.task_id)
             self.task_selected.emit(row.task_id)
 
+    def set_startup_status(self, text: str) -> None:
+        """Show a startup progress note under the active list; empty hides it."""
+        text = str(text or "").strip()
+        self._startup_indicator.setText(text)
+        self._startup_indicator.setVisible(bool(text))
+
     def remove_tasks(self, task_ids: set[str]) -> None:
         for rows in (self._rows_active, self._rows_past):
             for task_id in task_ids:
@@ -252,6 +252,8 @@ class EnvironmentsPage(
             if not env:
                 self._name.setText("")
                 self._max_agents_running.setText("-1")
+                self._resource_profile.setCurrentText("unlimited")
+                self._cpuset_partitioning.setChecked(False)
                 self._headless_desktop_enabled.setChecked(False)
                 self._cache_desktop_build.setChecked(False)
                 self._cache_desktop_build.setEnabled(False)
@@ -261,6 +263,14 @@ class EnvironmentsPage(
                 self._gh_context_enabled.setEnabled(False)
                 self._gh_context_label.setVisible(False)
                 self._gh_context_row.setVisible(False)
+                self._clone_partial.setChecked(False)
+                self._clone_depth.setText("")
+                self._clone_sparse_paths.setText("")
+                self._clone_label.setVisible(False)
+                self._clone_row.setVisible(False)
+                self._mounted_snapshots.setChecked(False)
+                self._isolation_label.setVisible(False)
+                self._mounted_snapshots.setVisible(False)
                 self._workspace_type_combo.setCurrentIndex(0)
                 self._workspace_target.setText("")
                 self._gh_use_host_cli.setChecked(bool(is_gh_available()))
@@ -289,6 +299,12 @@ class EnvironmentsPage(
             self._max_agents_running.setText(
                 str(int(getattr(env, "max_agents_running", -1)))
             )
+            self._resource_profile.setCurrentText(
+                str(getattr(env, "resource_profile", "") or "unlimited")
+            )
+            self._cpuset_partitioning.setChecked(
+                bool(getattr(env, "cpuset_partitioning", False))
+            )
             self._headless_desktop_enabled.setChecked(
                 bool(getattr(env, "headless_desktop_enabled", False))
             )
@@ -324,6 +340,21 @@ class EnvironmentsPage(
             self._gh_context_label.setVisible(context_available)
             self._gh_context_row.setVisible(context_available)
 
+            clone_depth = int(getattr(env, "clone_depth", 0) or 0)
+            self._clone_partial.setChecked(bool(getattr(env, "clone_partial", False)))
+            self._clone_depth.setText(str(clone_depth) if clone_depth > 0 else "")
+            self._clone_sparse_paths.setText(
+                ", ".join(getattr(env, "clone_sparse_paths", []) or [])
+            )
+            self._clone_label.setVisible(is_github_env)
+            self._clone_row.setVisible(is_github_env)
+
+            self._mounted_snapshots.setChecked(
+                bool(getattr(env, "mounted_snapshots", False))
+            )
+            self._isolation_label.setVisible(is_local_env)
+            self._mounted_snapshots.setVisible(is_local_env)
+
             idx = self._workspace_type_combo.findData(workspace_type)
             if idx >= 0:
                 self._workspace_type_combo.setCurrentIndex(idx)
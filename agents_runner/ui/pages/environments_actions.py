@@ -14,6 +14,7 @@ from agents_runner.environments import load_environments
 from agents_runner.environments import parse_env_vars_text
 from agents_runner.environments import parse_mounts_text
 from agents_runner.environments import save_environment
+from agents_runner.gh.repo_clone import parse_sparse_paths
 from agents_runner.gh_management import is_gh_available
 from agents_runner.ui.dialogs.new_environment_wizard import NewEnvironmentWizard
 
@@ -124,6 +125,9 @@ class _EnvironmentsPageActionsMixin:
             max_agents_running = int(max_agents_text)
         except ValueError:
             max_agents_running = -1
+        resource_profile = (
+            str(self._resource_profile.currentText() or "").strip() or "unlimited"
+        )
 
         # Get workspace type and target from existing environment
         workspace_type = (
@@ -152,6 +156,10 @@ class _EnvironmentsPageActionsMixin:
         else:
             gh_context_enabled = False
 
+        clone_partial, clone_depth, clone_sparse_paths = (
+            self._clone_settings_from_form()
+        )
+
         env_vars, errors = parse_env_vars_text(self._env_vars.toPlainText() or "")
         if errors:
             if show_validation_errors:
@@ -202,6 +210,8 @@ class _EnvironmentsPageActionsMixin:
                 color=str(self._color.currentData() or "slate"),
                 host_workdir="",
                 max_agents_running=max_agents_running,
+                resource_profile=resource_profile,
+                cpuset_partitioning=bool(self._cpuset_partitioning.isChecked()),
                 headless_desktop_enabled=bool(
                     self._headless_desktop_enabled.isChecked()
                 ),
@@ -222,6 +232,10 @@ class _EnvironmentsPageActionsMixin:
                 workspace_target=workspace_target,
                 gh_use_host_cli=gh_use_host_cli,
                 gh_context_enabled=gh_context_enabled,
+                clone_partial=clone_partial,
+                clone_depth=clone_depth,
+                clone_sparse_paths=clone_sparse_paths,
+                mounted_snapshots=bool(self._mounted_snapshots.isChecked()),
                 prompts=prompts,
                 prompts_unlocked=prompts_unlocked,
                 agent_selection=agent_selection,
@@ -234,6 +248,8 @@ class _EnvironmentsPageActionsMixin:
                 name=name,
                 color=str(self._color.currentData() or "slate"),
                 max_agents_running=max_agents_running,
+                resource_profile=resource_profile,
+                cpuset_partitioning=bool(self._cpuset_partitioning.isChecked()),
                 headless_desktop_enabled=bool(
                     self._headless_desktop_enabled.isChecked()
                 ),
@@ -254,6 +270,10 @@ class _EnvironmentsPageActionsMixin:
                 workspace_target=workspace_target,
                 gh_use_host_cli=gh_use_host_cli,
                 gh_context_enabled=gh_context_enabled,
+                clone_partial=clone_partial,
+                clone_depth=clone_depth,
+                clone_sparse_paths=clone_sparse_paths,
+                mounted_snapshots=bool(self._mounted_snapshots.isChecked()),
                 prompts=prompts,
                 prompts_unlocked=prompts_unlocked,
                 agent_selection=agent_selection,
@@ -264,6 +284,16 @@ class _EnvironmentsPageActionsMixin:
         self.updated.emit(preferred_env_id if preferred_env_id is not None else env_id)
         return True
 
+    def _clone_settings_from_form(self) -> tuple[bool, int, list[str]]:
+        try:
+            clone_depth = max(0, int(str(self._clone_depth.text() or "0").strip()))
+        except ValueError:
+            clone_depth = 0
+        clone_sparse_paths = list(
+            parse_sparse_paths(str(self._clone_sparse_paths.text() or ""))
+        )
+        return bool(self._clone_partial.isChecked()), clone_depth, clone_sparse_paths
+
     def selected_environment_id(self) -> str:
         return str(self._env_select.currentData() or "")
 
@@ -278,6 +308,9 @@ class _EnvironmentsPageActionsMixin:
             max_agents_running = int(max_agents_text)
         except ValueError:
             max_agents_running = -1
+        resource_profile = (
+            str(self._resource_profile.currentText() or "").strip() or "unlimited"
+        )
 
         # Get workspace type and target from existing environment
         workspace_type = (
@@ -306,6 +339,10 @@ class _EnvironmentsPageActionsMixin:
         else:
             gh_context_enabled = False
 
+        clone_partial, clone_depth, clone_sparse_paths = (
+            self._clone_settings_from_form()
+        )
+
         env_vars, errors = parse_env_vars_text(self._env_vars.toPlainText() or "")
         if errors:
             QMessageBox.warning(
@@ -355,6 +392,8 @@ class _EnvironmentsPageActionsMixin:
                 color=str(self._color.currentData() or "slate"),
                 host_workdir="",
                 max_agents_running=max_agents_running,
+                resource_profile=resource_profile,
+                cpuset_partitioning=bool(self._cpuset_partitioning.isChecked()),
                 headless_desktop_enabled=bool(
                     self._headless_desktop_enabled.isChecked()
                 ),
@@ -375,6 +414,10 @@ class _EnvironmentsPageActionsMixin:
                 workspace_target=workspace_target,
                 gh_use_host_cli=gh_use_host_cli,
                 gh_context_enabled=gh_context_enabled,
+                clone_partial=clone_partial,
+                clone_depth=clone_depth,
+                clone_sparse_paths=clone_sparse_paths,
+                mounted_snapshots=bool(self._mounted_snapshots.isChecked()),
                 prompts=prompts,
                 prompts_unlocked=prompts_unlocked,
                 agent_selection=agent_selection,
@@ -387,6 +430,8 @@ class _EnvironmentsPageActionsMixin:
             name=name,
             color=str(self._color.currentData() or "slate"),
             max_agents_running=max_agents_running,
+            resource_profile=resource_profile,
+            cpuset_partitioning=bool(self._cpuset_partitioning.isChecked()),
             headless_desktop_enabled=bool(self._headless_desktop_enabled.isChecked()),
             cache_desktop_build=bool(self._cache_desktop_build.isChecked()),
             container_caching_enabled=bool(self._container_caching_enabled.isChecked()),
@@ -403,6 +448,10 @@ class _EnvironmentsPageActionsMixin:
             workspace_target=workspace_target,
             gh_use_host_cli=gh_use_host_cli,
             gh_context_enabled=gh_context_enabled,
+            clone_partial=clone_partial,
+            clone_depth=clone_depth,
+            clone_sparse_paths=clone_sparse_paths,
+            mounted_snapshots=bool(self._mounted_snapshots.isChecked()),
             prompts=prompts,
             prompts_unlocked=prompts_unlocked,
             agent_selection=agent_selection,
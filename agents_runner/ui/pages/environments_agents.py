@@ -150,6 +150,7 @@ class AgentsTabWidget(QWidget):
         self._selection_mode.addItem("Least used (active tasks)", "least-used")
         self._selection_mode.addItem("Fallback (show mapping)", "fallback")
         self._selection_mode.addItem("Pinned (use one agent)", "pinned")
+        self._selection_mode.addItem("Race (start several at once)", "race")
         self._selection_mode.setMaximumWidth(340)
         self._selection_mode.currentIndexChanged.connect(
             self._on_selection_mode_changed
@@ -164,6 +165,25 @@ class AgentsTabWidget(QWidget):
         self._pinned_agent.currentIndexChanged.connect(self._on_pinned_agent_changed)
         controls_row.addWidget(self._pinned_agent)
 
+        self._race_label = QLabel("Race")
+        controls_row.addWidget(self._race_label)
+
+        self._race_width = QComboBox()
+        for width in range(2, 6):
+            self._race_width.addItem(f"{width} agents", width)
+        self._race_width.currentIndexChanged.connect(self._on_race_options_changed)
+        controls_row.addWidget(self._race_width)
+
+        self._race_pick = QComboBox()
+        self._race_pick.addItem("First success wins", "first")
+        self._race_pick.addItem("Smallest diff wins", "smallest-diff")
+        self._race_pick.setToolTip(
+            "Smallest diff waits for every agent and keeps the successful run "
+            "with the fewest changed lines."
+        )
+        self._race_pick.currentIndexChanged.connect(self._on_race_options_changed)
+        controls_row.addWidget(self._race_pick)
+
         # Separator
         sep2 = QLabel("::")
         sep2.setStyleSheet(
@@ -183,6 +203,7 @@ class AgentsTabWidget(QWidget):
 
         self._refresh_fallback_visibility()
         self._refresh_pinned_visibility()
+        self._refresh_race_visibility()
         self._refresh_cross_agent_visibility()
         self._render_table()
 
@@ -218,9 +239,13 @@ class AgentsTabWidget(QWidget):
     def _on_selection_mode_changed(self, _index: int) -> None:
         self._refresh_fallback_visibility()
         self._refresh_pinned_visibility()
+        self._refresh_race_visibility()
         self._ensure_pinned_default()
         self.agents_changed.emit()
 
+    def _on_race_options_changed(self, _index: int) -> None:
+        self.agents_changed.emit()
+
     def _refresh_fallback_visibility(self) -> None:
         is_fallback_mode = (
             str(self._selection_mode.currentData() or "round-robin") == "fallback"
@@ -232,6 +257,12 @@ class AgentsTabWidget(QWidget):
         self._pinned_agent_label.setVisible(is_pinned_mode)
         self._pinned_agent.setVisible(is_pinned_mode)
 
+    def _refresh_race_visibility(self) -> None:
+        is_race_mode = str(self._selection_mode.currentData() or "") == "race"
+        self._race_label.setVisible(is_race_mode)
+        self._race_width.setVisible(is_race_mode)
+        self._race_pick.setVisible(is_race_mode)
+
     def _ensure_pinned_default(self) -> None:
         if str(self._selection_mode.currentData() or "") != "pinned":
             return
@@ -619,12 +650,16 @@ class AgentsTabWidget(QWidget):
 
     def set_agent_selection(self, agent_selection: AgentSelection | None) -> None:
         self._selection_mode.blockSignals(True)
+        self._race_width.blockSignals(True)
+        self._race_pick.blockSignals(True)
         try:
             if agent_selection is None:
                 self._rows = []
                 self._fallbacks = {}
                 self._pinned_agent_id = ""
                 self._selection_mode.setCurrentIndex(0)
+                self._race_width.setCurrentIndex(0)
+                self._race_pick.setCurrentIndex(0)
             else:
                 self._rows = [
                     AgentInstance(
@@ -644,12 +679,23 @@ class AgentsTabWidget(QWidget):
                     str(agent_selection.selection_mode or "round-robin")
                 )
                 self._selection_mode.setCurrentIndex(idx if idx >= 0 else 0)
+                idx = self._race_width.findData(
+                    int(getattr(agent_selection, "race_width", 2) or 2)
+                )
+                self._race_width.setCurrentIndex(idx if idx >= 0 else 0)
+                idx = self._race_pick.findData(
+                    str(getattr(agent_selection, "race_pick", "") or "first")
+                )
+                self._race_pick.setCurrentIndex(idx if idx >= 0 else 0)
         finally:
             self._selection_mode.blockSignals(False)
+            self._race_width.blockSignals(False)
+            self._race_pick.blockSignals(False)
 
         self._render_table()
         self._refresh_fallback_visibility()
         self._refresh_pinned_visibility()
+        self._refresh_race_visibility()
         self._refresh_priority_visibility()
         self._ensure_pinned_default()
 
@@ -692,6 +738,8 @@ class AgentsTabWidget(QWidget):
             selection_mode=mode,
             agent_fallbacks=cleaned_fallbacks,
             pinned_agent_id=pinned_id,
+            race_width=int(self._race_width.currentData() or 2),
+            race_pick=str(self._race_pick.currentData() or "first"),
         )
 
     def set_cross_agents_enabled(self, enabled: bool) -> None:
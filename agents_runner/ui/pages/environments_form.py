@@ -21,6 +21,7 @@ from PySide6.QtWidgets import QToolButton
 from PySide6.QtWidgets import QVBoxLayout
 from PySide6.QtWidgets import QWidget
 
+from agents_runner.docker.resources import RESOURCE_PROFILES
 from agents_runner.environments import ALLOWED_STAINS
 from agents_runner.environments import WORKSPACE_CLONED
 from agents_runner.environments import WORKSPACE_MOUNTED
@@ -109,6 +110,26 @@ class _EnvironmentsFormMixin:
         self._max_agents_running.setValidator(QIntValidator(-1, 10_000_000, self))
         self._max_agents_running.setMaximumWidth(150)
 
+        self._resource_profile = QComboBox()
+        self._resource_profile.setEditable(True)
+        for profile_name in RESOURCE_PROFILES:
+            self._resource_profile.addItem(profile_name)
+        self._resource_profile.setToolTip(
+            "CPU, memory and process limits for each agent container.\n"
+            + "\n".join(
+                f"{name}: {profile.describe()}"
+                for name, profile in RESOURCE_PROFILES.items()
+            )
+            + "\nOr type a custom spec, e.g. cpus=2, memory=4g, pids=512"
+        )
+        self._resource_profile.setMinimumWidth(220)
+
+        self._cpuset_partitioning = QCheckBox("Pin each task to its own CPUs")
+        self._cpuset_partitioning.setToolTip(
+            "Assigns each running task a separate CPU set (sized from the CPU limit) "
+            "so concurrent builds do not compete for the same cores."
+        )
+
         self._headless_desktop_enabled = QCheckBox("Enable headless desktop")
         self._headless_desktop_enabled.setToolTip(
             "When enabled, agent runs for this environment will start a noVNC desktop.\n"
@@ -155,6 +176,36 @@ class _EnvironmentsFormMixin:
         self._gh_context_enabled.setEnabled(False)
         self._gh_context_enabled.setVisible(True)
 
+        self._clone_partial = QCheckBox("Partial clone")
+        self._clone_partial.setToolTip(
+            "Clone with --filter=blob:none: file contents are downloaded on demand.\n"
+            "Much faster for large repositories; history and trees are still complete."
+        )
+        self._clone_depth = QLineEdit()
+        self._clone_depth.setPlaceholderText("full history")
+        self._clone_depth.setToolTip(
+            "Shallow clone depth in commits (empty or 0 for full history).\n"
+            "History is deepened automatically when branch comparisons need it."
+        )
+        self._clone_depth.setValidator(QIntValidator(0, 1_000_000, self))
+        self._clone_depth.setMaximumWidth(120)
+        self._clone_sparse_paths = QLineEdit()
+        self._clone_sparse_paths.setPlaceholderText(
+            "Sparse paths, e.g. services/api, docs"
+        )
+        self._clone_sparse_paths.setToolTip(
+            "Comma-separated paths to check out (sparse checkout).\n"
+            "Leave empty to check out the whole repository."
+        )
+
+        self._mounted_snapshots = QCheckBox("Copy-on-write snapshot per task")
+        self._mounted_snapshots.setToolTip(
+            "Each task works in its own copy-on-write view of the folder\n"
+            "(overlayfs, or a reflink copy) so tasks can run in parallel.\n"
+            "Changes are merged back when the task finishes; files that also\n"
+            "changed in the folder meanwhile are reported and left alone."
+        )
+
         # Workspace controls are retained for compatibility with existing logic but remain hidden.
         self._workspace_type_combo = QComboBox()
         self._workspace_type_combo.addItem("Use Settings workdir", WORKSPACE_NONE)
@@ -318,6 +369,14 @@ class _EnvironmentsFormMixin:
         max_agents_row_layout.addWidget(self._max_agents_running)
         max_agents_row_layout.addStretch(1)
 
+        resources_row = QWidget(general_page)
+        resources_layout = QHBoxLayout(resources_row)
+        resources_layout.setContentsMargins(0, 0, 0, 0)
+        resources_layout.setSpacing(BUTTON_ROW_SPACING)
+        resources_layout.addWidget(self._resource_profile)
+        resources_layout.addWidget(self._cpuset_partitioning)
+        resources_layout.addStretch(1)
+
         headless_desktop_row = QWidget(general_page)
         headless_desktop_layout = QHBoxLayout(headless_desktop_row)
         headless_desktop_layout.setContentsMargins(0, 0, 0, 0)
@@ -351,6 +410,23 @@ class _EnvironmentsFormMixin:
         self._gh_context_label.setVisible(False)
         self._gh_context_row.setVisible(False)
 
+        self._clone_label = QLabel("Clone")
+        self._clone_row = QWidget(general_page)
+        clone_layout = QHBoxLayout(self._clone_row)
+        clone_layout.setContentsMargins(0, 0, 0, 0)
+        clone_layout.setSpacing(BUTTON_ROW_SPACING)
+        clone_layout.addWidget(self._clone_partial)
+        clone_layout.addWidget(QLabel("Depth"))
+        clone_layout.addWidget(self._clone_depth)
+        clone_layout.addWidget(self._clone_sparse_paths, 1)
+
+        self._clone_label.setVisible(False)
+        self._clone_row.setVisible(False)
+
+        self._isolation_label = QLabel("Isolation")
+        self._isolation_label.setVisible(False)
+        self._mounted_snapshots.setVisible(False)
+
         grid.addWidget(QLabel("Name"), 0, 0)
         grid.addWidget(self._name, 0, 1, 1, 2)
         grid.addWidget(QLabel("Color"), 1, 0)
@@ -365,6 +441,12 @@ class _EnvironmentsFormMixin:
         grid.addWidget(container_caching_row, 6, 1, 1, 2)
         grid.addWidget(QLabel("Cross agents"), 7, 0)
         grid.addWidget(cross_agents_row, 7, 1, 1, 2)
+        grid.addWidget(QLabel("Resources"), 8, 0)
+        grid.addWidget(resources_row, 8, 1, 1, 2)
+        grid.addWidget(self._clone_label, 9, 0)
+        grid.addWidget(self._clone_row, 9, 1, 1, 2)
+        grid.addWidget(self._isolation_label, 10, 0)
+        grid.addWidget(self._mounted_snapshots, 10, 1, 1, 2)
 
         general_body.addLayout(grid)
         general_body.addStretch(1)
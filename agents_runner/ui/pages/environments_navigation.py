@@ -34,13 +34,22 @@ class _EnvironmentsNavigationMixin:
             self._preflight_enabled,
             self._cached_preflight_enabled,
             self._run_preflight_enabled,
+            self._cpuset_partitioning,
+            self._clone_partial,
+            self._mounted_snapshots,
         ):
             checkbox.toggled.connect(self._trigger_immediate_autosave)
 
+        self._resource_profile.currentTextChanged.connect(
+            self._queue_debounced_autosave
+        )
+
         for line_edit in (
             self._name,
             self._max_agents_running,
             self._workspace_target,
+            self._clone_depth,
+            self._clone_sparse_paths,
         ):
             line_edit.textChanged.connect(self._queue_debounced_autosave)
 
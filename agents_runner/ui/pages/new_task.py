@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import os
 from pathlib import Path
+from typing import TYPE_CHECKING
 from typing import Callable
 
 from PySide6.QtCore import Qt
@@ -10,6 +11,7 @@ from PySide6.QtCore import Signal
 from PySide6.QtCore import QThread
 from PySide6.QtGui import QTextCursor
 from PySide6.QtWidgets import QComboBox
+from PySide6.QtWidgets import QFileDialog
 from PySide6.QtWidgets import QGridLayout
 from PySide6.QtWidgets import QHBoxLayout
 from PySide6.QtWidgets import QLabel
@@ -24,6 +26,8 @@ from PySide6.QtWidgets import QWidget
 from agents_runner.environments import WORKSPACE_CLONED
 from agents_runner.environments import WORKSPACE_MOUNTED
 from agents_runner.environments import WORKSPACE_NONE
+from agents_runner.prompt_batch import load_prompt_batch
+from agents_runner.prompt_batch import parse_prompt_batch
 from agents_runner.prompt_sanitizer import sanitize_prompt
 from agents_runner.prompts import load_prompt
 from agents_runner.terminal_apps import detect_terminal_options
@@ -38,14 +42,19 @@ from agents_runner.ui.widgets import StainedGlassButton
 from agents_runner.stt.mic_recorder import FfmpegPulseRecorder
 from agents_runner.stt.mic_recorder import MicRecorderError
 from agents_runner.stt.mic_recorder import MicRecording
+from agents_runner.ui.stt.qt_worker import SttStreamBridge
 from agents_runner.ui.stt.qt_worker import SttWorker
 from midori_ai_logger import MidoriAiLogger
 
+if TYPE_CHECKING:
+    from agents_runner.stt.service import SttSession
+
 logger = MidoriAiLogger(channel=None, name=__name__)
 
 
 class NewTaskPage(QWidget):
     requested_run = Signal(str, str, str, str)
+    requested_batch = Signal(object, str, str, str)
     requested_launch = Signal(str, str, str, str, str, str, str)
     back_requested = Signal()
     environment_changed = Signal(str)
@@ -66,6 +75,15 @@ class NewTaskPage(QWidget):
         self._mic_recording: MicRecording | None = None
         self._stt_thread: QThread | None = None
         self._stt_worker: SttWorker | None = None
+        self._stt_session: SttSession | None = None
+        self._stt_pending_audio: Path | None = None
+        self._stt_anchor = -1
+        self._stt_live_len = 0
+        self._stt_prefix = ""
+        self._stt_bridge = SttStreamBridge(self)
+        self._stt_bridge.partial.connect(self._on_stt_stream_partial)
+        self._stt_bridge.final.connect(self._on_stt_stream_final)
+        self._stt_bridge.error.connect(self._on_stt_stream_error)
         self._current_interactive_slot: Callable | None = None
 
         layout = QVBoxLayout(self)
@@ -253,6 +271,16 @@ class NewTaskPage(QWidget):
         self._run_agent = StainedGlassButton("Run Agent")
         self._run_agent.set_glass_enabled(False)
         self._run_agent.clicked.connect(self._on_run)
+        self._run_agent_menu = QMenu(self)
+        self._run_batch_from_prompt = self._run_agent_menu.addAction(
+            "Run each line as a task (--- separates multi-line prompts)"
+        )
+        self._run_batch_from_prompt.triggered.connect(self._on_run_batch_from_prompt)
+        self._run_batch_from_file = self._run_agent_menu.addAction(
+            "Run prompts from file…"
+        )
+        self._run_batch_from_file.triggered.connect(self._on_run_batch_from_file)
+        self._run_agent.set_menu(self._run_agent_menu)
         self._run_interactive.setEnabled(False)
         self._run_agent.setEnabled(False)
         buttons.addWidget(self._run_interactive)
@@ -347,6 +375,54 @@ class NewTaskPage(QWidget):
             return
         prompt = sanitize_prompt(prompt)
 
+        target = self._run_target()
+        if target is None:
+            return
+        self.requested_run.emit(prompt, *target)
+
+    def _on_run_batch_from_prompt(self) -> None:
+        prompts = parse_prompt_batch(self._prompt.toPlainText() or "")
+        if not prompts:
+            QMessageBox.warning(self, "Missing prompt", "Enter a prompt first.")
+            return
+        self._emit_batch(prompts)
+
+    def _on_run_batch_from_file(self) -> None:
+        path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Run prompts from file",
+            "",
+            "Prompt lists (*.txt *.md *.jsonl);;All files (*)",
+        )
+        if not path:
+            return
+        try:
+            prompts = load_prompt_batch(path)
+        except (OSError, UnicodeDecodeError, ValueError) as exc:
+            QMessageBox.warning(self, "Could not read prompts", f"{path}: {exc}")
+            return
+        if not prompts:
+            QMessageBox.warning(self, "Empty batch", f"No prompts found in {path}.")
+            return
+        self._emit_batch(prompts)
+
+    def _emit_batch(self, prompts: list[str]) -> None:
+        reply = QMessageBox.question(
+            self,
+            "Run batch",
+            f"Queue {len(prompts)} task(s), one per prompt?",
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.Yes,
+        )
+        if reply != QMessageBox.Yes:
+            return
+        target = self._run_target()
+        if target is None:
+            return
+        self.requested_batch.emit(prompts, *target)
+
+    def _run_target(self) -> tuple[str, str, str] | None:
+        """Return (host_codex, env_id, base_branch) for a run, or None."""
         if not self._workspace_ready:
             QMessageBox.warning(
                 self,
@@ -354,7 +430,7 @@ class NewTaskPage(QWidget):
                 self._workspace_error
                 or "Pick an environment with a local folder or GitHub repo configured.",
             )
-            return
+            return None
 
         host_codex = os.path.expanduser(str(self._host_codex_dir or "").strip())
 
@@ -363,9 +439,9 @@ class NewTaskPage(QWidget):
 
         # Confirm auto base branch for cloned repo environments
         if not self._confirm_auto_base_branch(env_id, base_branch):
-            return
+            return None
 
-        self.requested_run.emit(prompt, host_codex, env_id, base_branch)
+        return host_codex, env_id, base_branch
 
     def _on_get_agent_help(self) -> None:
         if not self._workspace_ready:
@@ -671,8 +747,10 @@ class NewTaskPage(QWidget):
         self._update_workspace_visibility()  # Update visibility after status change
 
     def _on_voice_toggled(self, enabled: bool) -> None:
-        # Check if STT is already running
-        if self._stt_thread is not None:
+        # Check if STT is already running (file worker or a finishing stream)
+        if self._stt_thread is not None or (
+            self._stt_session is not None and self._mic_recording is None
+        ):
             logger.rprint(
                 "[STT] Voice toggle rejected: thread still running", mode="debug"
             )
@@ -705,10 +783,21 @@ class NewTaskPage(QWidget):
                 self._voice_btn.blockSignals(False)
             return
 
+        session: SttSession | None = None
+        try:
+            session = self._stt_bridge.begin_session()
+        except Exception as exc:
+            # Streaming is an optimization; the WAV fallback still works.
+            logger.rprint(f"[STT] Streaming session unavailable: {exc!r}", mode="warn")
+
         try:
             recorder = FfmpegPulseRecorder()
-            self._mic_recording = recorder.start()
+            self._mic_recording = recorder.start(
+                on_pcm=session.feed if session is not None else None
+            )
         except MicRecorderError as exc:
+            if session is not None:
+                session.cancel()
             QMessageBox.warning(
                 self, "Microphone error", str(exc) or "Could not start recording."
             )
@@ -719,6 +808,9 @@ class NewTaskPage(QWidget):
             finally:
                 self._voice_btn.blockSignals(False)
             return
+        self._stt_session = session
+        self._stt_anchor = -1
+        self._stt_live_len = 0
         self._voice_btn.setIcon(lucide_icon("square"))
         self._voice_btn.setToolTip(
             "Stop recording and transcribe into the prompt editor."
@@ -741,6 +833,9 @@ class NewTaskPage(QWidget):
             logger.rprint(f"[STT] Recorder stopped: {audio_path}", mode="debug")
         except MicRecorderError as exc:
             logger.rprint(f"[STT] Recorder error: {exc!r}", mode="error")
+            if self._stt_session is not None:
+                self._stt_session.cancel()
+                self._stt_session = None
             QMessageBox.warning(
                 self, "Microphone error", str(exc) or "Could not stop recording."
             )
@@ -752,6 +847,16 @@ class NewTaskPage(QWidget):
         self._voice_btn.setIcon(lucide_icon("refresh-cw"))
         self._voice_btn.setToolTip("Transcribing speech-to-text…")
 
+        if self._stt_session is not None:
+            # The resident service already has the audio; only the tail is left.
+            logger.rprint("[STT] Finishing streaming session", mode="debug")
+            self._stt_pending_audio = Path(audio_path)
+            self._stt_session.finish()
+            return
+
+        self._start_file_transcription(Path(audio_path))
+
+    def _start_file_transcription(self, audio_path: Path) -> None:
         logger.rprint("[STT] Creating worker and thread", mode="debug")
         worker = SttWorker(mode=self._stt_mode, audio_path=str(audio_path))
         thread = QThread(self)
@@ -782,6 +887,76 @@ class NewTaskPage(QWidget):
             f"[STT] Thread started (is_running={thread.isRunning()})", mode="debug"
         )
 
+    def _replace_live_dictation(self, text: str) -> None:
+        """Swap the in-progress dictation text in the prompt for ``text``."""
+        document_len = len(self._prompt.toPlainText())
+        if self._stt_anchor < 0:
+            if not text:
+                return
+            self._stt_anchor = document_len
+            self._stt_live_len = 0
+            self._stt_prefix = "\n" if self._prompt.toPlainText().strip() else ""
+
+        replacement = f"{self._stt_prefix}{text}" if text else ""
+        start = min(self._stt_anchor, document_len)
+        end = min(self._stt_anchor + self._stt_live_len, document_len)
+        cursor = QTextCursor(self._prompt.document())
+        cursor.setPosition(start)
+        cursor.setPosition(end, QTextCursor.MoveMode.KeepAnchor)
+        cursor.insertText(replacement)
+        self._stt_live_len = len(replacement)
+        self._prompt.setTextCursor(cursor)
+
+    def _on_stt_stream_partial(self, text: str) -> None:
+        if self._stt_session is None:
+            return
+        self._replace_live_dictation(str(text or "").strip())
+
+    def _on_stt_stream_final(self, text: str) -> None:
+        logger.rprint(
+            f"[STT] Streaming final received (text_length={len(text)})", mode="debug"
+        )
+        if self._stt_session is None:
+            return
+        text = str(text or "").strip()
+        self._replace_live_dictation(text)
+        if not text:
+            QMessageBox.information(
+                self,
+                "No speech detected",
+                "Speech-to-text did not return any text.",
+            )
+        self._finish_stream_session()
+
+    def _on_stt_stream_error(self, message: str) -> None:
+        logger.rprint(f"[STT] Streaming error: {message}", mode="warn")
+        if self._stt_session is None:
+            return
+        self._replace_live_dictation("")
+        self._stt_session = None
+        self._stt_anchor = -1
+        self._stt_live_len = 0
+        pending = self._stt_pending_audio
+        self._stt_pending_audio = None
+        if pending is not None:
+            # Recording already stopped; transcribe the WAV the old way.
+            self._start_file_transcription(pending)
+
+    def _finish_stream_session(self) -> None:
+        self._stt_session = None
+        self._stt_anchor = -1
+        self._stt_live_len = 0
+        pending = self._stt_pending_audio
+        self._stt_pending_audio = None
+        if pending is not None:
+            try:
+                pending.unlink(missing_ok=True)
+            except Exception as exc:
+                logger.rprint(f"[STT] Failed to delete audio: {exc!r}", mode="warn")
+        self._voice_btn.setEnabled(True)
+        self._voice_btn.setIcon(mic_icon(size=18))
+        self._voice_btn.setToolTip("Speech-to-text into the prompt editor.")
+
     def _on_stt_done(self, text: str, audio_path: str) -> None:
         logger.rprint(
             f"[STT] Done signal received (text_length={len(text)})", mode="debug"
@@ -863,6 +1038,9 @@ class NewTaskPage(QWidget):
         finally:
             self._base_branch.blockSignals(False)
 
+    def selected_base_branch(self) -> str:
+        return str(self._base_branch.currentData() or "")
+
     def set_interactive_defaults(self, terminal_id: str, command: str) -> None:
         if command:
             self._command.setText(command)
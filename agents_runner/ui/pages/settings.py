@@ -35,6 +35,7 @@ class SettingsPage(QWidget, _SettingsFormMixin):
     back_requested = Signal()
     saved = Signal(dict)
     test_preflight_requested = Signal(dict)
+    disk_usage_refresh_requested = Signal()
 
     def __init__(
         self,
@@ -155,10 +156,13 @@ class SettingsPage(QWidget, _SettingsFormMixin):
             self._headless_desktop_enabled,
             self._gh_context_default,
             self._spellcheck_enabled,
+            self._stt_prewarm,
+            self._reduce_motion,
             self._mount_host_cache,
             self._radio_enabled,
             self._radio_autostart,
             self._radio_loudness_boost_enabled,
+            self._admission_control_enabled,
         ):
             checkbox.toggled.connect(self._trigger_immediate_autosave)
 
@@ -167,6 +171,12 @@ class SettingsPage(QWidget, _SettingsFormMixin):
             self._host_claude_dir,
             self._host_copilot_dir,
             self._host_gemini_dir,
+            self._max_total_agents_running,
+            self._agent_cli_max_running,
+            self._admission_max_load_per_cpu,
+            self._admission_min_free_memory_mb,
+            self._admission_min_free_disk_mb,
+            self._workspace_disk_quota_gb,
         ):
             line_edit.textChanged.connect(self._queue_debounced_autosave)
 
@@ -180,6 +190,9 @@ class SettingsPage(QWidget, _SettingsFormMixin):
         self.try_autosave()
         self.back_requested.emit()
 
+    def set_disk_usage(self, text: str) -> None:
+        self._disk_usage_summary.setPlainText(text)
+
     def _on_test_preflight(self) -> None:
         self.try_autosave()
         self.test_preflight_requested.emit(self.get_settings())
@@ -4,6 +4,8 @@ import os
 from dataclasses import dataclass
 
 from PySide6.QtCore import QSignalBlocker, Qt
+from PySide6.QtGui import QDoubleValidator
+from PySide6.QtGui import QIntValidator
 from PySide6.QtWidgets import QCheckBox
 from PySide6.QtWidgets import QComboBox
 from PySide6.QtWidgets import QDoubleSpinBox
@@ -25,6 +27,8 @@ from agents_runner.agent_cli import normalize_agent
 from agents_runner.agent_systems import available_agent_system_names
 from agents_runner.agent_systems import get_agent_system
 from agents_runner.agent_systems import get_default_agent_system_name
+from agents_runner.execution.scheduler import format_agent_limits
+from agents_runner.execution.scheduler import parse_agent_limits
 from agents_runner.ui.radio import RadioController
 from agents_runner.ui.dialogs.theme_preview_dialog import ThemePreviewDialog
 from agents_runner.ui.graphics import available_ui_theme_names
@@ -79,6 +83,18 @@ class _SettingsFormMixin:
                 subtitle="Container and desktop runtime toggles.",
                 section="Runtime",
             ),
+            _SettingsPaneSpec(
+                key="scheduling",
+                title="Task Scheduling",
+                subtitle="Concurrency limits and host resource checks for queued tasks.",
+                section="Runtime",
+            ),
+            _SettingsPaneSpec(
+                key="disk_usage",
+                title="Disk Usage",
+                subtitle="Space used by task workspaces under managed-repos/.",
+                section="Runtime",
+            ),
             _SettingsPaneSpec(
                 key="preflight_script",
                 title="Preflight Script",
@@ -179,6 +195,92 @@ class _SettingsFormMixin:
             "Underlines misspelled words in the prompt editor and provides suggestions."
         )
 
+        self._stt_prewarm = QCheckBox("Preload speech-to-text model at startup")
+        self._stt_prewarm.setToolTip(
+            "Loads the offline speech-to-text model in a background process when the "
+            "app starts so the first dictation transcribes immediately."
+        )
+
+        self._reduce_motion = QCheckBox("Reduce background motion")
+        self._reduce_motion.setToolTip(
+            "Keeps the theme background still and switches themes without a fade."
+        )
+
+        self._max_total_agents_running = QLineEdit()
+        self._max_total_agents_running.setPlaceholderText("-1")
+        self._max_total_agents_running.setToolTip(
+            "Maximum agent runs across all environments. -1 means unlimited.\n"
+            "Per-environment limits still apply."
+        )
+        self._max_total_agents_running.setValidator(QIntValidator(-1, 10_000_000, self))
+        self._max_total_agents_running.setMaximumWidth(150)
+
+        self._agent_cli_max_running = QLineEdit()
+        self._agent_cli_max_running.setPlaceholderText("codex=2, claude=1")
+        self._agent_cli_max_running.setToolTip(
+            "Maximum concurrent runs per agent CLI, e.g. to stay under provider "
+            "rate limits.\nAgents that are not listed are unlimited."
+        )
+
+        self._admission_control_enabled = QCheckBox(
+            "Delay queued tasks while the host is busy"
+        )
+        self._admission_control_enabled.setToolTip(
+            "Checks host load, free memory and free disk before starting a queued "
+            "task.\nTasks wait in the queue until the host is back under the limits."
+        )
+
+        self._admission_max_load_per_cpu = QLineEdit()
+        self._admission_max_load_per_cpu.setPlaceholderText("2.0")
+        self._admission_max_load_per_cpu.setToolTip(
+            "1-minute load average per CPU at which new starts wait. 0 disables."
+        )
+        self._admission_max_load_per_cpu.setValidator(
+            QDoubleValidator(0.0, 1000.0, 2, self)
+        )
+        self._admission_max_load_per_cpu.setMaximumWidth(150)
+
+        self._admission_min_free_memory_mb = QLineEdit()
+        self._admission_min_free_memory_mb.setPlaceholderText("1024")
+        self._admission_min_free_memory_mb.setToolTip(
+            "Memory (MiB) to keep available after starting another container. "
+            "0 disables."
+        )
+        self._admission_min_free_memory_mb.setValidator(
+            QIntValidator(0, 10_000_000, self)
+        )
+        self._admission_min_free_memory_mb.setMaximumWidth(150)
+
+        self._admission_min_free_disk_mb = QLineEdit()
+        self._admission_min_free_disk_mb.setPlaceholderText("2048")
+        self._admission_min_free_disk_mb.setToolTip(
+            "Free space (MiB) required on the data directory's filesystem. 0 disables."
+        )
+        self._admission_min_free_disk_mb.setValidator(
+            QIntValidator(0, 10_000_000, self)
+        )
+        self._admission_min_free_disk_mb.setMaximumWidth(150)
+
+        self._workspace_disk_quota_gb = QLineEdit()
+        self._workspace_disk_quota_gb.setPlaceholderText("0")
+        self._workspace_disk_quota_gb.setToolTip(
+            "Total size (GiB) allowed for task workspaces. Above it, workspaces of "
+            "finished tasks are removed, least recently used first. 0 disables."
+        )
+        self._workspace_disk_quota_gb.setValidator(
+            QDoubleValidator(0.0, 1_000_000.0, 1, self)
+        )
+        self._workspace_disk_quota_gb.setMaximumWidth(150)
+
+        self._disk_usage_summary = QPlainTextEdit()
+        self._disk_usage_summary.setReadOnly(True)
+        self._disk_usage_summary.setPlaceholderText("Scanning…")
+
+        self._refresh_disk_usage = QToolButton()
+        self._refresh_disk_usage.setText("Rescan")
+        self._refresh_disk_usage.setToolButtonStyle(Qt.ToolButtonTextOnly)
+        self._refresh_disk_usage.clicked.connect(self.disk_usage_refresh_requested)
+
         self._mount_host_cache = QCheckBox("Mount host cache into containers")
         self._mount_host_cache.setToolTip(
             "Mounts ~/.cache to speed up package manager installs across environments."
@@ -274,6 +376,7 @@ class _SettingsFormMixin:
             specs_by_key["general_preferences"]
         )
         general_body.addWidget(self._spellcheck_enabled)
+        general_body.addWidget(self._stt_prewarm)
         general_body.addWidget(self._gh_context_default)
         general_body.addWidget(self._append_pixelarch_context)
         general_body.addStretch(1)
@@ -287,6 +390,7 @@ class _SettingsFormMixin:
         themes_grid.addWidget(QLabel("Theme"), 0, 0)
         themes_grid.addWidget(self._ui_theme, 0, 1)
         themes_body.addLayout(themes_grid)
+        themes_body.addWidget(self._reduce_motion)
         previews_heading = QLabel("Theme previews")
         previews_heading.setObjectName("SettingsPaneSubtitle")
         themes_body.addWidget(previews_heading)
@@ -342,6 +446,47 @@ class _SettingsFormMixin:
         runtime_body.addStretch(1)
         self._register_page("runtime_behavior", runtime_page)
 
+        scheduling_page, scheduling_body = self._create_page(specs_by_key["scheduling"])
+        scheduling_grid = QGridLayout()
+        scheduling_grid.setHorizontalSpacing(GRID_HORIZONTAL_SPACING)
+        scheduling_grid.setVerticalSpacing(GRID_VERTICAL_SPACING)
+        scheduling_grid.setColumnStretch(1, 1)
+        scheduling_grid.addWidget(QLabel("Max agents running (all)"), 0, 0)
+        scheduling_grid.addWidget(self._max_total_agents_running, 0, 1)
+        scheduling_grid.addWidget(QLabel("Per-agent limits"), 1, 0)
+        scheduling_grid.addWidget(self._agent_cli_max_running, 1, 1)
+        scheduling_body.addLayout(scheduling_grid)
+        scheduling_body.addWidget(self._admission_control_enabled)
+        admission_grid = QGridLayout()
+        admission_grid.setHorizontalSpacing(GRID_HORIZONTAL_SPACING)
+        admission_grid.setVerticalSpacing(GRID_VERTICAL_SPACING)
+        admission_grid.setColumnStretch(1, 1)
+        admission_grid.addWidget(QLabel("Max load per CPU"), 0, 0)
+        admission_grid.addWidget(self._admission_max_load_per_cpu, 0, 1)
+        admission_grid.addWidget(QLabel("Min free memory (MiB)"), 1, 0)
+        admission_grid.addWidget(self._admission_min_free_memory_mb, 1, 1)
+        admission_grid.addWidget(QLabel("Min free disk (MiB)"), 2, 0)
+        admission_grid.addWidget(self._admission_min_free_disk_mb, 2, 1)
+        scheduling_body.addLayout(admission_grid)
+        scheduling_body.addStretch(1)
+        self._register_page("scheduling", scheduling_page)
+
+        disk_page, disk_body = self._create_page(specs_by_key["disk_usage"])
+        disk_grid = QGridLayout()
+        disk_grid.setHorizontalSpacing(GRID_HORIZONTAL_SPACING)
+        disk_grid.setVerticalSpacing(GRID_VERTICAL_SPACING)
+        disk_grid.setColumnStretch(1, 1)
+        disk_grid.addWidget(QLabel("Workspace quota (GiB)"), 0, 0)
+        disk_grid.addWidget(self._workspace_disk_quota_gb, 0, 1)
+        disk_body.addLayout(disk_grid)
+        disk_body.addWidget(self._disk_usage_summary, 1)
+        disk_actions = QHBoxLayout()
+        disk_actions.setSpacing(BUTTON_ROW_SPACING)
+        disk_actions.addWidget(self._refresh_disk_usage)
+        disk_actions.addStretch(1)
+        disk_body.addLayout(disk_actions)
+        self._register_page("disk_usage", disk_page)
+
         preflight_page, preflight_body = self._create_page(
             specs_by_key["preflight_script"]
         )
@@ -709,9 +854,35 @@ class _SettingsFormMixin:
             self._spellcheck_enabled.setChecked(
                 bool(settings.get("spellcheck_enabled", True))
             )
+            self._stt_prewarm.setChecked(bool(settings.get("stt_prewarm") or False))
+            self._reduce_motion.setChecked(bool(settings.get("reduce_motion") or False))
             self._mount_host_cache.setChecked(
                 bool(settings.get("mount_host_cache", False))
             )
+            self._max_total_agents_running.setText(
+                str(settings.get("max_total_agents_running", -1))
+            )
+            self._admission_control_enabled.setChecked(
+                bool(settings.get("admission_control_enabled", True))
+            )
+            self._admission_max_load_per_cpu.setText(
+                str(settings.get("admission_max_load_per_cpu", 2.0))
+            )
+            self._admission_min_free_memory_mb.setText(
+                str(settings.get("admission_min_free_memory_mb", 1024))
+            )
+            self._admission_min_free_disk_mb.setText(
+                str(settings.get("admission_min_free_disk_mb", 2048))
+            )
+            self._workspace_disk_quota_gb.setText(
+                str(settings.get("workspace_disk_quota_gb", 0.0))
+            )
+            agent_limits = settings.get("agent_cli_max_running")
+            self._agent_cli_max_running.setText(
+                format_agent_limits(agent_limits)
+                if isinstance(agent_limits, dict)
+                else ""
+            )
 
             theme_value = normalize_ui_theme_name(
                 settings.get("ui_theme"), allow_auto=True
@@ -782,7 +953,30 @@ class _SettingsFormMixin:
             ),
             "gh_context_default_enabled": bool(self._gh_context_default.isChecked()),
             "spellcheck_enabled": bool(self._spellcheck_enabled.isChecked()),
+            "stt_prewarm": bool(self._stt_prewarm.isChecked()),
+            "reduce_motion": bool(self._reduce_motion.isChecked()),
             "mount_host_cache": bool(self._mount_host_cache.isChecked()),
+            "max_total_agents_running": str(
+                self._max_total_agents_running.text() or "-1"
+            ).strip(),
+            "agent_cli_max_running": parse_agent_limits(
+                self._agent_cli_max_running.text()
+            ),
+            "admission_control_enabled": bool(
+                self._admission_control_enabled.isChecked()
+            ),
+            "admission_max_load_per_cpu": str(
+                self._admission_max_load_per_cpu.text() or ""
+            ).strip(),
+            "admission_min_free_memory_mb": str(
+                self._admission_min_free_memory_mb.text() or ""
+            ).strip(),
+            "admission_min_free_disk_mb": str(
+                self._admission_min_free_disk_mb.text() or ""
+            ).strip(),
+            "workspace_disk_quota_gb": str(
+                self._workspace_disk_quota_gb.text() or ""
+            ).strip(),
             "radio_enabled": bool(self._radio_enabled.isChecked()),
             "radio_autostart": bool(self._radio_autostart.isChecked()),
             "radio_channel": RadioController.normalize_channel(
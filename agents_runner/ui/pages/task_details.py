@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 from PySide6.QtCore import Qt
 from PySide6.QtCore import QProcess
 from PySide6.QtCore import QProcessEnvironment
@@ -21,14 +23,12 @@ from PySide6.QtWidgets import QToolButton
 from PySide6.QtWidgets import QVBoxLayout
 from PySide6.QtWidgets import QWidget
 
-from agents_runner.ui.pages.artifacts_tab import ArtifactsTab
-
 from agents_runner.artifacts import get_artifact_info
 from agents_runner.environments import WORKSPACE_CLONED
 from agents_runner.ui.lucide_icons import lucide_icon
 from agents_runner.ui.task_model import Task
 from agents_runner.ui.task_model import _task_display_status
-from agents_runner.ui.utils import _format_duration
+from agents_runner.log_format import format_duration
 from agents_runner.ui.utils import _rgba
 from agents_runner.ui.utils import _status_color
 from agents_runner.ui.widgets import GlassCard
@@ -38,9 +38,33 @@ from agents_runner.ui.widgets import StatusGlyph
 import logging
 import sys
 
+if TYPE_CHECKING:
+    from agents_runner.ui.pages.artifacts_tab import ArtifactsTab
+
 logger = logging.getLogger(__name__)
 
 
+def _format_resource_usage(task: Task) -> str:
+    """Summarize cgroup usage of the most recent attempt that recorded it."""
+    for attempt in reversed(task.attempt_history or []):
+        usage = attempt.get("resource_usage") if isinstance(attempt, dict) else None
+        if not isinstance(usage, dict) or not usage:
+            continue
+        parts: list[str] = []
+        peak_mb = usage.get("peak_memory_mb")
+        if isinstance(peak_mb, (int, float)):
+            if peak_mb >= 1024:
+                parts.append(f"peak {peak_mb / 1024:.1f} GiB")
+            else:
+                parts.append(f"peak {peak_mb:.0f} MiB")
+        cpu_seconds = usage.get("cpu_seconds")
+        if isinstance(cpu_seconds, (int, float)):
+            parts.append(f"{cpu_seconds:.1f} CPU-s")
+        if parts:
+            return " · ".join(parts)
+    return "—"
+
+
 class TaskDetailsPage(QWidget):
     back_requested = Signal()
     pr_requested = Signal(str)
@@ -200,12 +224,15 @@ class TaskDetailsPage(QWidget):
         self._started = QLabel("—")
         self._uptime = QLabel("—")
         self._exit = QLabel("—")
+        self._resource_usage = QLabel("—")
         details.addWidget(QLabel("Started"), 0, 0)
         details.addWidget(self._started, 0, 1)
         details.addWidget(QLabel("Elapsed"), 1, 0)
         details.addWidget(self._uptime, 1, 1)
         details.addWidget(QLabel("Exit code"), 2, 0)
         details.addWidget(self._exit, 2, 1)
+        details.addWidget(QLabel("Resources"), 3, 0)
+        details.addWidget(self._resource_usage, 3, 1)
 
         state_layout.addLayout(title_row)
         state_layout.addLayout(state_row)
@@ -271,13 +298,11 @@ class TaskDetailsPage(QWidget):
 
         mid.addLayout(right_column, 2)
 
-        # Artifacts tab
-        artifacts_tab = ArtifactsTab()
-        self._artifacts_tab = artifacts_tab
+        # Artifacts tab (built the first time a task has artifacts)
+        self._artifacts_tab: ArtifactsTab | None = None
 
         # Store tab widgets for dynamic show/hide
         self._task_tab_widget = task_tab
-        self._artifacts_tab_widget = artifacts_tab
 
         # Add only the Task tab initially (always visible)
         self._task_tab_index = self._tabs.addTab(task_tab, "Task")
@@ -309,9 +334,11 @@ class TaskDetailsPage(QWidget):
         """Show the Artifacts tab if not already visible."""
         if self._artifacts_tab_visible:
             return
-        self._artifacts_tab_index = self._tabs.addTab(
-            self._artifacts_tab_widget, "Artifacts"
-        )
+        if self._artifacts_tab is None:
+            from agents_runner.ui.pages.artifacts_tab import ArtifactsTab
+
+            self._artifacts_tab = ArtifactsTab()
+        self._artifacts_tab_index = self._tabs.addTab(self._artifacts_tab, "Artifacts")
         self._artifacts_tab_visible = True
 
     def _hide_artifacts_tab(self) -> None:
@@ -582,7 +609,7 @@ class TaskDetailsPage(QWidget):
         self._sync_review_menu(task)
 
         # Notify artifacts tab of status changes
-        if self._artifacts_tab_visible:
+        if self._artifacts_tab_visible and self._artifacts_tab is not None:
             self._artifacts_tab.on_task_status_changed(task)
 
     def _sync_desktop_button(self, task: Task) -> None:
@@ -634,7 +661,7 @@ class TaskDetailsPage(QWidget):
             self._hide_artifacts_tab()
 
     def _load_artifacts(self) -> None:
-        if self._last_task:
+        if self._last_task and self._artifacts_tab is not None:
             self._artifacts_tab.set_task(self._last_task)
 
     def _apply_status(self, task: Task) -> None:
@@ -658,13 +685,14 @@ class TaskDetailsPage(QWidget):
             started_local = task.started_at.astimezone().strftime("%Y-%m-%d %H:%M:%S")
         self._started.setText(started_local)
         self._exit.setText("—" if task.exit_code is None else str(task.exit_code))
+        self._resource_usage.setText(_format_resource_usage(task))
 
     def _tick_uptime(self) -> None:
         task = self._last_task
         if not task:
             self._uptime.setText("—")
             return
-        self._uptime.setText(_format_duration(task.elapsed_seconds()))
+        self._uptime.setText(format_duration(task.elapsed_seconds()))
 
     def cleanup(self) -> None:
         """Clean up resources, including external viewer process."""
@@ -2,11 +2,19 @@ from __future__ import annotations
 
 import os
 import sys
+import threading
 import time
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from midori_ai_logger import MidoriAiLogger
 
+from agents_runner.ui.runtime.startup_profile import active_startup_profiler
+from agents_runner.ui.runtime.startup_profile import mark_startup_phase
+
+if TYPE_CHECKING:
+    from agents_runner.prompt_batch import PromptBatchRequest
+
 _FAULT_LOG_HANDLE = None
 logger = MidoriAiLogger(channel=None, name=__name__)
 
@@ -193,7 +201,37 @@ def _initialize_qtwebengine() -> None:
         logger.rprint(f"QtWebEngine not available: {e}", mode="debug")
 
 
-def run_app(argv: list[str]) -> None:
+def _watch_first_paint(window: object) -> None:
+    """Report the startup profile once the main window has painted."""
+    profiler = active_startup_profiler()
+    if profiler is None:
+        return
+
+    from PySide6.QtCore import QEvent
+    from PySide6.QtCore import QObject
+    from PySide6.QtCore import QTimer
+    from PySide6.QtWidgets import QApplication
+
+    class _FirstPaintFilter(QObject):
+        def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+            if event.type() == QEvent.Type.Paint:
+                watched.removeEventFilter(self)
+                # Mark after the paint cycle completes, not when it starts.
+                QTimer.singleShot(0, _on_first_paint)
+            return False
+
+    def _on_first_paint() -> None:
+        profiler.mark("first_paint")
+        profiler.emit_report()
+        if profiler.exit_after_report:
+            QApplication.quit()
+
+    target = getattr(window, "centralWidget", lambda: None)() or window
+    paint_filter = _FirstPaintFilter(target)
+    target.installEventFilter(paint_filter)
+
+
+def run_app(argv: list[str], *, batch: PromptBatchRequest | None = None) -> None:
     _maybe_enable_faulthandler()
     _configure_qt_logging_runtime()
     _configure_qtwebengine_runtime()
@@ -204,20 +242,18 @@ def run_app(argv: list[str]) -> None:
 
     from PySide6.QtWidgets import QApplication
 
-    from agents_runner.environments import load_environments
-    from agents_runner.ui.qt_diagnostics import install_qt_message_handler
+    from agents_runner.environments import has_environments
     from agents_runner.setup.orchestrator import check_setup_complete
-    from agents_runner.ui.style import app_stylesheet
     from agents_runner.ui.constants import APP_TITLE
-    from agents_runner.ui.dialogs.first_run_setup import FirstRunSetupDialog
-    from agents_runner.ui.dialogs.new_environment_wizard import NewEnvironmentWizard
     from agents_runner.ui.icons import _app_icon
     from agents_runner.ui.main_window import MainWindow
+    from agents_runner.ui.qt_diagnostics import install_qt_message_handler
+    from agents_runner.ui.style import app_stylesheet
 
-    # Clean up stale temporary files from previous runs
-    _cleanup_stale_temp_files()
+    mark_startup_phase("imports_done")
 
     app = QApplication(argv)
+    mark_startup_phase("qapplication")
 
     # Install Qt diagnostics handler for Issue #141 (QTimer thread warnings)
     # Enable via AGENTS_RUNNER_QT_DIAGNOSTICS=1 environment variable
@@ -234,16 +270,33 @@ def run_app(argv: list[str]) -> None:
 
     # Check if first-run setup is needed
     if not check_setup_complete():
+        from agents_runner.ui.dialogs.first_run_setup import FirstRunSetupDialog
+
         dialog = FirstRunSetupDialog(parent=None)
         dialog.exec()
 
     # Check if user has no environments and show wizard
-    if not load_environments():
+    if not has_environments():
+        from agents_runner.ui.dialogs.new_environment_wizard import NewEnvironmentWizard
+
         wizard = NewEnvironmentWizard(parent=None)
         wizard.exec()
+    mark_startup_phase("setup_checks")
 
     window = MainWindow()
+    mark_startup_phase("main_window")
     if icon is not None:
         window.setWindowIcon(icon)
+    _watch_first_paint(window)
     window.show()
+    mark_startup_phase("window_shown")
+    if batch is not None:
+        window.queue_prompt_batch(batch)
+
+    # Clean up stale temporary files from previous runs, off the startup path.
+    threading.Thread(
+        target=_cleanup_stale_temp_files,
+        name="stale-temp-cleanup",
+        daemon=True,
+    ).start()
     sys.exit(app.exec())
@@ -0,0 +1,197 @@
+"""Cold-start profiler for ``--profile-startup``.
+
+Records per-module import times (by wrapping ``builtins.__import__``), named
+startup phases, and time-to-first-paint of the main window, then prints a
+report to stderr and writes it as JSON next to the app state.
+
+This module must stay free of Qt imports so it can be installed before any
+heavy module is loaded.
+"""
+
+from __future__ import annotations
+
+import builtins
+import json
+import sys
+import time
+from dataclasses import dataclass
+from dataclasses import field
+from pathlib import Path
+from typing import Any
+
+PROFILE_FLAG = "--profile-startup"
+PROFILE_EXIT_FLAG = "--profile-startup-exit"
+
+_REPORT_TOP_IMPORTS = 25
+
+
+@dataclass
+class _ImportRecord:
+    name: str
+    cumulative_s: float
+    self_s: float
+    depth: int
+
+
+@dataclass
+class StartupProfiler:
+    started_s: float = field(default_factory=time.perf_counter)
+    exit_after_report: bool = False
+    phases: list[tuple[str, float]] = field(default_factory=list)
+    imports: list[_ImportRecord] = field(default_factory=list)
+    reported: bool = False
+    _stack: list[float] = field(default_factory=list)
+    _original_import: Any = None
+
+    def install(self) -> None:
+        if self._original_import is not None:
+            return
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+
+    def uninstall(self) -> None:
+        if self._original_import is None:
+            return
+        builtins.__import__ = self._original_import
+        self._original_import = None
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started_s) * 1000.0
+
+    def mark(self, label: str) -> None:
+        self.phases.append((str(label), self.elapsed_ms()))
+
+    def _timed_import(
+        self,
+        name: str,
+        globals: dict[str, Any] | None = None,
+        locals: dict[str, Any] | None = None,
+        fromlist: Any = (),
+        level: int = 0,
+    ) -> Any:
+        original = self._original_import
+        modules_before = len(sys.modules)
+        self._stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            child_s = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+            # Only count calls that actually loaded something new.
+            if len(sys.modules) != modules_before:
+                self.imports.append(
+                    _ImportRecord(
+                        name=_resolve_import_name(name, globals, level),
+                        cumulative_s=elapsed,
+                        self_s=max(0.0, elapsed - child_s),
+                        depth=len(self._stack),
+                    )
+                )
+
+    def report(self) -> dict[str, Any]:
+        first_paint = next(
+            (ms for label, ms in self.phases if label == "first_paint"), None
+        )
+        top_level = [record for record in self.imports if record.depth == 0]
+        slowest = sorted(self.imports, key=lambda r: r.cumulative_s, reverse=True)
+        return {
+            "time_to_first_paint_ms": first_paint,
+            "phases": [{"label": label, "ms": ms} for label, ms in self.phases],
+            "total_import_ms": sum(r.cumulative_s for r in top_level) * 1000.0,
+            "modules_loaded": len(self.imports),
+            "slowest_imports": [
+                {
+                    "module": record.name,
+                    "cumulative_ms": record.cumulative_s * 1000.0,
+                    "self_ms": record.self_s * 1000.0,
+                }
+                for record in slowest[:_REPORT_TOP_IMPORTS]
+            ],
+        }
+
+    def emit_report(self) -> dict[str, Any]:
+        """Print the report to stderr and persist it; runs at most once."""
+        payload = self.report()
+        if self.reported:
+            return payload
+        self.reported = True
+        self.uninstall()
+
+        lines = ["[startup-profile] phases (ms since profiler start):"]
+        for phase in payload["phases"]:
+            lines.append(f"  {phase['label']:<28} {phase['ms']:9.1f}")
+        ttfp = payload["time_to_first_paint_ms"]
+        lines.append(
+            "[startup-profile] time-to-first-paint: "
+            + (f"{ttfp:.1f} ms" if ttfp is not None else "n/a")
+        )
+        lines.append(
+            f"[startup-profile] imports: {payload['modules_loaded']} calls, "
+            f"{payload['total_import_ms']:.1f} ms at top level"
+        )
+        lines.append("[startup-profile] slowest imports (cumulative / self ms):")
+        for item in payload["slowest_imports"]:
+            lines.append(
+                f"  {item['cumulative_ms']:9.1f} {item['self_ms']:9.1f}  {item['module']}"
+            )
+        print("\n".join(lines), file=sys.stderr, flush=True)
+
+        try:
+            path = Path.home() / ".midoriai" / "agents-runner" / "startup-profile.json"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+            print(f"[startup-profile] written to {path}", file=sys.stderr, flush=True)
+        except OSError:
+            pass
+        return payload
+
+
+def _resolve_import_name(name: str, globals: dict[str, Any] | None, level: int) -> str:
+    if level <= 0 or not globals:
+        return name
+    package = str(globals.get("__package__") or "")
+    parts = package.split(".") if package else []
+    if level > 1:
+        parts = parts[: -(level - 1)]
+    base = ".".join(parts)
+    if not name:
+        return base
+    return f"{base}.{name}" if base else name
+
+
+_PROFILER: StartupProfiler | None = None
+
+
+def install_startup_profiler(*, exit_after_report: bool = False) -> StartupProfiler:
+    """Start recording imports and phases; call as early as possible."""
+    global _PROFILER
+    if _PROFILER is None:
+        _PROFILER = StartupProfiler(exit_after_report=exit_after_report)
+        _PROFILER.install()
+        _PROFILER.mark("profiler_installed")
+    return _PROFILER
+
+
+def active_startup_profiler() -> StartupProfiler | None:
+    profiler = _PROFILER
+    if profiler is None or profiler.reported:
+        return None
+    return profiler
+
+
+def mark_startup_phase(label: str) -> None:
+    """Record a named phase; no-op unless ``--profile-startup`` is active."""
+    profiler = active_startup_profiler()
+    if profiler is not None:
+        profiler.mark(label)
+
+
+def strip_profile_flags(argv: list[str]) -> tuple[list[str], bool, bool]:
+    """Remove profiler flags from ``argv``; return (argv, enabled, exit_after)."""
+    enabled = PROFILE_FLAG in argv or PROFILE_EXIT_FLAG in argv
+    exit_after = PROFILE_EXIT_FLAG in argv
+    cleaned = [arg for arg in argv if arg not in (PROFILE_FLAG, PROFILE_EXIT_FLAG)]
+    return cleaned, enabled, exit_after
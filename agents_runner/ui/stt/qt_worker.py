@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 from PySide6.QtCore import QObject
 from PySide6.QtCore import Signal
 
 from agents_runner.stt.transcribe import transcribe_audio_file
 
+if TYPE_CHECKING:
+    from agents_runner.stt.service import SttSession
+
 
 class SttWorker(QObject):
     done = Signal(str, str)
@@ -22,3 +27,24 @@ class SttWorker(QObject):
             self.error.emit(str(exc) or "Speech-to-text failed.", self._audio_path)
             return
         self.done.emit(text, self._audio_path)
+
+
+class SttStreamBridge(QObject):
+    """Re-emits resident STT session callbacks as Qt signals.
+
+    Service callbacks run on its reader thread; connecting to these signals
+    from GUI objects gives queued delivery on the GUI thread.
+    """
+
+    partial = Signal(str)
+    final = Signal(str)
+    error = Signal(str)
+
+    def begin_session(self) -> SttSession:
+        from agents_runner.stt.service import get_stt_service
+
+        return get_stt_service().begin_session(
+            on_partial=self.partial.emit,
+            on_final=self.final.emit,
+            on_error=self.error.emit,
+        )
@@ -7,7 +7,7 @@ from datetime import datetime
 
 from agents_runner.environments import WORKSPACE_NONE
 from agents_runner.environments import WORKSPACE_CLONED
-from agents_runner.ui.utils import _format_duration
+from agents_runner.log_format import format_duration
 
 
 @dataclass
@@ -20,6 +20,7 @@ class Task:
     created_at_s: float
     environment_id: str = ""
     status: str = "queued"
+    priority: int = 0
     exit_code: int | None = None
     error: str | None = None
     container_id: str | None = None
@@ -34,6 +35,8 @@ class Task:
     gh_pr_metadata_path: str = ""
     gh_context_path: str = ""
     workspace_type: str = WORKSPACE_NONE
+    # Root of the task's copy-on-write snapshot (mounted workspaces only).
+    workspace_snapshot: str = ""
     git: dict[str, object] | None = None
     agent_cli: str = ""
     agent_instance_id: str = ""
@@ -97,17 +100,17 @@ class Task:
                 last_line = self.last_nonblank_log_line()
                 if last_line:
                     return last_line
-                return f"elapsed {_format_duration(duration)}"
+                return f"elapsed {format_duration(duration)}"
             return ""
         if self.exit_code == 0:
             last_line = self.last_nonblank_log_line()
-            dur = _format_duration(duration)
+            dur = format_duration(duration)
             if last_line and dur != "—":
                 return f"{last_line} • {dur}"
             if last_line:
                 return last_line
             return f"ok • {dur}"
-        return f"exit {self.exit_code} • {_format_duration(duration)}"
+        return f"exit {self.exit_code} • {format_duration(duration)}"
 
     def is_active(self) -> bool:
         return (self.status or "").lower() in {
@@ -15,19 +15,6 @@ def _parse_docker_time(value: str | None) -> datetime | None:
     return dt if dt and dt.year >= 1970 else None
 
 
-def _format_duration(seconds: float | None) -> str:
-    if seconds is None:
-        return "—"
-    seconds = max(0.0, float(seconds))
-    if seconds < 60:
-        return f"{int(seconds)}s"
-    minutes, rem = divmod(int(seconds), 60)
-    if minutes < 60:
-        return f"{minutes}m {int(rem)}s"
-    hours, minutes = divmod(minutes, 60)
-    return f"{hours}h {minutes}m"
-
-
 def _safe_str(value: object, default: str = "") -> str:
     """Convert value to stripped string, returning default if empty."""
     return str(value or default).strip() or default
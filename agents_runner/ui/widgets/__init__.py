@@ -4,6 +4,7 @@ from .animated_checkbox import AnimatedCheckBox
 from .arc_spinner import ArcSpinner
 from .artifact_highlighter import ArtifactSyntaxHighlighter, detect_language
 from .glass_card import GlassCard
+from .lazy_page import LazyPageHost
 from .loading_bar import BouncingLoadingBar
 from .log_highlighter import LogHighlighter
 from .smooth_scroll import SmoothScrollArea
@@ -22,6 +23,7 @@ __all__ = [
     "ArtifactSyntaxHighlighter",
     "BouncingLoadingBar",
     "GlassCard",
+    "LazyPageHost",
     "LogHighlighter",
     "SmoothScrollArea",
     "SpellHighlighter",
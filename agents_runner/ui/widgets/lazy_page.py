@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from typing import Callable
+
+from PySide6.QtCore import Signal
+from PySide6.QtWidgets import QVBoxLayout
+from PySide6.QtWidgets import QWidget
+
+from agents_runner.ui.runtime.startup_profile import mark_startup_phase
+
+
+class LazyPageHost(QWidget):
+    """Placeholder in the page stack that builds its page on first use.
+
+    The host is what gets shown/hidden by navigation; the real page is created
+    by ``factory`` the first time :meth:`page` is called (or the host is shown)
+    and fills the host's layout.
+    """
+
+    loaded = Signal(object)
+
+    def __init__(
+        self,
+        factory: Callable[[], QWidget],
+        *,
+        name: str,
+        parent: QWidget | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self._factory = factory
+        self._name = name
+        self._page: QWidget | None = None
+        self._layout = QVBoxLayout(self)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+        self._layout.setSpacing(0)
+
+    def is_loaded(self) -> bool:
+        return self._page is not None
+
+    def page(self) -> QWidget:
+        if self._page is None:
+            page = self._factory()
+            self._page = page
+            self._layout.addWidget(page)
+            mark_startup_phase(f"page_built:{self._name}")
+            self.loaded.emit(page)
+        return self._page
+
+    def showEvent(self, event) -> None:
+        self.page()
+        super().showEvent(event)
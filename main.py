@@ -58,9 +58,21 @@ def main() -> None:
             viewer_args = [sys.argv[0]] + sys.argv[2:]
             sys.exit(run_desktop_viewer(viewer_args))
 
+        from agents_runner.ui.runtime.startup_profile import install_startup_profiler
+        from agents_runner.ui.runtime.startup_profile import strip_profile_flags
+
+        argv, profile_startup, exit_after_profile = strip_profile_flags(sys.argv)
+        if profile_startup:
+            install_startup_profiler(exit_after_report=exit_after_profile)
+
+        from agents_runner.prompt_batch import strip_batch_flags
+
+        # --batch-prompts FILE [--batch-env ID] [--batch-base-branch NAME]
+        argv, batch = strip_batch_flags(argv)
+
         from agents_runner.ui.runtime.app import run_app
 
-        run_app(sys.argv)
+        run_app(argv, batch=batch)
     except SystemExit:
         raise
     except BaseException as error: